@@ -0,0 +1 @@
+"""Performance benchmarks for the trading hot paths (see hot_paths.py)."""
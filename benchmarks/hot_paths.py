@@ -0,0 +1,431 @@
+"""
+Hot-path benchmark suite with stored baselines.
+
+Every case builds its inputs from the deterministic SyntheticMarket
+(src/backtest/synthetic.py), so runs on the same machine are comparable
+and a slowdown shows up as a ratio against benchmarks/baselines.json.
+Setup (building bots, writing paper state files) is not timed; each repeat
+gets fresh state because several cases mutate it. Runs happen in a
+temporary working directory since GridBot and the paper client write
+their state files to ``config/``.
+
+Usage:
+    python -m benchmarks.hot_paths                  # run and compare
+    python -m benchmarks.hot_paths check_orders     # selected cases
+    python -m benchmarks.hot_paths --save           # record new baselines
+    python -m benchmarks.hot_paths --tolerance 1.3  # exit 1 above 1.3x baseline
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import tempfile
+import time
+import warnings
+from collections.abc import Callable
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+from src.backtest.synthetic import SyntheticMarket
+
+BASELINE_PATH = Path(__file__).with_name("baselines.json")
+DEFAULT_TOLERANCE = 1.5
+SEED = 42
+
+SYMBOL_INFO = {
+    "symbol": "BTCUSDT",
+    "min_qty": 0.00001,
+    "step_size": 0.00001,
+    "min_notional": 5.0,
+    "tick_size": 0.01,
+}
+
+
+@dataclass
+class Case:
+    """One benchmark: ``setup(size)`` returns the callable that gets timed."""
+
+    name: str
+    setup: Callable[[int], Callable[[], Any]]
+    size: int
+    description: str
+
+
+@dataclass
+class CaseResult:
+    name: str
+    size: int
+    median_ms: float
+    min_ms: float
+    baseline_ms: float | None = None
+
+    @property
+    def ratio(self) -> float | None:
+        if not self.baseline_ms:
+            return None
+        return self.median_ms / self.baseline_ms
+
+
+CASES: dict[str, Case] = {}
+
+
+def case(name: str, size: int, description: str):
+    def register(setup):
+        CASES[name] = Case(name, setup, size, description)
+        return setup
+
+    return register
+
+
+# ═══════════════════════════════════════════════════════════════
+# OFFLINE COLLABORATORS
+# ═══════════════════════════════════════════════════════════════
+
+
+def _paper_client_class():
+    from src.api.paper_client import PaperBinanceClient
+
+    class OfflinePaperClient(PaperBinanceClient):
+        """Paper client with synthetic prices instead of mainnet requests."""
+
+        prices: dict[str, float]
+
+        def _fetch_mainnet_price(self, symbol: str) -> float:
+            return self.prices.get(symbol, 0.0)
+
+        def get_symbol_info(self, symbol: str) -> dict:
+            return {**SYMBOL_INFO, "symbol": symbol}
+
+    return OfflinePaperClient
+
+
+def _write_paper_state(state_dir: Path, cohort: str, orders: list[dict], balances: dict) -> None:
+    """Paper portfolio file in the format PaperBinanceClient._load_state reads."""
+    state = {
+        "balances": balances,
+        "reserved": {},
+        "next_order_id": len(orders) + 1,
+        "orders": {str(o["order_id"]): o for o in orders},
+    }
+    state_dir.mkdir(parents=True, exist_ok=True)
+    (state_dir / f"paper_portfolio_{cohort}.json").write_text(json.dumps(state))
+
+
+def _paper_order(order_id: int, side: str, price: float, quantity: float, status: str) -> dict:
+    return {
+        "order_id": order_id,
+        "symbol": "BTCUSDT",
+        "side": side,
+        "order_type": "LIMIT",
+        "quantity": quantity,
+        "price": price,
+        "status": status,
+        "executed_qty": quantity if status == "FILLED" else 0,
+        "created_at": 1_700_000_000 + order_id,
+        "filled_at": 1_700_000_100 + order_id if status == "FILLED" else None,
+    }
+
+
+class _SilentNotifier:
+    enabled = False
+
+    def send(self, message: str, urgent: bool = False):
+        pass
+
+
+class _KlineFeed:
+    """Answers the klines requests of the analysis modules from the synthetic market."""
+
+    def __init__(self, market: SyntheticMarket, periods: int):
+        self.market = market
+        self.periods = periods
+
+    def get(self, url: str, params: dict | None = None, **kwargs) -> list:
+        return self.market.klines(params["symbol"], min(params["limit"], self.periods))
+
+
+# ═══════════════════════════════════════════════════════════════
+# CASES
+# ═══════════════════════════════════════════════════════════════
+
+
+@case("grid_strategy_build", 200, "GridStrategy with N levels (Decimal rounding per level)")
+def _grid_strategy_build(size: int):
+    from src.strategies.grid_strategy import GridStrategy
+
+    def run():
+        return GridStrategy(57000, 63000, size, 100_000, SYMBOL_INFO)
+
+    return run
+
+
+@case("grid_strategy_fills", 1000, "N buy+sell fill lookups on a 200-level grid")
+def _grid_strategy_fills(size: int):
+    from src.strategies.grid_strategy import GridStrategy
+
+    strategy = GridStrategy(57000, 63000, 200, 100_000, SYMBOL_INFO)
+    prices = [level.price for level in strategy.levels]
+    fills = [prices[i % len(prices)] for i in range(0, size * 7, 7)]
+
+    def run():
+        for price in fills:
+            strategy.on_buy_filled(price)
+            strategy.on_sell_filled(price)
+
+    return run
+
+
+@case("check_orders", 500, "GridBot.check_orders with N active orders, 10% filled (paper)")
+def _check_orders(size: int):
+    from src.core.bot import GridBot
+    from src.strategies.grid_strategy import GridStrategy
+
+    class OfflineGridBot(GridBot):
+        def _init_trade_pair_tracker(self):
+            pass
+
+        def _init_memory(self):
+            pass
+
+        def _init_stop_loss(self):
+            pass
+
+        def _init_risk_modules(self):
+            pass
+
+    strategy = GridStrategy(57000, 63000, size, 1_000_000, SYMBOL_INFO)
+    mid = Decimal(60000)
+    orders, active = [], {}
+    for order_id, level in enumerate(strategy.levels, start=1):
+        side = "BUY" if level.price < mid else "SELL"
+        status = "FILLED" if order_id % 10 == 0 else "NEW"
+        orders.append(
+            _paper_order(order_id, side, float(level.price), float(level.quantity), status)
+        )
+        active[order_id] = {
+            "type": side,
+            "price": float(level.price),
+            "quantity": float(level.quantity),
+            "created_at": "2024-01-01T00:00:00",
+        }
+
+    state_dir = Path("paper_check_orders")
+    _write_paper_state(state_dir, "bench", orders, {"USDT": 2_000_000.0, "BTC": 50.0})
+    client = _paper_client_class()(state_dir=str(state_dir), cohort_name="bench")
+    client.prices = {"BTCUSDT": 60000.0}
+
+    bot = OfflineGridBot(
+        {"symbol": "BTCUSDT", "investment": 1_000_000, "state_file": "bench_grid_state.json"},
+        client=client,
+    )
+    bot.telegram = _SilentNotifier()
+    bot.strategy = strategy
+    bot.symbol_info = SYMBOL_INFO
+    for order_id, info in active.items():
+        bot.active_orders[order_id] = info
+    return bot.check_orders
+
+
+@case("paper_matching", 5000, "PaperBinanceClient price tick with N orders of history")
+def _paper_matching(size: int):
+    market = SyntheticMarket(seed=SEED, symbols=["BTCUSDT"])
+    flow = market.order_flow("BTCUSDT", size, periods=1000)
+    close = float(market.ohlcv("BTCUSDT", 1000)["close"][-1])
+    orders = []
+    for order_id, order in enumerate(flow, start=1):
+        # Last 5% still open, the rest is filled/canceled history
+        status = "NEW" if order_id > size * 0.95 else ("FILLED" if order_id % 3 else "CANCELED")
+        orders.append(_paper_order(order_id, order.side, order.price, order.quantity, status))
+
+    state_dir = Path("paper_matching")
+    _write_paper_state(state_dir, "bench", orders, {"USDT": 5_000_000.0, "BTC": 100.0})
+    client = _paper_client_class()(state_dir=str(state_dir), cohort_name="bench")
+    client.prices = {"BTCUSDT": close}
+
+    def run():
+        return client.get_current_price("BTCUSDT")
+
+    return run
+
+
+@case("backtest_run", 180, "BacktestEngine.run: N days x 6 coins, weekly Markowitz rebalance")
+def _backtest_run(size: int):
+    from src.backtest.engine import BacktestEngine
+    from src.strategies.portfolio_rebalance import portfolio_rebalance_strategy
+
+    prices = SyntheticMarket(seed=SEED).price_frame(periods=size)
+    engine = BacktestEngine(initial_capital=1000.0)
+
+    def run():
+        return engine.run(
+            price_data=prices,
+            strategy=portfolio_rebalance_strategy,
+            price_history=prices,
+            rebalance_interval_days=7,
+        )
+
+    return run
+
+
+@case("divergence_analyze", 20, "DivergenceDetector.analyze on N symbols (500 candles each)")
+def _divergence_analyze(size: int):
+    from src.analysis.divergence_detector import DivergenceDetector
+
+    symbols = [f"S{i:02d}USDT" for i in range(size)]
+    market = SyntheticMarket(seed=SEED, symbols=symbols)
+    data = {s: market.ohlcv(s, 500) for s in symbols}
+    detector = DivergenceDetector.__new__(DivergenceDetector)
+    detector.conn = None
+    detector.http = None
+
+    def run():
+        return [detector.analyze(s, ohlcv_data=data[s]) for s in symbols]
+
+    return run
+
+
+@case("memory_similarity", 1000, "TradingMemory similarity ranking over N candidate trades")
+def _memory_similarity(size: int):
+    from src.data.memory import TradingMemory
+
+    candidates = SyntheticMarket(seed=SEED).trade_history(size)
+    score = TradingMemory._similarity_score
+
+    def run():
+        scored = [(score(c, 35, "ETHUSDT", "BULL"), c) for c in candidates]
+        scored.sort(key=lambda x: x[0], reverse=True)
+        return scored[:10]
+
+    return run
+
+
+@case("correlation_matrix", 30, "CorrelationCalculator matrix for N symbols (60 daily returns)")
+def _correlation_matrix(size: int):
+    from src.analysis.correlation_matrix import CorrelationCalculator
+
+    symbols = [f"S{i:02d}USDT" for i in range(size)]
+    feed = _KlineFeed(SyntheticMarket(seed=SEED, symbols=symbols), periods=61)
+    calculator = CorrelationCalculator.__new__(CorrelationCalculator)
+    calculator.http = feed
+    calculator._cache = {}
+    calculator._returns_cache = {}
+
+    def run():
+        return calculator.compute_correlation_matrix(symbols)
+
+    return run
+
+
+# ═══════════════════════════════════════════════════════════════
+# RUNNER
+# ═══════════════════════════════════════════════════════════════
+
+
+def run_case(bench: Case, repeat: int = 5, size: int | None = None) -> CaseResult:
+    """Median and best of ``repeat`` timed calls, each after a fresh setup."""
+    size = size or bench.size
+    timings = []
+    for _ in range(max(repeat, 1)):
+        func = bench.setup(size)
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return CaseResult(bench.name, size, statistics.median(timings), min(timings))
+
+
+def run_benchmarks(
+    names: list[str] | None = None, repeat: int = 5, scale: float = 1.0
+) -> list[CaseResult]:
+    """Run cases in a scratch working directory (state files land in config/)."""
+    selected = [CASES[n] for n in names] if names else list(CASES.values())
+    cwd = Path.cwd()
+    with tempfile.TemporaryDirectory(prefix="bench_") as scratch:
+        os.chdir(scratch)
+        try:
+            return [run_case(b, repeat=repeat, size=max(int(b.size * scale), 1)) for b in selected]
+        finally:
+            os.chdir(cwd)
+
+
+def load_baselines(path: Path = BASELINE_PATH) -> dict[str, dict]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text()).get("cases", {})
+
+
+def save_baselines(results: list[CaseResult], path: Path = BASELINE_PATH) -> None:
+    cases = load_baselines(path)
+    cases.update({r.name: {"size": r.size, "median_ms": round(r.median_ms, 3)} for r in results})
+    payload = {
+        "machine": f"{platform.machine()} {platform.processor() or platform.system()}".strip(),
+        "python": platform.python_version(),
+        "seed": SEED,
+        "cases": dict(sorted(cases.items())),
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n")
+
+
+def attach_baselines(results: list[CaseResult], baselines: dict[str, dict]) -> None:
+    """Set ``baseline_ms`` where a baseline exists for the same input size."""
+    for result in results:
+        baseline = baselines.get(result.name)
+        if baseline and baseline.get("size") == result.size:
+            result.baseline_ms = baseline["median_ms"]
+
+
+def format_report(results: list[CaseResult], tolerance: float = DEFAULT_TOLERANCE) -> str:
+    lines = [f"{'Case':<22}{'N':>7}{'median ms':>12}{'min ms':>10}{'baseline':>10}{'ratio':>8}"]
+    for r in results:
+        baseline = f"{r.baseline_ms:.2f}" if r.baseline_ms else "-"
+        ratio = f"{r.ratio:.2f}x" if r.ratio else "-"
+        flag = "  REGRESSION" if r.ratio and r.ratio > tolerance else ""
+        lines.append(
+            f"{r.name:<22}{r.size:>7}{r.median_ms:>12.2f}{r.min_ms:>10.2f}"
+            f"{baseline:>10}{ratio:>8}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Hot-path benchmarks against stored baselines")
+    parser.add_argument("cases", nargs="*", help=f"Cases to run (default all): {', '.join(CASES)}")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case (median kept)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every input size")
+    parser.add_argument("--save", action="store_true", help="Write results as new baselines")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Exit 1 if a case is slower than tolerance x baseline",
+    )
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    # Fills, order placement and grid-spacing checks log on every run; keep the report readable
+    logging.getLogger("trading_bot").setLevel(logging.ERROR)
+    warnings.simplefilter("ignore", RuntimeWarning)
+
+    results = run_benchmarks(args.cases or None, repeat=args.repeat, scale=args.scale)
+    attach_baselines(results, load_baselines())
+    print(format_report(results, args.tolerance))
+
+    if args.save:
+        save_baselines(results)
+        print(f"\nBaselines written to {BASELINE_PATH}")
+        return 0
+    regressions = [r.name for r in results if r.ratio and r.ratio > args.tolerance]
+    if regressions:
+        print(f"\nSlower than {args.tolerance:.2f}x baseline: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -57,12 +57,13 @@ CREATE INDEX idx_trades_symbol ON trades(symbol);
 CREATE INDEX idx_trades_action ON trades(action);
 CREATE INDEX idx_trades_fear_greed ON trades(fear_greed);
 CREATE INDEX idx_trades_outcome ON trades(was_good_decision) WHERE was_good_decision IS NOT NULL;
+CREATE INDEX idx_trades_updated ON trades(updated_at);
 
 -- ═══════════════════════════════════════════════════════════════
 -- MARKET_SNAPSHOTS - Stündliche Marktdaten
 -- ═══════════════════════════════════════════════════════════════
 CREATE TABLE IF NOT EXISTS market_snapshots (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
     timestamp TIMESTAMPTZ NOT NULL DEFAULT NOW(),
 
     -- Global Market
@@ -90,8 +91,10 @@ CREATE TABLE IF NOT EXISTS market_snapshots (
     btc_rsi DECIMAL(5, 2),
     btc_macd JSONB,
 
-    created_at TIMESTAMPTZ DEFAULT NOW()
-);
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
 
 CREATE INDEX idx_snapshots_timestamp ON market_snapshots(timestamp DESC);
 CREATE INDEX idx_snapshots_fear_greed ON market_snapshots(fear_greed);
@@ -100,7 +103,7 @@ CREATE INDEX idx_snapshots_fear_greed ON market_snapshots(fear_greed);
 -- WHALE_ALERTS - Große Transaktionen
 -- ═══════════════════════════════════════════════════════════════
 CREATE TABLE IF NOT EXISTS whale_alerts (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
     timestamp TIMESTAMPTZ NOT NULL,
 
     symbol VARCHAR(20) NOT NULL,
@@ -117,8 +120,10 @@ CREATE TABLE IF NOT EXISTS whale_alerts (
     potential_impact VARCHAR(20),  -- BULLISH, BEARISH, NEUTRAL
     notes TEXT,
 
-    created_at TIMESTAMPTZ DEFAULT NOW()
-);
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
 
 CREATE INDEX idx_whale_timestamp ON whale_alerts(timestamp DESC);
 CREATE INDEX idx_whale_symbol ON whale_alerts(symbol);
@@ -239,7 +244,7 @@ CREATE INDEX idx_stoploss_symbol ON stop_loss_orders(symbol);
 -- AI_CONVERSATIONS - Telegram AI Chat History
 -- ═══════════════════════════════════════════════════════════════
 CREATE TABLE IF NOT EXISTS ai_conversations (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
     timestamp TIMESTAMPTZ NOT NULL DEFAULT NOW(),
 
     user_message TEXT NOT NULL,
@@ -251,8 +256,10 @@ CREATE TABLE IF NOT EXISTS ai_conversations (
     had_trade_context BOOLEAN DEFAULT false,
     had_market_context BOOLEAN DEFAULT false,
 
-    created_at TIMESTAMPTZ DEFAULT NOW()
-);
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
 
 CREATE INDEX idx_ai_conv_timestamp ON ai_conversations(timestamp DESC);
 
@@ -260,7 +267,7 @@ CREATE INDEX idx_ai_conv_timestamp ON ai_conversations(timestamp DESC);
 -- TECHNICAL_INDICATORS - Berechnete Indikatoren
 -- ═══════════════════════════════════════════════════════════════
 CREATE TABLE IF NOT EXISTS technical_indicators (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
     timestamp TIMESTAMPTZ NOT NULL,
     symbol VARCHAR(20) NOT NULL,
 
@@ -294,8 +301,9 @@ CREATE TABLE IF NOT EXISTS technical_indicators (
 
     created_at TIMESTAMPTZ DEFAULT NOW(),
 
+    PRIMARY KEY (id, timestamp),
     UNIQUE(timestamp, symbol)
-);
+) PARTITION BY RANGE (timestamp);
 
 CREATE INDEX idx_tech_timestamp ON technical_indicators(timestamp DESC);
 CREATE INDEX idx_tech_symbol ON technical_indicators(symbol);
@@ -498,12 +506,13 @@ CREATE INDEX idx_signals_cycle ON signal_components(cycle_id);
 CREATE INDEX idx_signals_cohort ON signal_components(cohort_id);
 CREATE INDEX idx_signals_timestamp ON signal_components(timestamp DESC);
 CREATE INDEX idx_signals_divergence ON signal_components(has_divergence) WHERE has_divergence = true;
+CREATE INDEX IF NOT EXISTS idx_signals_created ON signal_components(created_at);
 
 -- ═══════════════════════════════════════════════════════════════
 -- CALCULATION_SNAPSHOTS - Alle Math-Berechnungen persistieren
 -- ═══════════════════════════════════════════════════════════════
 CREATE TABLE IF NOT EXISTS calculation_snapshots (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
     timestamp TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     cycle_id UUID REFERENCES trading_cycles(id),
     cohort_id UUID REFERENCES cohorts(id),
@@ -554,8 +563,10 @@ CREATE TABLE IF NOT EXISTS calculation_snapshots (
     consecutive_wins INTEGER DEFAULT 0,
     consecutive_losses INTEGER DEFAULT 0,
 
-    created_at TIMESTAMPTZ DEFAULT NOW()
-);
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
 
 CREATE INDEX idx_calc_timestamp ON calculation_snapshots(timestamp DESC);
 CREATE INDEX idx_calc_cycle ON calculation_snapshots(cycle_id);
@@ -623,13 +634,14 @@ CREATE INDEX idx_pairs_cycle ON trade_pairs(cycle_id);
 CREATE INDEX idx_pairs_cohort ON trade_pairs(cohort_id);
 CREATE INDEX idx_pairs_symbol ON trade_pairs(symbol);
 CREATE INDEX idx_pairs_status ON trade_pairs(status);
+CREATE INDEX idx_pairs_cohort_status ON trade_pairs(cohort_id, status);
 CREATE INDEX idx_pairs_entry ON trade_pairs(entry_timestamp DESC);
 
 -- ═══════════════════════════════════════════════════════════════
 -- REGIME_HISTORY - Markt-Regime Tracking
 -- ═══════════════════════════════════════════════════════════════
 CREATE TABLE IF NOT EXISTS regime_history (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
     timestamp TIMESTAMPTZ NOT NULL DEFAULT NOW(),
 
     regime VARCHAR(20) NOT NULL,  -- BULL, BEAR, SIDEWAYS
@@ -647,12 +659,73 @@ CREATE TABLE IF NOT EXISTS regime_history (
     previous_regime VARCHAR(20),
     regime_duration_hours INTEGER,
 
-    created_at TIMESTAMPTZ DEFAULT NOW()
-);
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
 
 CREATE INDEX idx_regime_timestamp ON regime_history(timestamp DESC);
 CREATE INDEX idx_regime_type ON regime_history(regime);
 
+-- Materialisierter Tages-Lookup: ein Regime pro Tag (dominantes Regime,
+-- bei Gleichstand das zuletzt gesehene). Wird von RegimeDetector.store_regime
+-- und dem wöchentlichen Bayesian-Update gepflegt; Joins laufen über den PK
+-- statt über DATE(regime_history.timestamp).
+CREATE TABLE IF NOT EXISTS regime_daily (
+    day DATE PRIMARY KEY,
+    regime VARCHAR(20) NOT NULL,
+    observations INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- ═══════════════════════════════════════════════════════════════
+-- ANALYTICS ROLLUPS - Tages-Aggregate für Playbook und Weekly Export
+-- ═══════════════════════════════════════════════════════════════
+-- Gepflegt von src/data/analytics_rollups.py (stündlicher Refresh der Tage
+-- mit geänderten Trades). Unbekanntes Regime = '', unbekannter F&G = -1.
+CREATE TABLE IF NOT EXISTS trade_rollup_daily (
+    day DATE NOT NULL,
+    hour SMALLINT NOT NULL,
+    symbol VARCHAR(20) NOT NULL,
+    action VARCHAR(10) NOT NULL,
+    regime VARCHAR(20) NOT NULL DEFAULT '',
+    fear_greed SMALLINT NOT NULL DEFAULT -1,
+    trades INTEGER NOT NULL DEFAULT 0,
+
+    -- outcome_24h (Playbook)
+    n_24h INTEGER NOT NULL DEFAULT 0,
+    good_24h INTEGER NOT NULL DEFAULT 0,
+    bad_24h INTEGER NOT NULL DEFAULT 0,
+    sum_24h DOUBLE PRECISION NOT NULL DEFAULT 0,
+    sumsq_24h DOUBLE PRECISION NOT NULL DEFAULT 0,
+    good_sum_24h DOUBLE PRECISION NOT NULL DEFAULT 0,
+    bad_sum_24h DOUBLE PRECISION NOT NULL DEFAULT 0,
+
+    -- outcome_1h + Confidence (Weekly Export)
+    n_1h INTEGER NOT NULL DEFAULT 0,
+    win_1h INTEGER NOT NULL DEFAULT 0,
+    loss_1h INTEGER NOT NULL DEFAULT 0,
+    sum_1h DOUBLE PRECISION NOT NULL DEFAULT 0,
+    profit_1h DOUBLE PRECISION NOT NULL DEFAULT 0,
+    loss_sum_1h DOUBLE PRECISION NOT NULL DEFAULT 0,
+    n_confidence INTEGER NOT NULL DEFAULT 0,
+    sum_confidence DOUBLE PRECISION NOT NULL DEFAULT 0,
+
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (day, hour, symbol, action, regime, fear_greed)
+);
+
+CREATE TABLE IF NOT EXISTS signal_rollup_daily (
+    day DATE NOT NULL,
+    regime VARCHAR(20) NOT NULL DEFAULT '',
+    signal VARCHAR(30) NOT NULL,  -- Spalte aus signal_components oder 'overall'
+    total INTEGER NOT NULL DEFAULT 0,
+    correct INTEGER NOT NULL DEFAULT 0,
+    sum_strength DOUBLE PRECISION NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (day, regime, signal)
+);
+
 -- ═══════════════════════════════════════════════════════════════
 -- SIGNAL_WEIGHTS - Bayesian Gewichtung über Zeit
 -- ═══════════════════════════════════════════════════════════════
@@ -979,7 +1052,7 @@ CREATE INDEX idx_alloc_status ON cohort_allocations(status);
 -- OPPORTUNITIES - Scanner gefundene Opportunities
 -- ═══════════════════════════════════════════════════════════════
 CREATE TABLE IF NOT EXISTS opportunities (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
     timestamp TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     symbol VARCHAR(20) NOT NULL,
 
@@ -1018,8 +1091,10 @@ CREATE TABLE IF NOT EXISTS opportunities (
     expires_at TIMESTAMPTZ,              -- Opportunity verfällt nach X Stunden
     is_expired BOOLEAN DEFAULT FALSE,
 
-    created_at TIMESTAMPTZ DEFAULT NOW()
-);
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
 
 CREATE INDEX idx_opp_timestamp ON opportunities(timestamp DESC);
 CREATE INDEX idx_opp_symbol ON opportunities(symbol);
@@ -1030,7 +1105,7 @@ CREATE INDEX idx_opp_active ON opportunities(is_expired, was_traded);
 -- SOCIAL_SENTIMENT - Social Media Tracking (erweitert)
 -- ═══════════════════════════════════════════════════════════════
 CREATE TABLE IF NOT EXISTS social_sentiment (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
     timestamp TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     symbol VARCHAR(20) NOT NULL,
 
@@ -1052,8 +1127,10 @@ CREATE TABLE IF NOT EXISTS social_sentiment (
     composite_sentiment DECIMAL(5, 4),   -- -1 to +1
     sentiment_change_24h DECIMAL(5, 4),  -- Änderung vs gestern
 
-    created_at TIMESTAMPTZ DEFAULT NOW()
-);
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
 
 CREATE INDEX idx_social_timestamp ON social_sentiment(timestamp DESC);
 CREATE INDEX idx_social_symbol ON social_sentiment(symbol);
@@ -1435,6 +1512,48 @@ CREATE INDEX IF NOT EXISTS idx_opp_symbol_timestamp ON opportunities(symbol, tim
 CREATE INDEX IF NOT EXISTS idx_tech_symbol_timestamp ON technical_indicators(symbol, timestamp DESC);
 CREATE INDEX IF NOT EXISTS idx_trades_cohort_cycle ON trades(cohort_id, cycle_id, timestamp DESC);
 
+-- ═══════════════════════════════════════════════════════════════
+-- RISK_BUDGETS - Vorberechnete CVaR-Budgets pro Symbol und Regime
+-- ═══════════════════════════════════════════════════════════════
+-- Geschrieben von task_refresh_risk_budgets, gelesen vom CVaRPositionSizer
+CREATE TABLE IF NOT EXISTS risk_budgets (
+    symbol VARCHAR(20) NOT NULL,
+    regime VARCHAR(20) NOT NULL,          -- DEFAULT = ohne Regime-Anpassung
+
+    var_95 DECIMAL(10, 6) NOT NULL,
+    var_99 DECIMAL(10, 6) NOT NULL,
+    cvar_95 DECIMAL(10, 6) NOT NULL,
+    cvar_99 DECIMAL(10, 6) NOT NULL,
+    max_loss_observed DECIMAL(10, 6) NOT NULL,
+    volatility DECIMAL(10, 6) NOT NULL,
+    downside_volatility DECIMAL(10, 6) NOT NULL,
+
+    kelly_fraction DECIMAL(10, 6) NOT NULL,   -- Half-Kelly Anteil
+    adjusted_cvar DECIMAL(10, 6) NOT NULL,    -- CVaR(95%) nach Regime-Multiplikator
+    max_position_pct DECIMAL(10, 6) NOT NULL, -- bei 2% Risk Budget, volle Confidence
+
+    sample_size INTEGER NOT NULL,
+    computed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    PRIMARY KEY (symbol, regime)
+);
+
+-- ═══════════════════════════════════════════════════════════════
+-- C3: QUERY-PLAN INDEXES (gemessen mit python -m src.data.index_advisor)
+-- ═══════════════════════════════════════════════════════════════
+-- Outcome-Updates: Zeitfenster + outcome_XX IS NULL (Partial: nur offene Trades)
+CREATE INDEX IF NOT EXISTS idx_trades_pending_1h ON trades(timestamp) WHERE outcome_1h IS NULL;
+CREATE INDEX IF NOT EXISTS idx_trades_pending_4h ON trades(timestamp) WHERE outcome_4h IS NULL;
+CREATE INDEX IF NOT EXISTS idx_trades_pending_24h ON trades(timestamp) WHERE outcome_24h IS NULL;
+CREATE INDEX IF NOT EXISTS idx_trades_pending_7d ON trades(timestamp) WHERE outcome_7d IS NULL;
+-- find_similar_situations: bewertete Trades, neueste zuerst
+CREATE INDEX IF NOT EXISTS idx_trades_evaluated ON trades(timestamp DESC) WHERE outcome_24h IS NOT NULL;
+-- CycleManager._get_daily_returns: Index-Only-Scan je Zyklus
+CREATE INDEX IF NOT EXISTS idx_trades_cycle_outcome ON trades(cycle_id, timestamp) INCLUDE (outcome_24h) WHERE outcome_24h IS NOT NULL;
+-- Trade-Bewertung und Signal-Joins über trade_pairs
+CREATE INDEX IF NOT EXISTS idx_pairs_entry_trade ON trade_pairs(entry_trade_id);
+CREATE INDEX IF NOT EXISTS idx_pairs_exit_trade ON trade_pairs(exit_trade_id);
+
 -- ═══════════════════════════════════════════════════════════════
 -- C2: RETENTION-FRIENDLY INDEXES (for D2 cleanup DELETEs)
 -- ═══════════════════════════════════════════════════════════════
@@ -1464,5 +1583,113 @@ EXCEPTION WHEN duplicate_object THEN NULL; END $$;
 ALTER TABLE trades ADD COLUMN IF NOT EXISTS expected_price DECIMAL(20, 8);
 ALTER TABLE trades ADD COLUMN IF NOT EXISTS slippage_bps DECIMAL(10, 4);
 
+-- ═══════════════════════════════════════════════════════════════
+-- PARTITIONING: monatliche Range-Partitionen für Zeitreihen-Tabellen
+-- ═══════════════════════════════════════════════════════════════
+-- market_snapshots, whale_alerts, social_sentiment, opportunities,
+-- technical_indicators, calculation_snapshots, ai_conversations und
+-- regime_history sind nach timestamp partitioniert ({table}_pYYYYMM plus
+-- {table}_default für Ausreißer). Retention (task_cleanup_old_data) droppt
+-- ganze Monate statt Zeilen zu löschen und legt kommende Monate an.
+
+-- Partitionen für [heute - months_back, heute + months_ahead] Monate anlegen
+CREATE OR REPLACE FUNCTION ensure_monthly_partitions(
+    parent TEXT, months_ahead INT DEFAULT 2, months_back INT DEFAULT 0
+)
+RETURNS INT AS $$
+DECLARE
+    month_start DATE;
+    part TEXT;
+    created INT := 0;
+BEGIN
+    EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF %I DEFAULT',
+                   parent || '_default', parent);
+
+    FOR i IN -months_back..months_ahead LOOP
+        month_start := (date_trunc('month', CURRENT_DATE) + make_interval(months => i))::date;
+        part := parent || '_p' || to_char(month_start, 'YYYYMM');
+        CONTINUE WHEN to_regclass(part) IS NOT NULL;
+        BEGIN
+            EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                           part, parent, month_start, (month_start + INTERVAL '1 month')::date);
+            created := created + 1;
+        EXCEPTION WHEN check_violation THEN
+            -- Default-Partition enthält bereits Zeilen dieses Monats
+            RAISE NOTICE 'Partition % übersprungen: Zeilen in %_default', part, parent;
+        END;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Migration bestehender (unpartitionierter) Tabellen: einmalig pro Tabelle
+--   SELECT convert_to_monthly_partitions('market_snapshots');
+-- Kopiert alle Zeilen in eine partitionierte Tabelle gleicher Struktur und
+-- übernimmt Indexe, CHECK- und Foreign-Key-Constraints. Sperrt die Tabelle
+-- für die Dauer der Kopie; idempotent für bereits partitionierte Tabellen.
+CREATE OR REPLACE FUNCTION convert_to_monthly_partitions(parent TEXT)
+RETURNS BOOLEAN AS $$
+DECLARE
+    legacy TEXT := parent || '_legacy';
+    oldest DATE;
+    months_back INT;
+    index_defs TEXT[];
+    fk_defs TEXT[];
+    def TEXT;
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(parent)) THEN
+        RETURN FALSE;
+    END IF;
+
+    EXECUTE format('LOCK TABLE %I IN ACCESS EXCLUSIVE MODE', parent);
+
+    SELECT array_agg(indexdef) INTO index_defs
+    FROM pg_indexes i
+    WHERE i.tablename = parent AND i.schemaname = current_schema()
+    -- NOT EXISTS: ohne Primary Key wäre "<> (Subquery)" NULL und verwirft alle Indexe
+    AND NOT EXISTS (
+        SELECT 1 FROM pg_constraint c
+        WHERE c.conrelid = to_regclass(parent) AND c.contype = 'p'
+        AND c.conname = i.indexname
+    );
+
+    SELECT array_agg(format('ALTER TABLE %I ADD CONSTRAINT %I %s',
+                            parent, conname, pg_get_constraintdef(oid)))
+    INTO fk_defs
+    FROM pg_constraint
+    WHERE conrelid = to_regclass(parent) AND contype = 'f';
+
+    EXECUTE format('ALTER TABLE %I RENAME TO %I', parent, legacy);
+    EXECUTE format(
+        'CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+        'PARTITION BY RANGE (timestamp)', parent, legacy);
+
+    EXECUTE format('SELECT MIN(timestamp)::date FROM %I', legacy) INTO oldest;
+    months_back := COALESCE(
+        (EXTRACT(YEAR FROM age(date_trunc('month', CURRENT_DATE), date_trunc('month', oldest))) * 12
+         + EXTRACT(MONTH FROM age(date_trunc('month', CURRENT_DATE), date_trunc('month', oldest))))::int,
+        0);
+    PERFORM ensure_monthly_partitions(parent, 2, months_back);
+
+    EXECUTE format('INSERT INTO %I SELECT * FROM %I', parent, legacy);
+    EXECUTE format('DROP TABLE %I', legacy);
+
+    EXECUTE format('ALTER TABLE %I ADD PRIMARY KEY (id, timestamp)', parent);
+    FOREACH def IN ARRAY COALESCE(index_defs, '{}') LOOP
+        EXECUTE def;  -- indexdef referenziert den ursprünglichen Tabellennamen
+    END LOOP;
+    FOREACH def IN ARRAY COALESCE(fk_defs, '{}') LOOP
+        EXECUTE def;
+    END LOOP;
+    RETURN TRUE;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT ensure_monthly_partitions(t)
+FROM unnest(ARRAY[
+    'market_snapshots', 'whale_alerts', 'social_sentiment', 'opportunities',
+    'technical_indicators', 'calculation_snapshots', 'ai_conversations', 'regime_history'
+]) AS t;
+
 -- Fertig!
 SELECT 'Trading Bot Database initialized successfully with 3-Tier Portfolio System!' as status;
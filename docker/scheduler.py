@@ -5,13 +5,14 @@ Registriert alle periodischen Tasks und führt sie aus.
 """
 
 import logging
+import os
 import signal
 import sys
-import time
+import threading
 
 import schedule
 
-_shutdown = False
+_shutdown = threading.Event()
 
 sys.path.insert(0, "/app")
 
@@ -19,62 +20,104 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-from src.notifications.telegram_service import get_telegram
-from src.tasks.analysis_tasks import (
-    task_compute_technical_indicators,
-    task_divergence_scan,
-    task_learn_patterns,
-    task_regime_detection,
-    task_update_signal_weights,
-)
-from src.tasks.cycle_tasks import (
-    task_ab_test_check,
-    task_cycle_management,
-    task_weekly_rebalance,
-)
-from src.tasks.data_tasks import (
-    task_fetch_etf_flows,
-    task_fetch_social_sentiment,
-    task_fetch_token_unlocks,
-    task_whale_check,
-)
-from src.tasks.hybrid_tasks import task_hybrid_rebalance, task_mode_evaluation
-from src.tasks.market_tasks import task_market_snapshot, task_sentiment_check
-from src.tasks.monitoring_tasks import (
-    task_discovery_health_check,
-    task_grid_health_summary,
-    task_order_timeout_check,
-    task_portfolio_plausibility,
-    task_reconcile_orders,
-    task_stale_detection,
-    task_tier_health_check,
-)
-from src.tasks.portfolio_tasks import (
-    task_auto_discovery,
-    task_coin_performance_update,
-    task_portfolio_rebalance,
-    task_portfolio_snapshot,
-    task_scan_opportunities,
-    task_update_watchlist,
+from src.tasks.executor import Priority, TaskExecutor
+from src.utils.lazy import lazy_task, preload
+from src.utils.telemetry import get_task_telemetry, start_metrics_server
+
+# Task-Module werden erst beim ersten Lauf importiert (schneller Start/Restart).
+# SCHEDULER_PRELOAD_TASKS=true importiert alle beim Start (Import-Fehler sofort sehen).
+task_compute_technical_indicators = lazy_task(
+    "src.tasks.analysis_tasks:task_compute_technical_indicators"
 )
-from src.tasks.reporting_tasks import (
-    task_daily_summary,
-    task_update_playbook,
-    task_weekly_export,
+task_divergence_scan = lazy_task("src.tasks.analysis_tasks:task_divergence_scan")
+task_learn_patterns = lazy_task("src.tasks.analysis_tasks:task_learn_patterns")
+task_refresh_risk_budgets = lazy_task("src.tasks.analysis_tasks:task_refresh_risk_budgets")
+task_regime_detection = lazy_task("src.tasks.analysis_tasks:task_regime_detection")
+task_update_signal_weights = lazy_task("src.tasks.analysis_tasks:task_update_signal_weights")
+task_ab_test_check = lazy_task("src.tasks.cycle_tasks:task_ab_test_check")
+task_cycle_management = lazy_task("src.tasks.cycle_tasks:task_cycle_management")
+task_weekly_rebalance = lazy_task("src.tasks.cycle_tasks:task_weekly_rebalance")
+task_fetch_etf_flows = lazy_task("src.tasks.data_tasks:task_fetch_etf_flows")
+task_fetch_social_sentiment = lazy_task("src.tasks.data_tasks:task_fetch_social_sentiment")
+task_fetch_token_unlocks = lazy_task("src.tasks.data_tasks:task_fetch_token_unlocks")
+task_whale_check = lazy_task("src.tasks.data_tasks:task_whale_check")
+task_hybrid_rebalance = lazy_task("src.tasks.hybrid_tasks:task_hybrid_rebalance")
+task_mode_evaluation = lazy_task("src.tasks.hybrid_tasks:task_mode_evaluation")
+task_market_snapshot = lazy_task("src.tasks.market_tasks:task_market_snapshot")
+task_sentiment_check = lazy_task("src.tasks.market_tasks:task_sentiment_check")
+task_discovery_health_check = lazy_task("src.tasks.monitoring_tasks:task_discovery_health_check")
+task_grid_health_summary = lazy_task("src.tasks.monitoring_tasks:task_grid_health_summary")
+task_order_timeout_check = lazy_task("src.tasks.monitoring_tasks:task_order_timeout_check")
+task_portfolio_plausibility = lazy_task("src.tasks.monitoring_tasks:task_portfolio_plausibility")
+task_reconcile_orders = lazy_task("src.tasks.monitoring_tasks:task_reconcile_orders")
+task_stale_detection = lazy_task("src.tasks.monitoring_tasks:task_stale_detection")
+task_tier_health_check = lazy_task("src.tasks.monitoring_tasks:task_tier_health_check")
+task_auto_discovery = lazy_task("src.tasks.portfolio_tasks:task_auto_discovery")
+task_coin_performance_update = lazy_task("src.tasks.portfolio_tasks:task_coin_performance_update")
+task_portfolio_rebalance = lazy_task("src.tasks.portfolio_tasks:task_portfolio_rebalance")
+task_portfolio_snapshot = lazy_task("src.tasks.portfolio_tasks:task_portfolio_snapshot")
+task_scan_opportunities = lazy_task("src.tasks.portfolio_tasks:task_scan_opportunities")
+task_update_watchlist = lazy_task("src.tasks.portfolio_tasks:task_update_watchlist")
+task_daily_summary = lazy_task("src.tasks.reporting_tasks:task_daily_summary")
+task_refresh_analytics_rollups = lazy_task(
+    "src.tasks.reporting_tasks:task_refresh_analytics_rollups"
 )
-from src.tasks.retention_tasks import task_cleanup_old_data
-from src.tasks.system_tasks import (
-    task_check_stops,
-    task_evaluate_signal_correctness,
-    task_evaluate_trade_decisions,
-    task_macro_check,
-    task_reset_daily_drawdown,
-    task_system_health_check,
-    task_update_outcomes,
-    task_update_outcomes_1h,
-    task_update_outcomes_4h,
-    task_update_outcomes_7d,
+task_update_playbook = lazy_task("src.tasks.reporting_tasks:task_update_playbook")
+task_weekly_export = lazy_task("src.tasks.reporting_tasks:task_weekly_export")
+task_cleanup_old_data = lazy_task("src.tasks.retention_tasks:task_cleanup_old_data")
+task_check_stops = lazy_task("src.tasks.system_tasks:task_check_stops")
+task_evaluate_signal_correctness = lazy_task(
+    "src.tasks.system_tasks:task_evaluate_signal_correctness"
 )
+task_evaluate_trade_decisions = lazy_task("src.tasks.system_tasks:task_evaluate_trade_decisions")
+task_macro_check = lazy_task("src.tasks.system_tasks:task_macro_check")
+task_reset_daily_drawdown = lazy_task("src.tasks.system_tasks:task_reset_daily_drawdown")
+task_system_health_check = lazy_task("src.tasks.system_tasks:task_system_health_check")
+task_update_outcomes = lazy_task("src.tasks.system_tasks:task_update_outcomes")
+task_update_outcomes_1h = lazy_task("src.tasks.system_tasks:task_update_outcomes_1h")
+task_update_outcomes_4h = lazy_task("src.tasks.system_tasks:task_update_outcomes_4h")
+task_update_outcomes_7d = lazy_task("src.tasks.system_tasks:task_update_outcomes_7d")
+
+# Prioritätsklassen: jede Klasse hat eigene Worker, Stop-Checks warten nie auf Reports.
+# Nicht gelistete Tasks laufen als DATA.
+TASK_PRIORITIES = {
+    # Risk
+    "task_check_stops": Priority.RISK,
+    "task_reset_daily_drawdown": Priority.RISK,
+    "task_refresh_risk_budgets": Priority.RISK,
+    "task_portfolio_plausibility": Priority.RISK,
+    # Trading
+    "task_reconcile_orders": Priority.TRADING,
+    "task_order_timeout_check": Priority.TRADING,
+    "task_stale_detection": Priority.TRADING,
+    "task_mode_evaluation": Priority.TRADING,
+    "task_hybrid_rebalance": Priority.TRADING,
+    "task_weekly_rebalance": Priority.TRADING,
+    "task_portfolio_rebalance": Priority.TRADING,
+    "task_cycle_management": Priority.TRADING,
+    "_task_profit_redistribution": Priority.TRADING,
+    # Reporting + lange AI-Calls (niedrigste Klasse)
+    "task_daily_summary": Priority.REPORTING,
+    "task_weekly_export": Priority.REPORTING,
+    "task_update_playbook": Priority.REPORTING,
+    "task_ab_test_check": Priority.REPORTING,
+    "task_auto_discovery": Priority.REPORTING,
+    "task_cleanup_old_data": Priority.REPORTING,
+    "task_system_health_check": Priority.REPORTING,
+    "task_grid_health_summary": Priority.REPORTING,
+    "task_discovery_health_check": Priority.REPORTING,
+    "task_tier_health_check": Priority.REPORTING,
+    "_task_ai_portfolio_optimizer": Priority.REPORTING,
+    "_task_production_validation": Priority.REPORTING,
+}
+
+# Timeouts (Sekunden) abweichend vom Klassen-Default in src/tasks/executor.py
+TASK_TIMEOUTS = {
+    "task_weekly_export": 3600.0,
+    "task_auto_discovery": 3600.0,
+    "task_cleanup_old_data": 3600.0,
+    "_task_ai_portfolio_optimizer": 3600.0,
+}
 
 # Logging
 logging.basicConfig(
@@ -234,6 +277,18 @@ def main():
 
     sc = get_config().scheduler
 
+    if os.getenv("SCHEDULER_PRELOAD_TASKS", "false").lower() == "true":
+        preload([job for job in globals().values() if hasattr(job, "lazy_target")])
+        logger.info("Task modules preloaded")
+
+    def _handle_sigterm(_signum, _frame):
+        _shutdown.set()
+        logger.info("SIGTERM received, shutting down scheduler...")
+
+    signal.signal(signal.SIGTERM, _handle_sigterm)
+
+    from src.notifications.telegram_service import get_telegram
+
     telegram = get_telegram()
     telegram.send("🚀 <b>Trading Bot Scheduler gestartet</b>\n\n<i>Alle Jobs aktiv.</i>")
 
@@ -262,6 +317,9 @@ def main():
     # Trade decision quality (precise, from trade_pairs)
     schedule.every().day.at("22:30").do(task_evaluate_trade_decisions)
 
+    # Analytics-Rollups für Playbook/Weekly Export (nach 1h-Outcomes)
+    schedule.every().hour.at(":15").do(task_refresh_analytics_rollups)
+
     # Wöchentliches Rebalancing (default Sonntag 18:00)
     schedule.every().sunday.at(sc.weekly_rebalance_time).do(task_weekly_rebalance)
 
@@ -308,6 +366,9 @@ def main():
     # Regime Detection alle 4 Stunden
     schedule.every(4).hours.do(task_regime_detection)
 
+    # CVaR Risk-Budgets stündlich vorberechnen (Bot liest nur aus dem Speicher)
+    schedule.every().hour.at(":20").do(task_refresh_risk_budgets)
+
     # Bayesian Signal Weights täglich um 22:00
     schedule.every().day.at("22:00").do(task_update_signal_weights)
 
@@ -397,21 +458,35 @@ def main():
     for job in schedule.get_jobs():
         logger.info(f"  - {job}")
 
-    def _handle_sigterm(_signum, _frame):
-        global _shutdown
-        _shutdown = True
-        logger.info("SIGTERM received, shutting down scheduler...")
-
-    signal.signal(signal.SIGTERM, _handle_sigterm)
-
-    # Run loop
-    while not _shutdown:
+    # Jobs laufen auf Worker-Lanes je Prioritätsklasse statt im Main-Thread
+    executor = TaskExecutor(
+        workers={
+            Priority.RISK: sc.risk_workers,
+            Priority.TRADING: sc.trading_workers,
+            Priority.DATA: sc.data_workers,
+            Priority.REPORTING: sc.reporting_workers,
+        }
+    )
+    executor.wrap_jobs(schedule.get_jobs(), TASK_PRIORITIES, TASK_TIMEOUTS)
+    executor.start()
+
+    # Task-Telemetrie: lokaler Prometheus/JSON-Endpoint + Snapshot für Telegram /perf
+    telemetry = get_task_telemetry()
+    metrics_port = int(os.getenv("SCHEDULER_METRICS_PORT", "9108"))
+    if metrics_port > 0:
+        start_metrics_server(metrics_port, os.getenv("SCHEDULER_METRICS_HOST", "127.0.0.1"))
+
+    # Run loop (wait() returns immediately on SIGTERM instead of sleeping out the minute)
+    while not _shutdown.is_set():
         try:
             schedule.run_pending()
         except Exception as e:
             logger.error(f"Scheduler Error: {e}")
-        time.sleep(60)
+        telemetry.publish()
+        _shutdown.wait(60)
 
+    executor.shutdown(timeout=30)
+    telemetry.publish()
     logger.info("Scheduler stopped.")
 
 
@@ -102,6 +102,8 @@ class TradingTelegramBot:
 /sell <symbol> - Verkaufsvorschlag
 /rebalance - Rebalancing starten
 /validate - Production Readiness Check
+/perf - Laufzeiten der Scheduler-Tasks
+/profile [sek] - Tick-Profil des Trading-Bots
 
 *Playbook (Erfahrungsgedächtnis):*
 /playbook - Zeige aktuelle Regeln
@@ -314,20 +316,13 @@ _RSI neutral, MACD bullish crossover, Preis über SMAs_
         await update.message.reply_text("Loading portfolio tiers...")
 
         try:
-            import psycopg2
             from psycopg2.extras import RealDictCursor
 
-            database_url = os.getenv("DATABASE_URL")
-            if database_url:
-                conn = psycopg2.connect(database_url)
-            else:
-                conn = psycopg2.connect(
-                    host=os.getenv("POSTGRES_HOST", "localhost"),
-                    port=os.getenv("POSTGRES_PORT", 5432),
-                    database=os.getenv("POSTGRES_DB", "trading_bot"),
-                    user=os.getenv("POSTGRES_USER", "trading"),
-                    password=os.getenv("POSTGRES_PASSWORD", ""),
-                )
+            from src.data.database import get_pooled_connection
+
+            conn = get_pooled_connection()
+            if conn is None:
+                raise RuntimeError("Keine Datenbankverbindung verfügbar")
 
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute(
@@ -474,19 +469,11 @@ _Das Playbook wird bei jedem AI-Call als Kontext verwendet._
         await update.message.reply_text("🔄 Starte Playbook-Analyse...")
 
         try:
-            import psycopg2
+            from src.data.database import get_pooled_connection
 
-            database_url = os.getenv("DATABASE_URL")
-            if database_url:
-                conn = psycopg2.connect(database_url)
-            else:
-                conn = psycopg2.connect(
-                    host=os.getenv("POSTGRES_HOST", "localhost"),
-                    port=os.getenv("POSTGRES_PORT", 5432),
-                    database=os.getenv("POSTGRES_DB", "trading_bot"),
-                    user=os.getenv("POSTGRES_USER", "trading"),
-                    password=os.getenv("POSTGRES_PASSWORD", ""),
-                )
+            conn = get_pooled_connection()
+            if conn is None:
+                raise RuntimeError("Keine Datenbankverbindung verfügbar")
 
             from src.data.playbook import TradingPlaybook
 
@@ -570,6 +557,74 @@ _Das Playbook wird bei jedem AI-Call als Kontext verwendet._
             logger.error(f"Report error: {e}")
             await update.message.reply_text(f"❌ Fehler: {e}")
 
+    # ═══════════════════════════════════════════════════════════════
+    # PERF COMMAND (Scheduler-Task-Telemetrie)
+    # ═══════════════════════════════════════════════════════════════
+
+    async def cmd_perf(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Laufzeit, Start-Lag, DB- und HTTP-Zeit der Scheduler-Tasks."""
+        try:
+            from src.utils.telemetry import format_perf_summary, read_published
+
+            snapshot = read_published()
+            if snapshot is None:
+                await update.message.reply_text(
+                    "⚠️ Keine aktuellen Task-Metriken.\nLäuft der Scheduler?"
+                )
+                return
+
+            await update.message.reply_text(format_perf_summary(snapshot), parse_mode="HTML")
+
+        except Exception as e:
+            logger.error(f"Perf error: {e}")
+            await update.message.reply_text(f"❌ Fehler: {e}")
+
+    async def cmd_profile(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Startet den Sampling-Profiler im Trading-Prozess und sendet das Ergebnis."""
+        import asyncio
+        import html
+        import time
+
+        from src.core.tick_profiler import (
+            DEFAULT_SAMPLE_SECONDS,
+            MAX_SAMPLE_SECONDS,
+            read_profile_result,
+            request_profile,
+        )
+
+        try:
+            seconds = float(context.args[0]) if context.args else DEFAULT_SAMPLE_SECONDS
+        except ValueError:
+            await update.message.reply_text("Usage: /profile [sekunden]\nBeispiel: /profile 120")
+            return
+        seconds = min(max(seconds, 1.0), MAX_SAMPLE_SECONDS)
+
+        try:
+            requested_at = time.time()
+            request_profile(seconds)
+            await update.message.reply_text(
+                f"🔬 Profiling für {seconds:.0f}s angefordert (Start nach dem nächsten Tick)..."
+            )
+
+            # Anfrage wird erst nach dem laufenden Tick gelesen (Tick-Intervall + Puffer)
+            deadline = time.monotonic() + seconds + 120
+            while time.monotonic() < deadline:
+                await asyncio.sleep(5)
+                result = read_profile_result(since=requested_at)
+                if result is not None:
+                    await update.message.reply_text(
+                        f"<pre>{html.escape(result[:3500])}</pre>", parse_mode="HTML"
+                    )
+                    return
+
+            await update.message.reply_text(
+                "⚠️ Kein Profil erhalten.\nLäuft der Trading-Bot mit gemeinsamem config/-Volume?"
+            )
+
+        except Exception as e:
+            logger.error(f"Profile error: {e}")
+            await update.message.reply_text(f"❌ Fehler: {e}")
+
     # ═══════════════════════════════════════════════════════════════
     # COMPARE COMMAND (Cohort-Vergleich)
     # ═══════════════════════════════════════════════════════════════
@@ -739,6 +794,8 @@ def main():
     # Report + Compare Commands
     app.add_handler(CommandHandler("report", bot.cmd_report))
     app.add_handler(CommandHandler("compare", bot.cmd_compare))
+    app.add_handler(CommandHandler("perf", bot.cmd_perf))
+    app.add_handler(CommandHandler("profile", bot.cmd_profile))
 
     # Portfolio Tier Commands
     app.add_handler(CommandHandler("portfolio", bot.cmd_portfolio))
@@ -13,12 +13,14 @@ from dotenv import load_dotenv
 # Füge src zum Path hinzu
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from src.core.bot import GridBot
+from src.core.bot import GridBot, setup_logging
 from src.core.config import BotConfig, validate_environment
+from src.core.tick_profiler import install_profile_signal
 
 
 def main():
     load_dotenv()
+    setup_logging()
 
     config = BotConfig.from_env()
 
@@ -58,6 +60,7 @@ def main():
 
     bot = GridBot(config.to_dict())
     signal.signal(signal.SIGTERM, lambda _s, _f: bot.stop())
+    install_profile_signal()
     bot.run()
 
 
@@ -35,7 +35,7 @@ def _create_client():
         client = PaperBinanceClient(initial_usdt=initial)
         logger.info(f"Paper Trading mode — ${initial:.0f} initial USDT, real mainnet prices")
     else:
-        from src.api.binance_client import BinanceClient
+        from src.api.binance_client import get_binance_client
 
         if not testnet:
             print("LIVE MODUS - ECHTES GELD!")
@@ -44,7 +44,13 @@ def _create_client():
                 print("Abgebrochen.")
                 sys.exit(0)
 
-        client = BinanceClient(testnet=testnet)
+        client = get_binance_client(testnet=testnet)
+
+    record_path = os.getenv("REPLAY_RECORD_PATH")
+    if record_path:
+        from src.core.replay import RecordingClient, start_recording
+
+        client = RecordingClient(client, start_recording(record_path))
 
     return client, paper_mode, testnet
 
@@ -119,6 +125,12 @@ def _run_cohort_orchestrator(client, paper_mode, testnet):
 def main():
     load_dotenv()
 
+    from src.core.bot import setup_logging
+    from src.core.tick_profiler import install_profile_signal
+
+    setup_logging()
+    install_profile_signal()
+
     env_ok, warnings = validate_environment()
     for w in warnings:
         print(f"  WARNING: {w}")
@@ -129,12 +141,19 @@ def main():
 
     portfolio_mode = os.getenv("PORTFOLIO_MANAGER", "false").lower() == "true"
 
-    if portfolio_mode:
-        logger.info("Starting in 3-Tier Portfolio Manager mode")
-        _run_portfolio_manager(client, paper_mode, testnet)
-    else:
-        logger.info("Starting in Cohort Trading mode")
-        _run_cohort_orchestrator(client, paper_mode, testnet)
+    try:
+        if portfolio_mode:
+            logger.info("Starting in 3-Tier Portfolio Manager mode")
+            _run_portfolio_manager(client, paper_mode, testnet)
+        else:
+            logger.info("Starting in Cohort Trading mode")
+            _run_cohort_orchestrator(client, paper_mode, testnet)
+    finally:
+        if os.getenv("REPLAY_RECORD_PATH"):
+            from src.core.replay import stop_recording
+
+            # Flush buffered ticks and close the recording file
+            stop_recording()
 
 
 if __name__ == "__main__":
@@ -18,7 +18,6 @@ Mathematik:
 """
 
 import logging
-import os
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
@@ -26,6 +25,8 @@ from typing import Any
 import numpy as np
 from dotenv import load_dotenv
 
+from src.analysis.regime_detection import REGIME_DAILY_UPSERT, ensure_regime_daily_table
+from src.data.database import get_pooled_connection
 from src.utils.singleton import SingletonMixin
 
 load_dotenv()
@@ -33,7 +34,6 @@ load_dotenv()
 logger = logging.getLogger("trading_bot")
 
 try:
-    import psycopg2
     from psycopg2.extras import RealDictCursor
 
     POSTGRES_AVAILABLE = True
@@ -79,6 +79,14 @@ SIGNAL_NAMES = [
     "ai",
 ]
 
+# Signal-Spalten in signal_components ("ai" hat keine eigene *_signal Spalte)
+SIGNAL_COLUMNS = {name: f"{name}_signal" for name in SIGNAL_NAMES if name != "ai"}
+
+# Lookbacks des wöchentlichen Updates (Tage)
+GLOBAL_LOOKBACK_DAYS = 30
+REGIME_LOOKBACK_DAYS = 60
+REGIMES = ["BULL", "BEAR", "SIDEWAYS"]
+
 # Default Gewichte (gleichverteilt)
 DEFAULT_WEIGHTS = {name: 1.0 / len(SIGNAL_NAMES) for name in SIGNAL_NAMES}
 
@@ -95,6 +103,96 @@ MIN_WEIGHT = 0.02
 MAX_WEIGHT = 0.30
 
 
+@dataclass
+class SignalOutcomes:
+    """
+    Signal-Werte und Trade-Outcomes als Matrix (eine Zeile pro Signal-Record).
+
+    Wird einmal aus der DB geladen; Performance für beliebige Teilmengen
+    (Cohort, Regime, Lookback) wird per Maske in NumPy berechnet.
+    """
+
+    signals: np.ndarray  # (n, len(SIGNAL_COLUMNS)), NaN = kein Signal
+    pnl: np.ndarray  # (n,)
+    cohort_ids: np.ndarray  # (n,) object
+    regimes: np.ndarray  # (n,) object
+    age_days: np.ndarray  # (n,)
+
+    @classmethod
+    def from_rows(cls, rows: list[tuple]) -> "SignalOutcomes":
+        """Baue Matrix aus (cohort_id, regime, age_days, pnl_pct, *signals) Zeilen"""
+        k = len(SIGNAL_COLUMNS)
+        return cls(
+            signals=np.array([row[4:] for row in rows], dtype=float).reshape(-1, k),
+            pnl=np.nan_to_num(np.array([row[3] for row in rows], dtype=float)),
+            cohort_ids=np.array([row[0] for row in rows], dtype=object),
+            regimes=np.array([row[1] for row in rows], dtype=object),
+            age_days=np.array([row[2] for row in rows], dtype=float),
+        )
+
+    def mask(
+        self,
+        *,
+        lookback_days: int | None = None,
+        cohort_id: str | None = None,
+        regime: str | None = None,
+    ) -> np.ndarray:
+        """Boolesche Zeilenauswahl für Lookback/Cohort/Regime"""
+        selected = np.ones(len(self.pnl), dtype=bool)
+        if lookback_days is not None:
+            selected &= self.age_days <= lookback_days
+        if cohort_id:
+            selected &= self.cohort_ids == cohort_id
+        if regime:
+            selected &= self.regimes == regime
+        return selected
+
+    def performance(self, selected: np.ndarray | None = None) -> dict[str, SignalPerformance]:
+        """
+        Accuracy und PnL-Korrelation aller Signale in einem Durchlauf.
+
+        Korrekt = positives Signal + Profit ODER negatives Signal + kein Profit.
+        Korrelation nur bei >= 3 Werten und Streuung in Signal und PnL.
+        """
+        performance = {name: SignalPerformance(signal_name=name) for name in SIGNAL_NAMES}
+        if selected is None:
+            selected = np.ones(len(self.pnl), dtype=bool)
+        if not selected.any():
+            return performance
+
+        signals = self.signals[selected]
+        pnl = self.pnl[selected][:, None]
+        valid = ~np.isnan(signals)
+        counts = valid.sum(axis=0)
+
+        values = np.where(valid, signals, 0.0)
+        profitable = pnl > 0
+        correct = valid & (((values > 0) & profitable) | ((values < 0) & ~profitable))
+        correct_counts = correct.sum(axis=0)
+
+        # Zentrierte Momente pro Spalte, nur über gültige Werte
+        n = np.maximum(counts, 1)
+        pnl_valid = np.where(valid, pnl, 0.0)
+        sig_dev = np.where(valid, values - values.sum(axis=0) / n, 0.0)
+        pnl_dev = np.where(valid, pnl - pnl_valid.sum(axis=0) / n, 0.0)
+        cov = (sig_dev * pnl_dev).sum(axis=0)
+        sig_var = (sig_dev**2).sum(axis=0)
+        pnl_var = (pnl_dev**2).sum(axis=0)
+
+        for j, name in enumerate(SIGNAL_COLUMNS):
+            total = int(counts[j])
+            if not total:
+                continue
+            perf = performance[name]
+            perf.total_trades = total
+            perf.correct_predictions = int(correct_counts[j])
+            perf.accuracy = perf.correct_predictions / total
+            if total >= 3 and sig_var[j] > 0 and pnl_var[j] > 0:
+                perf.correlation_with_pnl = float(cov[j] / np.sqrt(sig_var[j] * pnl_var[j]))
+
+        return performance
+
+
 class BayesianWeightLearner(SingletonMixin):
     """
     Lernt optimale Signal-Gewichte aus historischen Trade-Daten.
@@ -123,10 +221,10 @@ class BayesianWeightLearner(SingletonMixin):
             return
 
         try:
-            database_url = os.getenv("DATABASE_URL")
-            if database_url:
-                self.conn = psycopg2.connect(database_url)
+            self.conn = get_pooled_connection()
+            if self.conn:
                 logger.info("BayesianWeightLearner: DB verbunden")
+                ensure_regime_daily_table(self.conn)
         except Exception as e:
             logger.error(f"BayesianWeightLearner: DB Fehler: {e}")
 
@@ -180,6 +278,8 @@ class BayesianWeightLearner(SingletonMixin):
         cohort_id: str | None = None,
         lookback_days: int = 30,
         regime: str | None = None,
+        *,
+        performance: dict[str, SignalPerformance] | None = None,
     ) -> BayesianWeights:
         """
         Aktualisiere Gewichte basierend auf Signal-Performance.
@@ -188,12 +288,14 @@ class BayesianWeightLearner(SingletonMixin):
             cohort_id: Optional - nur Trades dieser Cohort
             lookback_days: Anzahl Tage für Analyse
             regime: Optional - nur Trades in diesem Regime
+            performance: Optional bereits berechnete Performance (weekly_update)
 
         Returns:
             BayesianWeights mit aktualisierten Werten
         """
         # 1. Hole Signal Performance aus DB
-        performance = self._calculate_signal_performance(cohort_id, lookback_days, regime)
+        if performance is None:
+            performance = self._calculate_signal_performance(cohort_id, lookback_days, regime)
 
         if (
             not performance
@@ -248,84 +350,75 @@ class BayesianWeightLearner(SingletonMixin):
         regime: str | None,
     ) -> dict[str, SignalPerformance]:
         """Berechne Performance für jedes Signal"""
-        if not self.conn:
+        outcomes = self._fetch_signal_outcomes(lookback_days, cohort_id=cohort_id, regime=regime)
+        if outcomes is None:
             return {}
+        return outcomes.performance()
 
-        performance = {name: SignalPerformance(signal_name=name) for name in SIGNAL_NAMES}
+    def _fetch_signal_outcomes(
+        self,
+        lookback_days: int,
+        *,
+        cohort_id: str | None = None,
+        regime: str | None = None,
+    ) -> SignalOutcomes | None:
+        """
+        Lade Signal-Werte geschlossener Trades mit PnL und Tages-Regime.
 
-        try:
-            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Query für Signal Components mit Outcome
-                query = """
-                    SELECT
-                        sc.*,
-                        tp.pnl_pct,
-                        rh.regime
-                    FROM signal_components sc
-                    LEFT JOIN trade_pairs tp ON sc.trade_id = tp.entry_trade_id
-                    LEFT JOIN regime_history rh ON DATE(sc.created_at) = DATE(rh.timestamp)
-                    WHERE sc.created_at >= NOW() - INTERVAL '%s days'
-                    AND tp.status = 'closed'
-                """
+        Das Regime kommt aus regime_daily (PK-Lookup, eine Zeile pro Tag)
+        statt aus einem DATE()-Join auf regime_history.
+        """
+        if not self.conn:
+            return None
 
-                params = [lookback_days]
+        signal_cols = ", ".join(f"sc.{col}" for col in SIGNAL_COLUMNS.values())
+        query = f"""
+            SELECT
+                sc.cohort_id::text,
+                rd.regime,
+                EXTRACT(EPOCH FROM NOW() - sc.created_at) / 86400.0,
+                tp.pnl_pct,
+                {signal_cols}
+            FROM signal_components sc
+            JOIN trade_pairs tp ON sc.trade_id = tp.entry_trade_id
+            LEFT JOIN regime_daily rd ON rd.day = sc.created_at::date
+            WHERE sc.created_at >= NOW() - INTERVAL '%s days'
+            AND tp.status = 'closed'
+        """
+        params: list[Any] = [lookback_days]
 
-                if cohort_id:
-                    query += " AND sc.cohort_id = %s"
-                    params.append(cohort_id)
+        if cohort_id:
+            query += " AND sc.cohort_id = %s"
+            params.append(cohort_id)
 
-                if regime:
-                    query += " AND rh.regime = %s"
-                    params.append(regime)
+        if regime:
+            query += " AND rd.regime = %s"
+            params.append(regime)
 
+        try:
+            with self.conn.cursor() as cur:
                 cur.execute(query, params)
-                rows = cur.fetchall()
-
-                if not rows:
-                    return performance
-
-                # Verarbeite jeden Trade
-                signal_values: dict[str, list[tuple[float, float]]] = {
-                    name: [] for name in SIGNAL_NAMES
-                }
-
-                for row in rows:
-                    pnl = float(row.get("pnl_pct") or 0)
-                    was_profitable = pnl > 0
-
-                    for signal_name in SIGNAL_NAMES:
-                        col_name = f"{signal_name}_signal"
-                        if col_name in row and row[col_name] is not None:
-                            signal_val = float(row[col_name])
-                            signal_values[signal_name].append((signal_val, pnl))
-
-                            # War die Vorhersage korrekt?
-                            # Positives Signal + Profit ODER Negatives Signal + Loss
-                            signal_correct = (signal_val > 0 and was_profitable) or (
-                                signal_val < 0 and not was_profitable
-                            )
-
-                            performance[signal_name].total_trades += 1
-                            if signal_correct:
-                                performance[signal_name].correct_predictions += 1
+                return SignalOutcomes.from_rows(cur.fetchall())
 
-                # Berechne finale Metriken
-                for name, perf in performance.items():
-                    if perf.total_trades > 0:
-                        perf.accuracy = perf.correct_predictions / perf.total_trades
+        except Exception as e:
+            logger.error(f"Signal Performance Berechnung fehlgeschlagen: {e}")
+            return None
 
-                        # Korrelation berechnen
-                        if len(signal_values[name]) >= 3:
-                            signals = np.array([v[0] for v in signal_values[name]])
-                            pnls = np.array([v[1] for v in signal_values[name]])
+    def refresh_regime_daily(self, days: int = REGIME_LOOKBACK_DAYS) -> bool:
+        """Aktualisiere regime_daily für die letzten `days` Tage"""
+        if not self.conn:
+            return False
 
-                            if np.std(signals) > 0 and np.std(pnls) > 0:
-                                perf.correlation_with_pnl = float(np.corrcoef(signals, pnls)[0, 1])
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute(REGIME_DAILY_UPSERT, (days,))
+            self.conn.commit()
+            return True
 
         except Exception as e:
-            logger.error(f"Signal Performance Berechnung fehlgeschlagen: {e}")
-
-        return performance
+            logger.error(f"regime_daily Refresh fehlgeschlagen: {e}")
+            self.conn.rollback()
+            return False
 
     def _compute_posterior_alphas(
         self, performance: dict[str, SignalPerformance]
@@ -503,10 +596,9 @@ class BayesianWeightLearner(SingletonMixin):
 
     def compare_regimes(self) -> dict[str, dict[str, float]]:
         """Vergleiche Gewichte zwischen Regimes"""
-        regimes = ["BULL", "BEAR", "SIDEWAYS"]
         comparison = {}
 
-        for regime in regimes:
+        for regime in REGIMES:
             weights = self._get_regime_weights(regime)
             if weights:
                 comparison[regime] = weights
@@ -559,9 +651,21 @@ class BayesianWeightLearner(SingletonMixin):
             "errors": [],
         }
 
+        # Einmal laden, alle Teilmengen per Maske auswerten
+        self.refresh_regime_daily(REGIME_LOOKBACK_DAYS)
+        outcomes = self._fetch_signal_outcomes(max(GLOBAL_LOOKBACK_DAYS, REGIME_LOOKBACK_DAYS))
+
+        def performance_for(**filters: Any) -> dict[str, SignalPerformance]:
+            if outcomes is None:
+                return {}
+            return outcomes.performance(outcomes.mask(**filters))
+
         # 1. Globales Update
         try:
-            global_weights = self.update_weights(lookback_days=30)
+            global_weights = self.update_weights(
+                lookback_days=GLOBAL_LOOKBACK_DAYS,
+                performance=performance_for(lookback_days=GLOBAL_LOOKBACK_DAYS),
+            )
             results["updates"].append(
                 {
                     "type": "global",
@@ -574,9 +678,13 @@ class BayesianWeightLearner(SingletonMixin):
             results["errors"].append(f"Global update failed: {e}")
 
         # 2. Regime-spezifische Updates
-        for regime in ["BULL", "BEAR", "SIDEWAYS"]:
+        for regime in REGIMES:
             try:
-                regime_weights = self.update_weights(lookback_days=60, regime=regime)
+                regime_weights = self.update_weights(
+                    lookback_days=REGIME_LOOKBACK_DAYS,
+                    regime=regime,
+                    performance=performance_for(lookback_days=REGIME_LOOKBACK_DAYS, regime=regime),
+                )
                 if regime_weights.sample_size >= MIN_TRADES_FOR_UPDATE:
                     results["updates"].append(
                         {
@@ -593,7 +701,13 @@ class BayesianWeightLearner(SingletonMixin):
         cohort_ids = self._get_active_cohort_ids()
         for cohort_id in cohort_ids:
             try:
-                cohort_weights = self.update_weights(cohort_id=cohort_id, lookback_days=30)
+                cohort_weights = self.update_weights(
+                    cohort_id=cohort_id,
+                    lookback_days=GLOBAL_LOOKBACK_DAYS,
+                    performance=performance_for(
+                        lookback_days=GLOBAL_LOOKBACK_DAYS, cohort_id=cohort_id
+                    ),
+                )
                 if cohort_weights.sample_size >= MIN_TRADES_FOR_UPDATE:
                     results["updates"].append(
                         {
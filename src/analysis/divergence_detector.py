@@ -18,7 +18,6 @@ Hidden Divergences (Trend-Fortsetzung):
 """
 
 import logging
-import os
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
@@ -27,6 +26,7 @@ from typing import Any
 import numpy as np
 from dotenv import load_dotenv
 
+from src.data.database import get_pooled_connection
 from src.utils.singleton import SingletonMixin
 
 load_dotenv()
@@ -34,7 +34,6 @@ load_dotenv()
 logger = logging.getLogger("trading_bot")
 
 try:
-    import psycopg2
     from psycopg2.extras import RealDictCursor
 
     POSTGRES_AVAILABLE = True
@@ -145,9 +144,8 @@ class DivergenceDetector(SingletonMixin):
             return
 
         try:
-            database_url = os.getenv("DATABASE_URL")
-            if database_url:
-                self.conn = psycopg2.connect(database_url)
+            self.conn = get_pooled_connection()
+            if self.conn:
                 logger.debug("DivergenceDetector: DB verbunden")
         except Exception as e:
             logger.error(f"DivergenceDetector: DB Fehler: {e}")
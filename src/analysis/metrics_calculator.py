@@ -17,7 +17,6 @@ für spätere Analyse und Optimierung.
 """
 
 import logging
-import os
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
@@ -25,6 +24,7 @@ from typing import Any
 import numpy as np
 from dotenv import load_dotenv
 
+from src.data.database import get_pooled_connection
 from src.utils.singleton import SingletonMixin
 
 load_dotenv()
@@ -32,7 +32,6 @@ load_dotenv()
 logger = logging.getLogger("trading_bot")
 
 try:
-    import psycopg2
     from psycopg2.extras import RealDictCursor
 
     POSTGRES_AVAILABLE = True
@@ -118,9 +117,8 @@ class MetricsCalculator(SingletonMixin):
             return
 
         try:
-            database_url = os.getenv("DATABASE_URL")
-            if database_url:
-                self.conn = psycopg2.connect(database_url)
+            self.conn = get_pooled_connection()
+            if self.conn:
                 logger.info("MetricsCalculator: PostgreSQL verbunden")
         except Exception as e:
             logger.error(f"MetricsCalculator: DB Verbindung fehlgeschlagen: {e}")
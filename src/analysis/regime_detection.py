@@ -13,8 +13,8 @@ Warum wichtig:
 - Sideways: Grid Trading optimal
 """
 
+import importlib.util
 import logging
-import os
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
@@ -23,6 +23,7 @@ from typing import Any
 import numpy as np
 from dotenv import load_dotenv
 
+from src.data.database import get_pooled_connection
 from src.utils.singleton import SingletonMixin
 
 load_dotenv()
@@ -30,22 +31,61 @@ load_dotenv()
 logger = logging.getLogger("trading_bot")
 
 try:
-    import psycopg2
     from psycopg2.extras import RealDictCursor
 
     POSTGRES_AVAILABLE = True
 except ImportError:
     POSTGRES_AVAILABLE = False
 
-try:
-    from hmmlearn import hmm
-
-    HMM_AVAILABLE = True
-except ImportError:
-    HMM_AVAILABLE = False
+# hmmlearn wird erst beim Modell-Init importiert (zieht scipy/sklearn nach)
+HMM_AVAILABLE = importlib.util.find_spec("hmmlearn") is not None
+if not HMM_AVAILABLE:
     logger.debug("hmmlearn nicht installiert - pip install hmmlearn")
 
 
+# Pflegt regime_daily (ein Regime pro Tag) aus regime_history.
+# Parameter: Anzahl zurückliegender Tage (0 = nur heute).
+REGIME_DAILY_UPSERT = """
+    INSERT INTO regime_daily (day, regime, observations, updated_at)
+    SELECT DISTINCT ON (day) day, regime, observations, NOW()
+    FROM (
+        SELECT timestamp::date AS day, regime,
+               COUNT(*) AS observations, MAX(timestamp) AS last_seen
+        FROM regime_history
+        WHERE timestamp >= CURRENT_DATE - %s::int
+        GROUP BY 1, 2
+    ) per_day
+    ORDER BY day, observations DESC, last_seen DESC
+    ON CONFLICT (day) DO UPDATE SET
+        regime = EXCLUDED.regime,
+        observations = EXCLUDED.observations,
+        updated_at = EXCLUDED.updated_at
+"""
+
+# init.sql läuft nur auf frischen Volumes - bestehende DBs bekommen die Tabelle hier
+REGIME_DAILY_DDL = """
+    CREATE TABLE IF NOT EXISTS regime_daily (
+        day DATE PRIMARY KEY,
+        regime VARCHAR(20) NOT NULL,
+        observations INTEGER NOT NULL DEFAULT 0,
+        updated_at TIMESTAMPTZ DEFAULT NOW()
+    )
+"""
+
+
+def ensure_regime_daily_table(conn) -> bool:
+    """Legt regime_daily an, falls sie fehlt (idempotent)"""
+    try:
+        with conn.cursor() as cur:
+            cur.execute(REGIME_DAILY_DDL)
+        conn.commit()
+        return True
+    except Exception as e:
+        logger.error(f"regime_daily Migration fehlgeschlagen: {e}")
+        conn.rollback()
+        return False
+
+
 class MarketRegime(Enum):
     """Markt-Regimes"""
 
@@ -110,10 +150,10 @@ class RegimeDetector(SingletonMixin):
             return
 
         try:
-            database_url = os.getenv("DATABASE_URL")
-            if database_url:
-                self.conn = psycopg2.connect(database_url)
+            self.conn = get_pooled_connection()
+            if self.conn:
                 logger.info("RegimeDetector: DB verbunden")
+                ensure_regime_daily_table(self.conn)
         except Exception as e:
             logger.error(f"RegimeDetector: DB Fehler: {e}")
 
@@ -126,6 +166,8 @@ class RegimeDetector(SingletonMixin):
             return
 
         try:
+            from hmmlearn import hmm
+
             self.model = hmm.GaussianHMM(
                 n_components=self.NUM_STATES,
                 covariance_type="full",
@@ -560,6 +602,13 @@ class RegimeDetector(SingletonMixin):
                         state.regime_duration_days * 24,
                     ),
                 )
+                # Eigener Savepoint: ein Fehler im Tages-Lookup darf die History nicht verwerfen
+                cur.execute("SAVEPOINT regime_daily_upsert")
+                try:
+                    cur.execute(REGIME_DAILY_UPSERT, (0,))
+                except Exception as e:
+                    logger.warning(f"regime_daily Update fehlgeschlagen: {e}")
+                    cur.execute("ROLLBACK TO SAVEPOINT regime_daily_upsert")
                 self.conn.commit()
                 logger.debug(f"Regime {state.current_regime.value} gespeichert")
 
@@ -15,12 +15,12 @@ Ermöglicht:
 """
 
 import logging
-import os
 from dataclasses import dataclass
 from typing import Any
 
 from dotenv import load_dotenv
 
+from src.data.database import get_pooled_connection
 from src.utils.singleton import SingletonMixin
 
 load_dotenv()
@@ -28,7 +28,6 @@ load_dotenv()
 logger = logging.getLogger("trading_bot")
 
 try:
-    import psycopg2
     from psycopg2.extras import Json, RealDictCursor
 
     POSTGRES_AVAILABLE = True
@@ -71,6 +70,66 @@ class SignalBreakdown:
     divergence_strength: float = 0.0
 
 
+# Spalten für INSERT INTO signal_components (Reihenfolge = signal_component_values())
+SIGNAL_COMPONENT_COLUMNS = (
+    "trade_id",
+    "cycle_id",
+    "cohort_id",
+    "fear_greed_signal",
+    "rsi_signal",
+    "macd_signal",
+    "trend_signal",
+    "volume_signal",
+    "whale_signal",
+    "sentiment_signal",
+    "macro_signal",
+    "ai_direction_signal",
+    "ai_confidence",
+    "ai_risk_level",
+    "playbook_alignment_score",
+    "weights_applied",
+    "math_composite_score",
+    "ai_composite_score",
+    "final_score",
+    "has_divergence",
+    "divergence_type",
+    "divergence_strength",
+)
+
+
+def signal_component_values(
+    trade_id: str,
+    signals: SignalBreakdown,
+    cycle_id: str | None = None,
+    cohort_id: str | None = None,
+) -> tuple:
+    """Parameter-Tupel für SIGNAL_COMPONENT_COLUMNS."""
+    return (
+        trade_id,
+        cycle_id,
+        cohort_id,
+        signals.fear_greed_signal,
+        signals.rsi_signal,
+        signals.macd_signal,
+        signals.trend_signal,
+        signals.volume_signal,
+        signals.whale_signal,
+        signals.sentiment_signal,
+        signals.macro_signal,
+        signals.ai_direction_signal,
+        signals.ai_confidence,
+        signals.ai_risk_level,
+        signals.playbook_alignment,
+        Json(signals.weights),
+        signals.math_composite,
+        signals.ai_composite,
+        signals.final_score,
+        signals.has_divergence,
+        signals.divergence_type,
+        signals.divergence_strength,
+    )
+
+
 # Default Gewichte (werden durch Bayesian Learning aktualisiert)
 DEFAULT_WEIGHTS = {
     "fear_greed": 0.15,
@@ -108,9 +167,8 @@ class SignalAnalyzer(SingletonMixin):
             return
 
         try:
-            database_url = os.getenv("DATABASE_URL")
-            if database_url:
-                self.conn = psycopg2.connect(database_url)
+            self.conn = get_pooled_connection()
+            if self.conn:
                 logger.info("SignalAnalyzer: PostgreSQL verbunden")
         except Exception as e:
             logger.error(f"SignalAnalyzer: DB Verbindung fehlgeschlagen: {e}")
@@ -574,49 +632,11 @@ class SignalAnalyzer(SingletonMixin):
         try:
             with self.conn.cursor() as cur:
                 cur.execute(
-                    """
-                    INSERT INTO signal_components (
-                        trade_id, cycle_id, cohort_id,
-                        fear_greed_signal, rsi_signal, macd_signal, trend_signal,
-                        volume_signal, whale_signal, sentiment_signal, macro_signal,
-                        ai_direction_signal, ai_confidence, ai_risk_level,
-                        playbook_alignment_score, weights_applied,
-                        math_composite_score, ai_composite_score, final_score,
-                        has_divergence, divergence_type, divergence_strength
-                    ) VALUES (
-                        %s, %s, %s,
-                        %s, %s, %s, %s,
-                        %s, %s, %s, %s,
-                        %s, %s, %s,
-                        %s, %s,
-                        %s, %s, %s,
-                        %s, %s, %s
-                    )
+                    f"""
+                    INSERT INTO signal_components ({", ".join(SIGNAL_COMPONENT_COLUMNS)})
+                    VALUES ({", ".join(["%s"] * len(SIGNAL_COMPONENT_COLUMNS))})
                 """,
-                    (
-                        trade_id,
-                        cycle_id,
-                        cohort_id,
-                        signals.fear_greed_signal,
-                        signals.rsi_signal,
-                        signals.macd_signal,
-                        signals.trend_signal,
-                        signals.volume_signal,
-                        signals.whale_signal,
-                        signals.sentiment_signal,
-                        signals.macro_signal,
-                        signals.ai_direction_signal,
-                        signals.ai_confidence,
-                        signals.ai_risk_level,
-                        signals.playbook_alignment,
-                        Json(signals.weights),
-                        signals.math_composite,
-                        signals.ai_composite,
-                        signals.final_score,
-                        signals.has_divergence,
-                        signals.divergence_type,
-                        signals.divergence_strength,
-                    ),
+                    signal_component_values(trade_id, signals, cycle_id, cohort_id),
                 )
                 self.conn.commit()
                 logger.debug(f"SignalAnalyzer: Signals für Trade {trade_id} gespeichert")
@@ -7,10 +7,14 @@ Ergänzt die Markowitz-Optimierung mit Timing-Signalen:
 - Technische Analyse sagt WANN kaufen (überkauft/überverkauft)
 """
 
+from __future__ import annotations
+
 from dataclasses import dataclass
 from enum import Enum
+from typing import TYPE_CHECKING
 
-import pandas as pd
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class Signal(Enum):
@@ -127,6 +131,8 @@ class TechnicalAnalyzer:
         Hoher ATR: Hohe Volatilität
         Niedriger ATR: Niedrige Volatilität
         """
+        import pandas as pd
+
         tr1 = high - low
         tr2 = abs(high - close.shift())
         tr3 = abs(low - close.shift())
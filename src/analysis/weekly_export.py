@@ -12,14 +12,15 @@ The export creates:
 """
 
 import json
-import os
 import shutil
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from src.data.analytics_rollups import UNKNOWN_FEAR_GREED, refresh_rollups
+from src.data.database import get_pooled_connection
+
 # Try to import psycopg2 for database access
 try:
-    import psycopg2
     from psycopg2.extras import RealDictCursor
 
     HAS_DB = True
@@ -48,17 +49,26 @@ class WeeklyExporter:
         """Initialize the exporter."""
         self.EXPORT_DIR.mkdir(parents=True, exist_ok=True)
         self.PLAYBOOK_HISTORY.mkdir(parents=True, exist_ok=True)
-        self.db_url = os.getenv("DATABASE_URL")
 
     def _get_db_connection(self):
-        """Get database connection if available."""
-        if not HAS_DB or not self.db_url:
+        """Get a pooled database connection handle if available."""
+        if not HAS_DB:
             return None
         try:
-            return psycopg2.connect(self.db_url)
+            return get_pooled_connection()
         except Exception:
             return None
 
+    def _refresh_rollups(self) -> None:
+        """Rebuild rollup days whose trades changed since the last refresh."""
+        conn = self._get_db_connection()
+        if not conn:
+            return
+        try:
+            refresh_rollups(conn)
+        finally:
+            conn.close()
+
     def export_weekly_analysis(self) -> dict:
         """
         Generate the complete weekly export.
@@ -74,6 +84,9 @@ class WeeklyExporter:
         export_path = self.EXPORT_DIR / export_name
         export_path.mkdir(parents=True, exist_ok=True)
 
+        # Bring rollups up to date once; the DB sections below read only aggregates
+        self._refresh_rollups()
+
         # Gather all data
         export_data = {
             "metadata": {
@@ -119,7 +132,7 @@ class WeeklyExporter:
         }
 
     def _get_performance_data(self, start: datetime, end: datetime) -> dict:
-        """Get performance metrics for the week."""
+        """Get performance metrics for the week (from trade_rollup_daily)."""
         conn = self._get_db_connection()
         if not conn:
             return {"error": "Database not available", "total_pnl": 0}
@@ -130,15 +143,15 @@ class WeeklyExporter:
                 cur.execute(
                     """
                     SELECT
-                        DATE(created_at) as date,
-                        SUM(CASE WHEN outcome_1h > 0 THEN outcome_1h ELSE 0 END) as profit,
-                        SUM(CASE WHEN outcome_1h < 0 THEN outcome_1h ELSE 0 END) as loss
-                    FROM trades
-                    WHERE created_at BETWEEN %s AND %s
-                    GROUP BY DATE(created_at)
+                        day as date,
+                        SUM(profit_1h) as profit,
+                        SUM(loss_sum_1h) as loss
+                    FROM trade_rollup_daily
+                    WHERE day BETWEEN %s AND %s
+                    GROUP BY day
                     ORDER BY date
                     """,
-                    (start, end),
+                    (start.date(), end.date()),
                 )
                 daily = cur.fetchall()
 
@@ -163,26 +176,27 @@ class WeeklyExporter:
             conn.close()
 
     def _get_trades_data(self, start: datetime, end: datetime) -> dict:
-        """Get trade statistics for the week."""
+        """Get trade statistics for the week (from trade_rollup_daily)."""
         conn = self._get_db_connection()
         if not conn:
             return {"error": "Database not available", "total_count": 0}
 
+        days = (start.date(), end.date())
         try:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 # Total trades
                 cur.execute(
                     """
                     SELECT
-                        COUNT(*) as total,
-                        COUNT(*) FILTER (WHERE outcome_1h > 0) as winning,
-                        COUNT(*) FILTER (WHERE outcome_1h < 0) as losing,
-                        AVG(outcome_1h) as avg_outcome,
-                        AVG(confidence) as avg_confidence
-                    FROM trades
-                    WHERE created_at BETWEEN %s AND %s
+                        COALESCE(SUM(trades), 0) as total,
+                        COALESCE(SUM(win_1h), 0) as winning,
+                        COALESCE(SUM(loss_1h), 0) as losing,
+                        SUM(sum_1h) / NULLIF(SUM(n_1h), 0) as avg_outcome,
+                        SUM(sum_confidence) / NULLIF(SUM(n_confidence), 0) as avg_confidence
+                    FROM trade_rollup_daily
+                    WHERE day BETWEEN %s AND %s
                     """,
-                    (start, end),
+                    days,
                 )
                 stats = cur.fetchone()
 
@@ -191,13 +205,13 @@ class WeeklyExporter:
                     """
                     SELECT
                         symbol,
-                        COUNT(*) as trades,
-                        AVG(outcome_1h) as avg_outcome
-                    FROM trades
-                    WHERE created_at BETWEEN %s AND %s
+                        SUM(trades) as trades,
+                        SUM(sum_1h) / NULLIF(SUM(n_1h), 0) as avg_outcome
+                    FROM trade_rollup_daily
+                    WHERE day BETWEEN %s AND %s
                     GROUP BY symbol
                     """,
-                    (start, end),
+                    days,
                 )
                 by_symbol = cur.fetchall()
 
@@ -206,20 +220,20 @@ class WeeklyExporter:
                     """
                     SELECT
                         CASE
-                            WHEN fear_greed_at_entry < 20 THEN 'extreme_fear'
-                            WHEN fear_greed_at_entry < 40 THEN 'fear'
-                            WHEN fear_greed_at_entry < 60 THEN 'neutral'
-                            WHEN fear_greed_at_entry < 80 THEN 'greed'
+                            WHEN fear_greed < 20 THEN 'extreme_fear'
+                            WHEN fear_greed < 40 THEN 'fear'
+                            WHEN fear_greed < 60 THEN 'neutral'
+                            WHEN fear_greed < 80 THEN 'greed'
                             ELSE 'extreme_greed'
                         END as fg_range,
-                        COUNT(*) as trades,
-                        AVG(outcome_1h) as avg_outcome
-                    FROM trades
-                    WHERE created_at BETWEEN %s AND %s
-                      AND fear_greed_at_entry IS NOT NULL
+                        SUM(trades) as trades,
+                        SUM(sum_1h) / NULLIF(SUM(n_1h), 0) as avg_outcome
+                    FROM trade_rollup_daily
+                    WHERE day BETWEEN %s AND %s
+                      AND fear_greed <> %s
                     GROUP BY fg_range
                     """,
-                    (start, end),
+                    (*days, UNKNOWN_FEAR_GREED),
                 )
                 by_fg = cur.fetchall()
 
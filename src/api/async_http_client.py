@@ -0,0 +1,354 @@
+"""
+Asynchroner HTTP Client für parallele Fan-Out Requests.
+
+Gleiche Semantik wie HTTPClient (Retries mit Exponential Backoff, Timeout pro
+api_type, Statistiken), aber auf asyncio/aiohttp-Basis. Eine dauerhafte
+ClientSession hält Keep-Alive Verbindungen offen, ein Semaphore pro Host
+begrenzt die Parallelität.
+
+Für synchronen Code (Scheduler-Tasks) gibt es eine Fassade: fetch_all()
+führt die Requests auf einem eigenen Event-Loop-Thread aus und blockiert,
+bis alle Antworten da sind.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+from src.api.http_client import HTTPClient, HTTPClientError
+from src.utils.singleton import SingletonMixin
+from src.utils.telemetry import record_http
+
+try:
+    import aiohttp
+
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+logger = logging.getLogger("trading_bot")
+
+
+class AsyncHTTPClient(SingletonMixin):
+    """
+    Asyncio-basierter Zwilling von HTTPClient.
+
+    Usage (async):
+        client = get_async_http_client()
+        data = await client.get("https://api.example.com/data")
+
+    Usage (sync, z.B. in Scheduler-Tasks):
+        results = client.fetch_all([
+            {"url": "https://api.binance.com/api/v3/klines", "params": {...}},
+            {"url": "https://api.binance.com/api/v3/klines", "params": {...}},
+        ])
+        # results[i] ist dict/list oder HTTPClientError
+    """
+
+    DEFAULT_TIMEOUTS = HTTPClient.DEFAULT_TIMEOUTS
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        default_timeout: int = 10,
+        *,
+        max_per_host: int = 8,
+        max_connections: int = 50,
+    ):
+        """
+        Args:
+            max_retries: Maximale Anzahl Retries bei Fehlern
+            base_delay: Basis-Verzögerung zwischen Retries (Sekunden)
+            max_delay: Maximale Verzögerung zwischen Retries (Sekunden)
+            default_timeout: Standard-Timeout für Requests (Sekunden)
+            max_per_host: Maximale parallele Requests pro Host
+            max_connections: Maximale offene Verbindungen insgesamt
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise HTTPClientError("aiohttp nicht installiert")
+
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.default_timeout = default_timeout
+        self.max_per_host = max_per_host
+        self.max_connections = max_connections
+
+        self.headers = {"User-Agent": "TradingBot/1.0", "Accept": "application/json"}
+
+        # Sessions und Semaphores sind an ihren Event Loop gebunden
+        self._sessions: dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._host_semaphores: dict[tuple[asyncio.AbstractEventLoop, str], asyncio.Semaphore] = {}
+
+        # Eigener Loop-Thread für die Sync-Fassade
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: threading.Thread | None = None
+        self._loop_lock = threading.Lock()
+
+        # Statistiken (gleiche Keys wie HTTPClient.stats)
+        self.stats = {"requests": 0, "successes": 0, "retries": 0, "failures": 0}
+
+    # ═══════════════════════════════════════════════════════════════
+    # ASYNC API
+    # ═══════════════════════════════════════════════════════════════
+
+    def _calculate_delay(self, attempt: int) -> float:
+        """Berechnet Exponential Backoff Delay"""
+        delay = self.base_delay * (2**attempt)
+        return min(delay, self.max_delay)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Lazy-init der ClientSession für den laufenden Loop"""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_per_host,
+                keepalive_timeout=30,
+            )
+            session = aiohttp.ClientSession(connector=connector, headers=self.headers)
+            self._sessions[loop] = session
+        return session
+
+    def _get_semaphore(self, url: str) -> asyncio.Semaphore:
+        """Semaphore pro (Loop, Host) für die Concurrency-Grenze"""
+        key = (asyncio.get_running_loop(), urlsplit(url).netloc)
+        sem = self._host_semaphores.get(key)
+        if sem is None:
+            sem = asyncio.Semaphore(self.max_per_host)
+            self._host_semaphores[key] = sem
+        return sem
+
+    async def aclose(self):
+        """Schließt die Session des laufenden Loops (für direkte async Nutzung)"""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
+        for key in [k for k in self._host_semaphores if k[0] is loop]:
+            del self._host_semaphores[key]
+
+    async def get(
+        self,
+        url: str,
+        params: dict | None = None,
+        timeout: int | None = None,
+        headers: dict | None = None,
+        api_type: str = "default",
+    ) -> dict[str, Any]:
+        """
+        Asynchroner HTTP GET Request mit Retry-Logik.
+
+        Raises:
+            HTTPClientError: Bei allen Fehlern nach allen Retries
+        """
+        return await self._request(
+            "GET", url, params=params, timeout=timeout, headers=headers, api_type=api_type
+        )
+
+    async def post(
+        self,
+        url: str,
+        json: dict | None = None,
+        data: dict | None = None,
+        *,
+        timeout: int | None = None,
+        headers: dict | None = None,
+        api_type: str = "default",
+    ) -> dict[str, Any]:
+        """Asynchroner HTTP POST Request mit Retry-Logik."""
+        return await self._request(
+            "POST",
+            url,
+            json=json,
+            data=data,
+            timeout=timeout,
+            headers=headers,
+            api_type=api_type,
+        )
+
+    async def _request(self, method: str, url: str, **kwargs) -> dict[str, Any]:
+        """Interne Request-Methode mit Retry-Logik (spiegelt HTTPClient._request)"""
+        api_type = kwargs.pop("api_type", "default")
+        timeout = kwargs.pop("timeout", None) or self.DEFAULT_TIMEOUTS.get(
+            api_type, self.default_timeout
+        )
+        extra_headers = kwargs.pop("headers", None)
+        if extra_headers:
+            kwargs["headers"] = extra_headers
+        kwargs = {k: v for k, v in kwargs.items() if v is not None}
+        kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+
+        session = self._get_session()
+        semaphore = self._get_semaphore(url)
+
+        last_exception = None
+        last_status_code = None
+
+        for attempt in range(self.max_retries):
+            self.stats["requests"] += 1
+            delay = 0.0
+
+            try:
+                async with semaphore:
+                    started = time.perf_counter()
+                    try:
+                        async with session.request(method, url, **kwargs) as response:
+                            last_status_code = response.status
+
+                            # Erfolg
+                            if response.status == 200:
+                                self.stats["successes"] += 1
+                                return await response.json(content_type=None)
+
+                            # Rate Limit
+                            if response.status == 429:
+                                delay = self._calculate_delay(attempt) * 3
+                                logger.warning(f"Rate limit hit for {url}, waiting {delay:.1f}s")
+                            # Server Error
+                            elif 500 <= response.status < 600:
+                                delay = self._calculate_delay(attempt)
+                                logger.warning(
+                                    f"Server error {response.status} for {url}, retry in {delay:.1f}s"
+                                )
+                            # Client Error (nicht retry-fähig)
+                            else:
+                                text = await response.text()
+                                self.stats["failures"] += 1
+                                raise HTTPClientError(f"HTTP {response.status}: {text[:200]}")
+                    finally:
+                        record_http(time.perf_counter() - started)
+
+            except asyncio.TimeoutError as e:
+                last_exception = e
+                logger.warning(f"Timeout for {url} (attempt {attempt + 1}/{self.max_retries})")
+                if attempt >= self.max_retries - 1:
+                    continue
+                delay = self._calculate_delay(attempt)
+
+            except aiohttp.ClientConnectionError as e:
+                last_exception = e
+                logger.warning(
+                    f"Connection error for {url} (attempt {attempt + 1}/{self.max_retries})"
+                )
+                if attempt >= self.max_retries - 1:
+                    continue
+                delay = self._calculate_delay(attempt)
+
+            except aiohttp.ClientError as e:
+                last_exception = e
+                logger.error(f"Request error for {url}: {e}")
+                break
+
+            # Sleep außerhalb des Semaphores, damit andere Requests weiterlaufen
+            await asyncio.sleep(delay)
+            self.stats["retries"] += 1
+
+        # Alle Retries fehlgeschlagen
+        self.stats["failures"] += 1
+
+        if last_exception:
+            raise HTTPClientError(
+                f"Request failed after {self.max_retries} attempts: {last_exception}"
+            )
+        raise HTTPClientError(f"Request failed with status {last_status_code}")
+
+    async def gather(self, requests: list[dict[str, Any]]) -> list[Any]:
+        """
+        Führt mehrere Requests parallel aus.
+
+        Args:
+            requests: Liste von Request-Specs mit den Keys von get()/post()
+                      plus optional "method" ("GET" default)
+
+        Returns:
+            Ergebnisse in Eingabe-Reihenfolge; fehlgeschlagene Requests
+            liefern die HTTPClientError-Instanz statt einer Response
+        """
+
+        async def _one(spec: dict[str, Any]) -> Any:
+            spec = dict(spec)
+            method = spec.pop("method", "GET").upper()
+            url = spec.pop("url")
+            try:
+                return await self._request(method, url, **spec)
+            except HTTPClientError as e:
+                return e
+            except Exception as e:
+                self.stats["failures"] += 1
+                return HTTPClientError(f"Request error for {url}: {e}")
+
+        return await asyncio.gather(*(_one(spec) for spec in requests))
+
+    # ═══════════════════════════════════════════════════════════════
+    # SYNC FASSADE
+    # ═══════════════════════════════════════════════════════════════
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Startet den Hintergrund-Loop beim ersten Bedarf"""
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="async-http-client",
+                    daemon=True,
+                )
+                self._loop_thread.start()
+            return self._loop
+
+    def run(self, coro, timeout: float | None = None) -> Any:
+        """Führt eine Coroutine auf dem Client-Loop aus und wartet auf das Ergebnis"""
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        return future.result(timeout=timeout)
+
+    def fetch_all(self, requests: list[dict[str, Any]], timeout: float | None = None) -> list[Any]:
+        """Synchrone Variante von gather() für Scheduler-Tasks"""
+        if not requests:
+            return []
+        return self.run(self.gather(requests), timeout=timeout)
+
+    def get_stats(self) -> dict[str, int]:
+        """Gibt Request-Statistiken zurück"""
+        return {
+            **self.stats,
+            "success_rate": (self.stats["successes"] / max(self.stats["requests"], 1)) * 100,
+        }
+
+    def close(self):
+        """Schließt Session und stoppt den Hintergrund-Loop."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+
+        try:
+            asyncio.run_coroutine_threadsafe(self.aclose(), loop).result(timeout=5)
+        except Exception:
+            pass
+
+        loop.call_soon_threadsafe(loop.stop)
+        if self._loop_thread is not None:
+            self._loop_thread.join(timeout=5)
+        loop.close()
+        self._loop = None
+        self._loop_thread = None
+
+
+# Convenience wrappers — delegate to SingletonMixin
+def get_async_http_client() -> AsyncHTTPClient:
+    """Gibt die globale AsyncHTTPClient-Instanz zurück."""
+    return AsyncHTTPClient.get_instance()
+
+
+def reset_async_http_client():
+    """Reset the global AsyncHTTPClient instance, closing its session and loop."""
+    AsyncHTTPClient.reset_instance()
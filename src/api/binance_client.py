@@ -1,5 +1,6 @@
 """Binance API Client Wrapper - mit Rate Limiting und Decimal-Formatierung"""
 
+import hashlib
 import logging
 import os
 import time
@@ -10,6 +11,7 @@ from threading import Lock
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
 load_dotenv()
 
@@ -72,9 +74,12 @@ class RateLimiter:
 class BinanceClient:
     """Binance API Client mit Rate Limiting und Retry-Logik"""
 
-    def __init__(self, testnet: bool = True):
+    # Größe des HTTP Connection Pools (mehrere Threads teilen sich eine Session)
+    HTTP_POOL_SIZE = 20
+
+    def __init__(self, testnet: bool = True, rate_limiter: RateLimiter | None = None):
         self.testnet = testnet
-        self.rate_limiter = RateLimiter(
+        self.rate_limiter = rate_limiter or RateLimiter(
             max_requests=1000, window_seconds=60
         )  # 1000 von 1200 zur Sicherheit
 
@@ -98,6 +103,20 @@ class BinanceClient:
             )
             logger.info("Binance Client initialisiert (LIVE)")
 
+        self._mount_http_pool()
+
+    def _mount_http_pool(self):
+        """Vergrößert den Connection Pool der python-binance Session.
+
+        Der Default von requests (10 Connections) reicht nicht, wenn Scheduler-Tasks
+        und Orchestrator-Threads denselben Client nutzen.
+        """
+        session = getattr(self.client, "session", None)
+        if session is None or not hasattr(session, "mount"):
+            return
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.HTTP_POOL_SIZE)
+        session.mount("https://", adapter)
+
     def _rate_limited_call(self, func, *args, **kwargs):
         """Wrapper für rate-limited API Calls"""
         self.rate_limiter.acquire()
@@ -251,6 +270,14 @@ class BinanceClient:
             logger.error(f"API Error (get_open_orders): {e}")
             return []
 
+    def get_all_open_orders(self) -> list | None:
+        """Alle offenen Orders aller Symbole mit einem Request (None bei API-Fehler)"""
+        try:
+            return self._rate_limited_call(self.client.get_open_orders)
+        except BinanceAPIException as e:
+            logger.error(f"API Error (get_all_open_orders): {e}")
+            return None
+
     def cancel_order(self, symbol: str, order_id: int) -> dict:
         """Order stornieren"""
         try:
@@ -302,3 +329,76 @@ class BinanceClient:
         current, max_requests = self.rate_limiter.get_usage()
         percent = (current / max_requests) * 100
         return f"{current}/{max_requests} ({percent:.1f}%)"
+
+
+# ═══════════════════════════════════════════════════════════════
+# PROZESSWEITER CLIENT POOL
+# ═══════════════════════════════════════════════════════════════
+
+_clients: dict[tuple[bool, str | None, str | None], BinanceClient] = {}
+_clients_lock = Lock()
+_shared_rate_limiter: RateLimiter | None = None
+
+
+def get_shared_rate_limiter() -> RateLimiter:
+    """Prozessweiter RateLimiter - Binance limitiert pro IP, nicht pro Client."""
+    global _shared_rate_limiter
+    with _clients_lock:
+        if _shared_rate_limiter is None:
+            _shared_rate_limiter = RateLimiter(max_requests=1000, window_seconds=60)
+        return _shared_rate_limiter
+
+
+def _secret_fingerprint(api_secret: str | None) -> str | None:
+    """SHA-256 des Secrets für den Pool-Key - das Secret selbst bleibt aus dem Key."""
+    if not api_secret:
+        return None
+    return hashlib.sha256(api_secret.encode()).hexdigest()
+
+
+def get_binance_client(testnet: bool | None = None) -> BinanceClient:
+    """
+    Gibt den geteilten BinanceClient für (testnet, API-Key, Secret-Hash) zurück.
+
+    Der Client wird erst beim ersten Aufruf erstellt (Ping + HTTP Session) und
+    danach wiederverwendet. Alle Clients teilen sich einen RateLimiter. Ein
+    rotiertes Secret (gleicher Key) ergibt einen neuen Client statt des alten.
+
+    Args:
+        testnet: Testnet verwenden. None = aus BINANCE_TESTNET lesen.
+    """
+    if testnet is None:
+        testnet = os.getenv("BINANCE_TESTNET", "true").lower() == "true"
+
+    prefix = "BINANCE_TESTNET_API" if testnet else "BINANCE_API"
+    api_key = os.getenv(f"{prefix}_KEY")
+    key = (testnet, api_key, _secret_fingerprint(os.getenv(f"{prefix}_SECRET")))
+
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    rate_limiter = get_shared_rate_limiter()
+    with _clients_lock:
+        # Double-checked: ein anderer Thread könnte den Client inzwischen erstellt haben
+        client = _clients.get(key)
+        if client is None:
+            client = BinanceClient(testnet=testnet, rate_limiter=rate_limiter)
+            _clients[key] = client
+        return client
+
+
+def reset_binance_clients():
+    """Leert den Client Pool (Tests, Credential-Wechsel)."""
+    global _shared_rate_limiter
+    with _clients_lock:
+        for client in _clients.values():
+            session = getattr(client.client, "session", None)
+            close_fn = getattr(session, "close", None)
+            if callable(close_fn):
+                try:
+                    close_fn()
+                except Exception:
+                    pass
+        _clients.clear()
+        _shared_rate_limiter = None
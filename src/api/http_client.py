@@ -4,6 +4,7 @@ Ersetzt alle verstreuten requests.get() / requests.post() Aufrufe.
 """
 
 import logging
+import os
 import time
 from collections.abc import Callable
 from datetime import datetime, timedelta
@@ -13,10 +14,15 @@ from typing import Any
 
 import requests
 
+from src.api.response_cache import CachedResponse, HTTPResponseCache
 from src.utils.singleton import SingletonMixin
+from src.utils.telemetry import record_http
 
 logger = logging.getLogger("trading_bot")
 
+# Stale-if-error: abgelaufene Cache-Einträge höchstens so lange nach Ablauf ausliefern
+DEFAULT_STALE_IF_ERROR = 24 * 3600
+
 
 class HTTPClientError(Exception):
     """Basis-Exception für HTTP Client Fehler"""
@@ -88,10 +94,14 @@ class HTTPClient(SingletonMixin):
     - Rate Limit Handling
     - Strukturiertes Logging
     - Response Caching (optional)
+    - Persistenter Cache mit ETag/Last-Modified Revalidierung (cache_ttl)
 
     Usage:
         client = HTTPClient()
         data = client.get("https://api.example.com/data", timeout=10)
+
+        # Langsam veränderliche APIs: lokal frisch halten, danach 304-Revalidierung
+        data = client.get("https://api.alternative.me/fng/", cache_ttl=3600)
     """
 
     # Standard-Timeouts pro API-Typ
@@ -109,6 +119,9 @@ class HTTPClient(SingletonMixin):
         base_delay: float = 1.0,
         max_delay: float = 30.0,
         default_timeout: int = 10,
+        response_cache: HTTPResponseCache | None = None,
+        *,
+        stale_if_error: int | None = None,
     ):
         """
         Args:
@@ -116,18 +129,35 @@ class HTTPClient(SingletonMixin):
             base_delay: Basis-Verzögerung zwischen Retries (Sekunden)
             max_delay: Maximale Verzögerung zwischen Retries (Sekunden)
             default_timeout: Standard-Timeout für Requests (Sekunden)
+            response_cache: Persistenter Cache für cache_ttl-Requests (lazy default)
+            stale_if_error: Wie lange (Sekunden nach Ablauf) ein Cache-Eintrag bei
+                Fehlern noch ausgeliefert wird (Default: HTTP_STALE_IF_ERROR, 24h)
         """
         self.max_retries = max_retries
         self.base_delay = base_delay
         self.max_delay = max_delay
         self.default_timeout = default_timeout
+        if stale_if_error is None:
+            stale_if_error = int(os.getenv("HTTP_STALE_IF_ERROR", DEFAULT_STALE_IF_ERROR))
+        self.stale_if_error = stale_if_error
 
         # Session für Connection Pooling
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": "TradingBot/1.0", "Accept": "application/json"})
 
+        # Persistenter Response Cache (erst bei erstem cache_ttl-Request erstellt)
+        self._response_cache = response_cache
+
         # Statistiken
-        self.stats = {"requests": 0, "successes": 0, "retries": 0, "failures": 0}
+        self.stats = {
+            "requests": 0,
+            "successes": 0,
+            "retries": 0,
+            "failures": 0,
+            "cache_hits": 0,
+            "not_modified": 0,
+            "stale_served": 0,
+        }
 
     def _calculate_delay(self, attempt: int) -> float:
         """Berechnet Exponential Backoff Delay"""
@@ -163,6 +193,9 @@ class HTTPClient(SingletonMixin):
         timeout: int | None = None,
         headers: dict | None = None,
         api_type: str = "default",
+        *,
+        cache_ttl: int | None = None,
+        stale_if_error: int | None = None,
     ) -> dict[str, Any]:
         """
         HTTP GET Request mit Retry-Logik.
@@ -173,6 +206,10 @@ class HTTPClient(SingletonMixin):
             timeout: Timeout in Sekunden (optional, nutzt api_type Default)
             headers: Zusätzliche Header
             api_type: API-Typ für Timeout-Lookup ('default', 'deepseek', etc.)
+            cache_ttl: Persistent cachen; Default-Frische in Sekunden, falls der
+                Server kein Cache-Control/Expires sendet. None = kein Cache.
+            stale_if_error: Max. Sekunden nach Ablauf, die ein Cache-Eintrag bei
+                Fehlern noch ausgeliefert wird (None = Client-Default)
 
         Returns:
             Response JSON als Dict
@@ -181,7 +218,14 @@ class HTTPClient(SingletonMixin):
             HTTPClientError: Bei allen Fehlern nach allen Retries
         """
         return self._request(
-            "GET", url, params=params, timeout=timeout, headers=headers, api_type=api_type
+            "GET",
+            url,
+            params=params,
+            timeout=timeout,
+            headers=headers,
+            api_type=api_type,
+            cache_ttl=cache_ttl,
+            stale_if_error=stale_if_error,
         )
 
     def post(
@@ -228,6 +272,10 @@ class HTTPClient(SingletonMixin):
         )
         extra_headers = kwargs.pop("headers", None)
         files = kwargs.pop("files", None)
+        cache_ttl = kwargs.pop("cache_ttl", None)
+        stale_if_error = kwargs.pop("stale_if_error", None)
+        if stale_if_error is None:
+            stale_if_error = self.stale_if_error
 
         if extra_headers:
             kwargs["headers"] = {**self.session.headers, **extra_headers}
@@ -236,6 +284,22 @@ class HTTPClient(SingletonMixin):
         if files:
             kwargs["files"] = files
 
+        # Persistenter Cache: frisch → lokal, abgelaufen → Conditional Request
+        cache_key = None
+        cached_entry: CachedResponse | None = None
+        if cache_ttl is not None and method == "GET":
+            cache = self._get_response_cache()
+            cache_key = cache.make_key(url, kwargs.get("params"))
+            cached_entry = cache.get(cache_key)
+            if cached_entry is not None:
+                if cached_entry.is_fresh():
+                    self.stats["cache_hits"] += 1
+                    return cached_entry.body
+                kwargs["headers"] = {
+                    **kwargs.get("headers", self.session.headers),
+                    **cached_entry.conditional_headers(),
+                }
+
         last_exception = None
         last_status_code = None
 
@@ -243,17 +307,35 @@ class HTTPClient(SingletonMixin):
             self.stats["requests"] += 1
 
             try:
-                if method == "GET":
-                    response = self.session.get(url, **kwargs)
-                else:
-                    response = self.session.post(url, **kwargs)
+                started = time.perf_counter()
+                try:
+                    if method == "GET":
+                        response = self.session.get(url, **kwargs)
+                    else:
+                        response = self.session.post(url, **kwargs)
+                finally:
+                    record_http(time.perf_counter() - started)
 
                 last_status_code = response.status_code
 
+                # Nicht verändert seit letztem Abruf
+                if response.status_code == 304 and cached_entry is not None:
+                    self.stats["successes"] += 1
+                    self.stats["not_modified"] += 1
+                    self._response_cache.refresh(
+                        cache_key, cached_entry, response.headers, cache_ttl
+                    )
+                    return cached_entry.body
+
                 # Erfolg
                 if response.status_code == 200:
                     self.stats["successes"] += 1
-                    return response.json()
+                    body = response.json()
+                    if cache_key is not None:
+                        self._response_cache.store(
+                            cache_key, url, body, response.headers, cache_ttl
+                        )
+                    return body
 
                 # Rate Limit
                 if response.status_code == 429:
@@ -303,6 +385,20 @@ class HTTPClient(SingletonMixin):
         # Alle Retries fehlgeschlagen
         self.stats["failures"] += 1
 
+        # Stale-if-error: lieber veraltete Daten als gar keine, aber nur begrenzt alt
+        if cached_entry is not None:
+            staleness = cached_entry.staleness()
+            if staleness <= stale_if_error:
+                self.stats["stale_served"] += 1
+                logger.warning(
+                    f"Serving stale cached response for {url} ({staleness / 3600:.1f}h stale)"
+                )
+                return cached_entry.body
+            logger.warning(
+                f"Cached response for {url} too stale to serve "
+                f"({staleness / 3600:.1f}h > {stale_if_error / 3600:.1f}h)"
+            )
+
         if last_exception:
             raise HTTPClientError(
                 f"Request failed after {self.max_retries} attempts: {last_exception}"
@@ -310,6 +406,11 @@ class HTTPClient(SingletonMixin):
         else:
             raise HTTPClientError(f"Request failed with status {last_status_code}")
 
+    def _get_response_cache(self) -> HTTPResponseCache:
+        if self._response_cache is None:
+            self._response_cache = HTTPResponseCache()
+        return self._response_cache
+
     def get_stats(self) -> dict[str, int]:
         """Gibt Request-Statistiken zurück"""
         return {
@@ -200,6 +200,10 @@ class PaperBinanceClient:
             o.to_dict() for o in self._orders.values() if o.symbol == symbol and o.status == "NEW"
         ]
 
+    def get_all_open_orders(self) -> list:
+        """Return open (NEW) orders across all symbols."""
+        return [o.to_dict() for o in self._orders.values() if o.status == "NEW"]
+
     def get_order_status(self, symbol: str, order_id: int) -> dict | None:
         """Return order status dict."""
         order = self._orders.get(order_id)
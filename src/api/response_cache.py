@@ -0,0 +1,231 @@
+"""
+Persistenter HTTP Response Cache mit Conditional Requests.
+
+Für langsam veränderliche externe APIs (Fear & Greed, ETF Flows, Token Unlocks,
+Economic Calendar). Responses werden als JSON-Datei pro URL abgelegt und
+überleben Neustarts. Frische Einträge werden lokal beantwortet, abgelaufene
+per If-None-Match / If-Modified-Since revalidiert (304 = kein Body-Transfer).
+
+Freshness-Regeln (vereinfachtes RFC 9111):
+- Cache-Control: no-store   → nicht speichern
+- Cache-Control: no-cache   → speichern, aber immer revalidieren
+- Cache-Control: max-age=N  → N Sekunden frisch
+- Expires                   → frisch bis Zeitpunkt
+- sonst                     → Default-TTL des Aufrufers
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+logger = logging.getLogger("trading_bot")
+
+DEFAULT_CACHE_DIR = "data/cache/http"
+
+
+@dataclass
+class CachedResponse:
+    """Ein gecachter JSON-Response inkl. Validatoren"""
+
+    url: str
+    body: Any
+    etag: str | None
+    last_modified: str | None
+    expires_at: float
+    stored_at: float
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        return (now or time.time()) < self.expires_at
+
+    def staleness(self, now: float | None = None) -> float:
+        """Sekunden seit Ablauf der Frische (0 solange frisch)"""
+        return max((now or time.time()) - self.expires_at, 0.0)
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Header für einen Conditional Request"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def parse_cache_control(value: str | None) -> dict[str, str | None]:
+    """Parst einen Cache-Control Header in {directive: value}"""
+    directives: dict[str, str | None] = {}
+    if not value:
+        return directives
+    for raw in value.split(","):
+        part = raw.strip()
+        if not part:
+            continue
+        name, _, arg = part.partition("=")
+        directives[name.strip().lower()] = arg.strip().strip('"') or None
+    return directives
+
+
+class HTTPResponseCache:
+    """
+    Datei-basierter Response Cache (eine JSON-Datei pro Key).
+
+    Usage:
+        cache = HTTPResponseCache("data/cache/http")
+        key = cache.make_key(url, params)
+        entry = cache.get(key)
+        if entry and entry.is_fresh():
+            return entry.body
+    """
+
+    def __init__(self, cache_dir: str | Path | None = None, max_entries: int = 500):
+        self.cache_dir = Path(cache_dir or os.getenv("HTTP_CACHE_DIR", DEFAULT_CACHE_DIR))
+        self.max_entries = max_entries
+        self._memory: dict[str, CachedResponse] = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def make_key(url: str, params: dict | None = None) -> str:
+        """Stabiler Key aus URL und Query-Parametern"""
+        raw = json.dumps([url, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> CachedResponse | None:
+        """Eintrag aus Memory oder Disk (None wenn nicht vorhanden/korrupt)"""
+        with self._lock:
+            entry = self._memory.get(key)
+        if entry is not None:
+            return entry
+
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path) as f:
+                entry = CachedResponse(**json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            logger.debug(f"HTTP Cache: korrupter Eintrag {path.name}: {e}")
+            return None
+
+        with self._lock:
+            self._memory[key] = entry
+        return entry
+
+    def store(
+        self, key: str, url: str, body: Any, headers: Any, default_ttl: int
+    ) -> CachedResponse | None:
+        """Speichert einen 200-Response. Gibt None zurück bei no-store."""
+        directives = parse_cache_control(headers.get("Cache-Control"))
+        if "no-store" in directives:
+            self.invalidate(key)
+            return None
+
+        now = time.time()
+        entry = CachedResponse(
+            url=url,
+            body=body,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            expires_at=now + self._freshness_lifetime(directives, headers, default_ttl, now),
+            stored_at=now,
+        )
+        self._write(key, entry)
+        return entry
+
+    def refresh(self, key: str, entry: CachedResponse, headers: Any, default_ttl: int):
+        """Verlängert einen Eintrag nach 304 Not Modified"""
+        directives = parse_cache_control(headers.get("Cache-Control"))
+        now = time.time()
+        entry.expires_at = now + self._freshness_lifetime(directives, headers, default_ttl, now)
+        entry.etag = headers.get("ETag") or entry.etag
+        entry.last_modified = headers.get("Last-Modified") or entry.last_modified
+        self._write(key, entry)
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._memory.pop(key, None)
+        try:
+            self._path(key).unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def clear(self):
+        """Löscht alle Einträge (Memory und Disk)"""
+        with self._lock:
+            self._memory.clear()
+        if self.cache_dir.exists():
+            for path in self.cache_dir.glob("*.json"):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _freshness_lifetime(
+        directives: dict[str, str | None], headers: Any, default_ttl: int, now: float
+    ) -> float:
+        if "no-cache" in directives:
+            return 0.0
+
+        max_age = directives.get("max-age")
+        if max_age is not None:
+            try:
+                return max(float(max_age), 0.0)
+            except ValueError:
+                pass
+
+        expires = headers.get("Expires")
+        if expires:
+            try:
+                return max(parsedate_to_datetime(expires).timestamp() - now, 0.0)
+            except (TypeError, ValueError):
+                pass
+
+        return float(default_ttl)
+
+    def _write(self, key: str, entry: CachedResponse):
+        """Atomarer Write (tmp + replace), danach ggf. alte Einträge entfernen"""
+        with self._lock:
+            is_new = key not in self._memory
+            self._memory[key] = entry
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            temp_file = path.with_suffix(".tmp")
+            with open(temp_file, "w") as f:
+                json.dump(asdict(entry), f)
+            temp_file.replace(path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"HTTP Cache: Schreiben fehlgeschlagen für {entry.url}: {e}")
+            return
+
+        if is_new:
+            self._prune()
+
+    def _prune(self):
+        """Begrenzt die Anzahl der Dateien auf max_entries (älteste zuerst)"""
+        try:
+            files = list(self.cache_dir.glob("*.json"))
+        except OSError:
+            return
+        if len(files) <= self.max_entries:
+            return
+
+        files.sort(key=lambda p: p.stat().st_mtime)
+        for path in files[: len(files) - self.max_entries]:
+            with self._lock:
+                self._memory.pop(path.stem, None)
+            try:
+                path.unlink()
+            except OSError:
+                pass
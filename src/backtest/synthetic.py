@@ -0,0 +1,218 @@
+"""
+Synthetischer Markt-Generator
+Reproduzierbare OHLCV-, Kline- und Order-Flow-Daten für Benchmarks und Tests
+
+Gleicher Seed → identische Daten, unabhängig von Aufrufreihenfolge und
+Plattform. Jedes Symbol hat einen eigenen Zufallsstrom (aus Seed und
+Symbolname abgeleitet); ein gemeinsamer Marktfaktor sorgt für realistische
+Korrelationen zwischen den Coins. Die Preise folgen einer geometrischen
+Brownschen Bewegung mit Regime-Wechseln (BULL / SIDEWAYS / BEAR).
+"""
+
+import zlib
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+# Drift und Volatilität pro Periode je Regime
+REGIMES = {
+    "BULL": (0.0006, 0.008),
+    "SIDEWAYS": (0.0, 0.005),
+    "BEAR": (-0.0006, 0.011),
+}
+
+DEFAULT_START_PRICES = {
+    "BTCUSDT": 60000.0,
+    "ETHUSDT": 3000.0,
+    "SOLUSDT": 150.0,
+    "BNBUSDT": 550.0,
+    "XRPUSDT": 0.55,
+    "ADAUSDT": 0.45,
+}
+
+DEFAULT_START = datetime(2024, 1, 1)
+
+
+@dataclass
+class SyntheticOrder:
+    """Limit-Order aus dem synthetischen Order-Flow"""
+
+    symbol: str
+    side: str  # BUY oder SELL
+    price: float
+    quantity: float
+    created_index: int  # Periode, in der die Order entstand
+
+
+class SyntheticMarket:
+    """
+    Deterministischer Markt mit korrelierten Symbolen.
+
+    Args:
+        seed: Basis-Seed für alle Zufallsströme
+        symbols: Handelspaare (Startpreise aus DEFAULT_START_PRICES, sonst 100)
+        market_beta: Anteil des gemeinsamen Marktfaktors an den Renditen
+        regime_length: Mittlere Dauer eines Regimes in Perioden
+    """
+
+    def __init__(
+        self,
+        seed: int = 42,
+        symbols: list[str] | None = None,
+        market_beta: float = 0.6,
+        regime_length: int = 240,
+    ):
+        self.seed = seed
+        self.symbols = symbols or list(DEFAULT_START_PRICES)
+        self.market_beta = market_beta
+        self.regime_length = regime_length
+
+    def _rng(self, *keys: str) -> np.random.Generator:
+        """Eigener Zufallsstrom pro Schlüssel (stabil über Python-Läufe)."""
+        entropy = [self.seed, *(zlib.crc32(k.encode()) for k in keys)]
+        return np.random.default_rng(entropy)
+
+    def regimes(self, periods: int) -> np.ndarray:
+        """Regime-Label je Periode (für alle Symbole gemeinsam)."""
+        rng = self._rng("regimes")
+        names = list(REGIMES)
+        labels = np.empty(periods, dtype=object)
+        i = 0
+        while i < periods:
+            length = max(int(rng.exponential(self.regime_length)), 1)
+            labels[i : i + length] = names[rng.integers(len(names))]
+            i += length
+        return labels
+
+    def returns(self, symbol: str, periods: int) -> np.ndarray:
+        """Log-Renditen je Periode: Regime-Drift + Marktfaktor + idiosynkratisch."""
+        labels = self.regimes(periods)
+        drift = np.array([REGIMES[r][0] for r in labels])
+        vol = np.array([REGIMES[r][1] for r in labels])
+        market = self._rng("market").standard_normal(periods)
+        own = self._rng("symbol", symbol).standard_normal(periods)
+        shock = self.market_beta * market + np.sqrt(1 - self.market_beta**2) * own
+        return drift + vol * shock
+
+    def ohlcv(self, symbol: str, periods: int = 500) -> dict[str, np.ndarray]:
+        """OHLCV-Arrays im Format von DivergenceDetector._fetch_ohlcv."""
+        rng = self._rng("ohlcv", symbol)
+        start = DEFAULT_START_PRICES.get(symbol, 100.0)
+        close = start * np.exp(np.cumsum(self.returns(symbol, periods)))
+        open_ = np.concatenate(([start], close[:-1]))
+        wick = np.abs(rng.normal(0, 0.003, (2, periods)))
+        high = np.maximum(open_, close) * (1 + wick[0])
+        low = np.minimum(open_, close) * (1 - wick[1])
+        # Volumen steigt mit der Kerzengröße
+        body = np.abs(close - open_) / open_
+        volume = rng.lognormal(3.0, 0.5, periods) * (1 + 50 * body) * 1e6 / start
+        return {"open": open_, "high": high, "low": low, "close": close, "volume": volume}
+
+    def klines(
+        self,
+        symbol: str,
+        periods: int = 500,
+        interval: timedelta = timedelta(hours=1),
+        start: datetime = DEFAULT_START,
+    ) -> list[list]:
+        """Binance-Kline-Format (/api/v3/klines): [open_time, o, h, l, c, v, ...]."""
+        data = self.ohlcv(symbol, periods)
+        step_ms = int(interval.total_seconds() * 1000)
+        # Naive Zeitpunkte als UTC, damit die Kline-Zeiten nicht von der Zeitzone abhängen
+        start_ms = int(start.replace(tzinfo=start.tzinfo or UTC).timestamp() * 1000)
+        rows = []
+        for i in range(periods):
+            open_time = start_ms + i * step_ms
+            rows.append(
+                [
+                    open_time,
+                    f"{data['open'][i]:.8f}",
+                    f"{data['high'][i]:.8f}",
+                    f"{data['low'][i]:.8f}",
+                    f"{data['close'][i]:.8f}",
+                    f"{data['volume'][i]:.8f}",
+                    open_time + step_ms - 1,
+                ]
+            )
+        return rows
+
+    def price_frame(
+        self,
+        periods: int = 365,
+        interval: timedelta = timedelta(days=1),
+        start: datetime = DEFAULT_START,
+        base_names: bool = True,
+    ) -> pd.DataFrame:
+        """Close-Preise als DataFrame (Spalten = Coins) für BacktestEngine.run."""
+        index = pd.date_range(start, periods=periods, freq=interval)
+        columns = {
+            (s.removesuffix("USDT") if base_names else s): self.ohlcv(s, periods)["close"]
+            for s in self.symbols
+        }
+        return pd.DataFrame(columns, index=index)
+
+    def order_flow(
+        self,
+        symbol: str,
+        n_orders: int,
+        periods: int = 500,
+        spread_pct: float = 3.0,
+    ) -> list[SyntheticOrder]:
+        """Limit-Orders um den Preispfad: BUY unter, SELL über dem Close."""
+        rng = self._rng("orders", symbol)
+        close = self.ohlcv(symbol, periods)["close"]
+        idx = np.sort(rng.integers(0, periods, n_orders))
+        offsets = rng.uniform(0.001, spread_pct / 100, n_orders)
+        sides = rng.random(n_orders) < 0.5
+        notional = rng.uniform(10, 200, n_orders)
+        orders = []
+        for i, offset, is_buy, value in zip(idx, offsets, sides, notional):
+            price = close[i] * (1 - offset if is_buy else 1 + offset)
+            orders.append(
+                SyntheticOrder(
+                    symbol=symbol,
+                    side="BUY" if is_buy else "SELL",
+                    price=round(float(price), 8),
+                    quantity=round(float(value / price), 8),
+                    created_index=int(i),
+                )
+            )
+        return orders
+
+    def trade_history(
+        self,
+        n_trades: int,
+        periods: int = 2000,
+        interval: timedelta = timedelta(hours=1),
+        start: datetime = DEFAULT_START,
+    ) -> list[dict]:
+        """Trade-Zeilen wie aus der ``trades``-Tabelle (für TradingMemory-Ranking)."""
+        rng = self._rng("trades")
+        labels = self.regimes(periods)
+        closes = {s: self.ohlcv(s, periods)["close"] for s in self.symbols}
+        trades = []
+        for _ in range(n_trades):
+            i = int(rng.integers(periods))
+            symbol = self.symbols[int(rng.integers(len(self.symbols)))]
+            price = float(closes[symbol][i])
+            value = float(rng.uniform(10, 500))
+            has_outcome = rng.random() < 0.8
+            outcome_24h = round(float(rng.normal(0.2, 2.5)), 3) if has_outcome else None
+            trades.append(
+                {
+                    "timestamp": start + i * interval,
+                    "action": "BUY" if rng.random() < 0.5 else "SELL",
+                    "symbol": symbol,
+                    "price": price,
+                    "value_usd": value,
+                    "fear_greed": int(np.clip(rng.normal(50, 20), 0, 100)),
+                    "market_trend": labels[i],
+                    "reasoning": "synthetic",
+                    "outcome_24h": outcome_24h,
+                    "outcome_7d": round(float(rng.normal(0.5, 6)), 3) if has_outcome else None,
+                    "was_good_decision": outcome_24h > -0.5 if has_outcome else None,
+                }
+            )
+        return trades
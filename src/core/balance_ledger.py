@@ -0,0 +1,201 @@
+"""In-process balance ledger for risk checks.
+
+``client.get_account_balance()`` is a signed ``GET /api/v3/account`` call
+(request weight 20) and used to run up to three times per BUY validation and
+tick. The ledger keeps the free balance per asset in memory instead:
+
+- ``balance(asset)`` serves the cached value and reconciles with the exchange
+  only when the asset was never loaded or the last sync is older than
+  ``BALANCE_RECONCILE_SECONDS`` (default 60).
+- Order placement reserves funds (BUY: quote, SELL: base), cancels release
+  the unfilled remainder, and fills credit the received asset. Assets that
+  were never loaded are not tracked, so events before the first sync are
+  ignored instead of double-counted.
+- Every reconcile records the drift between the ledger and the exchange.
+  Drift comes from activity the ledger does not see (manual trades, other
+  processes, fee rounding); it is exposed via ``metrics()`` and in the live
+  snapshot of each cohort.
+
+One ledger exists per client instance (``get_balance_ledger``), so all
+GridBots of a HybridOrchestrator share it like they share the account.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+import weakref
+from typing import Any
+
+from src.strategies.grid_strategy import TAKER_FEE_RATE
+
+logger = logging.getLogger("trading_bot")
+
+DEFAULT_RECONCILE_SECONDS = 60.0
+QUOTE_ASSET = "USDT"
+
+# Quote-asset drift at which a reconcile logs a warning
+DRIFT_WARN_THRESHOLD = 1.0
+
+
+def reconcile_interval() -> float:
+    """Configured reconcile interval (BALANCE_RECONCILE_SECONDS)."""
+    try:
+        return float(os.getenv("BALANCE_RECONCILE_SECONDS", str(DEFAULT_RECONCILE_SECONDS)))
+    except ValueError:
+        return DEFAULT_RECONCILE_SECONDS
+
+
+def split_symbol(symbol: str) -> tuple[str, str]:
+    """Split a spot symbol into (base, quote), e.g. BTCUSDT -> (BTC, USDT)."""
+    if symbol.endswith(QUOTE_ASSET):
+        return symbol[: -len(QUOTE_ASSET)], QUOTE_ASSET
+    return symbol, QUOTE_ASSET
+
+
+class BalanceLedger:
+    """Free balances per asset, updated from order events and reconciled periodically."""
+
+    def __init__(self, client, interval: float | None = None, clock=time.monotonic):
+        # Weak: the registry is keyed by the client, a strong ref would keep it alive
+        self._client = weakref.ref(client)
+        self.interval = reconcile_interval() if interval is None else interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._free: dict[str, float] = {}
+        self._synced_at: dict[str, float] = {}
+
+        self.hits = 0
+        self.reconciliations = 0
+        self.last_drift: dict[str, float] = {}
+        self.max_abs_drift: dict[str, float] = {}
+
+    @property
+    def client(self):
+        return self._client()
+
+    def balance(self, asset: str = QUOTE_ASSET) -> float:
+        """Free balance of ``asset``; reconciles only if missing or stale."""
+        with self._lock:
+            synced_at = self._synced_at.get(asset)
+            if synced_at is not None and self._clock() - synced_at < self.interval:
+                self.hits += 1
+                return self._free[asset]
+        self.reconcile(asset)
+        with self._lock:
+            return self._free.get(asset, 0.0)
+
+    def reconcile(self, asset: str = QUOTE_ASSET) -> float:
+        """Replace the ledger value with the exchange balance.
+
+        Returns:
+            Drift (exchange minus ledger) or 0.0 on first load / error.
+        """
+        try:
+            actual = float(self.client.get_account_balance(asset))
+        except Exception as e:
+            logger.warning(f"BalanceLedger: reconcile {asset} failed: {e}")
+            return 0.0
+
+        with self._lock:
+            expected = self._free.get(asset)
+            self._free[asset] = actual
+            self._synced_at[asset] = self._clock()
+            self.reconciliations += 1
+            if expected is None:
+                return 0.0
+            drift = actual - expected
+            self.last_drift[asset] = drift
+            self.max_abs_drift[asset] = max(self.max_abs_drift.get(asset, 0.0), abs(drift))
+
+        if asset == QUOTE_ASSET and abs(drift) >= DRIFT_WARN_THRESHOLD:
+            logger.warning(f"BalanceLedger: {asset} drift {drift:+.2f} (exchange {actual:.2f})")
+        return drift
+
+    def invalidate(self, asset: str | None = None) -> None:
+        """Force a reconcile on the next read (all assets if None)."""
+        with self._lock:
+            if asset is None:
+                self._synced_at.clear()
+            else:
+                self._synced_at.pop(asset, None)
+
+    def _apply(self, asset: str, delta: float) -> None:
+        with self._lock:
+            if asset in self._free:
+                self._free[asset] += delta
+
+    def on_order_placed(self, symbol: str, side: str, quantity: float, price: float) -> None:
+        """A limit order locks funds: quote for BUY, base for SELL."""
+        base, quote = split_symbol(symbol)
+        if side == "BUY":
+            self._apply(quote, -quantity * price)
+        else:
+            self._apply(base, -quantity)
+
+    def on_order_released(self, symbol: str, side: str, quantity: float, price: float) -> None:
+        """The unfilled ``quantity`` of a canceled/expired limit order is free again."""
+        if quantity <= 0:
+            return
+        base, quote = split_symbol(symbol)
+        if side == "BUY":
+            self._apply(quote, quantity * price)
+        else:
+            self._apply(base, quantity)
+
+    def on_fill(
+        self,
+        symbol: str,
+        side: str,
+        quantity: float,
+        *,
+        fill_price: float,
+        order_price: float | None = None,
+        fee_usd: float = 0.0,
+    ) -> None:
+        """Credit a fill.
+
+        Args:
+            order_price: Limit price the funds were reserved at, None for
+                market orders (nothing reserved, both legs settle now).
+        """
+        base, quote = split_symbol(symbol)
+        notional = quantity * fill_price
+        if side == "BUY":
+            # Taker fee is deducted from the received base asset
+            self._apply(base, quantity * (1 - float(TAKER_FEE_RATE)))
+            if order_price is None:
+                self._apply(quote, -notional)
+            else:
+                self._apply(quote, quantity * (order_price - fill_price))
+        else:
+            self._apply(quote, notional - fee_usd)
+            if order_price is None:
+                self._apply(base, -quantity)
+
+    def metrics(self) -> dict[str, Any]:
+        """Counters and reconcile drift for monitoring."""
+        with self._lock:
+            return {
+                "balances": dict(self._free),
+                "hits": self.hits,
+                "reconciliations": self.reconciliations,
+                "last_drift": dict(self.last_drift),
+                "max_abs_drift": dict(self.max_abs_drift),
+            }
+
+
+_ledgers: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_ledgers_lock = threading.Lock()
+
+
+def get_balance_ledger(client) -> BalanceLedger:
+    """Shared ledger of a client instance (created on first use)."""
+    with _ledgers_lock:
+        ledger = _ledgers.get(client)
+        if ledger is None:
+            ledger = BalanceLedger(client)
+            _ledgers[client] = ledger
+        return ledger
@@ -1,27 +1,40 @@
 """Main Bot Logic - Production Ready"""
 
+from __future__ import annotations
+
 import logging
 import time
 from datetime import datetime
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING
 
-from src.api.binance_client import BinanceClient
 from src.core.order_manager import OrderManagerMixin
 from src.core.risk_guard import RiskGuardMixin
-from src.core.state_manager import StateManagerMixin
+from src.core.state_manager import StateManagerMixin, TrackedOrders
+from src.core.state_store import StateStore, state_backend
+from src.core.tick_profiler import get_tick_profiler, tick_phase
 from src.strategies.grid_strategy import GridStrategy
 from src.utils.heartbeat import touch_heartbeat
 
+if TYPE_CHECKING:
+    from src.api.binance_client import BinanceClient
+    from src.core.tick_profiler import TickTimer
+
 
 # Logging Setup mit Rotation
 def setup_logging():
-    """Konfiguriert strukturiertes Logging mit Rotation"""
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
+    """Konfiguriert strukturiertes Logging mit Rotation.
 
+    Wird von den Entrypoints (main.py, main_hybrid.py) aufgerufen, nicht beim
+    Import. Mehrfache Aufrufe hängen keine weiteren Handler an.
+    """
     logger = logging.getLogger("trading_bot")
+    if any(isinstance(h, RotatingFileHandler) for h in logger.handlers):
+        return logger
+
+    log_dir = Path("logs")
+    log_dir.mkdir(exist_ok=True)
     logger.setLevel(logging.INFO)
 
     # Rotating File Handler (10MB, 5 Backups)
@@ -42,7 +55,7 @@ def setup_logging():
     return logger
 
 
-logger = setup_logging()
+logger = logging.getLogger("trading_bot")
 
 
 class TelegramNotifier:
@@ -70,6 +83,7 @@ class TelegramNotifier:
         svc = self._get_service()
         return svc.enabled if svc else False
 
+    @tick_phase("telegram")
     def send(self, message: str, urgent: bool = False):
         """Sendet eine Telegram-Nachricht"""
         svc = self._get_service()
@@ -91,11 +105,16 @@ class GridBot(RiskGuardMixin, OrderManagerMixin, StateManagerMixin):
 
     def __init__(self, config: dict, client: BinanceClient | None = None):
         self.config = config
-        self.client = client or BinanceClient(testnet=config.get("testnet", True))
+        if client is None:
+            # python-binance (aiohttp, dateparser) erst laden, wenn ein Client gebraucht wird
+            from src.api.binance_client import get_binance_client
+
+            client = get_binance_client(testnet=config.get("testnet", True))
+        self.client = client
         self.symbol = config["symbol"]
         self.running = False
         self.strategy = None
-        self.active_orders: dict[int, dict[str, Any]] = {}
+        self.active_orders = TrackedOrders()
         self.symbol_info: dict | None = None
 
         # State file für Persistenz (Hybrid-Modus nutzt pro-Symbol State Files)
@@ -103,6 +122,8 @@ class GridBot(RiskGuardMixin, OrderManagerMixin, StateManagerMixin):
         config_dir.mkdir(exist_ok=True)
         state_file_name = config.get("state_file", "bot_state.json")
         self.state_file = config_dir / state_file_name
+        # Optional: inkrementeller SQLite State Store statt JSON-Dump (STATE_BACKEND=sqlite)
+        self.state_store = StateStore.get_instance() if state_backend() == "sqlite" else None
 
         # Telegram Notifier
         self.telegram = TelegramNotifier()
@@ -129,6 +150,10 @@ class GridBot(RiskGuardMixin, OrderManagerMixin, StateManagerMixin):
         self.memory = None
         self._init_memory()
 
+        # Optional: Write-Behind Persistenz für den Fill-Pfad (WRITE_BEHIND=true)
+        self.write_behind = None
+        self._init_write_behind()
+
         # Optional: Stop-Loss Manager
         self.stop_loss_manager = None
         self._init_stop_loss()
@@ -160,6 +185,18 @@ class GridBot(RiskGuardMixin, OrderManagerMixin, StateManagerMixin):
             logger.warning(f"Memory-System nicht verfügbar: {e}")
             self.memory = None
 
+    def _init_write_behind(self):
+        """Aktiviert den WriteBehindWriter, wenn konfiguriert und die DB erreichbar ist"""
+        try:
+            from src.data.write_behind import get_write_behind, write_behind_enabled
+
+            if write_behind_enabled() and self.memory and self.memory.db:
+                self.write_behind = get_write_behind()
+                logger.info("Write-Behind Persistenz aktiv")
+        except Exception as e:
+            logger.warning(f"Write-Behind nicht verfügbar: {e}")
+            self.write_behind = None
+
     def _init_stop_loss(self):
         """Initialisiert den Stop-Loss Manager mit DB-Persistenz wenn verfügbar"""
         try:
@@ -175,7 +212,11 @@ class GridBot(RiskGuardMixin, OrderManagerMixin, StateManagerMixin):
             except Exception:
                 pass
 
-            self.stop_loss_manager = StopLossManager(db_manager=db_manager, telegram_bot=None)
+            self.stop_loss_manager = StopLossManager(
+                db_manager=db_manager,
+                telegram_bot=None,
+                write_behind=self.write_behind if db_manager else None,
+            )
             if db_manager:
                 logger.info("Stop-Loss Manager initialisiert (mit DB-Persistenz)")
             else:
@@ -284,6 +325,10 @@ class GridBot(RiskGuardMixin, OrderManagerMixin, StateManagerMixin):
             # Initialize circuit breaker with current price
             self._last_known_price = current_price
 
+            # Risk-Budget vor den ersten Orders laden
+            if self.cvar_sizer:
+                self.cvar_sizer.refresh_if_stale([self.symbol])
+
             self.telegram.send(
                 f"✅ Bot initialisiert\n"
                 f"Symbol: {self.symbol}\n"
@@ -304,19 +349,34 @@ class GridBot(RiskGuardMixin, OrderManagerMixin, StateManagerMixin):
         Returns:
             True if the bot should continue, False if it should stop.
         """
-        self.check_orders()
-        self.save_state()
+        with get_tick_profiler("grid_bot").tick(self.symbol) as timer:
+            return self._tick(timer)
+
+    def _tick(self, timer: TickTimer) -> bool:
+        with timer.phase("check_orders"):
+            self.check_orders()
+        with timer.phase("save_state"):
+            self.save_state()
 
-        current_price = self.client.get_current_price(self.symbol)
+        with timer.phase("price_fetch"):
+            current_price = self.client.get_current_price(self.symbol)
         if current_price:
             self._consecutive_price_failures = 0
 
-            if self._check_circuit_breaker(current_price):
-                return False
+            with timer.phase("circuit_breaker"):
+                if self._check_circuit_breaker(current_price):
+                    return False
+
+            with timer.phase("stop_losses"):
+                self._check_stop_losses(current_price)
 
-            self._check_stop_losses(current_price)
+            # Risk-Budgets außerhalb des Order-Pfads aktuell halten (zeitgesteuert)
+            if self.cvar_sizer:
+                with timer.phase("risk_budgets"):
+                    self.cvar_sizer.refresh_if_stale([self.symbol])
 
-            balance_usdt = self.client.get_account_balance("USDT")
+            with timer.phase("balance"):
+                balance_usdt = self.balance_ledger.balance("USDT")
             logger.info(
                 f"USDT: {balance_usdt:.2f} | "
                 f"{self.symbol}: {current_price:.2f} | "
@@ -333,16 +393,19 @@ class GridBot(RiskGuardMixin, OrderManagerMixin, StateManagerMixin):
         # multiple bots share one account (each bot would see the others'
         # locked USDT as a "loss"). HybridOrchestrator has its own stop-losses.
         if self.stop_loss_manager and not self.config.get("skip_portfolio_drawdown"):
-            portfolio_value = self.client.get_account_balance("USDT")
-
-            # Reset daily drawdown baseline at start of new day
-            today = datetime.now().strftime("%Y-%m-%d")
-            if today != self._last_drawdown_reset_date and portfolio_value > 0:
-                self.stop_loss_manager.reset_daily(portfolio_value)
-                self._last_drawdown_reset_date = today
-                logger.info(f"Daily drawdown reset: baseline ${portfolio_value:.2f}")
-
-            should_stop, reason = self.stop_loss_manager.check_portfolio_drawdown(portfolio_value)
+            with timer.phase("drawdown"):
+                portfolio_value = self.balance_ledger.balance("USDT")
+
+                # Reset daily drawdown baseline at start of new day
+                today = datetime.now().strftime("%Y-%m-%d")
+                if today != self._last_drawdown_reset_date and portfolio_value > 0:
+                    self.stop_loss_manager.reset_daily(portfolio_value)
+                    self._last_drawdown_reset_date = today
+                    logger.info(f"Daily drawdown reset: baseline ${portfolio_value:.2f}")
+
+                should_stop, reason = self.stop_loss_manager.check_portfolio_drawdown(
+                    portfolio_value
+                )
             if should_stop:
                 self._emergency_stop(reason)
                 return False
@@ -404,6 +467,8 @@ class GridBot(RiskGuardMixin, OrderManagerMixin, StateManagerMixin):
 
         self.running = False
         self.save_state()
+        if self.write_behind and not self.write_behind.flush(timeout=10):
+            logger.warning("Write-Behind: offene DB-Writes bleiben im Spool")
         self.telegram.send("🛑 Trading Bot gestoppt")
         logger.info("Bot gestoppt")
 
@@ -15,13 +15,13 @@ Jede Cohort hat:
 """
 
 import logging
-import os
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 
 from dotenv import load_dotenv
 
+from src.data.database import get_pooled_connection
 from src.utils.singleton import SingletonMixin
 
 load_dotenv()
@@ -29,7 +29,6 @@ load_dotenv()
 logger = logging.getLogger("trading_bot")
 
 try:
-    import psycopg2
     from psycopg2.extras import RealDictCursor
 
     POSTGRES_AVAILABLE = True
@@ -130,12 +129,10 @@ class CohortManager(SingletonMixin):
             return
 
         try:
-            database_url = os.getenv("DATABASE_URL")
-            if not database_url:
-                logger.warning("DATABASE_URL nicht gesetzt")
+            self.conn = get_pooled_connection()
+            if not self.conn:
+                logger.warning("DatabaseManager Pool nicht verfügbar")
                 return
-
-            self.conn = psycopg2.connect(database_url)
             logger.info("CohortManager: PostgreSQL verbunden")
         except Exception as e:
             logger.error(f"CohortManager: DB Verbindung fehlgeschlagen: {e}")
@@ -9,14 +9,19 @@ from __future__ import annotations
 
 import logging
 import time
-from typing import Any
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any
 
-from src.api.binance_client import BinanceClient
 from src.core.cohort_manager import CohortManager
 from src.core.hybrid_config import HybridConfig
 from src.core.hybrid_orchestrator import HybridOrchestrator
+from src.core.live_snapshot import LiveSnapshotPublisher
+from src.core.replay import recorded_tick
 from src.utils.heartbeat import touch_heartbeat
 
+if TYPE_CHECKING:
+    from src.api.binance_client import BinanceClient
+
 logger = logging.getLogger("trading_bot")
 
 
@@ -35,13 +40,16 @@ class CohortOrchestrator:
     MAX_CONSECUTIVE_ERRORS = 5
 
     def __init__(self, client: BinanceClient | None = None):
-        self.client = client or BinanceClient(
-            testnet=True,
-        )
+        if client is None:
+            from src.api.binance_client import get_binance_client
+
+            client = get_binance_client(testnet=True)
+        self.client = client
         self.orchestrators: dict[str, HybridOrchestrator] = {}
         self.cohort_configs: dict[str, dict[str, Any]] = {}
         self.running = False
         self.consecutive_errors = 0
+        self.snapshot_publisher = LiveSnapshotPublisher()
 
     def initialize(self) -> bool:
         """Load cohorts from DB and create per-cohort orchestrators.
@@ -126,12 +134,16 @@ class CohortOrchestrator:
 
         Returns True to continue, False to stop.
         """
-        for name, orch in self.orchestrators.items():
-            try:
-                orch.tick()
-            except Exception as e:
-                logger.error(f"CohortOrchestrator: {name} tick error: {e}")
+        with recorded_tick(self):
+            for name, orch in self.orchestrators.items():
+                try:
+                    orch.tick(persist=False)
+                except Exception as e:
+                    logger.error(f"CohortOrchestrator: {name} tick error: {e}")
 
+        # One save pass for all cohorts (only changed cohorts write)
+        self.save_state()
+        self.publish_snapshot()
         self.consecutive_errors = 0
         touch_heartbeat()
         return True
@@ -173,6 +185,7 @@ class CohortOrchestrator:
 
         self.running = False
         self.save_state()
+        self.snapshot_publisher.clear()
 
     def stop(self) -> None:
         """Stop all orchestrators gracefully."""
@@ -181,12 +194,36 @@ class CohortOrchestrator:
             orch.stop()
 
     def save_state(self) -> None:
-        """Save state for all orchestrators."""
+        """Save state for all orchestrators.
+
+        Unchanged cohorts skip their save; with the SQLite state store all
+        writes of one pass share a single transaction.
+        """
+        store = next(
+            (o.state_store for o in self.orchestrators.values() if o.state_store is not None),
+            None,
+        )
+        try:
+            with store.batch() if store is not None else nullcontext():
+                for name, orch in self.orchestrators.items():
+                    try:
+                        orch.save_state()
+                    except Exception as e:
+                        logger.error(f"CohortOrchestrator: {name} save_state error: {e}")
+        except Exception as e:
+            logger.error(f"CohortOrchestrator: batched save_state error: {e}")
+
+    def publish_snapshot(self) -> None:
+        """Publish the in-memory state of all cohorts for reporting/monitoring readers."""
+        cohorts = {}
         for name, orch in self.orchestrators.items():
             try:
-                orch.save_state()
+                state = orch.live_state()
+                state["cohort_config"] = self.cohort_configs.get(name, {})
+                cohorts[name] = state
             except Exception as e:
-                logger.error(f"CohortOrchestrator: {name} save_state error: {e}")
+                logger.error(f"CohortOrchestrator: {name} live_state error: {e}")
+        self.snapshot_publisher.publish(cohorts)
 
     def get_all_status(self) -> dict[str, dict[str, Any]]:
         """Return status for all cohorts (used by Telegram summary)."""
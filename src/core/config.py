@@ -313,6 +313,12 @@ class SchedulerConfig:
     outcome_update_interval: int = 360  # 6 Stunden
     whale_check_interval: int = 60
 
+    # Worker-Threads pro Prioritätsklasse (eigene Lanes, siehe src/tasks/executor.py)
+    risk_workers: int = 1
+    trading_workers: int = 1
+    data_workers: int = 2
+    reporting_workers: int = 1
+
     @classmethod
     def from_env(cls) -> "SchedulerConfig":
         return cls(
@@ -321,6 +327,10 @@ class SchedulerConfig:
             macro_check_time=os.getenv("MACRO_CHECK_TIME", "08:00"),
             market_snapshot_interval=int(os.getenv("MARKET_SNAPSHOT_INTERVAL", 60)),
             stop_loss_check_interval=int(os.getenv("STOP_LOSS_CHECK_INTERVAL", 5)),
+            risk_workers=int(os.getenv("SCHEDULER_RISK_WORKERS", 1)),
+            trading_workers=int(os.getenv("SCHEDULER_TRADING_WORKERS", 1)),
+            data_workers=int(os.getenv("SCHEDULER_DATA_WORKERS", 2)),
+            reporting_workers=int(os.getenv("SCHEDULER_REPORTING_WORKERS", 1)),
         )
 
 
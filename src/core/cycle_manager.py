@@ -15,19 +15,29 @@ Am Ende jedes Zyklus:
 """
 
 import logging
-import os
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
 from dotenv import load_dotenv
 
+from src.data.database import get_pooled_connection
 from src.utils.singleton import SingletonMixin
 
 load_dotenv()
 
 logger = logging.getLogger("trading_bot")
 
+# Tägliche Returns eines Zyklus (Index-Only-Scan über idx_trades_cycle_outcome)
+DAILY_RETURNS_QUERY = """
+    SELECT DATE_TRUNC('day', timestamp) as day,
+           SUM(outcome_24h) as daily_return
+    FROM trades
+    WHERE cycle_id = %s AND outcome_24h IS NOT NULL
+    GROUP BY DATE_TRUNC('day', timestamp)
+    ORDER BY day
+"""
+
 try:
     import psycopg2
     from psycopg2.extras import RealDictCursor
@@ -105,12 +115,10 @@ class CycleManager(SingletonMixin):
             return
 
         try:
-            database_url = os.getenv("DATABASE_URL")
-            if not database_url:
-                logger.warning("DATABASE_URL nicht gesetzt")
+            self.conn = get_pooled_connection()
+            if not self.conn:
+                logger.warning("DatabaseManager Pool nicht verfügbar")
                 return
-
-            self.conn = psycopg2.connect(database_url)
             logger.info("CycleManager: PostgreSQL verbunden")
         except Exception as e:
             logger.error(f"CycleManager: DB Verbindung fehlgeschlagen: {e}")
@@ -437,17 +445,7 @@ class CycleManager(SingletonMixin):
 
         try:
             with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(
-                    """
-                    SELECT DATE_TRUNC('day', timestamp) as day,
-                           SUM(outcome_24h) as daily_return
-                    FROM trades
-                    WHERE cycle_id = %s AND outcome_24h IS NOT NULL
-                    GROUP BY DATE_TRUNC('day', timestamp)
-                    ORDER BY day
-                """,
-                    (cycle_id,),
-                )
+                cur.execute(DAILY_RETURNS_QUERY, (cycle_id,))
                 return [float(row["daily_return"]) for row in cur.fetchall() if row["daily_return"]]
         except Exception as e:
             logger.error(f"Error getting daily returns: {e}")
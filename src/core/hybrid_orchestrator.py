@@ -18,22 +18,50 @@ from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from src.api.binance_client import BinanceClient
+from src.core.balance_ledger import get_balance_ledger
 from src.core.bot import GridBot, TelegramNotifier
 from src.core.mode_manager import ModeManager
+from src.core.replay import record_mode_input, recorded_tick
+from src.core.state_manager import next_state_version
+from src.core.state_store import StateStore, state_backend
+from src.core.tick_profiler import get_tick_profiler, tick_section
 from src.core.trading_mode import TradingMode
 from src.risk.stop_loss import StopLossManager, StopType
 from src.utils.heartbeat import touch_heartbeat
 
 if TYPE_CHECKING:
+    from src.api.binance_client import BinanceClient
     from src.core.hybrid_config import HybridConfig
     from src.portfolio.allocator import AllocationResult
 
 logger = logging.getLogger("trading_bot")
 
+_UNSET = object()
+
 
 class SymbolState:
-    """Per-symbol tracking state."""
+    """Per-symbol tracking state.
+
+    Assigning a persisted field (see to_dict) to a new value bumps ``version``,
+    so the orchestrator can skip saves when nothing changed.
+    """
+
+    _PERSISTED_FIELDS = frozenset(
+        {
+            "symbol",
+            "mode",
+            "hold_entry_price",
+            "hold_quantity",
+            "hold_stop_id",
+            "allocation_usd",
+            "cash_exit_started",
+        }
+    )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in self._PERSISTED_FIELDS and getattr(self, name, _UNSET) != value:
+            object.__setattr__(self, "version", next_state_version())
+        object.__setattr__(self, name, value)
 
     def __init__(self, symbol: str):
         self.symbol = symbol
@@ -91,7 +119,11 @@ class HybridOrchestrator:
         cohort_name: str | None = None,
     ):
         self.config = config
-        self.client = client or BinanceClient(testnet=True)
+        if client is None:
+            from src.api.binance_client import get_binance_client
+
+            client = get_binance_client(testnet=True)
+        self.client = client
         self.mode_manager = ModeManager(config)
         self.telegram = TelegramNotifier()
         self.cohort_id = cohort_id
@@ -107,7 +139,14 @@ class HybridOrchestrator:
                 db_manager = None
         except Exception:
             pass
-        self.stop_loss_manager = StopLossManager(db_manager=db_manager)
+        write_behind = None
+        if db_manager:
+            from src.data.write_behind import get_write_behind, write_behind_enabled
+
+            if write_behind_enabled():
+                write_behind = get_write_behind()
+        self.write_behind = write_behind
+        self.stop_loss_manager = StopLossManager(db_manager=db_manager, write_behind=write_behind)
 
         # Trade pair tracker for stop-loss / cash exit P&L
         self._trade_pair_tracker = None
@@ -130,6 +169,8 @@ class HybridOrchestrator:
         config_dir.mkdir(exist_ok=True)
         state_name = f"hybrid_state_{cohort_name}.json" if cohort_name else "hybrid_state.json"
         self.state_file = config_dir / state_name
+        self.state_store = StateStore.get_instance() if state_backend() == "sqlite" else None
+        self._saved_signature: tuple | None = None
 
     # ------------------------------------------------------------------
     # Public API
@@ -157,28 +198,37 @@ class HybridOrchestrator:
         del self.symbols[symbol]
         logger.info(f"Orchestrator: removed {symbol}")
 
-    def tick(self) -> bool:
+    def tick(self, persist: bool = True) -> bool:
         """Execute one iteration of the orchestrator loop.
 
+        Args:
+            persist: Save state at the end of the tick. CohortOrchestrator passes
+                False and saves all cohorts in one batch instead.
+
         Returns True to continue, False to stop.
         """
-        current_mode = self.mode_manager.get_current_mode().current_mode
+        with recorded_tick(self), get_tick_profiler("hybrid").tick() as timer:
+            with timer.phase("mode"):
+                current_mode = self.mode_manager.get_current_mode().current_mode
 
-        for symbol, state in list(self.symbols.items()):
-            try:
-                if current_mode == TradingMode.HOLD:
-                    self._execute_hold(state)
-                elif current_mode == TradingMode.GRID:
-                    self._execute_grid(state)
-                elif current_mode == TradingMode.CASH:
-                    self._execute_cash(state)
-            except Exception as e:
-                logger.error(f"Orchestrator: error on {symbol}: {e}")
+            for symbol, state in list(self.symbols.items()):
+                try:
+                    with timer.phase("execute", symbol):
+                        if current_mode == TradingMode.HOLD:
+                            self._execute_hold(state)
+                        elif current_mode == TradingMode.GRID:
+                            self._execute_grid(state)
+                        elif current_mode == TradingMode.CASH:
+                            self._execute_cash(state)
+                except Exception as e:
+                    logger.error(f"Orchestrator: error on {symbol}: {e}")
 
-        # Update stop losses with current prices
-        self._update_stop_losses()
+            # Update stop losses with current prices
+            self._update_stop_losses()
 
-        self.save_state()
+            if persist:
+                with timer.phase("save_state"):
+                    self.save_state()
         self.consecutive_errors = 0
 
         # Heartbeat for Docker health check
@@ -196,6 +246,7 @@ class HybridOrchestrator:
 
         Returns True if a mode switch occurred.
         """
+        record_mode_input(self.cohort_name, regime, regime_probability, regime_duration_days)
         self.mode_manager.update_regime_info(regime, regime_probability)
 
         target_mode, reason = self.mode_manager.evaluate_mode(
@@ -231,11 +282,12 @@ class HybridOrchestrator:
                     sf = config_dir / f"grid_state_{symbol}.json"
 
                 known_ids: set[int] = set()
-                if sf.exists():
+                orders = self.state_store.load_rows(sf.stem) if self.state_store else {}
+                if not orders and sf.exists():
                     with open(sf) as f:
-                        data = json.load(f)
-                    for oid in data.get("active_orders", {}):
-                        known_ids.add(int(oid))
+                        orders = json.load(f).get("active_orders", {})
+                for oid in orders:
+                    known_ids.add(int(oid))
 
                 # Get open orders from Binance
                 open_orders = self.client.get_open_orders(symbol)
@@ -250,6 +302,7 @@ class HybridOrchestrator:
                 logger.warning(f"Reconcile: error for {symbol}: {e}")
 
         if total_cancelled > 0:
+            get_balance_ledger(self.client).invalidate()
             logger.info(f"Reconcile: cancelled {total_cancelled} orphaned orders at startup")
         else:
             logger.info("Reconcile: no orphaned orders found")
@@ -336,6 +389,7 @@ class HybridOrchestrator:
         if not result["success"]:
             logger.error(f"HOLD buy failed for {state.symbol}: {result.get('error')}")
             return
+        get_balance_ledger(self.client).invalidate()
 
         # Parse executed quantity from order response
         order = result["order"]
@@ -605,6 +659,8 @@ class HybridOrchestrator:
 
         for order_id in list(state.grid_bot.active_orders.keys()):
             self.client.cancel_order(state.symbol, order_id)
+        if state.grid_bot.active_orders:
+            get_balance_ledger(self.client).invalidate()
         state.grid_bot.active_orders.clear()
 
     def _tighten_trailing_stop(self, state: SymbolState) -> None:
@@ -638,13 +694,12 @@ class HybridOrchestrator:
             telegram=self.telegram,
         )
         if result["success"]:
+            # Market sell bypasses the ledger (qty may be clamped to the balance)
+            get_balance_ledger(self.client).invalidate()
             logger.info(f"CASH: sold {state.hold_quantity} {state.symbol}")
             self.telegram.send(f"CASH Sell: {state.symbol}\nMenge: {state.hold_quantity}")
             sell_price = self.client.get_current_price(state.symbol) or state.hold_entry_price
-            if self._trade_pair_tracker:
-                self._trade_pair_tracker.close_pairs_by_symbol(
-                    state.symbol, sell_price, state.hold_quantity, "cash_exit"
-                )
+            self._close_trade_pairs(state.symbol, sell_price, state.hold_quantity, "cash_exit")
             if state.hold_stop_id:
                 self.stop_loss_manager.cancel_stop(state.hold_stop_id)
                 state.hold_stop_id = None
@@ -658,7 +713,8 @@ class HybridOrchestrator:
         """Update all stop losses with current prices."""
         prices: dict[str, float] = {}
         for symbol in self.symbols:
-            price = self.client.get_current_price(symbol)
+            with tick_section("stop_prices", symbol):
+                price = self.client.get_current_price(symbol)
             if price and price > 0:
                 prices[symbol] = price
 
@@ -667,7 +723,8 @@ class HybridOrchestrator:
 
         from src.risk.stop_loss_executor import execute_stop_loss_sell
 
-        triggered = self.stop_loss_manager.update_all(prices)
+        with tick_section("stop_updates"):
+            triggered = self.stop_loss_manager.update_all(prices)
         for stop in triggered:
             state = self.symbols.get(stop.symbol)
             if not state:
@@ -685,13 +742,13 @@ class HybridOrchestrator:
                 telegram=self.telegram,
             )
             if result["success"]:
+                get_balance_ledger(self.client).invalidate()
                 stop.confirm_trigger()
                 self.stop_loss_manager.notify_and_persist_trigger(stop)
                 logger.info(f"Stop sell executed: {stop.quantity} {stop.symbol}")
-                if self._trade_pair_tracker:
-                    self._trade_pair_tracker.close_pairs_by_symbol(
-                        stop.symbol, stop.triggered_price, stop.quantity, "stop_loss"
-                    )
+                self._close_trade_pairs(
+                    stop.symbol, stop.triggered_price, stop.quantity, "stop_loss"
+                )
                 state.hold_quantity = 0.0
                 state.hold_entry_price = 0.0
                 state.hold_stop_id = None
@@ -699,6 +756,31 @@ class HybridOrchestrator:
                 stop.reactivate()
                 logger.critical(f"Stop sell FAILED for {stop.symbol}, stop re-activated")
 
+    def _close_trade_pairs(
+        self, symbol: str, exit_price: float, exit_qty: float, exit_reason: str
+    ) -> None:
+        """Close all open trade pairs for a symbol after a stop-loss / CASH sell.
+
+        With write-behind on, the close is queued behind the pending fill jobs
+        (same writer, strict order) so a queued pair open cannot land after it.
+        """
+        if not self._trade_pair_tracker:
+            return
+        if self.write_behind is not None:
+            self.write_behind.submit(
+                "pair_close_symbol",
+                {
+                    "cohort_id": self._trade_pair_tracker.cohort_id,
+                    "symbol": symbol,
+                    "exit_price": exit_price,
+                    "exit_qty": exit_qty,
+                    "exit_reason": exit_reason,
+                    "timestamp": datetime.now().isoformat(),
+                },
+            )
+            return
+        self._trade_pair_tracker.close_pairs_by_symbol(symbol, exit_price, exit_qty, exit_reason)
+
     def _cleanup_symbol(self, state: SymbolState) -> None:
         """Clean up a symbol before removal."""
         self._cancel_grid_orders(state)
@@ -718,10 +800,46 @@ class HybridOrchestrator:
     # State persistence
     # ------------------------------------------------------------------
 
-    def save_state(self) -> None:
-        """Save orchestrator state to JSON (atomic write)."""
+    def _state_signature(self, mode_state: Any) -> tuple:
+        """Cheap fingerprint of everything save_state() persists (except static config)."""
+        return (
+            tuple((s, st.version) for s, st in self.symbols.items()),
+            mode_state.current_mode,
+            mode_state.mode_since,
+            self._last_rebalance,
+        )
+
+    def save_state(self, force: bool = False) -> None:
+        """Save orchestrator state to JSON (atomic write) or the incremental state store.
+
+        Skipped when no symbol state, mode or rebalance time changed since the
+        last save, unless ``force`` is set.
+        """
         try:
             mode_state = self.mode_manager.get_current_mode()
+            signature = self._state_signature(mode_state)
+            if not force and signature == self._saved_signature:
+                return
+
+            if self.state_store is not None:
+                namespace = self.state_file.stem
+                self.state_store.sync_rows(
+                    namespace, {s: st.to_dict() for s, st in self.symbols.items()}
+                )
+                self.state_store.put_document(
+                    namespace,
+                    {
+                        "current_mode": mode_state.current_mode.value,
+                        "mode_since": mode_state.mode_since.isoformat(),
+                        "config": self.config.to_dict(),
+                        "last_rebalance": self._last_rebalance.isoformat()
+                        if self._last_rebalance
+                        else None,
+                    },
+                )
+                self._saved_signature = signature
+                return
+
             state = {
                 "timestamp": datetime.now().isoformat(),
                 "current_mode": mode_state.current_mode.value,
@@ -737,17 +855,22 @@ class HybridOrchestrator:
             with open(temp_file, "w") as f:
                 json.dump(state, f, indent=2)
             temp_file.replace(self.state_file)
+            self._saved_signature = signature
         except Exception as e:
             logger.error(f"Orchestrator: save state error: {e}")
 
     def load_state(self) -> bool:
-        """Load orchestrator state from JSON."""
-        if not self.state_file.exists():
+        """Load orchestrator state from the state store or JSON."""
+        data = None
+        if self.state_store is not None:
+            data = self.state_store.load_state(self.state_file.stem, rows_field="symbols")
+        if data is None and not self.state_file.exists():
             return False
 
         try:
-            with open(self.state_file) as f:
-                data = json.load(f)
+            if data is None:
+                with open(self.state_file) as f:
+                    data = json.load(f)
 
             # Restore symbol states
             for symbol, sdata in data.get("symbols", {}).items():
@@ -982,6 +1105,35 @@ class HybridOrchestrator:
 
         return adjustments
 
+    def live_state(self) -> dict[str, Any]:
+        """In-memory state for the live snapshot (see src/core/live_snapshot.py).
+
+        Same top-level shape as the hybrid_state file plus the tracked grid
+        orders (as in the grid_state files) and the last price each GridBot saw.
+        """
+        mode_state = self.mode_manager.get_current_mode()
+        grid_orders: dict[str, dict] = {}
+        prices: dict[str, float] = {}
+        for symbol, state in self.symbols.items():
+            bot = state.grid_bot
+            if bot is None:
+                continue
+            grid_orders[symbol] = {
+                str(oid): dict(order) for oid, order in bot.active_orders.items()
+            }
+            if bot._last_known_price > 0:
+                prices[symbol] = bot._last_known_price
+
+        return {
+            "current_mode": mode_state.current_mode.value,
+            "mode_since": mode_state.mode_since.isoformat(),
+            "config": self.config.to_dict(),
+            "symbols": {s: st.to_dict() for s, st in self.symbols.items()},
+            "grid_orders": grid_orders,
+            "prices": prices,
+            "balance_ledger": get_balance_ledger(self.client).metrics(),
+        }
+
     def get_status(self) -> dict[str, Any]:
         """Return current orchestrator status."""
         mode_state = self.mode_manager.get_current_mode()
@@ -0,0 +1,147 @@
+"""Live state snapshot shared between the trading process and its readers.
+
+The trading process publishes one consistent document per tick (all cohorts
+with mode, config, symbol states, tracked grid orders and last seen prices)
+to ``LIVE_SNAPSHOT_PATH`` (default ``config/live_snapshot.json``, which sits on
+the volume shared by the bot, scheduler and Telegram containers).
+
+Writes go to a temp file followed by ``os.replace``, so readers always see a
+complete document and never a torn write. Readers parse the file at most once
+per published version: the parsed document is cached by file identity
+(inode, mtime, size), so repeated reads in the same process cost one ``stat()``.
+
+Readers should treat ``None`` (missing, unreadable or older than
+``LIVE_SNAPSHOT_MAX_AGE`` seconds) as "trading process not running" and fall
+back to the persisted state files.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+logger = logging.getLogger("trading_bot")
+
+DEFAULT_PATH = Path("config") / "live_snapshot.json"
+DEFAULT_MAX_AGE_SECONDS = 300.0
+
+_cache_lock = Lock()
+_cache: dict[str, tuple[tuple[int, int, int], dict[str, Any]]] = {}
+
+
+def snapshot_path() -> Path:
+    """Configured snapshot location (LIVE_SNAPSHOT_PATH)."""
+    return Path(os.getenv("LIVE_SNAPSHOT_PATH", str(DEFAULT_PATH)))
+
+
+def _max_age() -> float:
+    try:
+        return float(os.getenv("LIVE_SNAPSHOT_MAX_AGE", str(DEFAULT_MAX_AGE_SECONDS)))
+    except ValueError:
+        return DEFAULT_MAX_AGE_SECONDS
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+class LiveSnapshotPublisher:
+    """Writes versioned snapshots for readers in other processes."""
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path) if path is not None else snapshot_path()
+        self.version = 0
+
+    def publish(self, cohorts: dict[str, dict[str, Any]]) -> bool:
+        """Atomically replace the snapshot with the given cohort states.
+
+        Returns:
+            True if the snapshot was written.
+        """
+        self.version += 1
+        document = {
+            "version": self.version,
+            "published_at": time.time(),
+            "pid": os.getpid(),
+            "cohorts": cohorts,
+        }
+        temp_file = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_file, "w") as f:
+                json.dump(document, f, default=_default, separators=(",", ":"))
+            temp_file.replace(self.path)
+            return True
+        except OSError as e:
+            logger.warning(f"LiveSnapshot: publish failed: {e}")
+            temp_file.unlink(missing_ok=True)
+            return False
+
+    def clear(self) -> None:
+        """Remove the snapshot (clean shutdown), so readers fall back to state files."""
+        self.path.unlink(missing_ok=True)
+
+
+def read_snapshot(
+    path: str | Path | None = None, max_age: float | None = None
+) -> dict[str, Any] | None:
+    """Load the current snapshot.
+
+    Args:
+        path: Snapshot file (default: LIVE_SNAPSHOT_PATH).
+        max_age: Maximum age in seconds (default: LIVE_SNAPSHOT_MAX_AGE).
+
+    Returns:
+        Snapshot document or None if missing, unreadable or stale.
+    """
+    path = Path(path) if path is not None else snapshot_path()
+    max_age = _max_age() if max_age is None else max_age
+
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+
+    identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    key = str(path)
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None and cached[0] == identity:
+        document = cached[1]
+    else:
+        try:
+            with open(path) as f:
+                document = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.debug(f"LiveSnapshot: unreadable snapshot {path}: {e}")
+            return None
+        with _cache_lock:
+            _cache[key] = (identity, document)
+
+    if time.time() - float(document.get("published_at", 0)) > max_age:
+        return None
+    return document
+
+
+def snapshot_grid_states(snapshot: dict[str, Any]) -> dict[str, dict]:
+    """Grid orders from a snapshot in ``load_grid_states()`` shape.
+
+    Returns:
+        Dict keyed by "cohort:SYMBOL" -> {"symbol": ..., "active_orders": {...}}.
+    """
+    states: dict[str, dict] = {}
+    for cohort, data in snapshot.get("cohorts", {}).items():
+        for symbol, orders in data.get("grid_orders", {}).items():
+            states[f"{cohort}:{symbol}"] = {"symbol": symbol, "active_orders": orders}
+    return states
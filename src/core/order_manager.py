@@ -4,6 +4,8 @@ import logging
 from datetime import datetime, timedelta
 
 from src.api.http_client import HTTPClientError, get_http_client
+from src.core.replay import recorded_input
+from src.data.memory import TradeRecord
 from src.strategies.grid_strategy import TAKER_FEE_RATE
 
 logger = logging.getLogger("trading_bot")
@@ -13,14 +15,75 @@ MAX_FOLLOWUP_RETRIES = 5
 FOLLOWUP_BACKOFF_MINUTES = [2, 5, 15, 30, 60]
 
 
+def build_fill_trade_record(
+    symbol: str,
+    order_info: dict,
+    price: float,
+    quantity: float,
+    fee_usd: float,
+    *,
+    fear_greed: int,
+    btc_price: float,
+    timestamp: datetime | None = None,
+) -> TradeRecord:
+    """TradeRecord für einen Grid-Fill (auch vom Write-Behind-Writer genutzt)."""
+    # D4: Slippage tracking
+    order_price = order_info.get("price")
+    expected_price = float(price if order_price is None else order_price)
+    slippage_bps = None
+    if expected_price > 0:
+        if order_info["type"] == "BUY":
+            # Positive = paid more than expected (worse)
+            slippage_bps = (price - expected_price) / expected_price * 10000
+        else:
+            # Positive = received less than expected (worse)
+            slippage_bps = (expected_price - price) / expected_price * 10000
+
+    return TradeRecord(
+        timestamp=timestamp or datetime.now(),
+        action=order_info["type"],
+        symbol=symbol,
+        price=price,
+        quantity=quantity,
+        value_usd=price * quantity,
+        fear_greed=fear_greed,
+        btc_price=btc_price,
+        symbol_24h_change=0.0,
+        market_trend="NEUTRAL",
+        math_signal="GRID",
+        ai_signal="N/A",
+        reasoning=f"Grid order filled at {price} (fee: ${fee_usd:.4f})",
+        fee_usd=fee_usd,
+        expected_price=expected_price,
+        slippage_bps=round(slippage_bps, 4) if slippage_bps is not None else None,
+    )
+
+
 class OrderManagerMixin:
     """Mixin providing order management methods for GridBot.
 
     Expects the host class to have: client, symbol, strategy, symbol_info,
     active_orders, memory, stop_loss_manager, telegram, _pending_followups,
-    _validate_order_risk(), _create_stop_loss().
+    _trade_pair_tracker, write_behind, balance_ledger, _validate_order_risk(),
+    _create_stop_loss().
     """
 
+    def _place_limit_order(self, side: str, quantity, price) -> dict:
+        """Limit-Order platzieren und die gesperrten Mittel im Balance-Ledger reservieren."""
+        if side == "BUY":
+            result = self.client.place_limit_buy(self.symbol, quantity, price)
+        else:
+            result = self.client.place_limit_sell(self.symbol, quantity, price)
+        if result.get("success"):
+            self.balance_ledger.on_order_placed(self.symbol, side, float(quantity), float(price))
+        return result
+
+    def _release_order_funds(self, order_info: dict, unfilled_qty: float) -> None:
+        """Nicht gefüllten Rest einer beendeten Limit-Order im Ledger freigeben."""
+        self.balance_ledger.on_order_released(
+            self.symbol, order_info["type"], unfilled_qty, float(order_info["price"])
+        )
+
     def place_initial_orders(self):
         """Platziert die initialen Grid-Orders"""
         try:
@@ -60,7 +123,7 @@ class OrderManagerMixin:
                     failed_count += 1
                     continue
 
-                result = self.client.place_limit_buy(self.symbol, order["quantity"], order["price"])
+                result = self._place_limit_order("BUY", order["quantity"], order["price"])
 
                 if result["success"]:
                     order_id = result["order"]["orderId"]
@@ -115,6 +178,7 @@ class OrderManagerMixin:
                             f"({executed_qty}/{order_info['quantity']}) - weiter tracken"
                         )
                         order_info["executed_qty"] = executed_qty
+                        self.active_orders.touch()
                         continue
 
                     if status == "CANCELED" and executed_qty > 0:
@@ -127,6 +191,7 @@ class OrderManagerMixin:
 
                     if status in ("CANCELED", "EXPIRED", "REJECTED", "PENDING_CANCEL"):
                         logger.info(f"Order {order_id} Status: {status} - wird entfernt")
+                        self._release_order_funds(order_info, float(order_info["quantity"]))
                         del self.active_orders[order_id]
                         continue
 
@@ -154,21 +219,14 @@ class OrderManagerMixin:
                     )
 
                     fee_usd = filled_price * filled_qty * float(TAKER_FEE_RATE)
-                    trade_id = self._save_trade_to_memory(
-                        order_info, filled_price, filled_qty, fee_usd
+                    self._record_fill(
+                        order_info,
+                        filled_price,
+                        filled_qty,
+                        fee_usd,
+                        pair_action="open" if order_info["type"] == "BUY" else "close",
                     )
 
-                    # Track trade pair
-                    if self._trade_pair_tracker:
-                        if order_info["type"] == "BUY":
-                            self._trade_pair_tracker.open_pair(
-                                self.symbol, trade_id, filled_price, filled_qty, fee_usd
-                            )
-                        else:
-                            self._trade_pair_tracker.close_pair(
-                                self.symbol, trade_id, filled_price, filled_qty, fee_usd
-                            )
-
                     if order_info["type"] == "BUY" and self.stop_loss_manager:
                         fee_adjusted_qty = filled_qty * (1 - float(TAKER_FEE_RATE))
                         self._create_stop_loss(filled_price, fee_adjusted_qty)
@@ -198,8 +256,8 @@ class OrderManagerMixin:
                                 f"Follow-up SELL blocked\nSymbol: {self.symbol}\nReason: {reason}"
                             )
                         else:
-                            result = self.client.place_limit_sell(
-                                self.symbol, action["quantity"], action["price"]
+                            result = self._place_limit_order(
+                                "SELL", action["quantity"], action["price"]
                             )
                             if result["success"]:
                                 new_order_id = result["order"]["orderId"]
@@ -227,8 +285,8 @@ class OrderManagerMixin:
                                 f"Follow-up BUY blocked\nSymbol: {self.symbol}\nReason: {reason}"
                             )
                         else:
-                            result = self.client.place_limit_buy(
-                                self.symbol, action["quantity"], action["price"]
+                            result = self._place_limit_order(
+                                "BUY", action["quantity"], action["price"]
                             )
                             if result["success"]:
                                 new_order_id = result["order"]["orderId"]
@@ -262,6 +320,7 @@ class OrderManagerMixin:
                         self.active_orders[order_id]["intended_action"] = action
                         self.active_orders[order_id]["retry_count"] = retry_count + 1
                         self.active_orders[order_id]["next_retry_after"] = next_retry.isoformat()
+                        self.active_orders.touch()
 
         except Exception as e:
             logger.exception(f"Fehler in check_orders: {e}")
@@ -298,18 +357,19 @@ class OrderManagerMixin:
             f"Status: Canceled nach Partial Fill"
         )
 
-        trade_id = self._save_trade_to_memory(order_info, filled_price, filled_qty, fee_usd)
-
-        # Track trade pair for partial fills
-        if self._trade_pair_tracker and order_info["type"] == "BUY":
-            self._trade_pair_tracker.open_pair(
-                self.symbol, trade_id, filled_price, filled_qty, fee_usd
-            )
+        self._record_fill(
+            order_info,
+            filled_price,
+            filled_qty,
+            fee_usd,
+            pair_action="open" if order_info["type"] == "BUY" else None,
+        )
 
         if order_info["type"] == "BUY" and self.stop_loss_manager:
             fee_adjusted_qty = filled_qty * (1 - float(TAKER_FEE_RATE))
             self._create_stop_loss(filled_price, fee_adjusted_qty)
 
+        self._release_order_funds(order_info, float(order_info["quantity"]) - filled_qty)
         del self.active_orders[order_id]
 
     def _retry_failed_followup(self, order_id: int, order_info: dict):
@@ -358,10 +418,8 @@ class OrderManagerMixin:
         )
         if not allowed:
             logger.warning(f"Follow-up retry blocked by risk check: {reason}")
-        elif action_type == "PLACE_SELL":
-            result = self.client.place_limit_sell(self.symbol, action["quantity"], action["price"])
-        elif action_type == "PLACE_BUY":
-            result = self.client.place_limit_buy(self.symbol, action["quantity"], action["price"])
+        elif action_type in ("PLACE_SELL", "PLACE_BUY"):
+            result = self._place_limit_order(side, action["quantity"], action["price"])
 
         if result["success"]:
             new_order_id = result["order"]["orderId"]
@@ -378,8 +436,117 @@ class OrderManagerMixin:
             next_retry = datetime.now() + timedelta(minutes=FOLLOWUP_BACKOFF_MINUTES[backoff_idx])
             self.active_orders[order_id]["retry_count"] = retry_count + 1
             self.active_orders[order_id]["next_retry_after"] = next_retry.isoformat()
+            self.active_orders.touch()
             logger.warning(f"Follow-up retry fehlgeschlagen, nächster Versuch: {next_retry:%H:%M}")
 
+    def _record_fill(
+        self,
+        order_info: dict,
+        price: float,
+        quantity: float,
+        fee_usd: float,
+        *,
+        pair_action: str | None = None,
+        exit_reason: str = "grid_fill",
+    ):
+        """Persistiert einen Fill: Trade, Trade-Pair (open/close) und Signal-Breakdown.
+
+        Mit Write-Behind (WRITE_BEHIND=true) wird nur ein Job eingereiht, die
+        DB-Writes laufen gebündelt im Hintergrund und verzögern die Folge-Order nicht.
+        """
+        side = order_info.get("type")
+        if side in ("BUY", "SELL"):
+            order_price = order_info.get("price")
+            self.balance_ledger.on_fill(
+                self.symbol,
+                side,
+                quantity,
+                fill_price=price,
+                order_price=float(order_price) if order_price is not None else None,
+                fee_usd=fee_usd,
+            )
+
+        writer = getattr(self, "write_behind", None)
+        if writer is not None and self.memory:
+            self._submit_fill(
+                writer,
+                order_info,
+                price,
+                quantity,
+                fee_usd,
+                pair_action=pair_action,
+                exit_reason=exit_reason,
+            )
+            return
+
+        trade_id = self._save_trade_to_memory(order_info, price, quantity, fee_usd)
+
+        if not self._trade_pair_tracker or pair_action is None:
+            return
+        if pair_action == "open":
+            self._trade_pair_tracker.open_pair(self.symbol, trade_id, price, quantity, fee_usd)
+        else:
+            self._trade_pair_tracker.close_pair(
+                self.symbol, trade_id, price, quantity, fee_usd, exit_reason=exit_reason
+            )
+
+    def _submit_fill(
+        self,
+        writer,
+        order_info: dict,
+        price: float,
+        quantity: float,
+        fee_usd: float,
+        *,
+        pair_action: str | None,
+        exit_reason: str,
+    ):
+        """Reiht den rohen Fill beim WriteBehindWriter ein (ein Job = Trade + Pair + Signale).
+
+        Marktkontext (Fear & Greed, BTC-Preis) und Signal-Breakdown baut der
+        Writer-Thread; der Fill-Pfad macht bis zur Folge-Order kein Netzwerk-I/O.
+        """
+        try:
+            order_price = order_info.get("price")
+            payload = {
+                "fill": {
+                    "symbol": self.symbol,
+                    "side": order_info["type"],
+                    "order_price": float(order_price) if order_price is not None else None,
+                    "price": float(price),
+                    "quantity": float(quantity),
+                    "fee_usd": float(fee_usd),
+                    "timestamp": datetime.now().isoformat(),
+                },
+                "pair": None,
+                "cohort_id": self.config.get("cohort_id"),
+            }
+            if self._trade_pair_tracker and pair_action is not None:
+                payload["pair"] = {
+                    "action": pair_action,
+                    "cohort_id": self._trade_pair_tracker.cohort_id,
+                    "exit_reason": exit_reason,
+                }
+            writer.submit("trade_fill", payload)
+        except Exception as e:
+            logger.warning(f"Konnte Trade nicht für Write-Behind einreihen: {e}")
+
+    def _build_trade_record(
+        self, order_info: dict, price: float, quantity: float, fee_usd: float
+    ) -> TradeRecord:
+        """TradeRecord mit Marktkontext und Slippage für einen Fill."""
+        fear_greed = self._get_current_fear_greed()
+        btc_price = self.client.get_current_price("BTCUSDT") if self.symbol != "BTCUSDT" else price
+        return build_fill_trade_record(
+            self.symbol,
+            order_info,
+            price,
+            quantity,
+            fee_usd,
+            fear_greed=fear_greed,
+            btc_price=btc_price,
+        )
+
     def _save_trade_to_memory(
         self, order_info: dict, price: float, quantity: float, fee_usd: float = 0.0
     ) -> int | None:
@@ -388,42 +555,7 @@ class OrderManagerMixin:
             return None
 
         try:
-            from src.data.memory import TradeRecord
-
-            fear_greed = self._get_current_fear_greed()
-            btc_price = (
-                self.client.get_current_price("BTCUSDT") if self.symbol != "BTCUSDT" else price
-            )
-
-            # D4: Slippage tracking
-            expected_price = float(order_info.get("price", price))
-            slippage_bps = None
-            if expected_price > 0:
-                if order_info["type"] == "BUY":
-                    # Positive = paid more than expected (worse)
-                    slippage_bps = (price - expected_price) / expected_price * 10000
-                else:
-                    # Positive = received less than expected (worse)
-                    slippage_bps = (expected_price - price) / expected_price * 10000
-
-            trade_record = TradeRecord(
-                timestamp=datetime.now(),
-                action=order_info["type"],
-                symbol=self.symbol,
-                price=price,
-                quantity=quantity,
-                value_usd=price * quantity,
-                fear_greed=fear_greed,
-                btc_price=btc_price,
-                symbol_24h_change=0.0,
-                market_trend="NEUTRAL",
-                math_signal="GRID",
-                ai_signal="N/A",
-                reasoning=f"Grid order filled at {price} (fee: ${fee_usd:.4f})",
-                fee_usd=fee_usd,
-                expected_price=expected_price,
-                slippage_bps=round(slippage_bps, 4) if slippage_bps is not None else None,
-            )
+            trade_record = self._build_trade_record(order_info, price, quantity, fee_usd)
 
             trade_id = self.memory.save_trade(trade_record)
             logger.info(f"Trade in Memory gespeichert: ID {trade_id} (fee: ${fee_usd:.4f})")
@@ -435,7 +567,7 @@ class OrderManagerMixin:
 
                     analyzer = SignalAnalyzer.get_instance()
                     signals = analyzer.compute_all_signals(
-                        {"fear_greed": fear_greed, "price": price}
+                        {"fear_greed": trade_record.fear_greed, "price": price}
                     )
                     analyzer.store_signals(
                         trade_id=str(trade_id),
@@ -452,7 +584,11 @@ class OrderManagerMixin:
             return None
 
     def _get_current_fear_greed(self) -> int:
-        """Holt den aktuellen Fear & Greed Index"""
+        """Holt den aktuellen Fear & Greed Index (bei Replay aus der Aufzeichnung)"""
+        return recorded_input("fear_greed", self._fetch_fear_greed)
+
+    @staticmethod
+    def _fetch_fear_greed() -> int:
         try:
             http = get_http_client()
             data = http.get("https://api.alternative.me/fng/")
@@ -494,14 +630,7 @@ class OrderManagerMixin:
                     logger.warning(f"Downtime follow-up blocked by risk check: {reason}")
                     continue
 
-                if action_type == "PLACE_SELL":
-                    result = self.client.place_limit_sell(
-                        self.symbol, action["quantity"], action["price"]
-                    )
-                else:
-                    result = self.client.place_limit_buy(
-                        self.symbol, action["quantity"], action["price"]
-                    )
+                result = self._place_limit_order(side, action["quantity"], action["price"])
 
                 if result["success"]:
                     order_id = result["order"]["orderId"]
@@ -0,0 +1,674 @@
+"""Record live tick inputs and replay them offline at full speed.
+
+Recording (``REPLAY_RECORD_PATH=/app/logs/replay.jsonl`` for main_hybrid.py):
+``RecordingClient`` wraps the exchange client and appends every client call
+with its result (prices, order statuses, balances, order placements) to a
+JSONL file. ``recorded_tick`` marks the start of each top-level tick with
+its wall-clock time, and ``HybridOrchestrator.evaluate_and_switch`` logs
+its regime inputs. Before the first tick the recorder writes a ``meta``
+event with each cohort's config, mode, symbols and its JSON state files
+(hybrid and grid state).
+
+Replay (``python -m src.core.replay logs/replay.jsonl``): rebuilds the
+orchestrators from the meta event in a scratch directory and drives their
+``tick()`` directly, without sleeps. ``ReplayClient`` answers the calls
+from the recording:
+
+- Calls are matched per tick by method and arguments (FIFO). A call that
+  was not recorded in the tick falls back to the latest recorded answer
+  for the same call, then the same method. ``strict=True`` raises
+  ``ReplayMismatch`` instead.
+- ``datetime.now()``, ``time.time()`` and ``time.monotonic()`` in
+  ``src.*`` modules follow the recorded tick time; ``time.sleep`` returns
+  immediately. Code paths driven by the real clock (e.g. default arguments
+  bound at import) still use the real time.
+- Inputs fetched outside the client go through ``recorded_input`` (klines
+  for the dynamic grid range, Fear & Greed for trade records) and are
+  answered the same way.
+- Telegram is muted and write-behind is off for the duration of the replay.
+  TradingMemory still writes to PostgreSQL if one is configured, so replay
+  on a machine without database credentials.
+
+The report compares the order writes (place/cancel) of the replay with the
+recording tick by tick, so a performance change that alters trading
+decisions shows up as a divergence.
+
+Limitations: only JSON state files are captured (``STATE_BACKEND=json`` is
+forced during replay); stop-losses kept in PostgreSQL are not restored and
+are recreated from the hybrid state as on a cold start.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+logger = logging.getLogger("trading_bot")
+
+FORMAT_VERSION = 1
+
+# Public exchange-client API (BinanceClient / PaperBinanceClient)
+CLIENT_METHODS = frozenset(
+    {
+        "get_account_balance",
+        "get_current_price",
+        "get_symbol_info",
+        "place_market_buy",
+        "place_market_sell",
+        "place_limit_buy",
+        "place_limit_sell",
+        "get_open_orders",
+        "get_all_open_orders",
+        "cancel_order",
+        "get_order_status",
+        "get_all_orders",
+        "get_24h_ticker",
+        "get_rate_limit_status",
+        "get_portfolio_summary",
+    }
+)
+WRITE_METHODS = frozenset(
+    {"place_market_buy", "place_market_sell", "place_limit_buy", "place_limit_sell", "cancel_order"}
+)
+
+# Replay keeps state in the scratch dir and does not queue trades for PostgreSQL
+_REPLAY_ENV = {"STATE_BACKEND": "json", "WRITE_BEHIND": "false"}
+
+# Modules whose clock is left alone (the sampler thread must really sleep)
+_CLOCK_EXEMPT = frozenset({"src.core.tick_profiler", "src.core.replay"})
+# ``time`` is only swapped in the tick path; background threads (write-behind,
+# telemetry, task lanes) would spin on a no-op sleep
+_TIME_PACKAGES = ("src.core.", "src.risk.", "src.strategies.")
+
+
+class ReplayMismatch(LookupError):
+    """A call during replay has no recorded answer (strict mode or never recorded)."""
+
+
+class ReplayedError(RuntimeError):
+    """Re-raised exception that the client raised while recording."""
+
+
+def _call_key(method: str, args: tuple, kwargs: dict) -> str:
+    return json.dumps([method, list(args), kwargs], default=str, sort_keys=True)
+
+
+def _cohort_key(name: str | None) -> str:
+    return name or "default"
+
+
+# ═══════════════════════════════════════════════════════════════
+# RECORDING
+# ═══════════════════════════════════════════════════════════════
+
+
+class TickRecorder:
+    """Appends recording events to a JSONL file (one event per line)."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")  # noqa: SIM115
+        self._lock = threading.Lock()
+        self.meta_written = False
+        self.ticks = 0
+        self._depth = 0
+        self._tick_thread: int | None = None
+
+    def in_tick(self) -> bool:
+        """True on the thread that is currently running a recorded tick."""
+        return self._depth > 0 and self._tick_thread == threading.get_ident()
+
+    def write(self, event: dict[str, Any]) -> None:
+        line = json.dumps(event, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def record_call(self, method: str, args: tuple, kwargs: dict, result: Any = None, error=None):
+        event = {"type": "call", "method": method, "args": list(args), "kwargs": kwargs}
+        if error is not None:
+            event["error"] = f"{type(error).__name__}: {error}"
+        else:
+            event["result"] = result
+        self.write(event)
+
+    def record_meta(self, cohorts: dict[str, dict[str, Any]], testnet: bool = False) -> None:
+        self.write(
+            {
+                "type": "meta",
+                "version": FORMAT_VERSION,
+                "started": datetime.now().isoformat(),
+                "testnet": testnet,
+                "cohorts": cohorts,
+            }
+        )
+        self.meta_written = True
+
+    def record_mode(self, cohort: str | None, regime, probability, duration_days) -> None:
+        self.write(
+            {
+                "type": "mode",
+                "cohort": _cohort_key(cohort),
+                "regime": regime,
+                "probability": probability,
+                "duration_days": duration_days,
+            }
+        )
+
+    def flush(self) -> None:
+        with self._lock:
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class RecordingClient:
+    """Exchange-client proxy that records every public API call and its result."""
+
+    def __init__(self, client: Any, recorder: TickRecorder):
+        self._client = client
+        self.recorder = recorder
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if name not in CLIENT_METHODS or not callable(attr):
+            return attr
+
+        def recorded(*args, **kwargs):
+            if not self.recorder.in_tick():
+                return attr(*args, **kwargs)
+            try:
+                result = attr(*args, **kwargs)
+            except Exception as e:
+                self.recorder.record_call(name, args, kwargs, error=e)
+                raise
+            self.recorder.record_call(name, args, kwargs, result=result)
+            return result
+
+        return recorded
+
+
+_recorder: TickRecorder | None = None
+_replay_client: ReplayClient | None = None
+
+
+def start_recording(path: str | Path) -> TickRecorder:
+    """Open the process-wide recorder (wrap the client with RecordingClient)."""
+    global _recorder
+    if _recorder is None:
+        _recorder = TickRecorder(path)
+        logger.info(f"Replay: recording ticks to {path}")
+    return _recorder
+
+
+def stop_recording() -> None:
+    """Flush and close the process-wide recorder (shutdown path)."""
+    global _recorder
+    if _recorder is not None:
+        _recorder.close()
+        _recorder = None
+
+
+def get_recorder() -> TickRecorder | None:
+    return _recorder
+
+
+def describe_orchestrator(orch: Any) -> dict[str, Any]:
+    """Replay meta of one HybridOrchestrator: config, mode, symbols and state files."""
+    config_dir = orch.state_file.parent
+    files = {}
+    patterns = [orch.state_file.name]
+    if orch.cohort_name:
+        patterns.append(f"grid_state_*_{orch.cohort_name}.json")
+    else:
+        patterns.append("grid_state_*.json")
+    for pattern in patterns:
+        for path in sorted(config_dir.glob(pattern)):
+            try:
+                files[path.name] = path.read_text(encoding="utf-8")
+            except OSError:
+                continue
+    return {
+        "cohort_id": orch.cohort_id,
+        "cohort_name": orch.cohort_name,
+        "config": orch.config.to_dict(),
+        "mode": orch.mode_manager.get_current_mode().current_mode.value,
+        "symbols": {s: st.to_dict() for s, st in orch.symbols.items()},
+        "files": files,
+    }
+
+
+@contextmanager
+def recorded_tick(owner: Any) -> Iterator[None]:
+    """Mark a top-level tick of ``owner`` (Cohort- or HybridOrchestrator)."""
+    recorder = _recorder
+    if recorder is None:
+        yield
+        return
+    if recorder._depth > 0 and recorder._tick_thread != threading.get_ident():
+        # Tick on another thread while one is recorded: not part of the recording
+        yield
+        return
+    if recorder._depth == 0:
+        recorder._tick_thread = threading.get_ident()
+        if not recorder.meta_written:
+            if hasattr(owner, "orchestrators"):
+                orchestrators = owner.orchestrators
+            else:
+                orchestrators = {owner.cohort_name: owner}
+            recorder.record_meta(
+                {
+                    _cohort_key(name): describe_orchestrator(orch)
+                    for name, orch in orchestrators.items()
+                },
+                testnet=bool(getattr(owner.client, "testnet", False)),
+            )
+        recorder.ticks += 1
+        recorder.write({"type": "tick", "seq": recorder.ticks, "time": datetime.now().isoformat()})
+    recorder._depth += 1
+    try:
+        yield
+    finally:
+        recorder._depth -= 1
+        if recorder._depth == 0:
+            recorder.flush()
+
+
+def record_mode_input(cohort: str | None, regime, probability, duration_days) -> None:
+    if _recorder is not None:
+        _recorder.record_mode(cohort, regime, probability, duration_days)
+
+
+def recorded_input(name: str, fetch: Callable[[], Any]) -> Any:
+    """External tick input outside the exchange client (e.g. Fear & Greed).
+
+    Live, ``fetch()`` is called and its value recorded; during replay the
+    recorded value is returned without calling ``fetch``.
+    """
+    if _replay_client is not None:
+        return _replay_client.answer(f"input:{name}")
+    recording = _recorder is not None and _recorder.in_tick()
+    try:
+        value = fetch()
+    except Exception as e:
+        if recording:
+            _recorder.record_call(f"input:{name}", (), {}, error=e)
+        raise
+    if recording:
+        _recorder.record_call(f"input:{name}", (), {}, result=value)
+    return value
+
+
+# ═══════════════════════════════════════════════════════════════
+# REPLAY
+# ═══════════════════════════════════════════════════════════════
+
+
+@dataclass
+class RecordedTick:
+    seq: int
+    time: datetime
+    calls: list[dict[str, Any]] = field(default_factory=list)
+    modes: list[dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class Recording:
+    meta: dict[str, Any]
+    ticks: list[RecordedTick]
+
+    @classmethod
+    def load(cls, path: str | Path) -> Recording:
+        meta: dict[str, Any] | None = None
+        ticks: list[RecordedTick] = []
+        pending_modes: list[dict[str, Any]] = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                kind = event["type"]
+                if kind == "meta" and meta is None:
+                    meta = event
+                elif kind == "tick":
+                    ticks.append(RecordedTick(event["seq"], datetime.fromisoformat(event["time"])))
+                    ticks[-1].modes.extend(pending_modes)
+                    pending_modes = []
+                elif kind == "mode":
+                    # Mode inputs arrive between ticks and apply before the next one
+                    pending_modes.append(event)
+                elif kind == "call" and ticks:
+                    ticks[-1].calls.append(event)
+        if meta is None:
+            raise ValueError(f"{path}: no meta event (recording never reached a tick)")
+        return cls(meta, ticks)
+
+
+@dataclass
+class ReplayReport:
+    ticks: int = 0
+    calls: int = 0
+    exact: int = 0
+    fallback: int = 0
+    unused: int = 0
+    elapsed: float = 0.0
+    # Ticks whose order writes differ from the recording
+    divergent_ticks: list[int] = field(default_factory=list)
+    fallback_methods: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def ticks_per_second(self) -> float:
+        return self.ticks / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def matches(self) -> bool:
+        return not self.divergent_ticks
+
+    def summary(self) -> str:
+        lines = [
+            f"Replayed {self.ticks} ticks in {self.elapsed:.2f}s "
+            f"({self.ticks_per_second:.0f} ticks/s)",
+            f"Client calls: {self.calls} ({self.exact} exact, {self.fallback} fallback, "
+            f"{self.unused} recorded answers unused)",
+            "Order writes: "
+            + (
+                "identical to recording"
+                if self.matches
+                else f"differ in {len(self.divergent_ticks)} ticks "
+                f"(first: {', '.join(map(str, self.divergent_ticks[:5]))})"
+            ),
+        ]
+        if self.fallback_methods:
+            top = ", ".join(f"{m} x{n}" for m, n in self.fallback_methods.most_common(5))
+            lines.append(f"Fallback answers: {top}")
+        return "\n".join(lines)
+
+
+class ReplayClient:
+    """Exchange client that answers from a recording instead of the network."""
+
+    def __init__(self, recording: Recording, strict: bool = False):
+        self.recording = recording
+        self.strict = strict
+        self.testnet = bool(recording.meta.get("testnet", False))
+        self.client = self  # Reporting compatibility, as PaperBinanceClient
+        self.report = ReplayReport()
+        self._queues: dict[str, deque[dict[str, Any]]] = {}
+        self._method_queues: dict[str, deque[dict[str, Any]]] = {}
+        self._last: dict[str, dict[str, Any]] = {}
+        self._last_by_method: dict[str, dict[str, Any]] = {}
+        self._tick: RecordedTick | None = None
+        self.writes: list[str] = []
+
+    def begin_tick(self, tick: RecordedTick) -> None:
+        """Load the answers recorded during ``tick``."""
+        self._finish_tick()
+        self._tick = tick
+        self._queues = defaultdict(deque)
+        self._method_queues = defaultdict(deque)
+        for call in tick.calls:
+            self._queues[_call_key(call["method"], tuple(call["args"]), call["kwargs"])].append(
+                call
+            )
+            self._method_queues[call["method"]].append(call)
+        self.writes = []
+
+    def _finish_tick(self) -> None:
+        if self._tick is None:
+            return
+        self.report.unused += sum(len(q) for q in self._queues.values())
+        recorded = [
+            _call_key(c["method"], tuple(c["args"]), c["kwargs"])
+            for c in self._tick.calls
+            if c["method"] in WRITE_METHODS
+        ]
+        if Counter(recorded) != Counter(self.writes):
+            self.report.divergent_ticks.append(self._tick.seq)
+        self._tick = None
+
+    def finish(self) -> ReplayReport:
+        self._finish_tick()
+        return self.report
+
+    def answer(self, method: str, *args, **kwargs) -> Any:
+        """Recorded result of ``method(*args, **kwargs)`` in the current tick."""
+        key = _call_key(method, args, kwargs)
+        self.report.calls += 1
+        if method in WRITE_METHODS:
+            self.writes.append(key)
+
+        queue = self._queues.get(key)
+        if queue:
+            call = queue.popleft()
+            self._method_queues[method].remove(call)
+            self.report.exact += 1
+        else:
+            if self.strict:
+                raise ReplayMismatch(f"Unrecorded call in tick {self._seq()}: {key}")
+            call = self._last.get(key)
+            if call is None and self._method_queues.get(method):
+                call = self._method_queues[method].popleft()
+                self._queues[_call_key(method, tuple(call["args"]), call["kwargs"])].remove(call)
+            if call is None:
+                call = self._last_by_method.get(method)
+            if call is None:
+                raise ReplayMismatch(f"No recorded answer for {key}")
+            self.report.fallback += 1
+            self.report.fallback_methods[method] += 1
+
+        self._last[key] = call
+        self._last_by_method[method] = call
+        if "error" in call:
+            raise ReplayedError(call["error"])
+        return call["result"]
+
+    def _seq(self) -> int | None:
+        return self._tick.seq if self._tick else None
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in CLIENT_METHODS:
+            raise AttributeError(name)
+
+        def replayed(*args, **kwargs):
+            return self.answer(name, *args, **kwargs)
+
+        return replayed
+
+
+class _VirtualClock:
+    """Recorded tick time for ``datetime.now()``/``time.time()`` in src modules."""
+
+    def __init__(self, start: datetime):
+        self.now = start
+        self._epoch = start.timestamp()
+        self._origin = start
+
+    def monotonic(self) -> float:
+        return (self.now - self._origin).total_seconds()
+
+
+def _clock_shims(clock: _VirtualClock):
+    real_datetime = datetime
+
+    class VirtualDatetime(real_datetime):
+        @classmethod
+        def now(cls, tz=None):
+            if tz is None:
+                return clock.now
+            return clock.now.astimezone(tz)
+
+    class VirtualTime:
+        def __getattr__(self, name):
+            return getattr(time, name)
+
+        @staticmethod
+        def sleep(_seconds):
+            return None
+
+        @staticmethod
+        def time():
+            return clock.now.timestamp()
+
+        @staticmethod
+        def monotonic():
+            return clock.monotonic()
+
+    return VirtualDatetime, VirtualTime()
+
+
+@contextmanager
+def virtual_clock(clock: _VirtualClock) -> Iterator[None]:
+    """Swap ``datetime``/``time`` in loaded src modules for the virtual clock."""
+    virtual_datetime, virtual_time = _clock_shims(clock)
+    swapped = []
+    for name, module in list(sys.modules.items()):
+        if not name.startswith("src.") or name in _CLOCK_EXEMPT or module is None:
+            continue
+        if getattr(module, "datetime", None) is datetime:
+            swapped.append((module, "datetime", datetime))
+            module.datetime = virtual_datetime
+        if name.startswith(_TIME_PACKAGES) and getattr(module, "time", None) is time:
+            swapped.append((module, "time", time))
+            module.time = virtual_time
+    try:
+        yield
+    finally:
+        for module, attr, original in swapped:
+            setattr(module, attr, original)
+
+
+@contextmanager
+def _scratch_environment(meta: dict[str, Any]) -> Iterator[Path]:
+    """Temp working dir with the recorded state files, JSON backend, muted Telegram."""
+    from src.notifications.telegram_service import get_telegram
+
+    cwd = Path.cwd()
+    saved_env = {name: os.environ.get(name) for name in _REPLAY_ENV}
+    telegram = get_telegram()
+    telegram_enabled = telegram.enabled
+    with tempfile.TemporaryDirectory(prefix="replay_") as scratch:
+        config_dir = Path(scratch) / "config"
+        config_dir.mkdir()
+        for cohort in meta["cohorts"].values():
+            for name, content in cohort.get("files", {}).items():
+                (config_dir / name).write_text(content, encoding="utf-8")
+        os.chdir(scratch)
+        os.environ.update(_REPLAY_ENV)
+        telegram.enabled = False
+        try:
+            yield Path(scratch)
+        finally:
+            telegram.enabled = telegram_enabled
+            for name, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+            os.chdir(cwd)
+
+
+def build_orchestrators(meta: dict[str, Any], client: Any) -> dict[str, Any]:
+    """HybridOrchestrators restored from the recording meta (state loaded as in run())."""
+    from src.core.hybrid_config import HybridConfig
+    from src.core.hybrid_orchestrator import HybridOrchestrator
+    from src.core.trading_mode import TradingMode
+
+    orchestrators = {}
+    for key, cohort in meta["cohorts"].items():
+        config_data = dict(cohort["config"])
+        config_data["allowed_categories"] = tuple(config_data.get("allowed_categories", ()))
+        orch = HybridOrchestrator(
+            config=HybridConfig(**config_data),
+            client=client,
+            cohort_id=cohort.get("cohort_id"),
+            cohort_name=cohort.get("cohort_name"),
+        )
+        orch.mode_manager.get_current_mode().current_mode = TradingMode(cohort["mode"])
+        for symbol, state in cohort["symbols"].items():
+            orch.add_symbol(symbol, state.get("allocation_usd", 0.0))
+        orch.load_state()
+        orchestrators[key] = orch
+    return orchestrators
+
+
+def replay(
+    path: str | Path,
+    strict: bool = False,
+    max_ticks: int | None = None,
+) -> ReplayReport:
+    """Re-run a recording through fresh orchestrators as fast as possible."""
+    global _replay_client
+    recording = Recording.load(path)
+    ticks = recording.ticks[:max_ticks] if max_ticks else recording.ticks
+    client = ReplayClient(recording, strict=strict)
+    clock = _VirtualClock(ticks[0].time if ticks else datetime.now())
+
+    _replay_client = client
+    try:
+        with _scratch_environment(recording.meta):
+            with virtual_clock(clock):
+                orchestrators = build_orchestrators(recording.meta, client)
+            started = time.perf_counter()
+            for tick in ticks:
+                clock.now = tick.time
+                client.begin_tick(tick)
+                with virtual_clock(clock):
+                    for mode in tick.modes:
+                        orch = orchestrators.get(mode["cohort"])
+                        if orch is not None:
+                            orch.evaluate_and_switch(
+                                mode["regime"], mode["probability"], mode["duration_days"]
+                            )
+                    for orch in orchestrators.values():
+                        orch.tick(persist=False)
+                client.report.ticks += 1
+            client.report.elapsed = time.perf_counter() - started
+    finally:
+        _replay_client = None
+    return client.finish()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a recorded trading session offline")
+    parser.add_argument("recording", help="JSONL file written with REPLAY_RECORD_PATH")
+    parser.add_argument("--strict", action="store_true", help="Fail on any unrecorded call")
+    parser.add_argument("--ticks", type=int, default=None, help="Replay only the first N ticks")
+    parser.add_argument(
+        "--profile", action="store_true", help="Print tick phase percentiles afterwards"
+    )
+    args = parser.parse_args(argv)
+
+    logging.getLogger("trading_bot").setLevel(logging.ERROR)
+    try:
+        report = replay(args.recording, strict=args.strict, max_ticks=args.ticks)
+    except ReplayMismatch as e:
+        print(f"Replay diverged: {e}")
+        return 1
+    print(report.summary())
+    if args.profile:
+        from src.core.tick_profiler import format_all_stats
+
+        print()
+        print(format_all_stats())
+    return 0 if report.matches else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
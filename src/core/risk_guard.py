@@ -2,6 +2,8 @@
 
 import logging
 
+from src.core.balance_ledger import BalanceLedger, get_balance_ledger
+from src.core.tick_profiler import tick_phase
 from src.strategies.grid_strategy import TAKER_FEE_RATE
 
 logger = logging.getLogger("trading_bot")
@@ -12,11 +14,17 @@ class RiskGuardMixin:
 
     Expects the host class to have: client, symbol, stop_loss_manager,
     cvar_sizer, allocation_constraints, active_orders, _last_known_price,
-    running, telegram, memory, _emergency_stop().
+    running, telegram, memory, _emergency_stop(), _record_fill().
     """
 
     CIRCUIT_BREAKER_PCT = 10.0  # Emergency stop bei >10% Drop pro Check-Zyklus
 
+    @property
+    def balance_ledger(self) -> BalanceLedger:
+        """In-memory balances of the account behind ``self.client``."""
+        return get_balance_ledger(self.client)
+
+    @tick_phase("risk_validation")
     def _validate_order_risk(self, side: str, quantity: float, price: float) -> tuple[bool, str]:
         """
         Validiert eine Order gegen Risk-Checks bevor sie platziert wird.
@@ -25,6 +33,7 @@ class RiskGuardMixin:
             (allowed, reason) - False + reason wenn Order abgelehnt
         """
         order_value = quantity * price
+        portfolio_value = None
 
         # 1. Portfolio drawdown check (skip in hybrid mode — see bot.py)
         if (
@@ -37,7 +46,7 @@ class RiskGuardMixin:
         # 2. CVaR position sizing check
         if self.cvar_sizer and side == "BUY":
             try:
-                portfolio_value = self.client.get_account_balance("USDT")
+                portfolio_value = self.balance_ledger.balance("USDT")
                 if portfolio_value > 0:
                     sizing = self.cvar_sizer.calculate_position_size(
                         symbol=self.symbol,
@@ -56,7 +65,8 @@ class RiskGuardMixin:
         # 3. Allocation constraints check
         if self.allocation_constraints and side == "BUY":
             try:
-                portfolio_value = self.client.get_account_balance("USDT")
+                if portfolio_value is None:
+                    portfolio_value = self.balance_ledger.balance("USDT")
                 if portfolio_value > 0:
                     current_invested = sum(
                         float(o["quantity"]) * float(o["price"])
@@ -150,11 +160,13 @@ class RiskGuardMixin:
                     telegram=self.telegram,
                 )
                 if result["success"]:
+                    # Verkaufte Menge kann auf den Bestand gekürzt sein -> neu abgleichen
+                    self.balance_ledger.invalidate()
                     stop.confirm_trigger()
                     self.stop_loss_manager.notify_and_persist_trigger(stop)
                     logger.info(f"Stop-Loss sell confirmed: {stop.quantity} {stop.symbol}")
                     fee_usd = current_price * stop.quantity * float(TAKER_FEE_RATE)
-                    self._save_trade_to_memory(
+                    self._record_fill(
                         {"type": "SELL"},
                         current_price,
                         stop.quantity,
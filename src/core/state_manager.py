@@ -1,5 +1,6 @@
 """State persistence mixin for GridBot."""
 
+import itertools
 import json
 import logging
 from datetime import datetime
@@ -19,36 +20,125 @@ class _DecimalEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+_state_versions = itertools.count(1)
+
+
+def next_state_version() -> int:
+    """Process-wide monotonic version stamp for dirty tracking."""
+    return next(_state_versions)
+
+
+class TrackedOrders(dict):
+    """dict for active_orders that takes a new version stamp on every mutation.
+
+    In-place edits of a nested order dict are not seen — call touch() after those.
+    """
+
+    __slots__ = ("version",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = next_state_version()
+
+    def touch(self) -> None:
+        self.version = next_state_version()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.touch()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.touch()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self.touch()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self.touch()
+        return item
+
+    def clear(self):
+        super().clear()
+        self.touch()
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.touch()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self.touch()
+        return super().setdefault(key, default)
+
+
 class StateManagerMixin:
     """Mixin providing state persistence methods for GridBot.
 
     Expects the host class to have: active_orders, symbol, config, state_file,
-    client, stop_loss_manager, memory, telegram, _pending_followups,
-    _save_trade_to_memory(), _create_stop_loss().
+    state_store (optional), client, stop_loss_manager, memory, telegram, _pending_followups,
+    _record_fill(), _create_stop_loss().
     """
 
-    def save_state(self):
-        """Speichert Bot-State für Neustart - mit Error-Handling"""
-        try:
-            serializable_orders = {str(k): v for k, v in self.active_orders.items()}
+    @property
+    def active_orders(self) -> TrackedOrders:
+        return self._active_orders
+
+    @active_orders.setter
+    def active_orders(self, orders: dict) -> None:
+        self._active_orders = orders if isinstance(orders, TrackedOrders) else TrackedOrders(orders)
+
+    def _state_config(self) -> dict:
+        return {
+            "symbol": self.config.get("symbol"),
+            "investment": self.config.get("investment"),
+            "num_grids": self.config.get("num_grids"),
+            "grid_range_percent": self.config.get("grid_range_percent"),
+            "testnet": self.config.get("testnet"),
+        }
+
+    def save_state(self, force: bool = False):
+        """Speichert Bot-State für Neustart - mit Error-Handling
+
+        Ohne Änderung an active_orders seit dem letzten Save wird nichts
+        geschrieben (außer mit force=True).
+        """
+        version = self.active_orders.version
+        if not force and version == getattr(self, "_saved_orders_version", None):
+            return
 
+        serializable_orders = {str(k): v for k, v in self.active_orders.items()}
+
+        store = getattr(self, "state_store", None)
+        if store is not None:
+            # Inkrementell: nur geänderte Orders / geänderte Metadaten werden geschrieben
+            try:
+                namespace = self.state_file.stem
+                store.sync_rows(namespace, serializable_orders)
+                store.put_document(
+                    namespace, {"symbol": self.symbol, "config": self._state_config()}
+                )
+                self._saved_orders_version = version
+            except Exception as e:
+                logger.exception(f"Fehler beim Speichern des States: {e}")
+            return
+
+        try:
             state = {
                 "timestamp": datetime.now().isoformat(),
                 "symbol": self.symbol,
                 "active_orders": serializable_orders,
-                "config": {
-                    "symbol": self.config.get("symbol"),
-                    "investment": self.config.get("investment"),
-                    "num_grids": self.config.get("num_grids"),
-                    "grid_range_percent": self.config.get("grid_range_percent"),
-                    "testnet": self.config.get("testnet"),
-                },
+                "config": self._state_config(),
             }
 
             temp_file = self.state_file.with_suffix(".tmp")
             with open(temp_file, "w") as f:
                 json.dump(state, f, indent=2, cls=_DecimalEncoder)
             temp_file.replace(self.state_file)
+            self._saved_orders_version = version
 
         except Exception as e:
             logger.exception(f"Fehler beim Speichern des States: {e}")
@@ -61,12 +151,10 @@ class StateManagerMixin:
 
     def load_state(self) -> bool:
         """Lädt und validiert vorherigen State - mit Binance-Verifizierung"""
-        if not self.state_file.exists():
-            return False
-
         try:
-            with open(self.state_file) as f:
-                state = json.load(f)
+            state = self._read_state()
+            if state is None:
+                return False
 
             saved_config = state.get("config", {})
             if saved_config.get("symbol") != self.config.get("symbol"):
@@ -116,26 +204,14 @@ class StateManagerMixin:
                             f"Order {order_id} während Downtime gefüllt: "
                             f"{order_info.get('type')} @ {filled_price} x {filled_qty}"
                         )
-                        trade_id = self._save_trade_to_memory(
-                            order_info, filled_price, filled_qty, fee_usd
+                        self._record_fill(
+                            order_info,
+                            filled_price,
+                            filled_qty,
+                            fee_usd,
+                            pair_action="open" if order_info.get("type") == "BUY" else "close",
                         )
 
-                        # Track trade pair for downtime fills
-                        if self._trade_pair_tracker:
-                            if order_info.get("type") == "BUY":
-                                self._trade_pair_tracker.open_pair(
-                                    self.symbol, trade_id, filled_price, filled_qty, fee_usd
-                                )
-                            else:
-                                self._trade_pair_tracker.close_pair(
-                                    self.symbol,
-                                    trade_id,
-                                    filled_price,
-                                    filled_qty,
-                                    fee_usd,
-                                    exit_reason="grid_fill",
-                                )
-
                         if order_info.get("type") == "BUY" and self.stop_loss_manager:
                             fee_adjusted_qty = filled_qty * (1 - float(TAKER_FEE_RATE))
                             self._create_stop_loss(filled_price, fee_adjusted_qty)
@@ -165,15 +241,14 @@ class StateManagerMixin:
                             f"Order {order_id} canceled mit Partial Fill während Downtime: "
                             f"{executed_qty} of {order_info.get('quantity')}"
                         )
-                        trade_id = self._save_trade_to_memory(
-                            order_info, filled_price, executed_qty, fee_usd
+                        self._record_fill(
+                            order_info,
+                            filled_price,
+                            executed_qty,
+                            fee_usd,
+                            pair_action="open" if order_info.get("type") == "BUY" else None,
                         )
 
-                        if self._trade_pair_tracker and order_info.get("type") == "BUY":
-                            self._trade_pair_tracker.open_pair(
-                                self.symbol, trade_id, filled_price, executed_qty, fee_usd
-                            )
-
                         if order_info.get("type") == "BUY" and self.stop_loss_manager:
                             fee_adjusted_qty = executed_qty * (1 - float(TAKER_FEE_RATE))
                             self._create_stop_loss(filled_price, fee_adjusted_qty)
@@ -206,6 +281,19 @@ class StateManagerMixin:
             self.active_orders = {}
             return False
 
+    def _read_state(self) -> dict | None:
+        """Rohen State lesen: State Store (falls aktiv), sonst/als Migration die JSON-Datei."""
+        store = getattr(self, "state_store", None)
+        if store is not None:
+            state = store.load_state(self.state_file.stem, rows_field="active_orders")
+            if state is not None:
+                return state
+
+        if not self.state_file.exists():
+            return None
+        with open(self.state_file) as f:
+            return json.load(f)
+
     def _cancel_orphaned_orders(self, symbol: str | None) -> None:
         """Cancel all open orders for a symbol to prevent orphaned orders."""
         if not symbol:
@@ -219,6 +307,7 @@ class StateManagerMixin:
                 if order_id:
                     self.client.cancel_order(symbol, order_id)
                     logger.info(f"Orphaned Order {order_id} für {symbol} gecancelt")
+            self.balance_ledger.invalidate()
             logger.info(f"{len(open_orders)} orphaned Orders für {symbol} gecancelt")
         except Exception as e:
             logger.warning(f"Fehler beim Canceln orphaned Orders für {symbol}: {e}")
@@ -0,0 +1,387 @@
+"""Incremental state persistence backed by SQLite (WAL mode).
+
+Replaces the full-file JSON rewrite per save with row-level upserts:
+each GridBot order and each HybridOrchestrator symbol is one row, and only
+rows whose serialized content changed since the last save are written.
+Metadata (config, mode, timestamps) lives in one document row per namespace.
+
+Namespaces are the former state file stems, e.g. ``grid_state_BTCUSDT_conservative``
+or ``hybrid_state_conservative``, so readers can map them back 1:1.
+
+Enabled with ``STATE_BACKEND=sqlite``. The default stays ``json``; readers use
+``load_grid_states()`` / ``load_hybrid_states()`` which merge both sources, so
+monitoring and reporting work with either backend and during migration.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from threading import RLock
+from typing import Any
+
+from src.utils.singleton import SingletonMixin
+
+logger = logging.getLogger("trading_bot")
+
+DEFAULT_DB_NAME = "state.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS state_rows (
+    namespace TEXT NOT NULL,
+    row_key   TEXT NOT NULL,
+    data      TEXT NOT NULL,
+    PRIMARY KEY (namespace, row_key)
+);
+CREATE TABLE IF NOT EXISTS state_documents (
+    namespace  TEXT PRIMARY KEY,
+    data       TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+def _encode(value: Any) -> str:
+    """Deterministic compact JSON (Decimal → float) for storage and diffing."""
+    return json.dumps(
+        value,
+        default=lambda o: float(o) if isinstance(o, Decimal) else str(o),
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+
+
+def state_backend() -> str:
+    """Configured persistence backend: 'json' (default) or 'sqlite'."""
+    return os.getenv("STATE_BACKEND", "json").lower()
+
+
+class StateStore(SingletonMixin):
+    """SQLite WAL store for bot state with O(changed) writes.
+
+    Usage::
+
+        store = StateStore.get_instance()
+        store.sync_rows("grid_state_BTCUSDT", {"123": {...}, "124": {...}})
+        store.put_document("grid_state_BTCUSDT", {"symbol": "BTCUSDT", ...})
+        state = store.load_state("grid_state_BTCUSDT", rows_field="active_orders")
+    """
+
+    def __init__(self, db_path: str | Path | None = None):
+        if db_path is None:
+            db_path = os.getenv("STATE_DB_PATH", str(Path("config") / DEFAULT_DB_NAME))
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = RLock()
+        self._in_batch = False
+        self._conn = sqlite3.connect(
+            str(self.db_path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # NORMAL is crash-safe in WAL mode (only the last commit may be lost on power loss)
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        # Last persisted serialization per namespace → diff basis
+        self._row_cache: dict[str, dict[str, str]] = {}
+        self._doc_cache: dict[str, str] = {}
+
+        self.stats = {"row_writes": 0, "row_deletes": 0, "doc_writes": 0, "skipped": 0}
+
+    # ------------------------------------------------------------------
+    # Rows (orders, symbol states)
+    # ------------------------------------------------------------------
+
+    def _cached_rows(self, namespace: str) -> dict[str, str]:
+        cached = self._row_cache.get(namespace)
+        if cached is None:
+            cur = self._conn.execute(
+                "SELECT row_key, data FROM state_rows WHERE namespace = ?", (namespace,)
+            )
+            cached = dict(cur.fetchall())
+            self._row_cache[namespace] = cached
+        return cached
+
+    def sync_rows(self, namespace: str, rows: dict[Any, Any]) -> int:
+        """Persist ``rows`` so the stored set equals it; writes only the delta.
+
+        Returns:
+            Number of rows inserted, updated or deleted.
+        """
+        encoded = {str(k): _encode(v) for k, v in rows.items()}
+
+        with self._lock:
+            cached = self._cached_rows(namespace)
+            upserts = [(namespace, k, v) for k, v in encoded.items() if cached.get(k) != v]
+            deletes = [(namespace, k) for k in cached if k not in encoded]
+
+            if not upserts and not deletes:
+                self.stats["skipped"] += 1
+                return 0
+
+            with self._transaction():
+                if upserts:
+                    self._conn.executemany(
+                        "INSERT INTO state_rows (namespace, row_key, data) VALUES (?, ?, ?) "
+                        "ON CONFLICT(namespace, row_key) DO UPDATE SET data = excluded.data",
+                        upserts,
+                    )
+                if deletes:
+                    self._conn.executemany(
+                        "DELETE FROM state_rows WHERE namespace = ? AND row_key = ?", deletes
+                    )
+                self._conn.execute(
+                    "UPDATE state_documents SET updated_at = ? WHERE namespace = ?",
+                    (time.time(), namespace),
+                )
+
+            for _, k, v in upserts:
+                cached[k] = v
+            for _, k in deletes:
+                del cached[k]
+
+            self.stats["row_writes"] += len(upserts)
+            self.stats["row_deletes"] += len(deletes)
+            return len(upserts) + len(deletes)
+
+    def load_rows(self, namespace: str) -> dict[str, Any]:
+        with self._lock:
+            return {k: json.loads(v) for k, v in self._cached_rows(namespace).items()}
+
+    # ------------------------------------------------------------------
+    # Documents (metadata per namespace)
+    # ------------------------------------------------------------------
+
+    def put_document(self, namespace: str, document: dict[str, Any]) -> bool:
+        """Store the metadata document if its content changed. Returns True if written."""
+        encoded = _encode(document)
+        with self._lock:
+            if self._doc_cache.get(namespace) == encoded:
+                self.stats["skipped"] += 1
+                return False
+            with self._transaction():
+                self._conn.execute(
+                    "INSERT INTO state_documents (namespace, data, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(namespace) DO UPDATE SET "
+                    "data = excluded.data, updated_at = excluded.updated_at",
+                    (namespace, encoded, time.time()),
+                )
+            self._doc_cache[namespace] = encoded
+            self.stats["doc_writes"] += 1
+            return True
+
+    def get_document(self, namespace: str) -> tuple[dict[str, Any], float] | None:
+        """Returns (document, updated_at) or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, updated_at FROM state_documents WHERE namespace = ?", (namespace,)
+            ).fetchone()
+        if row is None:
+            return None
+        self._doc_cache[namespace] = row[0]
+        return json.loads(row[0]), row[1]
+
+    def load_state(self, namespace: str, rows_field: str) -> dict[str, Any] | None:
+        """Reassemble the JSON-file shape: document + rows under ``rows_field``."""
+        doc = self.get_document(namespace)
+        if doc is None:
+            return None
+        state, updated_at = doc
+        state[rows_field] = self.load_rows(namespace)
+        state.setdefault("timestamp", datetime.fromtimestamp(updated_at).isoformat())
+        return state
+
+    def namespaces(self, prefix: str = "") -> list[str]:
+        with self._lock:
+            escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            cur = self._conn.execute(
+                "SELECT namespace FROM state_documents WHERE namespace LIKE ? ESCAPE '\\' "
+                "ORDER BY namespace",
+                (f"{escaped}%",),
+            )
+            return [r[0] for r in cur.fetchall()]
+
+    def delete_namespace(self, namespace: str) -> None:
+        with self._lock, self._transaction():
+            self._conn.execute("DELETE FROM state_rows WHERE namespace = ?", (namespace,))
+            self._conn.execute("DELETE FROM state_documents WHERE namespace = ?", (namespace,))
+            self._row_cache.pop(namespace, None)
+            self._doc_cache.pop(namespace, None)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def batch(self):
+        """Group many saves (e.g. all cohorts of one tick) into one transaction."""
+        with self._lock:
+            if self._in_batch:
+                yield
+                return
+            self._conn.execute("BEGIN")
+            self._in_batch = True
+            try:
+                yield
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                # Diff caches may hold rolled-back content → reload from DB
+                self._row_cache.clear()
+                self._doc_cache.clear()
+                raise
+            else:
+                self._conn.execute("COMMIT")
+            finally:
+                self._in_batch = False
+
+    def checkpoint(self) -> None:
+        """Fold the WAL back into the main DB file (periodic compaction)."""
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error:
+                pass
+            self._conn.close()
+
+    def _transaction(self):
+        return nullcontext() if self._in_batch else _Transaction(self._conn)
+
+
+class _Transaction:
+    """BEGIN/COMMIT/ROLLBACK for a connection in autocommit mode."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+# ----------------------------------------------------------------------
+# Readers (monitoring, reporting) — merge SQLite and legacy JSON files
+# ----------------------------------------------------------------------
+
+
+def _read_json(path: Path) -> dict | None:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError) as e:
+        logger.warning(f"Could not load {path}: {e}")
+        return None
+
+
+def _open_reader_store(config_dir: Path) -> StateStore | None:
+    """Store for readers: the process singleton if it points here, else a fresh one."""
+    db_path = config_dir / DEFAULT_DB_NAME
+    if not db_path.is_file():
+        return None
+    instance = StateStore._instance
+    if instance is not None and instance.db_path.resolve() == db_path.resolve():
+        return instance
+    try:
+        return StateStore(db_path)
+    except sqlite3.Error as e:
+        logger.warning(f"Could not open state store {db_path}: {e}")
+        return None
+
+
+def _newest(json_state: dict | None, store_state: dict | None) -> dict | None:
+    """SQLite wins over a JSON file for the same namespace unless the file is newer."""
+    if json_state is None or store_state is None:
+        return store_state if json_state is None else json_state
+    if store_state.get("timestamp", "") >= json_state.get("timestamp", ""):
+        return store_state
+    return json_state
+
+
+def _load_states(config_dir: Path, prefix: str, rows_field: str) -> dict[str, dict]:
+    """All states with the given namespace prefix, keyed by namespace."""
+    states: dict[str, dict] = {}
+    for path in config_dir.glob(f"{prefix}*.json"):
+        data = _read_json(path)
+        if data is not None:
+            states[path.stem] = data
+
+    store = _open_reader_store(config_dir)
+    if store is None:
+        return states
+    try:
+        for namespace in store.namespaces(prefix):
+            state = _newest(states.get(namespace), store.load_state(namespace, rows_field))
+            if state is not None:
+                states[namespace] = state
+    finally:
+        if store is not StateStore._instance:
+            store.close()
+    return states
+
+
+def _load_single(config_dir: Path, namespace: str, rows_field: str) -> dict | None:
+    """One state by namespace (JSON file and/or state store)."""
+    path = config_dir / f"{namespace}.json"
+    json_state = _read_json(path) if path.exists() else None
+
+    store = _open_reader_store(config_dir)
+    if store is None:
+        return json_state
+    try:
+        return _newest(json_state, store.load_state(namespace, rows_field))
+    finally:
+        if store is not StateStore._instance:
+            store.close()
+
+
+def load_grid_states(config_dir: str | Path = "config") -> dict[str, dict]:
+    """Load all per-cohort grid states.
+
+    Returns:
+        Dict keyed by "cohort:SYMBOL" -> state dict (same shape as grid_state JSON).
+    """
+    states: dict[str, dict] = {}
+    for namespace, data in _load_states(Path(config_dir), "grid_state_", "active_orders").items():
+        # Namespace: grid_state_BTCUSDT_conservative
+        parts = namespace.replace("grid_state_", "").rsplit("_", 1)
+        if len(parts) == 2:
+            symbol, cohort = parts
+            states[f"{cohort}:{symbol}"] = data
+    return states
+
+
+def load_hybrid_states(config_dir: str | Path = "config", include_single: bool = False) -> dict:
+    """Load all per-cohort orchestrator states.
+
+    Args:
+        include_single: Fall back to the non-cohort ``hybrid_state`` as "default"
+            when no cohort states exist.
+
+    Returns:
+        Dict keyed by cohort name -> state dict (same shape as hybrid_state JSON).
+    """
+    config_dir = Path(config_dir)
+    states = {
+        ns.replace("hybrid_state_", ""): data
+        for ns, data in sorted(_load_states(config_dir, "hybrid_state_", "symbols").items())
+    }
+    if not states and include_single:
+        single = _load_single(config_dir, "hybrid_state", "symbols")
+        if single is not None:
+            states["default"] = single
+    return states
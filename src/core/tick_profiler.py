@@ -0,0 +1,384 @@
+"""Hot-path latency breakdown for GridBot.tick and HybridOrchestrator.tick.
+
+Each tick runs inside ``TickProfiler.tick(symbol)``; the phases of the tick
+are timed with ``timer.phase(name)`` (two ``perf_counter`` calls each).
+Code deeper in the call tree that is worth its own line (risk validation,
+Telegram sends) uses the ``tick_phase`` decorator, which adds its time to
+the tick currently running in this thread; such sub-phases overlap the
+phase they are called from.
+
+Per component ("grid_bot", "hybrid"), phase and symbol the profiler keeps a
+rolling window of the last ``TICK_PROFILE_WINDOW`` durations (default 512)
+and reports p50/p95/p99/max from it. Ticks slower than ``TICK_SLOW_MS``
+(default 2000) are logged with their phase breakdown.
+
+Sampling profiler on demand:
+- ``SIGUSR1`` (``install_profile_signal``, called by main.py/main_hybrid.py)
+- Telegram ``/profile [seconds]`` writes ``config/tick_profile_request.json``;
+  the trading process checks for it after each tick.
+
+The sampler records the main thread's stack every 5 ms, but only while a
+tick is running (the loop sleeps between ticks), and writes folded stacks
+(flamegraph.pl / speedscope format) to ``logs/`` plus a text summary with
+the phase percentiles to ``config/tick_profile.txt``.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+logger = logging.getLogger("trading_bot")
+
+DEFAULT_WINDOW = 512
+DEFAULT_SLOW_MS = 2000.0
+DEFAULT_SAMPLE_SECONDS = 120.0
+SAMPLE_INTERVAL_SECONDS = 0.005
+MAX_SAMPLE_SECONDS = 600.0
+
+REQUEST_PATH = Path("config") / "tick_profile_request.json"
+RESULT_PATH = Path("config") / "tick_profile.txt"
+PROFILE_DIR = Path("logs")
+
+# Label for stats aggregated over all symbols
+ALL_SYMBOLS = "*"
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+class TickTimer:
+    """Phase durations of one tick."""
+
+    __slots__ = ("phases", "started", "symbol", "symbol_phases")
+
+    def __init__(self, symbol: str | None):
+        self.symbol = symbol
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+        # Phases of multi-symbol ticks attributed to one symbol
+        self.symbol_phases: dict[tuple[str, str], float] = {}
+
+    def add(self, name: str, seconds: float, symbol: str | None = None) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+        if symbol is not None and symbol != self.symbol:
+            key = (name, symbol)
+            self.symbol_phases[key] = self.symbol_phases.get(key, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str, symbol: str | None = None) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started, symbol)
+
+
+_current: ContextVar[TickTimer | None] = ContextVar("tick_timer", default=None)
+# Depth of nested ticks in the main loop (CohortOrchestrator > Hybrid > GridBot)
+_tick_depth = 0
+
+
+@contextmanager
+def tick_section(name: str, symbol: str | None = None) -> Iterator[None]:
+    """Time a block as phase ``name`` of the running tick (no-op outside a tick)."""
+    timer = _current.get()
+    if timer is None:
+        yield
+        return
+    with timer.phase(name, symbol):
+        yield
+
+
+def tick_phase(name: str) -> Callable:
+    """Decorator: add the call's duration to the running tick as phase ``name``."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            timer = _current.get()
+            if timer is None:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timer.add(name, time.perf_counter() - started)
+
+        return wrapper
+
+    return decorator
+
+
+class TickProfiler:
+    """Rolling per-phase, per-symbol tick latencies of one component."""
+
+    def __init__(self, component: str, window: int | None = None, slow_ms: float | None = None):
+        self.component = component
+        self.window = int(window or _env_float("TICK_PROFILE_WINDOW", DEFAULT_WINDOW))
+        self.slow_ms = _env_float("TICK_SLOW_MS", DEFAULT_SLOW_MS) if slow_ms is None else slow_ms
+        self._lock = threading.Lock()
+        # (phase, symbol) -> recent durations in seconds
+        self._samples: dict[tuple[str, str], deque[float]] = {}
+        self.ticks = 0
+        self.slow_ticks = 0
+
+    @contextmanager
+    def tick(self, symbol: str | None = None) -> Iterator[TickTimer]:
+        global _tick_depth
+        timer = TickTimer(symbol)
+        token = _current.set(timer)
+        _tick_depth += 1
+        try:
+            yield timer
+        finally:
+            _tick_depth -= 1
+            _current.reset(token)
+            self._record(timer, time.perf_counter() - timer.started)
+            if _tick_depth == 0:
+                poll_profile_request()
+
+    def _record(self, timer: TickTimer, total: float) -> None:
+        label = timer.symbol or ALL_SYMBOLS
+        entries = [(("total", label), total)]
+        entries.extend(((phase, label), seconds) for phase, seconds in timer.phases.items())
+        if label != ALL_SYMBOLS:
+            entries.extend(((phase, ALL_SYMBOLS), seconds) for (phase, _), seconds in entries[:])
+        entries.extend(timer.symbol_phases.items())
+        with self._lock:
+            self.ticks += 1
+            for key, seconds in entries:
+                samples = self._samples.get(key)
+                if samples is None:
+                    samples = self._samples[key] = deque(maxlen=self.window)
+                samples.append(seconds)
+            slow = total * 1000 > self.slow_ms
+            if slow:
+                self.slow_ticks += 1
+        if slow:
+            breakdown = ", ".join(
+                f"{name} {seconds * 1000:.0f}ms"
+                for name, seconds in sorted(timer.phases.items(), key=lambda x: -x[1])
+            )
+            logger.warning(
+                f"Slow tick: {self.component}"
+                f"{f' {timer.symbol}' if timer.symbol else ''} {total * 1000:.0f}ms "
+                f"(> {self.slow_ms:.0f}ms) - {breakdown}"
+            )
+
+    def stats(self) -> dict[str, dict[str, dict[str, float]]]:
+        """{phase: {symbol: {count, p50, p95, p99, max}}} in milliseconds."""
+        with self._lock:
+            snapshot = {key: np.fromiter(v, dtype=float) for key, v in self._samples.items()}
+        out: dict[str, dict[str, dict[str, float]]] = {}
+        for (phase, symbol), values in sorted(snapshot.items()):
+            p50, p95, p99 = np.percentile(values, [50, 95, 99]) * 1000
+            out.setdefault(phase, {})[symbol] = {
+                "count": len(values),
+                "p50": round(float(p50), 2),
+                "p95": round(float(p95), 2),
+                "p99": round(float(p99), 2),
+                "max": round(float(values.max()) * 1000, 2),
+            }
+        return out
+
+    def format_stats(self) -> str:
+        """Table of the all-symbol percentiles, slowest phase (p95) first."""
+        stats = self.stats()
+        rows = sorted(
+            ((phase, by_symbol[ALL_SYMBOLS]) for phase, by_symbol in stats.items()),
+            key=lambda row: -row[1]["p95"],
+        )
+        lines = [
+            f"{self.component}: {self.ticks} ticks, {self.slow_ticks} slow (> {self.slow_ms:.0f}ms)",
+            f"{'phase':<18}{'n':>6}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)",
+        ]
+        lines.extend(
+            f"{phase:<18}{s['count']:>6}{s['p50']:>9.1f}{s['p95']:>9.1f}{s['p99']:>9.1f}{s['max']:>9.1f}"
+            for phase, s in rows
+        )
+        return "\n".join(lines)
+
+
+_profilers: dict[str, TickProfiler] = {}
+_profilers_lock = threading.Lock()
+
+
+def get_tick_profiler(component: str) -> TickProfiler:
+    """Shared profiler of a component (all GridBots share "grid_bot")."""
+    with _profilers_lock:
+        profiler = _profilers.get(component)
+        if profiler is None:
+            profiler = _profilers[component] = TickProfiler(component)
+        return profiler
+
+
+def format_all_stats() -> str:
+    with _profilers_lock:
+        profilers = list(_profilers.values())
+    return "\n\n".join(p.format_stats() for p in profilers) or "No ticks recorded yet."
+
+
+# ═══════════════════════════════════════════════════════════════
+# SAMPLING PROFILER
+# ═══════════════════════════════════════════════════════════════
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", Path(code.co_filename).stem)
+    return f"{module}:{code.co_name}"
+
+
+class SamplingProfiler:
+    """Samples the main thread's stack while a tick is running."""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL_SECONDS):
+        self.interval = interval
+        self._thread: threading.Thread | None = None
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self.samples = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds: float = DEFAULT_SAMPLE_SECONDS) -> bool:
+        """Sample for ``seconds`` in a daemon thread; False if already running."""
+        if self.running:
+            return False
+        seconds = min(max(seconds, 1.0), MAX_SAMPLE_SECONDS)
+        self._thread = threading.Thread(
+            target=self._run, args=(seconds,), name="tick-sampler", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Tick profiler: sampling main thread for {seconds:.0f}s")
+        return True
+
+    def sample(self, thread_id: int) -> None:
+        """Take one sample of ``thread_id`` (only counted while a tick runs)."""
+        if _tick_depth == 0:
+            return
+        frame = sys._current_frames().get(thread_id)
+        stack = []
+        while frame is not None:
+            stack.append(_frame_label(frame))
+            frame = frame.f_back
+        if stack:
+            self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def _run(self, seconds: float) -> None:
+        self.stacks = Counter()
+        self.samples = 0
+        target = threading.main_thread().ident
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            self.sample(target)
+            time.sleep(self.interval)
+        self._write_results()
+
+    def folded(self) -> str:
+        """Collapsed stacks ("a;b;c count"), one per line."""
+        return "\n".join(f"{';'.join(stack)} {n}" for stack, n in self.stacks.most_common())
+
+    def top_functions(self, n: int = 15) -> list[tuple[str, int, int]]:
+        """(function, self samples, inclusive samples), by inclusive samples."""
+        own: Counter[str] = Counter()
+        inclusive: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for label in set(stack):
+                inclusive[label] += count
+        return [(label, own[label], total) for label, total in inclusive.most_common(n)]
+
+    def summary(self) -> str:
+        lines = [f"Sampled {self.samples} tick stacks ({self.interval * 1000:.0f}ms interval)", ""]
+        lines.append(f"{'self':>6}{'incl':>6}  function")
+        lines.extend(f"{own:>6}{incl:>6}  {label}" for label, own, incl in self.top_functions())
+        lines.append("")
+        lines.append(format_all_stats())
+        return "\n".join(lines)
+
+    def _write_results(self) -> None:
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        summary = self.summary()
+        try:
+            PROFILE_DIR.mkdir(exist_ok=True)
+            folded = PROFILE_DIR / f"tick_profile_{stamp}.folded"
+            folded.write_text(self.folded(), encoding="utf-8")
+            RESULT_PATH.parent.mkdir(exist_ok=True)
+            tmp = RESULT_PATH.with_name(f".{RESULT_PATH.name}.tmp")
+            tmp.write_text(summary, encoding="utf-8")
+            tmp.replace(RESULT_PATH)
+        except OSError as e:
+            logger.warning(f"Tick profiler: writing results failed: {e}")
+        logger.info(f"Tick profiler results:\n{summary}")
+
+
+_sampler = SamplingProfiler()
+
+
+def get_sampler() -> SamplingProfiler:
+    return _sampler
+
+
+def request_profile(seconds: float = DEFAULT_SAMPLE_SECONDS, path: Path | None = None) -> None:
+    """Ask the trading process (other container) to run the sampler."""
+    target = path or REQUEST_PATH
+    target.parent.mkdir(exist_ok=True)
+    target.write_text(json.dumps({"seconds": seconds, "requested_at": time.time()}))
+
+
+def poll_profile_request(path: Path | None = None) -> bool:
+    """Start the sampler if a request file exists (one stat() per tick otherwise)."""
+    source = path or REQUEST_PATH
+    if not source.exists():
+        return False
+    try:
+        request: dict[str, Any] = json.loads(source.read_text())
+        source.unlink()
+    except (OSError, ValueError) as e:
+        logger.warning(f"Tick profiler: bad request file {source}: {e}")
+        source.unlink(missing_ok=True)
+        return False
+    return _sampler.start(float(request.get("seconds", DEFAULT_SAMPLE_SECONDS)))
+
+
+def read_profile_result(since: float = 0.0, path: Path | None = None) -> str | None:
+    """Latest sampler summary if it was written after ``since`` (epoch seconds)."""
+    source = path or RESULT_PATH
+    try:
+        if source.stat().st_mtime < since:
+            return None
+        return source.read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+
+def install_profile_signal(seconds: float = DEFAULT_SAMPLE_SECONDS) -> None:
+    """SIGUSR1 starts the sampler (``kill -USR1 <pid>``); no-op where unsupported."""
+    if not hasattr(signal, "SIGUSR1"):
+        return
+    signal.signal(signal.SIGUSR1, lambda _s, _f: _sampler.start(seconds))
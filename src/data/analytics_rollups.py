@@ -0,0 +1,154 @@
+"""
+Analytics Rollups
+=================
+Vorberechnete Tages-Aggregate für Playbook und Weekly Export.
+
+- trade_rollup_daily: je Tag, Stunde, Symbol, Action, Regime und F&G-Wert
+  (Summen statt Einzelwerte, Varianz über Quadratsummen)
+- signal_rollup_daily: je Tag, Regime und Signal (Trefferquote der Signale)
+
+Outcomes werden nachträglich gesetzt (outcome_1h/24h, was_good_decision aus
+trade_pairs), deshalb werden nicht nur neue Tage angehängt: jeder Refresh
+baut die Tage neu auf, deren Trades seit dem letzten Refresh geändert wurden
+(trades.updated_at), plus die letzten ROLLUP_RECENT_DAYS Tage. Der erste Lauf
+auf leeren Tabellen ist damit automatisch ein vollständiger Backfill.
+
+Leser summieren nur noch Rollup-Zeilen; ihre Laufzeit hängt von der Anzahl
+Tage ab, nicht von der Anzahl Trades.
+"""
+
+import logging
+
+logger = logging.getLogger("trading_bot")
+
+# Tage, die bei jedem Refresh neu aufgebaut werden (Signal-Bewertung läuft verzögert)
+ROLLUP_RECENT_DAYS = 2
+
+# Puffer für Transaktionen, die während des letzten Refresh noch nicht committet waren
+ROLLUP_CHANGE_MARGIN = "1 hour"
+
+# Signal-Spalten aus signal_components, die einzeln ausgewertet werden
+SIGNAL_COLUMNS = (
+    "fear_greed_signal",
+    "rsi_signal",
+    "macd_signal",
+    "trend_signal",
+    "volume_signal",
+    "whale_signal",
+    "sentiment_signal",
+    "macro_signal",
+    "ai_direction_signal",
+)
+
+# Pseudo-Signal für die Gesamt-Accuracy aller bewerteten Signale
+OVERALL_SIGNAL = "overall"
+
+# Regime/F&G ohne Wert (NULL in trades) — Primärschlüssel erlauben kein NULL
+UNKNOWN_REGIME = ""
+UNKNOWN_FEAR_GREED = -1
+
+DIRTY_DAYS_QUERY = f"""
+    WITH last_refresh AS (
+        SELECT MAX(refreshed_at) - INTERVAL '{ROLLUP_CHANGE_MARGIN}' AS since
+        FROM trade_rollup_daily
+    )
+    SELECT DISTINCT t.timestamp::date
+    FROM trades t, last_refresh
+    WHERE last_refresh.since IS NULL OR t.updated_at >= last_refresh.since
+    UNION
+    SELECT generate_series(CURRENT_DATE - %s::int, CURRENT_DATE, INTERVAL '1 day')::date
+"""
+
+TRADE_ROLLUP_INSERT = f"""
+    INSERT INTO trade_rollup_daily (
+        day, hour, symbol, action, regime, fear_greed, trades,
+        n_24h, good_24h, bad_24h, sum_24h, sumsq_24h, good_sum_24h, bad_sum_24h,
+        n_1h, win_1h, loss_1h, sum_1h, profit_1h, loss_sum_1h,
+        n_confidence, sum_confidence
+    )
+    SELECT
+        timestamp::date,
+        EXTRACT(HOUR FROM timestamp)::smallint,
+        symbol,
+        action,
+        COALESCE(market_trend, '{UNKNOWN_REGIME}'),
+        COALESCE(fear_greed, {UNKNOWN_FEAR_GREED}),
+        COUNT(*),
+        COUNT(outcome_24h),
+        COUNT(*) FILTER (WHERE outcome_24h IS NOT NULL AND was_good_decision),
+        COUNT(*) FILTER (WHERE outcome_24h IS NOT NULL AND was_good_decision = FALSE),
+        COALESCE(SUM(outcome_24h), 0),
+        COALESCE(SUM(outcome_24h * outcome_24h), 0),
+        COALESCE(SUM(outcome_24h) FILTER (WHERE was_good_decision), 0),
+        COALESCE(SUM(outcome_24h) FILTER (WHERE was_good_decision = FALSE), 0),
+        COUNT(outcome_1h),
+        COUNT(*) FILTER (WHERE outcome_1h > 0),
+        COUNT(*) FILTER (WHERE outcome_1h < 0),
+        COALESCE(SUM(outcome_1h), 0),
+        COALESCE(SUM(outcome_1h) FILTER (WHERE outcome_1h > 0), 0),
+        COALESCE(SUM(outcome_1h) FILTER (WHERE outcome_1h < 0), 0),
+        COUNT(confidence),
+        COALESCE(SUM(confidence), 0)
+    FROM trades
+    WHERE timestamp >= %s AND timestamp::date = ANY(%s)
+    GROUP BY 1, 2, 3, 4, 5, 6
+"""
+
+_SIGNAL_VALUES = ",\n            ".join(
+    [f"('{OVERALL_SIGNAL}', NULL::numeric)"] + [f"('{col}', sc.{col})" for col in SIGNAL_COLUMNS]
+)
+
+SIGNAL_ROLLUP_INSERT = f"""
+    INSERT INTO signal_rollup_daily (day, regime, signal, total, correct, sum_strength)
+    SELECT
+        sc.timestamp::date,
+        COALESCE(t.market_trend, '{UNKNOWN_REGIME}'),
+        v.signal,
+        COUNT(*),
+        COUNT(*) FILTER (WHERE sc.was_correct),
+        COALESCE(SUM(ABS(v.value)), 0)
+    FROM signal_components sc
+    LEFT JOIN trades t ON t.id = sc.trade_id
+    CROSS JOIN LATERAL (VALUES
+            {_SIGNAL_VALUES}
+    ) AS v(signal, value)
+    WHERE sc.was_correct IS NOT NULL
+    AND sc.timestamp >= %s AND sc.timestamp::date = ANY(%s)
+    AND (v.signal = '{OVERALL_SIGNAL}' OR ABS(v.value) > 0.1)
+    GROUP BY 1, 2, 3
+"""
+
+
+def refresh_rollups(conn, recent_days: int = ROLLUP_RECENT_DAYS) -> int:
+    """
+    Baut die Rollup-Tage neu auf, deren Trades sich geändert haben.
+
+    Args:
+        conn: DB-Verbindung (wird committet)
+        recent_days: Zusätzlich immer neu aufgebaute letzte Tage
+
+    Returns:
+        Anzahl neu aufgebauter Tage (0 bei Fehler)
+    """
+    try:
+        with conn.cursor() as cur:
+            cur.execute(DIRTY_DAYS_QUERY, (recent_days,))
+            days = sorted(row[0] for row in cur.fetchall())
+            if not days:
+                return 0
+
+            cur.execute("DELETE FROM trade_rollup_daily WHERE day = ANY(%s)", (days,))
+            cur.execute(TRADE_ROLLUP_INSERT, (days[0], days))
+            cur.execute("DELETE FROM signal_rollup_daily WHERE day = ANY(%s)", (days,))
+            cur.execute(SIGNAL_ROLLUP_INSERT, (days[0], days))
+        conn.commit()
+        logger.debug(f"Analytics Rollups: {len(days)} Tage aktualisiert")
+        return len(days)
+
+    except Exception as e:
+        logger.warning(f"Analytics Rollup Refresh fehlgeschlagen: {e}")
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        return 0
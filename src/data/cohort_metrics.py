@@ -0,0 +1,134 @@
+"""Cohort metrics for reporting — one grouped query for all active cohorts.
+
+Replaces the per-cohort realized-P&L and open-pair queries of the Telegram
+dashboard and comparison builders. Realized P&L, trade and win counts come
+from closed trade pairs; open pairs are aggregated per symbol into a JSON
+object so the whole result is one row per cohort.
+"""
+
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger("trading_bot")
+
+COHORT_METRICS_QUERY = """
+    SELECT
+        c.id::text AS id,
+        c.name,
+        c.starting_capital,
+        c.current_capital,
+        c.config,
+        COALESCE(closed.realized_pnl, 0) AS realized_pnl,
+        COALESCE(closed.trade_count, 0) AS trade_count,
+        COALESCE(closed.wins, 0) AS wins,
+        COALESCE(open_pairs.by_symbol, '{}'::jsonb) AS open_pairs
+    FROM cohorts c
+    LEFT JOIN (
+        SELECT cohort_id,
+               SUM(net_pnl) AS realized_pnl,
+               COUNT(*) AS trade_count,
+               COUNT(*) FILTER (WHERE net_pnl > 0) AS wins
+        FROM trade_pairs
+        WHERE status = 'closed'
+        GROUP BY cohort_id
+    ) closed ON closed.cohort_id = c.id
+    LEFT JOIN (
+        SELECT cohort_id,
+               jsonb_object_agg(
+                   symbol,
+                   jsonb_build_object('cost_basis', cost_basis, 'total_qty', total_qty)
+               ) AS by_symbol
+        FROM (
+            SELECT cohort_id, symbol,
+                   COALESCE(SUM(entry_value_usd), 0) AS cost_basis,
+                   COALESCE(SUM(remaining_quantity), 0) AS total_qty
+            FROM trade_pairs
+            WHERE status = 'open'
+            GROUP BY cohort_id, symbol
+        ) per_symbol
+        GROUP BY cohort_id
+    ) open_pairs ON open_pairs.cohort_id = c.id
+    WHERE c.is_active = true
+"""
+
+
+@dataclass
+class CohortMetrics:
+    """Realized performance and open positions of one cohort."""
+
+    id: str
+    name: str
+    starting_capital: float
+    current_capital: float
+    config: dict[str, Any]
+    realized_pnl: float = 0.0
+    trade_count: int = 0
+    wins: int = 0
+    open_pairs: dict[str, dict[str, float]] = field(default_factory=dict)
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.trade_count * 100 if self.trade_count else 0.0
+
+    @property
+    def pnl_pct(self) -> float:
+        return self.realized_pnl / self.starting_capital * 100 if self.starting_capital > 0 else 0.0
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "CohortMetrics":
+        (
+            cohort_id,
+            name,
+            starting,
+            current,
+            config,
+            realized,
+            trades,
+            wins,
+            open_pairs,
+        ) = row
+        if isinstance(config, str):
+            config = json.loads(config)
+        if isinstance(open_pairs, str):
+            open_pairs = json.loads(open_pairs)
+        return cls(
+            id=cohort_id,
+            name=name,
+            starting_capital=float(starting or 0),
+            current_capital=float(current or 0),
+            config=config or {},
+            realized_pnl=float(realized or 0),
+            trade_count=int(trades or 0),
+            wins=int(wins or 0),
+            open_pairs={
+                symbol: {key: float(value or 0) for key, value in pair.items()}
+                for symbol, pair in (open_pairs or {}).items()
+            },
+        )
+
+
+def fetch_cohort_metrics(conn) -> dict[str, CohortMetrics]:
+    """Load metrics of all active cohorts with a single query.
+
+    Args:
+        conn: DB connection (pooled handle from ``get_db_connection()``).
+
+    Returns:
+        Dict keyed by cohort name; empty on error.
+    """
+    try:
+        with conn.cursor() as cur:
+            cur.execute(COHORT_METRICS_QUERY)
+            rows = cur.fetchall()
+    except Exception as e:
+        logger.debug(f"Cohort metrics query failed: {e}")
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        return {}
+
+    metrics = (CohortMetrics.from_row(row) for row in rows)
+    return {m.name: m for m in metrics}
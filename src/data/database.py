@@ -1,20 +1,37 @@
 """
 Zentrales Database Connection Management.
 
-Stellt eine einzelne, wiederverwendbare Datenbankverbindung bereit.
-Alle Module sollten diese Klasse nutzen statt eigene Connections zu erstellen.
+Stellt einen prozessweiten Connection Pool bereit.
+Alle Module sollten diese Klasse nutzen statt eigene Connections zu erstellen:
+
+- get_cursor() / transaction(): Checkout + Return als Context Manager
+- get_pooled_connection(): Handle mit psycopg2-Connection-Interface für Module,
+  die ein ``self.conn`` halten (leiht pro Transaktion aus dem Pool)
+
+Pool-Größe:
+- DB_POOL_MIN: Verbindungen, die im Pool warm gehalten werden
+  (Default: SCHEDULER_WORKERS + 1, mindestens 2)
+- DB_POOL_MAX: Obergrenze gleichzeitiger Verbindungen (Default: max(10, 2 * DB_POOL_MIN))
+- DB_POOL_TIMEOUT: Sekunden, die auf eine freie Verbindung gewartet wird (Default: 10)
+- DB_VALIDATE_IDLE_SECONDS: Health-Check (SELECT 1) nur für Verbindungen, die länger
+  als N Sekunden ungenutzt im Pool lagen (Default: 30, 0 = immer prüfen)
+- DB_PGBOUNCER=true: PgBouncer (Transaction Pooling) davor - kein Health-Check
+  beim Checkout, Verbindungen werden nur transaktionsweise gehalten
 """
 
 from __future__ import annotations
 
 import logging
 import os
+import threading
+import time
 from contextlib import contextmanager
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from dotenv import load_dotenv
 
 from src.utils.singleton import SingletonMixin
+from src.utils.telemetry import record_db
 
 if TYPE_CHECKING:
     from psycopg2.extensions import connection
@@ -25,26 +42,51 @@ logger = logging.getLogger("trading_bot")
 
 # PostgreSQL
 try:
+    from psycopg2 import InterfaceError, OperationalError
+    from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_UNKNOWN
     from psycopg2.extras import RealDictCursor
     from psycopg2.pool import ThreadedConnectionPool
 
     POSTGRES_AVAILABLE = True
+    CONNECTION_ERRORS: tuple[type[Exception], ...] = (OperationalError, InterfaceError)
 except ImportError:
     POSTGRES_AVAILABLE = False
     ThreadedConnectionPool = None  # type: ignore
     RealDictCursor = None  # type: ignore
+    InterfaceError = OperationalError = Exception  # type: ignore
+    TRANSACTION_STATUS_IDLE = 0
+    TRANSACTION_STATUS_UNKNOWN = 4
+    CONNECTION_ERRORS = ()
     logger.warning("psycopg2 nicht installiert - pip install psycopg2-binary")
 
 
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def pool_size_from_env() -> tuple[int, int]:
+    """(minconn, maxconn) aus der Umgebung, abgeleitet von der Scheduler-Parallelität."""
+    workers = max(_env_int("SCHEDULER_WORKERS", 1), 1)
+    minconn = max(_env_int("DB_POOL_MIN", max(workers + 1, 2)), 0)
+    maxconn = max(_env_int("DB_POOL_MAX", max(10, 2 * minconn)), minconn, 1)
+    return minconn, maxconn
+
+
 class DatabaseManager(SingletonMixin):
     """
     Zentrales Database Connection Management mit Connection Pooling.
 
     Features:
     - Singleton Pattern (via SingletonMixin)
-    - Connection Pooling (min 1, max 10 connections)
+    - Connection Pooling (Größe via DB_POOL_MIN / DB_POOL_MAX)
     - Context Manager für sichere Transaktionen
     - Automatisches Reconnect bei Verbindungsabbruch
+    - Wartet bis DB_POOL_TIMEOUT auf eine freie Verbindung statt sofort zu scheitern
+    - Health-Check nur nach Leerlauf (DB_VALIDATE_IDLE_SECONDS), sonst genügen
+      closed-Flag und Transaktionsstatus; Metriken via get_pool_metrics()
 
     Usage:
         db = DatabaseManager.get_instance()
@@ -64,9 +106,36 @@ class DatabaseManager(SingletonMixin):
             db.return_connection(conn)
     """
 
+    POOL_RETRY_SECONDS = 30
+
     def __init__(self):
         self._pool: ThreadedConnectionPool | None = None
         self._db_url: str | None = None
+        self.minconn, self.maxconn = pool_size_from_env()
+        self.pool_timeout = float(_env_int("DB_POOL_TIMEOUT", 10))
+        self.pgbouncer = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+        # Begrenzt ausgeliehene Connections auf maxconn (ThreadedConnectionPool
+        # wirft sonst sofort "pool exhausted" statt zu warten)
+        self._slots = threading.BoundedSemaphore(self.maxconn)
+        self._last_init_attempt = 0.0
+
+        # Idle-basierte Validierung: id(conn) -> Zeitpunkt der Rückgabe
+        self.validate_idle_seconds = float(_env_int("DB_VALIDATE_IDLE_SECONDS", 30))
+        self._returned_at: dict[int, float] = {}
+        # Nach einem Verbindungsfehler werden alle älteren Connections geprüft
+        self._suspect_before = 0.0
+        self._local = threading.local()
+        self._metrics_lock = threading.Lock()
+        self.metrics = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "timeouts": 0,
+            "validations": 0,
+            "validation_failures": 0,
+            "connection_errors": 0,
+            "discarded": 0,
+        }
         self._init_pool()
 
     def _init_pool(self) -> bool:
@@ -75,6 +144,8 @@ class DatabaseManager(SingletonMixin):
             logger.warning("PostgreSQL nicht verfügbar - DatabaseManager deaktiviert")
             return False
 
+        self._last_init_attempt = time.monotonic()
+        self._returned_at.clear()
         try:
             # Hole Connection-Parameter
             self._db_url = os.getenv("DATABASE_URL")
@@ -82,15 +153,15 @@ class DatabaseManager(SingletonMixin):
             if self._db_url:
                 # Nutze DATABASE_URL wenn vorhanden
                 self._pool = ThreadedConnectionPool(
-                    minconn=1,
-                    maxconn=10,
+                    minconn=self.minconn,
+                    maxconn=self.maxconn,
                     dsn=self._db_url,
                 )
             else:
                 # Fallback auf einzelne Umgebungsvariablen
                 self._pool = ThreadedConnectionPool(
-                    minconn=1,
-                    maxconn=10,
+                    minconn=self.minconn,
+                    maxconn=self.maxconn,
                     host=os.getenv("POSTGRES_HOST", "localhost"),
                     port=int(os.getenv("POSTGRES_PORT", "5432")),
                     database=os.getenv("POSTGRES_DB", "trading_bot"),
@@ -98,7 +169,11 @@ class DatabaseManager(SingletonMixin):
                     password=os.getenv("POSTGRES_PASSWORD", ""),
                 )
 
-            logger.info("DatabaseManager: Connection Pool initialisiert (1-10 connections)")
+            logger.info(
+                f"DatabaseManager: Connection Pool initialisiert "
+                f"({self.minconn}-{self.maxconn} connections"
+                f"{', PgBouncer' if self.pgbouncer else ''})"
+            )
             return True
 
         except Exception as e:
@@ -106,42 +181,158 @@ class DatabaseManager(SingletonMixin):
             self._pool = None
             return False
 
+    def _ensure_pool(self) -> bool:
+        """Pool neu aufbauen, falls die DB beim Start nicht erreichbar war."""
+        if self._pool:
+            return True
+        if time.monotonic() - self._last_init_attempt < self.POOL_RETRY_SECONDS:
+            return False
+        return self._init_pool()
+
+    def _count(self, key: str, amount: float = 1) -> None:
+        with self._metrics_lock:
+            self.metrics[key] += amount
+
+    def _acquire_slot(self) -> bool:
+        """Wartet bis DB_POOL_TIMEOUT auf einen freien Pool-Slot."""
+        if self._slots.acquire(blocking=False):
+            return True
+
+        self._count("waits")
+        started = time.monotonic()
+        acquired = self._slots.acquire(timeout=self.pool_timeout)
+        self._count("wait_seconds", time.monotonic() - started)
+        if not acquired:
+            self._count("timeouts")
+            logger.warning(
+                f"DatabaseManager: keine freie Connection nach {self.pool_timeout:.0f}s "
+                f"(max {self.maxconn})"
+            )
+        return acquired
+
+    def _needs_validation(self, conn: connection) -> bool:
+        """SELECT 1 nur für Connections, deren Zustand wir nicht kennen."""
+        if self.pgbouncer:
+            return False
+        returned_at = self._returned_at.pop(id(conn), None)
+        if returned_at is None or returned_at <= self._suspect_before:
+            return True
+        return time.monotonic() - returned_at > self.validate_idle_seconds
+
+    def _is_usable(self, conn: connection) -> bool:
+        """Lokale Prüfung ohne Round-Trip (closed-Flag, Transaktionsstatus)."""
+        if conn.closed:
+            return False
+        status = conn.get_transaction_status()
+        if status == TRANSACTION_STATUS_UNKNOWN:
+            return False
+        if status != TRANSACTION_STATUS_IDLE:
+            # Liegengebliebene Transaktion aus einem früheren Checkout
+            conn.rollback()
+        return True
+
+    def _checkout(self) -> connection:
+        conn = self._pool.getconn()
+        try:
+            if not self._is_usable(conn):
+                raise InterfaceError("connection already closed")
+            if self._needs_validation(conn):
+                self._count("validations")
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                conn.rollback()
+        except Exception:
+            self._count("validation_failures")
+            self._discard(conn)
+            raise
+        return conn
+
+    def _discard(self, conn: connection) -> None:
+        self._returned_at.pop(id(conn), None)
+        self._count("discarded")
+        try:
+            self._pool.putconn(conn, close=True)
+        except Exception:
+            pass
+
     def get_connection(self) -> connection | None:
         """
         Holt eine Connection aus dem Pool.
 
+        Ein Health-Check (SELECT 1) läuft nur, wenn die Connection länger als
+        validate_idle_seconds ungenutzt war oder nach einem Verbindungsfehler.
+        Heiße Connections kosten keinen zusätzlichen Round-Trip.
+
         WICHTIG: Connection muss mit return_connection() zurückgegeben werden!
         Besser: Nutze get_cursor() Context Manager.
         """
-        if not self._pool:
+        if not self._ensure_pool():
+            return None
+
+        if not self._acquire_slot():
             return None
 
-        conn = None
+        self._count("checkouts")
         try:
-            conn = self._pool.getconn()
-            # Teste ob Connection noch gültig
-            with conn.cursor() as cur:
-                cur.execute("SELECT 1")
-            return conn
+            return self._checkout()
         except Exception as e:
             logger.warning(f"DatabaseManager: Connection ungültig, reconnecting: {e}")
-            if conn is not None:
-                try:
-                    self._pool.putconn(conn, close=True)
-                except Exception:
-                    pass
+            # Wahrscheinlich DB-Neustart: alle bis jetzt zurückgegebenen Connections prüfen
+            self._suspect_before = time.monotonic()
             try:
-                return self._pool.getconn()
+                return self._checkout()
             except Exception:
+                self._slots.release()
                 return None
 
-    def return_connection(self, conn: connection) -> None:
-        """Gibt eine Connection zurück an den Pool."""
+    def return_connection(self, conn: connection, close: bool = False) -> None:
+        """Gibt eine Connection zurück an den Pool (close=True verwirft sie)."""
         if self._pool and conn:
             try:
-                self._pool.putconn(conn)
+                if conn.closed:
+                    # Server-Verbindung verloren: übrige Connections vor Nutzung prüfen
+                    self._suspect_before = time.monotonic()
+                    close = True
+                if close:
+                    self._returned_at.pop(id(conn), None)
+                    self._count("discarded")
+                else:
+                    self._returned_at[id(conn)] = time.monotonic()
+                self._pool.putconn(conn, close=close)
             except Exception as e:
                 logger.warning(f"DatabaseManager: Connection return failed: {e}")
+            finally:
+                try:
+                    self._slots.release()
+                except ValueError:
+                    pass
+
+    def _connection_failed(self, conn: connection, error: Exception) -> bool:
+        """
+        Verbindungsfehler während eines Statements (statt Health-Check vorab).
+
+        Returns:
+            True wenn die Connection tot ist und verworfen werden muss
+        """
+        # psycopg2 setzt closed != 0, sobald libpq den Verbindungsabbruch erkennt
+        if not conn.closed:
+            return False
+        self._local.connection_lost = True
+        self._count("connection_errors")
+        logger.warning(f"DatabaseManager: Verbindung verloren, wird verworfen: {error}")
+        return True
+
+    @staticmethod
+    def _safe_rollback(conn: connection) -> None:
+        if not conn.closed:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+
+    def pooled_connection(self) -> PooledConnection:
+        """Handle mit Connection-Interface, das transaktionsweise aus dem Pool leiht."""
+        return PooledConnection(self)
 
     @contextmanager
     def get_cursor(self, dict_cursor: bool = True):
@@ -160,16 +351,20 @@ class DatabaseManager(SingletonMixin):
         if not conn:
             raise RuntimeError("Keine Datenbankverbindung verfügbar")
 
+        discard = False
         try:
             cursor_factory = RealDictCursor if dict_cursor else None
             with conn.cursor(cursor_factory=cursor_factory) as cur:
                 yield cur
+                # Ab hier ist bei Verbindungsabbruch unklar, ob der Server committed hat
+                self._local.commit_sent = True
                 conn.commit()
         except Exception as e:
-            conn.rollback()
+            discard = self._connection_failed(conn, e)
+            self._safe_rollback(conn)
             raise e
         finally:
-            self.return_connection(conn)
+            self.return_connection(conn, close=discard)
 
     @contextmanager
     def transaction(self):
@@ -187,14 +382,16 @@ class DatabaseManager(SingletonMixin):
         if not conn:
             raise RuntimeError("Keine Datenbankverbindung verfügbar")
 
+        discard = False
         try:
             yield conn
             conn.commit()
         except Exception as e:
-            conn.rollback()
+            discard = self._connection_failed(conn, e)
+            self._safe_rollback(conn)
             raise e
         finally:
-            self.return_connection(conn)
+            self.return_connection(conn, close=discard)
 
     def execute(
         self,
@@ -213,11 +410,17 @@ class DatabaseManager(SingletonMixin):
         Returns:
             Liste von Rows (als Dict) wenn fetch=True, sonst None
         """
-        with self.get_cursor() as cur:
-            cur.execute(query, params)
-            if fetch:
-                return cur.fetchall()
-            return None
+
+        def run():
+            with self.get_cursor() as cur:
+                started = time.perf_counter()
+                try:
+                    cur.execute(query, params)
+                finally:
+                    record_db(time.perf_counter() - started)
+                return cur.fetchall() if fetch else None
+
+        return self._retry_on_disconnect(run, read_only=_is_read_only(query))
 
     def execute_many(
         self,
@@ -234,9 +437,43 @@ class DatabaseManager(SingletonMixin):
         Returns:
             Anzahl betroffener Rows
         """
-        with self.get_cursor(dict_cursor=False) as cur:
-            cur.executemany(query, params_list)
-            return cur.rowcount
+
+        def run():
+            with self.get_cursor(dict_cursor=False) as cur:
+                started = time.perf_counter()
+                try:
+                    cur.executemany(query, params_list)
+                finally:
+                    record_db(time.perf_counter() - started)
+                return cur.rowcount
+
+        return self._retry_on_disconnect(run, read_only=_is_read_only(query))
+
+    def _retry_on_disconnect(self, run, read_only: bool = False):
+        """
+        Einmaliger Retry auf frischer Connection nach Verbindungsabbruch.
+
+        Schreibende Statements nur, solange das COMMIT noch nicht gesendet war:
+        ohne COMMIT verwirft der Server die offene Transaktion beim Abbruch.
+        Bricht die Verbindung während ``conn.commit()`` ab, ist offen, ob der
+        Server committed hat; ein zweiter Lauf könnte z.B. einen Trade doppelt
+        einfügen, deshalb wird der Fehler dann an den Aufrufer gereicht.
+        Lesende Statements werden immer wiederholt.
+        """
+        self._local.connection_lost = False
+        self._local.commit_sent = False
+        try:
+            return run()
+        except CONNECTION_ERRORS:
+            if not self._local.connection_lost:
+                raise
+            if self._local.commit_sent and not read_only:
+                logger.warning(
+                    "DatabaseManager: Verbindung beim Commit verloren, kein Retry "
+                    "(Ergebnis des Commits unbekannt)"
+                )
+                raise
+            return run()
 
     def is_connected(self) -> bool:
         """Prüft ob eine Verbindung möglich ist."""
@@ -275,8 +512,176 @@ class DatabaseManager(SingletonMixin):
             "available": True,
             "min_connections": self._pool.minconn,
             "max_connections": self._pool.maxconn,
+            "pgbouncer": self.pgbouncer,
+            "validate_idle_seconds": self.validate_idle_seconds,
+            **self.get_pool_metrics(),
         }
 
+    def get_pool_metrics(self) -> dict:
+        """Zähler für Checkouts, Wartezeiten und Validierungen."""
+        with self._metrics_lock:
+            metrics = dict(self.metrics)
+        metrics["wait_seconds"] = round(metrics["wait_seconds"], 3)
+        return metrics
+
+
+_READ_ONLY_PREFIXES = ("SELECT", "SHOW", "EXPLAIN")
+
+
+def _is_read_only(query: Any) -> bool:
+    """Heuristik: liest das Statement nur? (Bestimmt, ob die Leihe früh enden darf)"""
+    if isinstance(query, bytes):
+        query = query.decode(errors="ignore")
+    if not isinstance(query, str):
+        return False
+    return query.lstrip().upper().startswith(_READ_ONLY_PREFIXES)
+
+
+class PooledConnection:
+    """
+    Drop-in für eine langlebige psycopg2-Connection, gestützt auf den Pool.
+
+    Module behalten ihr ``self.conn.cursor() / commit() / rollback()`` Muster,
+    halten aber keine eigene Server-Connection mehr. Die Connection wird beim
+    ersten cursor() (pro Thread) ausgeliehen und zurückgegeben bei:
+    - commit() / rollback() / close()
+    - Schließen des letzten Cursors, wenn seit der Leihe nur gelesen wurde
+
+    Schreibende Transaktionen bleiben also bis commit()/rollback() auf
+    derselben Connection.
+
+    Usage:
+        conn = get_pooled_connection()
+        with conn.cursor() as cur:
+            cur.execute("INSERT ...")
+        conn.commit()  # gibt die Connection an den Pool zurück
+    """
+
+    def __init__(self, db: DatabaseManager):
+        self._db = db
+        self._local = threading.local()
+
+    def _lease(self) -> Any:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._db.get_connection()
+            if conn is None:
+                raise RuntimeError("Keine Datenbankverbindung verfügbar")
+            self._local.conn = conn
+            self._local.dirty = False
+            self._local.open_cursors = 0
+        return conn
+
+    def _release(self, discard: bool = False) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        self._db.return_connection(conn, close=discard)
+
+    def _end(self, action: str) -> None:
+        """commit/rollback auf der geliehenen Connection, danach zurückgeben."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        try:
+            getattr(conn, action)()
+        except Exception:
+            self._release(discard=True)
+            raise
+        self._release()
+
+    def cursor(self, *args, **kwargs) -> _LeasedCursor:
+        conn = self._lease()
+        try:
+            cur = conn.cursor(*args, **kwargs)
+        except Exception:
+            self._release(discard=bool(conn.closed))
+            raise
+        self._local.open_cursors += 1
+        return _LeasedCursor(self, cur)
+
+    def commit(self) -> None:
+        self._end("commit")
+
+    def rollback(self) -> None:
+        self._end("rollback")
+
+    def close(self) -> None:
+        """Gibt eine evtl. noch geliehene Connection zurück (offene Transaktion → Rollback)."""
+        self._release()
+
+    @property
+    def closed(self) -> bool:
+        return False
+
+    def __enter__(self) -> PooledConnection:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self._end("rollback" if exc_type else "commit")
+        return False
+
+    def _statement(self, query: Any) -> None:
+        if not _is_read_only(query):
+            self._local.dirty = True
+
+    def _cursor_closed(self, failed: bool) -> None:
+        if getattr(self._local, "conn", None) is None:
+            return
+        self._local.open_cursors -= 1
+        if self._local.open_cursors > 0 or self._local.dirty:
+            return
+        # Nur gelesen: Transaktion beenden und Connection sofort zurückgeben
+        self._end("rollback" if failed else "commit")
+
+
+class _LeasedCursor:
+    """Cursor-Proxy, der PooledConnection über Statements und Schließen informiert."""
+
+    def __init__(self, owner: PooledConnection, cursor: Any):
+        self._owner = owner
+        self._cursor = cursor
+        self._closed = False
+
+    def execute(self, query, vars=None):
+        self._owner._statement(query)
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(query, vars)
+        finally:
+            record_db(time.perf_counter() - started)
+
+    def executemany(self, query, vars_list):
+        self._owner._statement(query)
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(query, vars_list)
+        finally:
+            record_db(time.perf_counter() - started)
+
+    def close(self, failed: bool = False) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._cursor.close()
+        finally:
+            self._owner._cursor_closed(failed)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self) -> _LeasedCursor:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.close(failed=exc_type is not None)
+        return False
+
 
 # Convenience-Funktionen
 def get_db() -> DatabaseManager:
@@ -287,3 +692,13 @@ def get_db() -> DatabaseManager:
 def get_db_cursor(dict_cursor: bool = True):
     """Shortcut für db.get_cursor()."""
     return get_db().get_cursor(dict_cursor)
+
+
+def get_pooled_connection() -> PooledConnection | None:
+    """Pool-gestütztes Connection-Handle, None wenn keine Datenbank verfügbar ist."""
+    if not POSTGRES_AVAILABLE:
+        return None
+    db = get_db()
+    if not db._ensure_pool():
+        return None
+    return db.pooled_connection()
@@ -156,6 +156,7 @@ class EconomicCalendar:
                     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
                 },
                 api_type="default",
+                cache_ttl=6 * 3600,
             )
 
             for item in data.get("result", []):
@@ -14,7 +14,6 @@ ETF Flows sind wichtig weil:
 """
 
 import logging
-import os
 import re
 from dataclasses import dataclass
 from datetime import datetime
@@ -22,6 +21,7 @@ from typing import Any
 
 from dotenv import load_dotenv
 
+from src.data.database import get_pooled_connection
 from src.utils.singleton import SingletonMixin
 
 load_dotenv()
@@ -29,7 +29,6 @@ load_dotenv()
 logger = logging.getLogger("trading_bot")
 
 try:
-    import psycopg2
     from psycopg2.extras import RealDictCursor
 
     POSTGRES_AVAILABLE = True
@@ -107,9 +106,8 @@ class ETFFlowTracker(SingletonMixin):
             return
 
         try:
-            database_url = os.getenv("DATABASE_URL")
-            if database_url:
-                self.conn = psycopg2.connect(database_url)
+            self.conn = get_pooled_connection()
+            if self.conn:
                 logger.info("ETFFlowTracker: DB verbunden")
         except Exception as e:
             logger.error(f"ETFFlowTracker: DB Fehler: {e}")
@@ -151,7 +149,7 @@ class ETFFlowTracker(SingletonMixin):
         try:
             # SoSoValue public endpoint
             url = f"{self.SOSOVALUE_API}/etf/bitcoin/netflow"
-            response = self.http.get(url, timeout=10)
+            response = self.http.get(url, timeout=10, cache_ttl=3600)
 
             if response and "data" in response:
                 # Parse response
@@ -4,13 +4,13 @@ Holt historische Krypto-Daten von Binance (öffentliche API, kein Key nötig)
 """
 
 import logging
-import time
 from datetime import datetime, timedelta
 from pathlib import Path
 
 import pandas as pd
 
-from src.api.http_client import get_http_client
+from src.api.async_http_client import get_async_http_client
+from src.api.http_client import HTTPClientError, get_http_client
 
 logger = logging.getLogger("trading_bot")
 
@@ -62,6 +62,22 @@ class BinanceDataFetcher:
         Returns:
             DataFrame mit OHLCV Daten
         """
+        params = self._klines_params(symbol, interval, start_date, end_date, limit)
+
+        http = get_http_client()
+        data = http.get(f"{self.BASE_URL}/klines", params=params, api_type="binance")
+
+        return self._klines_to_df(data)
+
+    @staticmethod
+    def _klines_params(
+        symbol: str,
+        interval: str,
+        start_date: str | None,
+        end_date: str | None,
+        limit: int,
+    ) -> dict:
+        """Baut die Query-Parameter für /klines"""
         params = {"symbol": symbol, "interval": interval, "limit": limit}
 
         if start_date:
@@ -72,9 +88,11 @@ class BinanceDataFetcher:
             end_ts = int(datetime.strptime(end_date, "%Y-%m-%d").timestamp() * 1000)
             params["endTime"] = end_ts
 
-        http = get_http_client()
-        data = http.get(f"{self.BASE_URL}/klines", params=params, api_type="binance")
+        return params
 
+    @staticmethod
+    def _klines_to_df(data: list) -> pd.DataFrame:
+        """Konvertiert eine /klines Response in ein OHLCV DataFrame"""
         df = pd.DataFrame(
             data,
             columns=[
@@ -121,14 +139,25 @@ class BinanceDataFetcher:
 
         prices = {}
 
-        for symbol in symbols:
-            print(f"Fetching {symbol}...")
+        # Alle Symbole parallel laden (Concurrency-Limit pro Host im AsyncHTTPClient)
+        print(f"Fetching {len(symbols)} symbols...")
+        requests = [
+            {
+                "url": f"{self.BASE_URL}/klines",
+                "params": self._klines_params(symbol, interval, start_date, end_date, 1000),
+                "api_type": "binance",
+            }
+            for symbol in symbols
+        ]
+        responses = get_async_http_client().fetch_all(requests)
+
+        for symbol, data in zip(symbols, responses, strict=True):
+            if isinstance(data, HTTPClientError):
+                logger.warning(f"Fehler bei {symbol}: {data}")
+                continue
             try:
-                df = self.fetch_klines(
-                    symbol=symbol, interval=interval, start_date=start_date, end_date=end_date
-                )
+                df = self._klines_to_df(data)
                 prices[symbol.replace("USDT", "")] = df["close"]
-                time.sleep(0.1)  # Rate limiting
             except Exception as e:
                 logger.warning(f"Fehler bei {symbol}: {e}")
 
@@ -0,0 +1,416 @@
+"""
+Index Advisor
+=============
+Query-Plan-Benchmark für die heißen Abfragen der Anwendung.
+
+Lädt einen synthetischen Datensatz konfigurierbarer Größe (Cohort, Zyklen,
+Trades, Trade-Pairs), misst die echten SQL-Konstanten der Anwendung per
+EXPLAIN ANALYZE einmal ohne und einmal mit den Kandidaten-Indexen und
+berichtet Laufzeit, Speedup und tatsächlich genutzte Indexe.
+
+Alles läuft in EINER Transaktion, die am Ende zurückgerollt wird; jede
+Messung zusätzlich in einem Savepoint (UPDATE-Abfragen ändern dadurch keine
+Daten zwischen den Läufen). Die Transaktion hält während des Laufs Sperren
+auf trades/trade_pairs — gegen eine Scratch-DB laufen lassen, die mit
+docker/init.sql angelegt wurde.
+
+Kandidaten, die der Bericht rechtfertigt, stehen in docker/init.sql
+(Abschnitt C3). Bestehende Datenbanken migriert ``--apply`` mit
+CREATE INDEX CONCURRENTLY, ohne Schreibzugriffe zu blockieren.
+
+Aufruf:
+    python -m src.data.index_advisor --trades 200000 --cycles 20
+    python -m src.data.index_advisor --apply
+"""
+
+import argparse
+import logging
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger("trading_bot")
+
+# Mindest-Speedup, ab dem ein Kandidat als gerechtfertigt gilt
+MIN_SPEEDUP = 1.5
+
+SYNTHETIC_COHORT = "index_advisor"
+SYNTHETIC_SYMBOLS = ("BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT", "XRPUSDT", "ADAUSDT")
+
+
+@dataclass(frozen=True)
+class IndexCandidate:
+    """Index, der im Benchmark an- und abgeschaltet wird."""
+
+    name: str
+    table: str
+    definition: str  # alles nach "ON"
+
+    @property
+    def ddl(self) -> str:
+        return f"CREATE INDEX IF NOT EXISTS {self.name} ON {self.definition};"
+
+    @property
+    def concurrent_ddl(self) -> str:
+        return f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {self.name} ON {self.definition}"
+
+
+CANDIDATE_INDEXES = (
+    IndexCandidate("idx_trades_pending_1h", "trades", "trades(timestamp) WHERE outcome_1h IS NULL"),
+    IndexCandidate("idx_trades_pending_4h", "trades", "trades(timestamp) WHERE outcome_4h IS NULL"),
+    IndexCandidate(
+        "idx_trades_pending_24h", "trades", "trades(timestamp) WHERE outcome_24h IS NULL"
+    ),
+    IndexCandidate("idx_trades_pending_7d", "trades", "trades(timestamp) WHERE outcome_7d IS NULL"),
+    IndexCandidate(
+        "idx_trades_evaluated",
+        "trades",
+        "trades(timestamp DESC) WHERE outcome_24h IS NOT NULL",
+    ),
+    IndexCandidate(
+        "idx_trades_cycle_outcome",
+        "trades",
+        "trades(cycle_id, timestamp) INCLUDE (outcome_24h) WHERE outcome_24h IS NOT NULL",
+    ),
+    IndexCandidate("idx_pairs_entry_trade", "trade_pairs", "trade_pairs(entry_trade_id)"),
+    IndexCandidate("idx_pairs_exit_trade", "trade_pairs", "trade_pairs(exit_trade_id)"),
+)
+
+
+@dataclass(frozen=True)
+class QueryCase:
+    """Eine Anwendungs-Abfrage mit Parametern und den Indexen, die sie betrifft."""
+
+    name: str
+    sql: str
+    params: tuple = ()
+    indexes: tuple[str, ...] = ()
+
+
+@dataclass
+class PlanStats:
+    """Kennzahlen aus einem EXPLAIN (ANALYZE, FORMAT JSON) Plan."""
+
+    execution_ms: float
+    planning_ms: float
+    node_type: str
+    indexes_used: set[str] = field(default_factory=set)
+
+
+@dataclass
+class CaseResult:
+    """Messung einer Abfrage ohne und mit Kandidaten-Indexen."""
+
+    case: QueryCase
+    before: PlanStats
+    after: PlanStats
+
+    @property
+    def speedup(self) -> float:
+        return self.before.execution_ms / max(self.after.execution_ms, 0.001)
+
+    @property
+    def justified(self) -> set[str]:
+        """Kandidaten, die der After-Plan nutzt und die spürbar beschleunigen."""
+        if self.speedup < MIN_SPEEDUP:
+            return set()
+        return set(self.case.indexes) & self.after.indexes_used
+
+
+def query_cases(cycle_id: str) -> list[QueryCase]:
+    """Die heißen Abfragen, direkt aus den Konstanten der Anwendung."""
+    from src.core.cycle_manager import DAILY_RETURNS_QUERY
+    from src.data.memory import SIMILAR_SITUATIONS_QUERY
+    from src.tasks.system_tasks import EVALUATE_DECISIONS_QUERY, PENDING_OUTCOMES_QUERY
+
+    cases = [
+        QueryCase(
+            f"pending_outcomes_{column}",
+            PENDING_OUTCOMES_QUERY.format(column=f"outcome_{column}"),
+            (hours, hours + 1),
+            (f"idx_trades_pending_{column}",),
+        )
+        for column, hours in (("1h", 1), ("4h", 4), ("24h", 24), ("7d", 168))
+    ]
+    cases += [
+        QueryCase(
+            "similar_situations",
+            SIMILAR_SITUATIONS_QUERY,
+            (25, 75),
+            ("idx_trades_evaluated",),
+        ),
+        QueryCase(
+            "cycle_daily_returns",
+            DAILY_RETURNS_QUERY,
+            (cycle_id,),
+            ("idx_trades_cycle_outcome",),
+        ),
+        QueryCase(
+            "evaluate_entry_decisions",
+            EVALUATE_DECISIONS_QUERY.format(side="entry"),
+            (),
+            ("idx_pairs_entry_trade",),
+        ),
+        QueryCase(
+            "evaluate_exit_decisions",
+            EVALUATE_DECISIONS_QUERY.format(side="exit"),
+            (),
+            ("idx_pairs_exit_trade",),
+        ),
+    ]
+    return cases
+
+
+def summarize_plan(explain_json: Any) -> PlanStats:
+    """Extrahiert Laufzeiten und genutzte Indexe aus EXPLAIN ... FORMAT JSON."""
+    document = explain_json[0] if isinstance(explain_json, list) else explain_json
+    root = document["Plan"]
+
+    indexes: set[str] = set()
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if "Index Name" in node:
+            indexes.add(node["Index Name"])
+        stack.extend(node.get("Plans", []))
+
+    return PlanStats(
+        execution_ms=float(document.get("Execution Time", 0.0)),
+        planning_ms=float(document.get("Planning Time", 0.0)),
+        node_type=root.get("Node Type", ""),
+        indexes_used=indexes,
+    )
+
+
+# ═══════════════════════════════════════════════════════════════
+# SYNTHETISCHER DATENSATZ
+# ═══════════════════════════════════════════════════════════════
+
+SEED_TRADES = """
+    INSERT INTO trades (
+        timestamp, action, symbol, price, quantity, value_usd,
+        fear_greed, market_trend, confidence,
+        outcome_1h, outcome_4h, outcome_24h, outcome_7d, was_good_decision,
+        cohort_id, cycle_id
+    )
+    SELECT
+        ts,
+        CASE WHEN random() < 0.5 THEN 'BUY' ELSE 'SELL' END,
+        (%(symbols)s::text[])[1 + g %% cardinality(%(symbols)s::text[])],
+        100 + random() * 10, 1, 100,
+        (random() * 100)::int,
+        (ARRAY['BULL', 'BEAR', 'SIDEWAYS'])[1 + g %% 3],
+        round(random()::numeric, 2),
+        -- Outcomes sind gesetzt, sobald das Fenster vorbei ist; ein kleiner
+        -- Anteil bleibt dauerhaft offen (kein Preis zum Bewertungszeitpunkt)
+        CASE WHEN ts < NOW() - INTERVAL '1 hour' AND stale > 0.02 THEN random() * 4 - 2 END,
+        CASE WHEN ts < NOW() - INTERVAL '4 hours' AND stale > 0.02 THEN random() * 6 - 3 END,
+        CASE WHEN ts < NOW() - INTERVAL '24 hours' AND stale > 0.02 THEN random() * 10 - 5 END,
+        CASE WHEN ts < NOW() - INTERVAL '7 days' AND stale > 0.02 THEN random() * 20 - 10 END,
+        CASE WHEN ts < NOW() - INTERVAL '24 hours' AND stale > 0.02 THEN random() < 0.55 END,
+        %(cohort_id)s,
+        (%(cycle_ids)s::uuid[])[1 + g %% cardinality(%(cycle_ids)s::uuid[])]
+    FROM (
+        SELECT g, random() AS stale,
+               NOW() - random() * %(days)s * INTERVAL '1 day' AS ts
+        FROM generate_series(1, %(trades)s) g
+    ) s
+"""
+
+SEED_TRADE_PAIRS = """
+    INSERT INTO trade_pairs (
+        cohort_id, cycle_id, symbol, entry_trade_id, entry_timestamp,
+        entry_price, entry_quantity, entry_value_usd, exit_trade_id, status, net_pnl
+    )
+    SELECT b.cohort_id, b.cycle_id, b.symbol, b.id, b.timestamp,
+           b.price, b.quantity, b.value_usd, s.id,
+           CASE WHEN s.id IS NULL THEN 'open' ELSE 'closed' END,
+           CASE WHEN s.id IS NOT NULL THEN random() * 20 - 10 END
+    FROM (
+        SELECT *, row_number() OVER (PARTITION BY symbol ORDER BY timestamp) AS n
+        FROM trades WHERE cohort_id = %(cohort_id)s AND action = 'BUY'
+    ) b
+    LEFT JOIN (
+        SELECT id, symbol, row_number() OVER (PARTITION BY symbol ORDER BY timestamp) AS n
+        FROM trades WHERE cohort_id = %(cohort_id)s AND action = 'SELL'
+    ) s ON s.symbol = b.symbol AND s.n = b.n
+"""
+
+
+def seed_synthetic_data(cur, trades: int, cycles: int, days: int, seed: float) -> str:
+    """
+    Legt Cohort, Zyklen, Trades und Trade-Pairs an (ohne Commit).
+
+    Returns:
+        ID des ersten Zyklus (Parameter für cycle_daily_returns)
+    """
+    cur.execute("SELECT setseed(%s)", (seed,))
+    cur.execute(
+        "INSERT INTO cohorts (name, config) VALUES (%s, '{}') RETURNING id",
+        (SYNTHETIC_COHORT,),
+    )
+    cohort_id = cur.fetchone()[0]
+    cur.execute(
+        """
+        INSERT INTO trading_cycles (cohort_id, cycle_number, start_date)
+        SELECT %s, g, NOW() - g * INTERVAL '7 days'
+        FROM generate_series(1, %s) g
+        RETURNING id
+        """,
+        (cohort_id, cycles),
+    )
+    cycle_ids = [str(row[0]) for row in cur.fetchall()]
+    params = {
+        "symbols": list(SYNTHETIC_SYMBOLS),
+        "cohort_id": cohort_id,
+        "cycle_ids": cycle_ids,
+        "days": days,
+        "trades": trades,
+    }
+    cur.execute(SEED_TRADES, params)
+    cur.execute(SEED_TRADE_PAIRS, params)
+    cur.execute("ANALYZE trades")
+    cur.execute("ANALYZE trade_pairs")
+    return cycle_ids[0]
+
+
+# ═══════════════════════════════════════════════════════════════
+# MESSUNG
+# ═══════════════════════════════════════════════════════════════
+
+
+def explain_case(cur, case: QueryCase, runs: int = 3) -> PlanStats:
+    """EXPLAIN ANALYZE einer Abfrage, bester von ``runs`` Läufen (warmer Cache)."""
+    best: PlanStats | None = None
+    for _ in range(runs):
+        cur.execute("SAVEPOINT index_advisor_case")
+        try:
+            cur.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {case.sql}", case.params)
+            stats = summarize_plan(cur.fetchone()[0])
+        finally:
+            cur.execute("ROLLBACK TO SAVEPOINT index_advisor_case")
+        if best is None or stats.execution_ms < best.execution_ms:
+            best = stats
+    return best
+
+
+def _set_candidates(cur, enabled: bool) -> None:
+    for candidate in CANDIDATE_INDEXES:
+        if enabled:
+            cur.execute(candidate.ddl)
+        else:
+            cur.execute(f"DROP INDEX IF EXISTS {candidate.name}")
+    for table in sorted({c.table for c in CANDIDATE_INDEXES}):
+        cur.execute(f"ANALYZE {table}")
+
+
+def run_benchmark(
+    conn, trades: int = 100_000, cycles: int = 12, days: int = 90, seed: float = 0.42
+) -> list[CaseResult]:
+    """
+    Misst alle Abfragen ohne und mit Kandidaten-Indexen.
+
+    Die Transaktion wird immer zurückgerollt: weder Daten noch Indexe bleiben.
+    """
+    try:
+        with conn.cursor() as cur:
+            cycle_id = seed_synthetic_data(cur, trades, cycles, days, seed)
+            cases = query_cases(cycle_id)
+
+            _set_candidates(cur, enabled=False)
+            before = {case.name: explain_case(cur, case) for case in cases}
+
+            _set_candidates(cur, enabled=True)
+            return [CaseResult(case, before[case.name], explain_case(cur, case)) for case in cases]
+    finally:
+        conn.rollback()
+
+
+def format_report(results: list[CaseResult]) -> str:
+    """Tabellarischer Bericht mit gerechtfertigten Indexen."""
+    lines = [
+        f"{'Abfrage':<28} {'ohne ms':>10} {'mit ms':>10} {'Speedup':>8}  Indexe (mit)",
+        "-" * 90,
+    ]
+    for r in results:
+        used = ", ".join(sorted(r.after.indexes_used)) or r.after.node_type
+        lines.append(
+            f"{r.case.name:<28} {r.before.execution_ms:>10.2f} {r.after.execution_ms:>10.2f} "
+            f"{r.speedup:>7.1f}x  {used}"
+        )
+
+    justified = set().union(*(r.justified for r in results)) if results else set()
+    lines.append("")
+    lines.append(f"Gerechtfertigt (>= {MIN_SPEEDUP}x und genutzt):")
+    for candidate in CANDIDATE_INDEXES:
+        mark = "✓" if candidate.name in justified else "✗"
+        lines.append(f"  {mark} {candidate.ddl}")
+    return "\n".join(lines)
+
+
+def apply_indexes(conn, names: set[str] | None = None) -> list[str]:
+    """
+    Migration bestehender Datenbanken: Kandidaten per CREATE INDEX CONCURRENTLY.
+
+    Args:
+        conn: Eigene (nicht gepoolte) Verbindung; wird auf autocommit gesetzt
+        names: Nur diese Kandidaten (Default: alle)
+
+    Returns:
+        Namen der angelegten bzw. bereits vorhandenen Indexe
+    """
+    applied = []
+    previous = conn.autocommit
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            for candidate in CANDIDATE_INDEXES:
+                if names is not None and candidate.name not in names:
+                    continue
+                cur.execute(candidate.concurrent_ddl)
+                applied.append(candidate.name)
+                logger.info(f"Index Advisor: {candidate.name} angelegt")
+    finally:
+        conn.autocommit = previous
+    return applied
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="EXPLAIN ANALYZE Benchmark der heißen Abfragen")
+    parser.add_argument("--trades", type=int, default=100_000, help="Synthetische Trades")
+    parser.add_argument("--cycles", type=int, default=12, help="Synthetische Zyklen")
+    parser.add_argument("--days", type=int, default=90, help="Zeitraum der Trades in Tagen")
+    parser.add_argument("--seed", type=float, default=0.42, help="setseed() für Reproduzierbarkeit")
+    parser.add_argument(
+        "--apply", action="store_true", help="Kandidaten CONCURRENTLY anlegen statt messen"
+    )
+    args = parser.parse_args(argv)
+
+    import psycopg2
+
+    from src.data.database import get_db
+
+    db = get_db()
+    conn = db.get_connection()
+    if conn is None:
+        print("Keine Datenbankverbindung (DATABASE_URL / POSTGRES_*)")
+        return 1
+
+    try:
+        if args.apply:
+            for name in apply_indexes(conn):
+                print(f"✓ {name}")
+        else:
+            results = run_benchmark(
+                conn, trades=args.trades, cycles=args.cycles, days=args.days, seed=args.seed
+            )
+            print(format_report(results))
+    except psycopg2.Error as e:
+        print(f"Index Advisor fehlgeschlagen: {e}")
+        return 1
+    finally:
+        db.return_connection(conn)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,6 +3,7 @@ Zentraler Market Data Provider.
 Konsolidiert alle Marktdaten-Abfragen mit Caching.
 """
 
+import json
 import logging
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -67,7 +68,8 @@ class MarketDataProvider(SingletonMixin):
             FearGreedData mit value (0-100), classification und timestamp
         """
         try:
-            data = self.http.get(self.config.api.fear_greed_url, api_type="default")
+            # Index ändert sich täglich → persistent cachen, danach 304-Revalidierung
+            data = self.http.get(self.config.api.fear_greed_url, api_type="default", cache_ttl=3600)
 
             fg_data = data["data"][0]
             value = int(fg_data["value"])
@@ -130,6 +132,52 @@ class MarketDataProvider(SingletonMixin):
             logger.warning(f"Price API error for {symbol}: {e}")
             return 0.0
 
+    def get_prices(self, symbols: list[str]) -> dict[str, float]:
+        """
+        Holt Preise für mehrere Symbole mit einem Ticker-Request.
+
+        Frische Cache-Einträge werden wiederverwendet. Schlägt der Sammel-Request
+        fehl (z.B. ein Symbol ist auf Binance nicht gelistet), wird pro Symbol
+        nachgeladen.
+
+        Returns:
+            {symbol: preis} - Symbole ohne gültigen Preis fehlen
+        """
+        now = datetime.now()
+        prices: dict[str, float] = {}
+        missing = []
+        for symbol in dict.fromkeys(symbols):
+            entry = self._price_cache.get(symbol)
+            if entry and now - entry[1] < timedelta(seconds=self._cache_ttl):
+                prices[symbol] = entry[0]
+            else:
+                missing.append(symbol)
+
+        if not missing:
+            return prices
+
+        try:
+            data = self.http.get(
+                "https://api.binance.com/api/v3/ticker/price",
+                params={"symbols": json.dumps(missing, separators=(",", ":"))},
+                api_type="binance",
+            )
+        except HTTPClientError as e:
+            logger.warning(f"Bulk price API error ({len(missing)} symbols): {e}")
+            for symbol in missing:
+                price = self.get_price(symbol)
+                if price > 0:
+                    prices[symbol] = price
+            return prices
+
+        for row in data:
+            price = float(row["price"])
+            if price > 0:
+                prices[row["symbol"]] = price
+                self._price_cache[row["symbol"]] = (price, now)
+
+        return prices
+
     @cached(ttl_seconds=300)
     def get_24h_ticker(self, symbol: str) -> PriceData | None:
         """
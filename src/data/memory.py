@@ -23,6 +23,31 @@ from datetime import datetime
 
 logger = logging.getLogger("trading_bot")
 
+# Kandidaten für find_similar_situations: F&G-Umfeld + letzte bewertete Trades.
+# Beide Zweige laufen über idx_trades_evaluated (Partial Index auf timestamp).
+SIMILAR_SITUATIONS_QUERY = """
+    (
+        SELECT timestamp, action, symbol, price, value_usd,
+               fear_greed, market_trend, reasoning,
+               outcome_24h, outcome_7d, was_good_decision
+        FROM trades
+        WHERE fear_greed BETWEEN %s AND %s
+        AND outcome_24h IS NOT NULL
+        ORDER BY timestamp DESC
+        LIMIT 500
+    )
+    UNION
+    (
+        SELECT timestamp, action, symbol, price, value_usd,
+               fear_greed, market_trend, reasoning,
+               outcome_24h, outcome_7d, was_good_decision
+        FROM trades
+        WHERE outcome_24h IS NOT NULL
+        ORDER BY timestamp DESC
+        LIMIT 500
+    )
+"""
+
 
 @dataclass
 class TradeRecord:
@@ -75,6 +100,34 @@ class MarketSnapshot:
     notable_news: str
 
 
+# Spalten für INSERT INTO trades (Reihenfolge = trade_values())
+TRADE_COLUMNS = (
+    "timestamp",
+    "action",
+    "symbol",
+    "price",
+    "quantity",
+    "value_usd",
+    "fear_greed",
+    "btc_price",
+    "symbol_24h_change",
+    "market_trend",
+    "math_signal",
+    "ai_signal",
+    "reasoning",
+    "fee_usd",
+    "expected_price",
+    "slippage_bps",
+)
+
+
+def trade_values(trade: TradeRecord | dict) -> tuple:
+    """Parameter-Tupel für TRADE_COLUMNS aus einem TradeRecord (oder dessen Dict)."""
+    if isinstance(trade, TradeRecord):
+        return tuple(getattr(trade, column) for column in TRADE_COLUMNS)
+    return tuple(trade.get(column) for column in TRADE_COLUMNS)
+
+
 class TradingMemory:
     """
     PostgreSQL-basiertes Gedächtnis für den Trading Bot.
@@ -113,34 +166,12 @@ class TradingMemory:
         try:
             with self.db.get_cursor(dict_cursor=False) as cur:
                 cur.execute(
-                    """
-                    INSERT INTO trades (
-                        timestamp, action, symbol, price, quantity, value_usd,
-                        fear_greed, btc_price, symbol_24h_change, market_trend,
-                        math_signal, ai_signal, reasoning, fee_usd,
-                        expected_price, slippage_bps
-                    ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                    ) RETURNING id
+                    f"""
+                    INSERT INTO trades ({", ".join(TRADE_COLUMNS)})
+                    VALUES ({", ".join(["%s"] * len(TRADE_COLUMNS))})
+                    RETURNING id
                 """,
-                    (
-                        trade.timestamp,
-                        trade.action,
-                        trade.symbol,
-                        trade.price,
-                        trade.quantity,
-                        trade.value_usd,
-                        trade.fear_greed,
-                        trade.btc_price,
-                        trade.symbol_24h_change,
-                        trade.market_trend,
-                        trade.math_signal,
-                        trade.ai_signal,
-                        trade.reasoning,
-                        trade.fee_usd,
-                        trade.expected_price,
-                        trade.slippage_bps,
-                    ),
+                    trade_values(trade),
                 )
                 trade_id = cur.fetchone()[0]
                 return trade_id
@@ -251,31 +282,7 @@ class TradingMemory:
         fg_max = min(100, fear_greed + 25)
 
         with self.db.get_cursor() as cur:
-            cur.execute(
-                """
-                (
-                    SELECT timestamp, action, symbol, price, value_usd,
-                           fear_greed, market_trend, reasoning,
-                           outcome_24h, outcome_7d, was_good_decision
-                    FROM trades
-                    WHERE fear_greed BETWEEN %s AND %s
-                    AND outcome_24h IS NOT NULL
-                    ORDER BY timestamp DESC
-                    LIMIT 500
-                )
-                UNION
-                (
-                    SELECT timestamp, action, symbol, price, value_usd,
-                           fear_greed, market_trend, reasoning,
-                           outcome_24h, outcome_7d, was_good_decision
-                    FROM trades
-                    WHERE outcome_24h IS NOT NULL
-                    ORDER BY timestamp DESC
-                    LIMIT 500
-                )
-                """,
-                [fg_min, fg_max],
-            )
+            cur.execute(SIMILAR_SITUATIONS_QUERY, [fg_min, fg_max])
             candidates = cur.fetchall()
 
         if not candidates:
@@ -18,6 +18,8 @@ from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
+from src.data.analytics_rollups import OVERALL_SIGNAL, UNKNOWN_REGIME, refresh_rollups
+
 logger = logging.getLogger("trading_bot")
 
 # PostgreSQL
@@ -311,17 +313,18 @@ Basiert auf: 0 Trades
         changes = []
         metrics = {}
 
+        # Rollups auf Stand bringen (nur geänderte Tage), Analyse liest nur Aggregate
+        refresh_rollups(self.conn)
+
         try:
             with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
                 # 1. Grundlegende Trade-Statistiken
                 cur.execute("""
                     SELECT
-                        COUNT(*) as total_trades,
-                        COUNT(CASE WHEN was_good_decision THEN 1 END) as good_trades,
-                        AVG(outcome_24h) as avg_return_24h,
-                        AVG(outcome_7d) as avg_return_7d
-                    FROM trades
-                    WHERE outcome_24h IS NOT NULL
+                        COALESCE(SUM(n_24h), 0) as total_trades,
+                        COALESCE(SUM(good_24h), 0) as good_trades,
+                        SUM(sum_24h) / NULLIF(SUM(n_24h), 0) as avg_return_24h
+                    FROM trade_rollup_daily
                 """)
                 stats = cur.fetchone()
                 metrics["total_trades"] = stats["total_trades"] or 0
@@ -383,7 +386,7 @@ Basiert auf: 0 Trades
         }
 
     def _analyze_signal_accuracy(self, cur) -> dict:
-        """Analysiert Signal-Accuracy aus signal_components.
+        """Analysiert Signal-Accuracy aus signal_rollup_daily.
 
         Returns per-signal accuracy rates and overall stats.
         Requires 10.1 (was_correct populated) to produce data.
@@ -400,71 +403,59 @@ Basiert auf: 0 Trades
             ("ai_direction_signal", "AI Direction"),
         ]
 
-        signals = []
+        # Eine Abfrage: Summen je Signal und Regime
+        cur.execute("""
+            SELECT
+                signal,
+                regime,
+                SUM(total) as total,
+                SUM(correct) as correct,
+                SUM(sum_strength) as sum_strength
+            FROM signal_rollup_daily
+            GROUP BY signal, regime
+        """)
 
-        for col, label in signal_columns:
-            cur.execute(
-                f"""
-                SELECT
-                    COUNT(*) as total,
-                    COUNT(CASE WHEN was_correct THEN 1 END) as correct,
-                    AVG(ABS({col})) as avg_strength
-                FROM signal_components
-                WHERE was_correct IS NOT NULL
-                AND ABS({col}) > 0.1
-                """,
-            )
-            result = cur.fetchone()
-            total = result["total"] or 0
+        totals: dict[str, list[float]] = {}  # signal -> [total, correct, sum_strength]
+        by_regime: dict[str, list[float]] = {}  # regime -> [total, correct] (overall)
+        for row in cur.fetchall():
+            total = int(row["total"] or 0)
+            correct = int(row["correct"] or 0)
+            acc = totals.setdefault(row["signal"], [0, 0, 0.0])
+            acc[0] += total
+            acc[1] += correct
+            acc[2] += float(row["sum_strength"] or 0)
+            if row["signal"] == OVERALL_SIGNAL and row["regime"] != UNKNOWN_REGIME:
+                r = by_regime.setdefault(row["regime"], [0, 0])
+                r[0] += total
+                r[1] += correct
 
+        signals = []
+        for col, label in signal_columns:
+            total, correct, sum_strength = totals.get(col, [0, 0, 0.0])
             if total >= self.MIN_TRADES_FOR_PATTERN:
-                accuracy = (result["correct"] or 0) / total * 100
                 signals.append(
                     {
                         "signal": label,
                         "column": col,
                         "total": total,
-                        "correct": result["correct"] or 0,
-                        "accuracy": accuracy,
-                        "avg_strength": float(result["avg_strength"] or 0),
+                        "correct": correct,
+                        "accuracy": correct / total * 100,
+                        "avg_strength": sum_strength / total,
                     }
                 )
 
         # Overall accuracy
-        cur.execute("""
-            SELECT
-                COUNT(*) as total,
-                COUNT(CASE WHEN was_correct THEN 1 END) as correct
-            FROM signal_components
-            WHERE was_correct IS NOT NULL
-        """)
-        overall = cur.fetchone()
-        overall_total = overall["total"] or 0
-        overall_accuracy = (
-            (overall["correct"] or 0) / overall_total * 100 if overall_total > 0 else 0
-        )
+        overall_total, overall_correct, _ = totals.get(OVERALL_SIGNAL, [0, 0, 0.0])
+        overall_accuracy = overall_correct / overall_total * 100 if overall_total > 0 else 0
 
         # Per-regime signal accuracy
         regime_accuracy = {}
         for regime in ["BULL", "BEAR", "SIDEWAYS"]:
-            cur.execute(
-                """
-                SELECT
-                    COUNT(*) as total,
-                    COUNT(CASE WHEN sc.was_correct THEN 1 END) as correct
-                FROM signal_components sc
-                JOIN trades t ON sc.trade_id = t.id
-                WHERE sc.was_correct IS NOT NULL
-                AND t.market_trend = %s
-                """,
-                (regime,),
-            )
-            r = cur.fetchone()
-            r_total = r["total"] or 0
+            r_total, r_correct = by_regime.get(regime, [0, 0])
             if r_total >= self.MIN_TRADES_FOR_PATTERN:
                 regime_accuracy[regime] = {
                     "total": r_total,
-                    "accuracy": (r["correct"] or 0) / r_total * 100,
+                    "accuracy": r_correct / r_total * 100,
                 }
 
         return {
@@ -488,47 +479,65 @@ Basiert auf: 0 Trades
 
         regimes = ["BULL", "BEAR", "SIDEWAYS", None]
 
-        for min_fg, max_fg, label in ranges:
+        # Eine Abfrage für alle Bereiche (Bucket = fear_greed / 20), Action und Regime
+        cur.execute(
+            """
+            SELECT
+                fear_greed / 20 as bucket,
+                action,
+                regime,
+                SUM(n_24h) as trades,
+                SUM(good_24h) as wins,
+                SUM(sum_24h) as sum_return,
+                SUM(sumsq_24h) as sumsq_return
+            FROM trade_rollup_daily
+            WHERE fear_greed >= 0 AND fear_greed < 100
+            AND action IN ('BUY', 'SELL')
+            AND regime <> %s
+            AND n_24h > 0
+            GROUP BY 1, 2, 3
+            """,
+            (UNKNOWN_REGIME,),
+        )
+
+        # (bucket, action, regime) -> [trades, wins, sum, sumsq]; regime None = alle
+        groups: dict[tuple, list[float]] = {}
+        for row in cur.fetchall():
+            values = (
+                int(row["trades"] or 0),
+                int(row["wins"] or 0),
+                float(row["sum_return"] or 0),
+                float(row["sumsq_return"] or 0),
+            )
+            for regime in (row["regime"], None):
+                acc = groups.setdefault((int(row["bucket"]), row["action"], regime), [0, 0, 0, 0])
+                for i, v in enumerate(values):
+                    acc[i] += v
+
+        for bucket, (min_fg, max_fg, label) in enumerate(ranges):
             for action in ["BUY", "SELL"]:
                 for regime in regimes:
-                    regime_filter = (
-                        "AND market_trend = %s" if regime else "AND market_trend IS NOT NULL"
+                    trades, wins, sum_return, sumsq_return = groups.get(
+                        (bucket, action, regime), [0, 0, 0.0, 0.0]
                     )
-                    params = [min_fg, max_fg, action]
-                    if regime:
-                        params.append(regime)
-
-                    cur.execute(
-                        f"""
-                        SELECT
-                            COUNT(*) as trades,
-                            COUNT(CASE WHEN was_good_decision THEN 1 END) as wins,
-                            AVG(outcome_24h) as avg_return,
-                            STDDEV(outcome_24h) as volatility
-                        FROM trades
-                        WHERE fear_greed >= %s AND fear_greed < %s
-                        AND action = %s
-                        {regime_filter}
-                        AND outcome_24h IS NOT NULL
-                        """,
-                        params,
+                    if trades < self.MIN_TRADES_FOR_PATTERN:
+                        continue
+
+                    avg_return = sum_return / trades
+                    variance = max(0.0, (sumsq_return - trades * avg_return**2) / (trades - 1))
+                    patterns.append(
+                        {
+                            "range": label,
+                            "min": min_fg,
+                            "max": max_fg,
+                            "action": action,
+                            "regime": regime or "ALL",
+                            "trades": trades,
+                            "success_rate": wins / trades * 100,
+                            "avg_return": avg_return,
+                            "volatility": variance**0.5,
+                        }
                     )
-                    result = cur.fetchone()
-
-                    if result["trades"] and result["trades"] >= self.MIN_TRADES_FOR_PATTERN:
-                        patterns.append(
-                            {
-                                "range": label,
-                                "min": min_fg,
-                                "max": max_fg,
-                                "action": action,
-                                "regime": regime or "ALL",
-                                "trades": result["trades"],
-                                "success_rate": result["wins"] / result["trades"] * 100,
-                                "avg_return": float(result["avg_return"] or 0),
-                                "volatility": float(result["volatility"] or 0),
-                            }
-                        )
 
         return patterns
 
@@ -539,14 +548,14 @@ Basiert auf: 0 Trades
             SELECT
                 symbol,
                 action,
-                COUNT(*) as trades,
-                COUNT(CASE WHEN was_good_decision THEN 1 END) as wins,
-                AVG(outcome_24h) as avg_return
-            FROM trades
-            WHERE outcome_24h IS NOT NULL
+                SUM(n_24h) as trades,
+                SUM(good_24h) as wins,
+                SUM(sum_24h) / SUM(n_24h) as avg_return
+            FROM trade_rollup_daily
+            WHERE n_24h > 0
             GROUP BY symbol, action
-            HAVING COUNT(*) >= %s
-            ORDER BY COUNT(*) DESC
+            HAVING SUM(n_24h) >= %s
+            ORDER BY SUM(n_24h) DESC
         """,
             (self.MIN_TRADES_FOR_PATTERN,),
         )
@@ -567,12 +576,12 @@ Basiert auf: 0 Trades
         # Wochentag-Analyse
         cur.execute("""
             SELECT
-                EXTRACT(DOW FROM timestamp) as day_of_week,
-                COUNT(*) as trades,
-                AVG(outcome_24h) as avg_return
-            FROM trades
-            WHERE outcome_24h IS NOT NULL
-            GROUP BY EXTRACT(DOW FROM timestamp)
+                EXTRACT(DOW FROM day) as day_of_week,
+                SUM(n_24h) as trades,
+                SUM(sum_24h) / SUM(n_24h) as avg_return
+            FROM trade_rollup_daily
+            WHERE n_24h > 0
+            GROUP BY EXTRACT(DOW FROM day)
             ORDER BY avg_return DESC
         """)
         weekday_data = cur.fetchall()
@@ -580,13 +589,13 @@ Basiert auf: 0 Trades
         # Stunden-Analyse
         cur.execute("""
             SELECT
-                EXTRACT(HOUR FROM timestamp) as hour,
-                COUNT(*) as trades,
-                AVG(outcome_24h) as avg_return
-            FROM trades
-            WHERE outcome_24h IS NOT NULL
-            GROUP BY EXTRACT(HOUR FROM timestamp)
-            HAVING COUNT(*) >= 3
+                hour,
+                SUM(n_24h) as trades,
+                SUM(sum_24h) / SUM(n_24h) as avg_return
+            FROM trade_rollup_daily
+            WHERE n_24h > 0
+            GROUP BY hour
+            HAVING SUM(n_24h) >= 3
             ORDER BY avg_return DESC
             LIMIT 5
         """)
@@ -605,19 +614,18 @@ Basiert auf: 0 Trades
             cur.execute(
                 """
                 SELECT
-                    fear_greed,
+                    NULLIF(fear_greed, -1) as fear_greed,
                     action,
                     symbol,
-                    market_trend,
-                    COUNT(*) as trades,
-                    AVG(outcome_24h) as avg_return
-                FROM trades
-                WHERE outcome_24h IS NOT NULL
-                AND was_good_decision = FALSE
-                AND market_trend = %s
-                GROUP BY fear_greed, action, symbol, market_trend
-                HAVING COUNT(*) >= %s AND AVG(outcome_24h) < -1
-                ORDER BY AVG(outcome_24h) ASC
+                    regime as market_trend,
+                    SUM(bad_24h) as trades,
+                    SUM(bad_sum_24h) / SUM(bad_24h) as avg_return
+                FROM trade_rollup_daily
+                WHERE bad_24h > 0
+                AND regime = %s
+                GROUP BY 1, 2, 3, 4
+                HAVING SUM(bad_24h) >= %s AND SUM(bad_sum_24h) / SUM(bad_24h) < -1
+                ORDER BY avg_return ASC
                 LIMIT 5
                 """,
                 (regime, self.MIN_TRADES_FOR_PATTERN),
@@ -639,13 +647,14 @@ Basiert auf: 0 Trades
         cur.execute(
             """
             SELECT
-                fear_greed, action, symbol, market_trend,
-                COUNT(*) as trades, AVG(outcome_24h) as avg_return
-            FROM trades
-            WHERE outcome_24h IS NOT NULL AND was_good_decision = FALSE
-            GROUP BY fear_greed, action, symbol, market_trend
-            HAVING COUNT(*) >= %s AND AVG(outcome_24h) < -1
-            ORDER BY AVG(outcome_24h) ASC
+                NULLIF(fear_greed, -1) as fear_greed, action, symbol,
+                NULLIF(regime, '') as market_trend,
+                SUM(bad_24h) as trades, SUM(bad_sum_24h) / SUM(bad_24h) as avg_return
+            FROM trade_rollup_daily
+            WHERE bad_24h > 0
+            GROUP BY 1, 2, 3, 4
+            HAVING SUM(bad_24h) >= %s AND SUM(bad_sum_24h) / SUM(bad_24h) < -1
+            ORDER BY avg_return ASC
             LIMIT 10
             """,
             (self.MIN_TRADES_FOR_PATTERN,),
@@ -672,21 +681,19 @@ Basiert auf: 0 Trades
             cur.execute(
                 """
                 SELECT
-                    fear_greed,
+                    NULLIF(fear_greed, -1) as fear_greed,
                     action,
                     symbol,
-                    market_trend,
-                    COUNT(*) as trades,
-                    AVG(outcome_24h) as avg_return,
-                    COUNT(CASE WHEN was_good_decision THEN 1 END)::float
-                        / COUNT(*) as win_rate
-                FROM trades
-                WHERE outcome_24h IS NOT NULL
-                AND was_good_decision = TRUE
-                AND market_trend = %s
-                GROUP BY fear_greed, action, symbol, market_trend
-                HAVING COUNT(*) >= %s AND AVG(outcome_24h) > 1
-                ORDER BY win_rate DESC, AVG(outcome_24h) DESC
+                    regime as market_trend,
+                    SUM(good_24h) as trades,
+                    SUM(good_sum_24h) / SUM(good_24h) as avg_return,
+                    1.0::float as win_rate
+                FROM trade_rollup_daily
+                WHERE good_24h > 0
+                AND regime = %s
+                GROUP BY 1, 2, 3, 4
+                HAVING SUM(good_24h) >= %s AND SUM(good_sum_24h) / SUM(good_24h) > 1
+                ORDER BY win_rate DESC, avg_return DESC
                 LIMIT 5
                 """,
                 (regime, self.MIN_TRADES_FOR_PATTERN),
@@ -709,14 +716,15 @@ Basiert auf: 0 Trades
         cur.execute(
             """
             SELECT
-                fear_greed, action, symbol, market_trend,
-                COUNT(*) as trades, AVG(outcome_24h) as avg_return,
-                COUNT(CASE WHEN was_good_decision THEN 1 END)::float / COUNT(*) as win_rate
-            FROM trades
-            WHERE outcome_24h IS NOT NULL AND was_good_decision = TRUE
-            GROUP BY fear_greed, action, symbol, market_trend
-            HAVING COUNT(*) >= %s AND AVG(outcome_24h) > 1
-            ORDER BY win_rate DESC, AVG(outcome_24h) DESC
+                NULLIF(fear_greed, -1) as fear_greed, action, symbol,
+                NULLIF(regime, '') as market_trend,
+                SUM(good_24h) as trades, SUM(good_sum_24h) / SUM(good_24h) as avg_return,
+                1.0::float as win_rate
+            FROM trade_rollup_daily
+            WHERE good_24h > 0
+            GROUP BY 1, 2, 3, 4
+            HAVING SUM(good_24h) >= %s AND SUM(good_sum_24h) / SUM(good_24h) > 1
+            ORDER BY win_rate DESC, avg_return DESC
             LIMIT 10
             """,
             (self.MIN_TRADES_FOR_PATTERN,),
@@ -57,7 +57,7 @@ class FearGreedIndex:
     def get_current(self) -> dict:
         """Aktueller Fear & Greed Index"""
         try:
-            data = self.http.get(self.config.api.fear_greed_url, api_type="default")
+            data = self.http.get(self.config.api.fear_greed_url, api_type="default", cache_ttl=3600)
             fg_data = data["data"][0]
 
             return {
@@ -17,6 +17,7 @@ from typing import Any
 
 from dotenv import load_dotenv
 
+from src.data.database import get_pooled_connection
 from src.utils.singleton import SingletonMixin
 
 load_dotenv()
@@ -24,7 +25,6 @@ load_dotenv()
 logger = logging.getLogger("trading_bot")
 
 try:
-    import psycopg2
     from psycopg2.extras import RealDictCursor
 
     POSTGRES_AVAILABLE = True
@@ -41,9 +41,11 @@ except ImportError:
 
 # HTTP Client aus dem Projekt
 try:
-    from src.api.http_client import get_http_client
+    from src.api.async_http_client import get_async_http_client
+    from src.api.http_client import HTTPClientError, get_http_client
 except ImportError:
     get_http_client = None
+    get_async_http_client = None
 
 
 @dataclass
@@ -105,9 +107,8 @@ class SocialSentimentProvider(SingletonMixin):
             return
 
         try:
-            database_url = os.getenv("DATABASE_URL")
-            if database_url:
-                self.conn = psycopg2.connect(database_url)
+            self.conn = get_pooled_connection()
+            if self.conn:
                 logger.info("SocialSentimentProvider: DB verbunden")
         except Exception as e:
             logger.error(f"SocialSentimentProvider: DB Fehler: {e}")
@@ -158,29 +159,64 @@ class SocialSentimentProvider(SingletonMixin):
             return None
 
         try:
-            url = f"{self.LUNARCRUSH_BASE_URL}/coins/{symbol.lower()}/v1"
-            headers = {"Authorization": f"Bearer {self.lunarcrush_key}"}
-
-            response = self.http.get(url, headers=headers, timeout=10)
-
-            if response and "data" in response:
-                data = response["data"]
-                return {
-                    "galaxy_score": data.get("galaxy_score"),
-                    "alt_rank": data.get("alt_rank"),
-                    "social_volume": data.get("social_volume"),
-                    "social_engagement": data.get("social_engagement"),
-                    "social_contributors": data.get("social_contributors"),
-                    "social_dominance": data.get("social_dominance"),
-                    "sentiment": data.get("sentiment"),  # 0-5 scale
-                    "categories": data.get("categories", []),
-                }
+            response = self.http.get(**self._lunarcrush_request(symbol))
+            return self._parse_lunarcrush(response)
 
+        except Exception as e:
+            logger.error(f"LunarCrush API Fehler für {symbol}: {e}")
             return None
 
+    def get_lunarcrush_metrics_many(self, symbols: list[str]) -> dict[str, dict[str, Any] | None]:
+        """LunarCrush Metriken für mehrere Symbole, parallel über den AsyncHTTPClient."""
+        if not self.http or not self.lunarcrush_key:
+            logger.debug("LunarCrush: HTTP Client oder API Key nicht verfügbar")
+            return dict.fromkeys(symbols)
+
+        try:
+            responses = get_async_http_client().fetch_all(
+                [self._lunarcrush_request(symbol) for symbol in symbols]
+            )
         except Exception as e:
-            logger.error(f"LunarCrush API Fehler für {symbol}: {e}")
+            # Transportfehler des Bulk-Calls: pro Symbol einzeln, Fehler bleiben isoliert
+            logger.warning(f"LunarCrush Bulk-Abruf fehlgeschlagen, hole einzeln: {e}")
+            return {symbol: self.get_lunarcrush_metrics(symbol) for symbol in symbols}
+
+        metrics: dict[str, dict[str, Any] | None] = {}
+        for symbol, response in zip(symbols, responses, strict=True):
+            if isinstance(response, HTTPClientError):
+                logger.error(f"LunarCrush API Fehler für {symbol}: {response}")
+                metrics[symbol] = None
+                continue
+            try:
+                metrics[symbol] = self._parse_lunarcrush(response)
+            except Exception as e:
+                logger.error(f"LunarCrush Antwort für {symbol} unlesbar: {e}")
+                metrics[symbol] = None
+        return metrics
+
+    def _lunarcrush_request(self, symbol: str) -> dict[str, Any]:
+        """Request-Spec für get()/fetch_all()"""
+        return {
+            "url": f"{self.LUNARCRUSH_BASE_URL}/coins/{symbol.lower()}/v1",
+            "headers": {"Authorization": f"Bearer {self.lunarcrush_key}"},
+            "timeout": 10,
+        }
+
+    @staticmethod
+    def _parse_lunarcrush(response: Any) -> dict[str, Any] | None:
+        if not response or "data" not in response:
             return None
+        data = response["data"]
+        return {
+            "galaxy_score": data.get("galaxy_score"),
+            "alt_rank": data.get("alt_rank"),
+            "social_volume": data.get("social_volume"),
+            "social_engagement": data.get("social_engagement"),
+            "social_contributors": data.get("social_contributors"),
+            "social_dominance": data.get("social_dominance"),
+            "sentiment": data.get("sentiment"),  # 0-5 scale
+            "categories": data.get("categories", []),
+        }
 
     # ═══════════════════════════════════════════════════════════════
     # REDDIT API
@@ -343,10 +379,16 @@ class SocialSentimentProvider(SingletonMixin):
         - Reddit Sentiment (30%)
         - Reddit Activity (10%)
         """
+        return self._aggregate_sentiment(symbol, self.get_lunarcrush_metrics(symbol))
+
+    def get_aggregated_sentiments(self, symbols: list[str]) -> dict[str, SocialMetrics]:
+        """Wie get_aggregated_sentiment(), LunarCrush für alle Symbole parallel."""
+        lunarcrush = self.get_lunarcrush_metrics_many(symbols)
+        return {symbol: self._aggregate_sentiment(symbol, lunarcrush[symbol]) for symbol in symbols}
+
+    def _aggregate_sentiment(self, symbol: str, lunarcrush: dict[str, Any] | None) -> SocialMetrics:
         timestamp = datetime.now()
 
-        # Hole Daten aus allen Quellen
-        lunarcrush = self.get_lunarcrush_metrics(symbol)
         reddit = self.get_reddit_sentiment(symbol)
 
         # LunarCrush Metriken
@@ -608,9 +650,10 @@ class SocialSentimentProvider(SingletonMixin):
         if symbols is None:
             symbols = ["BTC", "ETH", "SOL", "AVAX", "LINK"]
 
+        lunarcrush = self.get_lunarcrush_metrics_many(symbols)
         for symbol in symbols:
             try:
-                metrics = self.get_aggregated_sentiment(symbol)
+                metrics = self._aggregate_sentiment(symbol, lunarcrush[symbol])
                 self.store_metrics(metrics)
                 logger.info(f"Social Sentiment für {symbol}: {metrics.composite_sentiment:.2f}")
             except Exception as e:
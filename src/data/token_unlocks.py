@@ -21,6 +21,7 @@ from typing import Any
 
 from dotenv import load_dotenv
 
+from src.data.database import get_pooled_connection
 from src.utils.singleton import SingletonMixin
 
 load_dotenv()
@@ -28,7 +29,6 @@ load_dotenv()
 logger = logging.getLogger("trading_bot")
 
 try:
-    import psycopg2
     from psycopg2.extras import RealDictCursor
 
     POSTGRES_AVAILABLE = True
@@ -116,9 +116,8 @@ class TokenUnlockTracker(SingletonMixin):
             return
 
         try:
-            database_url = os.getenv("DATABASE_URL")
-            if database_url:
-                self.conn = psycopg2.connect(database_url)
+            self.conn = get_pooled_connection()
+            if self.conn:
                 logger.info("TokenUnlockTracker: DB verbunden")
         except Exception as e:
             logger.error(f"TokenUnlockTracker: DB Fehler: {e}")
@@ -168,7 +167,9 @@ class TokenUnlockTracker(SingletonMixin):
                 "limit": 100,
             }
 
-            response = self.http.get(url, params=params, headers=headers, timeout=10)
+            response = self.http.get(
+                url, params=params, headers=headers, timeout=10, cache_ttl=6 * 3600
+            )
 
             if response and "data" in response:
                 unlocks = []
@@ -5,6 +5,21 @@ from datetime import datetime
 
 logger = logging.getLogger("trading_bot")
 
+# Columns set when a pair is opened (status / position_type are literals)
+OPEN_PAIR_COLUMNS = (
+    "cohort_id",
+    "symbol",
+    "entry_trade_id",
+    "entry_timestamp",
+    "entry_price",
+    "entry_quantity",
+    "entry_value_usd",
+    "entry_fee_usd",
+    "remaining_quantity",
+    "status",
+    "position_type",
+)
+
 
 class TradePairTracker:
     """Tracks BUY→SELL trade pairs in the ``trade_pairs`` table.
@@ -46,32 +61,21 @@ class TradePairTracker:
             return None
 
         try:
-            entry_value = entry_price * entry_qty
             with self.db.get_cursor(dict_cursor=False) as cur:
                 cur.execute(
-                    """
-                    INSERT INTO trade_pairs (
-                        cohort_id, symbol,
-                        entry_trade_id, entry_timestamp, entry_price,
-                        entry_quantity, entry_value_usd, entry_fee_usd,
-                        remaining_quantity, status, position_type
-                    ) VALUES (
-                        %s, %s,
-                        %s, %s, %s,
-                        %s, %s, %s,
-                        %s, 'open', 'LONG'
-                    ) RETURNING id
+                    f"""
+                    INSERT INTO trade_pairs ({", ".join(OPEN_PAIR_COLUMNS)})
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, 'open', 'LONG')
+                    RETURNING id
                     """,
-                    (
+                    self.open_pair_row(
                         self.cohort_id,
                         symbol,
-                        str(entry_trade_id) if entry_trade_id else None,
-                        datetime.now(),
-                        entry_price,
-                        entry_qty,
-                        entry_value,
-                        entry_fee,
-                        entry_qty,
+                        entry_trade_id,
+                        entry_timestamp=datetime.now(),
+                        entry_price=entry_price,
+                        entry_qty=entry_qty,
+                        entry_fee=entry_fee,
                     ),
                 )
                 row = cur.fetchone()
@@ -85,6 +89,43 @@ class TradePairTracker:
             logger.warning(f"TradePairTracker.open_pair failed: {e}")
             return None
 
+    @staticmethod
+    def open_pair_row(
+        cohort_id: str | None,
+        symbol: str,
+        entry_trade_id: str | int | None,
+        *,
+        entry_timestamp: datetime,
+        entry_price: float,
+        entry_qty: float,
+        entry_fee: float,
+    ) -> tuple:
+        """Parameter for one open pair, ordered like ``OPEN_PAIR_COLUMNS``."""
+        return (
+            cohort_id,
+            symbol,
+            str(entry_trade_id) if entry_trade_id else None,
+            entry_timestamp,
+            entry_price,
+            entry_qty,
+            entry_price * entry_qty,
+            entry_fee,
+            entry_qty,
+        )
+
+    @staticmethod
+    def insert_open_pairs(cur, rows: list[tuple]) -> None:
+        """Bulk-insert open pairs (rows from ``open_pair_row``) with one statement."""
+        from psycopg2.extras import execute_values
+
+        execute_values(
+            cur,
+            f"INSERT INTO trade_pairs ({', '.join(OPEN_PAIR_COLUMNS)}) VALUES %s",
+            rows,
+            template="(%s, %s, %s, %s, %s, %s, %s, %s, %s, 'open', 'LONG')",
+            page_size=max(len(rows), 1),
+        )
+
     # ------------------------------------------------------------------
     # Close the oldest open pair for a symbol (on SELL fill)
     # ------------------------------------------------------------------
@@ -104,83 +145,107 @@ class TradePairTracker:
 
         try:
             with self.db.get_cursor(dict_cursor=False) as cur:
-                # Find oldest open pair for this symbol + cohort
-                cur.execute(
-                    """
-                    SELECT id, entry_price, entry_quantity, entry_value_usd,
-                           entry_fee_usd, entry_timestamp
-                    FROM trade_pairs
-                    WHERE symbol = %s AND status = 'open'
-                      AND (cohort_id = %s OR (cohort_id IS NULL AND %s IS NULL))
-                    ORDER BY entry_timestamp ASC
-                    LIMIT 1
-                    """,
-                    (symbol, self.cohort_id, self.cohort_id),
+                return self.close_oldest_pair(
+                    cur,
+                    self.cohort_id,
+                    symbol,
+                    exit_trade_id=exit_trade_id,
+                    exit_price=exit_price,
+                    exit_qty=exit_qty,
+                    exit_fee=exit_fee,
+                    exit_reason=exit_reason,
+                    now=datetime.now(),
                 )
-                row = cur.fetchone()
-                if not row:
-                    logger.debug(f"No open pair to close for {symbol}")
-                    return False
-
-                pair_id = row[0]
-                entry_price_db = float(row[1])
-                entry_qty_db = float(row[2])
-                entry_value = float(row[3])
-                entry_fee = float(row[4])
-                entry_ts = row[5]
-
-                now = datetime.now()
-                exit_value = exit_price * exit_qty
-                gross_pnl = exit_value - entry_value
-                net_pnl = gross_pnl - entry_fee - exit_fee
-                pnl_pct = (net_pnl / entry_value * 100) if entry_value > 0 else 0.0
-                hold_hours = (now - entry_ts).total_seconds() / 3600 if entry_ts else 0.0
-
-                cur.execute(
-                    """
-                    UPDATE trade_pairs SET
-                        exit_trade_id = %s,
-                        exit_timestamp = %s,
-                        exit_price = %s,
-                        exit_quantity = %s,
-                        exit_value_usd = %s,
-                        exit_fee_usd = %s,
-                        gross_pnl = %s,
-                        net_pnl = %s,
-                        pnl_pct = %s,
-                        hold_duration_hours = %s,
-                        exit_reason = %s,
-                        status = 'closed',
-                        remaining_quantity = 0,
-                        updated_at = %s
-                    WHERE id = %s
-                    """,
-                    (
-                        str(exit_trade_id) if exit_trade_id else None,
-                        now,
-                        exit_price,
-                        exit_qty,
-                        exit_value,
-                        exit_fee,
-                        gross_pnl,
-                        net_pnl,
-                        pnl_pct,
-                        hold_hours,
-                        exit_reason,
-                        now,
-                        pair_id,
-                    ),
-                )
-                logger.info(
-                    f"Trade pair closed: {symbol} entry@{entry_price_db:.4f} "
-                    f"exit@{exit_price:.4f} P&L={net_pnl:+.4f}$ ({pnl_pct:+.2f}%) "
-                    f"held {hold_hours:.1f}h (pair {pair_id})"
-                )
-                return True
         except Exception as e:
             logger.warning(f"TradePairTracker.close_pair failed: {e}")
             return False
 
+    @staticmethod
+    def close_oldest_pair(
+        cur,
+        cohort_id: str | None,
+        symbol: str,
+        *,
+        exit_trade_id: str | int | None,
+        exit_price: float,
+        exit_qty: float,
+        exit_fee: float,
+        exit_reason: str,
+        now: datetime,
+    ) -> bool:
+        """Close the oldest open pair on an existing cursor (caller commits)."""
+        # Find oldest open pair for this symbol + cohort
+        cur.execute(
+            """
+            SELECT id, entry_price, entry_quantity, entry_value_usd,
+                   entry_fee_usd, entry_timestamp
+            FROM trade_pairs
+            WHERE symbol = %s AND status = 'open'
+              AND (cohort_id = %s OR (cohort_id IS NULL AND %s IS NULL))
+            ORDER BY entry_timestamp ASC
+            LIMIT 1
+            """,
+            (symbol, cohort_id, cohort_id),
+        )
+        row = cur.fetchone()
+        if not row:
+            logger.debug(f"No open pair to close for {symbol}")
+            return False
+
+        pair_id = row[0]
+        entry_price_db = float(row[1])
+        entry_value = float(row[3])
+        entry_fee = float(row[4])
+        entry_ts = row[5]
+
+        exit_value = exit_price * exit_qty
+        gross_pnl = exit_value - entry_value
+        net_pnl = gross_pnl - entry_fee - exit_fee
+        pnl_pct = (net_pnl / entry_value * 100) if entry_value > 0 else 0.0
+        hold_hours = (now - entry_ts).total_seconds() / 3600 if entry_ts else 0.0
+
+        cur.execute(
+            """
+            UPDATE trade_pairs SET
+                exit_trade_id = %s,
+                exit_timestamp = %s,
+                exit_price = %s,
+                exit_quantity = %s,
+                exit_value_usd = %s,
+                exit_fee_usd = %s,
+                gross_pnl = %s,
+                net_pnl = %s,
+                pnl_pct = %s,
+                hold_duration_hours = %s,
+                exit_reason = %s,
+                status = 'closed',
+                remaining_quantity = 0,
+                updated_at = %s
+            WHERE id = %s
+            """,
+            (
+                str(exit_trade_id) if exit_trade_id else None,
+                now,
+                exit_price,
+                exit_qty,
+                exit_value,
+                exit_fee,
+                gross_pnl,
+                net_pnl,
+                pnl_pct,
+                hold_hours,
+                exit_reason,
+                now,
+                pair_id,
+            ),
+        )
+        logger.info(
+            f"Trade pair closed: {symbol} entry@{entry_price_db:.4f} "
+            f"exit@{exit_price:.4f} P&L={net_pnl:+.4f}$ ({pnl_pct:+.2f}%) "
+            f"held {hold_hours:.1f}h (pair {pair_id})"
+        )
+        return True
+
     # ------------------------------------------------------------------
     # Close ALL open pairs for a symbol (stop-loss / cash exit)
     # ------------------------------------------------------------------
@@ -197,75 +262,94 @@ class TradePairTracker:
             return 0
 
         try:
-            now = datetime.now()
             with self.db.get_cursor(dict_cursor=False) as cur:
-                cur.execute(
-                    """
-                    SELECT id, entry_price, entry_quantity, entry_value_usd,
-                           entry_fee_usd, entry_timestamp
-                    FROM trade_pairs
-                    WHERE symbol = %s AND status = 'open'
-                      AND (cohort_id = %s OR (cohort_id IS NULL AND %s IS NULL))
-                    ORDER BY entry_timestamp ASC
-                    """,
-                    (symbol, self.cohort_id, self.cohort_id),
+                return self.close_symbol_pairs(
+                    cur,
+                    self.cohort_id,
+                    symbol,
+                    exit_price=exit_price,
+                    exit_reason=exit_reason,
+                    now=datetime.now(),
                 )
-                open_pairs = cur.fetchall()
-                if not open_pairs:
-                    return 0
+        except Exception as e:
+            logger.warning(f"TradePairTracker.close_pairs_by_symbol failed: {e}")
+            return 0
+
+    @staticmethod
+    def close_symbol_pairs(
+        cur,
+        cohort_id: str | None,
+        symbol: str,
+        *,
+        exit_price: float,
+        exit_reason: str,
+        now: datetime,
+    ) -> int:
+        """Close all open pairs for *symbol* on an existing cursor (caller commits)."""
+        cur.execute(
+            """
+            SELECT id, entry_price, entry_quantity, entry_value_usd,
+                   entry_fee_usd, entry_timestamp
+            FROM trade_pairs
+            WHERE symbol = %s AND status = 'open'
+              AND (cohort_id = %s OR (cohort_id IS NULL AND %s IS NULL))
+            ORDER BY entry_timestamp ASC
+            """,
+            (symbol, cohort_id, cohort_id),
+        )
+        open_pairs = cur.fetchall()
+        if not open_pairs:
+            return 0
 
-                closed = 0
-                for row in open_pairs:
-                    pair_id = row[0]
-                    entry_value = float(row[3])
-                    entry_fee = float(row[4])
-                    entry_ts = row[5]
-                    entry_qty_db = float(row[2])
+        closed = 0
+        for row in open_pairs:
+            pair_id = row[0]
+            entry_value = float(row[3])
+            entry_fee = float(row[4])
+            entry_ts = row[5]
+            entry_qty_db = float(row[2])
 
-                    pair_exit_value = exit_price * entry_qty_db
-                    gross_pnl = pair_exit_value - entry_value
-                    net_pnl = gross_pnl - entry_fee
-                    pnl_pct = (net_pnl / entry_value * 100) if entry_value > 0 else 0.0
-                    hold_hours = (now - entry_ts).total_seconds() / 3600 if entry_ts else 0.0
+            pair_exit_value = exit_price * entry_qty_db
+            gross_pnl = pair_exit_value - entry_value
+            net_pnl = gross_pnl - entry_fee
+            pnl_pct = (net_pnl / entry_value * 100) if entry_value > 0 else 0.0
+            hold_hours = (now - entry_ts).total_seconds() / 3600 if entry_ts else 0.0
 
-                    cur.execute(
-                        """
-                        UPDATE trade_pairs SET
-                            exit_timestamp = %s,
-                            exit_price = %s,
-                            exit_quantity = %s,
-                            exit_value_usd = %s,
-                            gross_pnl = %s,
-                            net_pnl = %s,
-                            pnl_pct = %s,
-                            hold_duration_hours = %s,
-                            exit_reason = %s,
-                            status = 'closed',
-                            remaining_quantity = 0,
-                            updated_at = %s
-                        WHERE id = %s
-                        """,
-                        (
-                            now,
-                            exit_price,
-                            entry_qty_db,
-                            pair_exit_value,
-                            gross_pnl,
-                            net_pnl,
-                            pnl_pct,
-                            hold_hours,
-                            exit_reason,
-                            now,
-                            pair_id,
-                        ),
-                    )
-                    closed += 1
+            cur.execute(
+                """
+                UPDATE trade_pairs SET
+                    exit_timestamp = %s,
+                    exit_price = %s,
+                    exit_quantity = %s,
+                    exit_value_usd = %s,
+                    gross_pnl = %s,
+                    net_pnl = %s,
+                    pnl_pct = %s,
+                    hold_duration_hours = %s,
+                    exit_reason = %s,
+                    status = 'closed',
+                    remaining_quantity = 0,
+                    updated_at = %s
+                WHERE id = %s
+                """,
+                (
+                    now,
+                    exit_price,
+                    entry_qty_db,
+                    pair_exit_value,
+                    gross_pnl,
+                    net_pnl,
+                    pnl_pct,
+                    hold_hours,
+                    exit_reason,
+                    now,
+                    pair_id,
+                ),
+            )
+            closed += 1
 
-                logger.info(
-                    f"Closed {closed} trade pairs for {symbol} "
-                    f"(reason={exit_reason}, price={exit_price:.4f})"
-                )
-                return closed
-        except Exception as e:
-            logger.warning(f"TradePairTracker.close_pairs_by_symbol failed: {e}")
-            return 0
+        logger.info(
+            f"Closed {closed} trade pairs for {symbol} "
+            f"(reason={exit_reason}, price={exit_price:.4f})"
+        )
+        return closed
@@ -11,13 +11,13 @@ Verwaltet das Coin-Universum:
 from __future__ import annotations
 
 import logging
-import os
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from decimal import Decimal
 
 from dotenv import load_dotenv
 
+from src.data.database import get_pooled_connection
 from src.utils.singleton import SingletonMixin
 
 load_dotenv()
@@ -26,7 +26,6 @@ logger = logging.getLogger("trading_bot")
 
 # PostgreSQL
 try:
-    import psycopg2
     from psycopg2.extras import RealDictCursor
 
     POSTGRES_AVAILABLE = True
@@ -114,17 +113,10 @@ class WatchlistManager(SingletonMixin):
             return False
 
         try:
-            database_url = os.getenv("DATABASE_URL")
-            if database_url:
-                self.conn = psycopg2.connect(database_url)
-            else:
-                self.conn = psycopg2.connect(
-                    host=os.getenv("POSTGRES_HOST", "localhost"),
-                    port=os.getenv("POSTGRES_PORT", 5432),
-                    database=os.getenv("POSTGRES_DB", "trading_bot"),
-                    user=os.getenv("POSTGRES_USER", "trading"),
-                    password=os.getenv("POSTGRES_PASSWORD", ""),
-                )
+            self.conn = get_pooled_connection()
+            if not self.conn:
+                logger.warning("WatchlistManager: DatabaseManager Pool nicht verfügbar")
+                return False
             logger.info("WatchlistManager: PostgreSQL verbunden")
             return True
         except Exception as e:
@@ -225,9 +217,9 @@ class WatchlistManager(SingletonMixin):
 
         if binance_client is None:
             try:
-                from src.api.binance_client import BinanceClient
+                from src.api.binance_client import get_binance_client
 
-                binance_client = BinanceClient()
+                binance_client = get_binance_client()
             except Exception as e:
                 logger.error(f"WatchlistManager: BinanceClient nicht verfügbar: {e}")
                 return 0
@@ -353,9 +345,9 @@ class WatchlistManager(SingletonMixin):
 
         if binance_client is None:
             try:
-                from src.api.binance_client import BinanceClient
+                from src.api.binance_client import get_binance_client
 
-                binance_client = BinanceClient()
+                binance_client = get_binance_client()
             except Exception:
                 return None
 
@@ -17,6 +17,7 @@ import logging
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
+from src.api.async_http_client import get_async_http_client
 from src.api.http_client import HTTPClientError, get_http_client
 from src.core.config import get_config
 
@@ -137,10 +138,21 @@ class WhaleAlertTracker:
         threshold_btc = self.config.whale.min_btc_amount
 
         try:
-            # Hole aktuelle unbestätigte Transaktionen
-            data = self.http.get(self.config.api.blockchain_url, api_type="blockchain")
+            # Unbestätigte Transaktionen und BTC-Preis parallel holen
+            data, price_data = get_async_http_client().fetch_all(
+                [
+                    {"url": self.config.api.blockchain_url, "api_type": "blockchain"},
+                    {
+                        "url": f"{self.config.api.coingecko_url}/simple/price",
+                        "params": {"ids": "bitcoin", "vs_currencies": "usd"},
+                        "api_type": "default",
+                    },
+                ]
+            )
+            if isinstance(data, HTTPClientError):
+                raise data
 
-            btc_price = self._get_btc_price()
+            btc_price = self._parse_btc_price(price_data)
 
             for tx in data.get("txs", [])[:50]:  # Maximal 50 prüfen
                 # Berechne Gesamtoutput
@@ -179,18 +191,16 @@ class WhaleAlertTracker:
 
         return whales
 
-    def _get_btc_price(self) -> float:
-        """Holt aktuellen BTC Preis"""
+    def _parse_btc_price(self, data) -> float:
+        """BTC Preis aus der CoinGecko-Antwort (HTTPClientError bei Fehlschlag)"""
+        if isinstance(data, HTTPClientError):
+            logger.warning(f"BTC Price API Error: {data}")
+            return 100000  # Fallback
         try:
-            data = self.http.get(
-                f"{self.config.api.coingecko_url}/simple/price",
-                params={"ids": "bitcoin", "vs_currencies": "usd"},
-                api_type="default",
-            )
             return data["bitcoin"]["usd"]
-        except HTTPClientError as e:
-            logger.warning(f"BTC Price API Error: {e}")
-            return 100000  # Fallback
+        except (KeyError, TypeError) as e:
+            logger.warning(f"BTC Price API Error: unexpected response {e}")
+            return 100000
 
     def _identify_address(self, address: str) -> str:
         """
@@ -0,0 +1,584 @@
+"""
+Write-Behind Persistenz für den Order-Fill-Pfad.
+
+Trades, Trade-Pairs (inkl. Symbol-Closes bei Stop-Loss / CASH-Exit),
+Signal-Breakdowns und Stop-Loss Updates werden nicht
+mehr synchron vor der Folge-Order geschrieben, sondern in eine Queue gestellt.
+Ein Hintergrund-Thread schreibt sie gebündelt (execute_values, ein Commit pro
+Batch) nach PostgreSQL.
+
+Der Fill-Pfad reiht nur den rohen Fill ein; Marktkontext (Fear & Greed,
+BTC-Preis) und Signal-Breakdown baut der Writer-Thread vor dem Schreiben.
+
+Garantien:
+- Reihenfolge: ein einziger Writer-Thread arbeitet die Jobs streng in
+  Einreihungs-Reihenfolge ab (also auch pro Trade / Stop-ID)
+- Dauerhaftigkeit: jeder Job wird vor dem Einreihen an einen lokalen JSONL-Spool
+  angehängt (flush + fsync); nach dem Commit folgt ein Ack-Eintrag. Nicht bestätigte Jobs werden
+  beim nächsten Start erneut geschrieben (at-least-once)
+- Shutdown: close() (auch via atexit) leert die Queue vor dem Beenden
+
+Aktivierung: WRITE_BEHIND=true. Spool pro Prozess unter
+data/spool/write_behind_<entrypoint>.jsonl (überschreibbar via WRITE_BEHIND_SPOOL).
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import sys
+import threading
+from collections import deque
+from datetime import datetime
+from itertools import groupby
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from src.data.database import CONNECTION_ERRORS, POSTGRES_AVAILABLE
+from src.utils.singleton import SingletonMixin
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = logging.getLogger("trading_bot")
+
+SPOOL_DIR = "data/spool"
+
+
+def default_spool_path() -> str:
+    """Spool pro Prozess (``write_behind_<entrypoint>.jsonl``).
+
+    trading-bot und hybrid-bot teilen sich das ``bot_data``-Volume; mit einem
+    gemeinsamen Spool würden sich Sequenznummern und Acks vermischen und jeder
+    Prozess beim Start die Jobs des anderen erneut schreiben.
+    """
+    name = Path(sys.argv[0]).stem if sys.argv and sys.argv[0] else ""
+    return f"{SPOOL_DIR}/write_behind_{name or 'python'}.jsonl"
+
+
+def write_behind_enabled() -> bool:
+    """True wenn WRITE_BEHIND=true gesetzt und psycopg2 verfügbar ist."""
+    return POSTGRES_AVAILABLE and os.getenv("WRITE_BEHIND", "false").lower() == "true"
+
+
+def _parse_ts(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    return value
+
+
+# ═══════════════════════════════════════════════════════════════
+# PREPARER (im Writer-Thread vor der Transaktion, einmal pro Job)
+# ═══════════════════════════════════════════════════════════════
+
+
+def _prepare_trade_fill(payload: dict) -> dict:
+    """Roher Fill → Trade-Datensatz mit Marktkontext und Signal-Breakdown.
+
+    Fear & Greed und BTC-Preis kommen aus dem MarketDataProvider (gecacht);
+    bei API-Fehlern liefert er neutrale Werte, der Fill wird trotzdem geschrieben.
+    """
+    if "fill" not in payload:
+        return payload  # bereits angereichert
+
+    from dataclasses import asdict
+
+    from src.core.order_manager import build_fill_trade_record
+    from src.data.market_data import get_market_data
+
+    fill = payload["fill"]
+    market = get_market_data()
+    fear_greed = market.get_fear_greed().value
+    price = fill["price"]
+    btc_price = price if fill["symbol"] == "BTCUSDT" else market.get_price("BTCUSDT")
+    record = build_fill_trade_record(
+        fill["symbol"],
+        {"type": fill["side"], "price": fill.get("order_price")},
+        price,
+        fill["quantity"],
+        fill["fee_usd"],
+        fear_greed=fear_greed,
+        btc_price=btc_price,
+        timestamp=_parse_ts(fill["timestamp"]),
+    )
+
+    signals = None
+    try:
+        from src.analysis.signal_analyzer import SignalAnalyzer
+
+        breakdown = SignalAnalyzer.get_instance().compute_all_signals(
+            {"fear_greed": fear_greed, "price": price}
+        )
+        signals = asdict(breakdown)
+    except Exception:
+        pass  # Non-critical, graceful degradation
+
+    prepared = {key: value for key, value in payload.items() if key != "fill"}
+    return {**prepared, "trade": asdict(record), "signals": signals}
+
+
+PREPARERS: dict[str, Callable[[dict], dict]] = {
+    "trade_fill": _prepare_trade_fill,
+}
+
+
+# ═══════════════════════════════════════════════════════════════
+# HANDLER (pro Job-Typ; bekommen eine Folge gleichartiger Payloads)
+# ═══════════════════════════════════════════════════════════════
+
+
+def _write_trade_fills(cur, payloads: list[dict]) -> None:
+    """Trades → Trade-Pairs → Signal-Breakdowns, jeweils als Bulk-Insert."""
+    from psycopg2.extras import execute_values
+
+    from src.analysis.signal_analyzer import (
+        SIGNAL_COMPONENT_COLUMNS,
+        SignalBreakdown,
+        signal_component_values,
+    )
+    from src.data.memory import TRADE_COLUMNS, trade_values
+    from src.data.trade_pairs import TradePairTracker
+
+    trades = []
+    for payload in payloads:
+        trade = dict(payload["trade"])
+        trade["timestamp"] = _parse_ts(trade["timestamp"])
+        trades.append(trade)
+
+    rows = execute_values(
+        cur,
+        f"INSERT INTO trades ({', '.join(TRADE_COLUMNS)}) VALUES %s RETURNING id",
+        [trade_values(trade) for trade in trades],
+        page_size=len(trades),
+        fetch=True,
+    )
+    trade_ids = [row[0] for row in rows]
+
+    # Pairs in Fill-Reihenfolge: Opens gebündelt, vor jedem Close geflusht,
+    # damit FIFO-Closes auch Pairs aus demselben Batch sehen
+    open_rows: list[tuple] = []
+    for trade_id, trade, payload in zip(trade_ids, trades, payloads, strict=True):
+        pair = payload.get("pair")
+        if not pair:
+            continue
+        if pair["action"] == "open":
+            open_rows.append(
+                TradePairTracker.open_pair_row(
+                    pair.get("cohort_id"),
+                    trade["symbol"],
+                    trade_id,
+                    entry_timestamp=trade["timestamp"],
+                    entry_price=trade["price"],
+                    entry_qty=trade["quantity"],
+                    entry_fee=trade["fee_usd"],
+                )
+            )
+            continue
+        if open_rows:
+            TradePairTracker.insert_open_pairs(cur, open_rows)
+            open_rows = []
+        TradePairTracker.close_oldest_pair(
+            cur,
+            pair.get("cohort_id"),
+            trade["symbol"],
+            exit_trade_id=trade_id,
+            exit_price=trade["price"],
+            exit_qty=trade["quantity"],
+            exit_fee=trade["fee_usd"],
+            exit_reason=pair.get("exit_reason", "grid_fill"),
+            now=trade["timestamp"],
+        )
+    if open_rows:
+        TradePairTracker.insert_open_pairs(cur, open_rows)
+
+    signal_rows = [
+        signal_component_values(
+            str(trade_id), SignalBreakdown(**payload["signals"]), None, payload.get("cohort_id")
+        )
+        for trade_id, payload in zip(trade_ids, payloads, strict=True)
+        if payload.get("signals")
+    ]
+    if signal_rows:
+        execute_values(
+            cur,
+            f"INSERT INTO signal_components ({', '.join(SIGNAL_COMPONENT_COLUMNS)}) VALUES %s",
+            signal_rows,
+            page_size=len(signal_rows),
+        )
+
+
+def _write_pair_closes(cur, payloads: list[dict]) -> None:
+    """Schließt alle offenen Pairs eines Symbols (Stop-Loss / CASH-Exit).
+
+    Läuft über dieselbe Queue wie die Fills, damit ein noch eingereihtes
+    ``open`` nicht nach dem Close landet und als Phantom-Pair offen bleibt.
+    """
+    from src.data.trade_pairs import TradePairTracker
+
+    for payload in payloads:
+        TradePairTracker.close_symbol_pairs(
+            cur,
+            payload.get("cohort_id"),
+            payload["symbol"],
+            exit_price=payload["exit_price"],
+            exit_reason=payload.get("exit_reason", "stop_loss"),
+            now=_parse_ts(payload["timestamp"]),
+        )
+
+
+def _write_stop_loss_saves(cur, payloads: list[dict]) -> None:
+    """Upsert neuer Stops (letzter Stand pro ID gewinnt)."""
+    from psycopg2.extras import execute_values
+
+    from src.risk.stop_loss import STOP_LOSS_COLUMNS, STOP_LOSS_UPSERT
+
+    latest = {payload["id"]: payload for payload in payloads}
+    execute_values(
+        cur,
+        STOP_LOSS_UPSERT,
+        [tuple(stop[column] for column in STOP_LOSS_COLUMNS) for stop in latest.values()],
+        page_size=len(latest),
+    )
+
+
+def _write_stop_loss_updates(cur, payloads: list[dict]) -> None:
+    from psycopg2.extras import execute_batch
+
+    from src.risk.stop_loss import STOP_LOSS_UPDATE
+
+    execute_batch(
+        cur,
+        STOP_LOSS_UPDATE,
+        [{**payload, "triggered_at": _parse_ts(payload["triggered_at"])} for payload in payloads],
+    )
+
+
+HANDLERS: dict[str, Callable[[Any, list[dict]], None]] = {
+    "trade_fill": _write_trade_fills,
+    "pair_close_symbol": _write_pair_closes,
+    "stop_loss_save": _write_stop_loss_saves,
+    "stop_loss_update": _write_stop_loss_updates,
+}
+
+
+class _PartialWrite(Exception):
+    """Verbindungsabbruch, nachdem ein Teil des Batches bereits committed war."""
+
+    def __init__(self, committed: int, error: Exception):
+        super().__init__(str(error))
+        self.committed = committed
+
+
+class WriteBehindWriter(SingletonMixin):
+    """
+    Gebündelter, asynchroner Writer mit lokalem Spool.
+
+    Usage:
+        writer = get_write_behind()
+        writer.submit("trade_fill", {"trade": {...}, "pair": {...}})
+        ...
+        writer.flush()  # optional: warten bis alles committed ist
+    """
+
+    RETRY_BASE_DELAY = 1.0
+    RETRY_MAX_DELAY = 30.0
+
+    def __init__(
+        self,
+        spool_path: str | Path | None = None,
+        batch_size: int = 200,
+        flush_interval: float = 0.2,
+        db=None,
+    ):
+        self.spool_path = Path(
+            spool_path or os.getenv("WRITE_BEHIND_SPOOL") or default_spool_path()
+        )
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._db = db
+
+        self._queue: deque[dict] = deque()
+        self._cond = threading.Condition()
+        self._inflight = 0
+        self._seq = 0
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+        self._atexit_registered = False
+
+        self.stats = {
+            "submitted": 0,
+            "written": 0,
+            "batches": 0,
+            "retries": 0,
+            "failed": 0,
+            "replayed": 0,
+        }
+
+        self._recover_spool()
+
+    # ═══════════════════════════════════════════════════════════════
+    # PUBLIC API
+    # ═══════════════════════════════════════════════════════════════
+
+    def submit(self, kind: str, payload: dict) -> int:
+        """Reiht einen Job ein (nach dem Spool-Append). Returns die Sequenznummer."""
+        if kind not in HANDLERS:
+            raise ValueError(f"Unbekannter Write-Behind Job: {kind}")
+
+        with self._cond:
+            self._seq += 1
+            job = {"seq": self._seq, "kind": kind, "payload": payload}
+            self._append_spool(job)
+            self._queue.append(job)
+            self.stats["submitted"] += 1
+            self._cond.notify_all()
+
+        self._ensure_worker()
+        return job["seq"]
+
+    def pending(self) -> int:
+        """Anzahl noch nicht committeter Jobs."""
+        with self._cond:
+            return len(self._queue) + self._inflight
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wartet bis alle Jobs committed sind. False bei Timeout."""
+        if self._thread is None:
+            return not self._queue
+        with self._cond:
+            self._cond.notify_all()
+            return self._cond.wait_for(
+                lambda: not self._queue and self._inflight == 0, timeout=timeout
+            )
+
+    def close(self, timeout: float = 10.0):
+        """Leert die Queue und stoppt den Writer-Thread (Rest bleibt im Spool)."""
+        if self._thread is None:
+            return
+        if not self.flush(timeout=timeout):
+            logger.warning(
+                f"WriteBehind: {self.pending()} Jobs nicht geschrieben, bleiben im Spool "
+                f"({self.spool_path})"
+            )
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._thread.join(timeout=timeout)
+        self._thread = None
+        if self._atexit_registered:
+            atexit.unregister(self.close)
+            self._atexit_registered = False
+
+    # ═══════════════════════════════════════════════════════════════
+    # SPOOL
+    # ═══════════════════════════════════════════════════════════════
+
+    def _append_spool(self, record: dict):
+        try:
+            self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.spool_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, default=str) + "\n")
+                # Dauerhaft, bevor submit() zurückkehrt (sonst geht der Job beim Crash verloren)
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            logger.warning(f"WriteBehind: Spool nicht beschreibbar: {e}")
+
+    def _recover_spool(self):
+        """Lädt nicht bestätigte Jobs aus dem Spool und kompaktiert ihn."""
+        if not self.spool_path.is_file():
+            return
+
+        jobs: dict[int, dict] = {}
+        acked = 0
+        try:
+            with open(self.spool_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # halb geschriebene Zeile nach Absturz
+                    if "ack" in record:
+                        acked = max(acked, record["ack"])
+                    elif record.get("kind") in HANDLERS:
+                        jobs[record["seq"]] = record
+        except OSError as e:
+            logger.warning(f"WriteBehind: Spool nicht lesbar: {e}")
+            return
+
+        pending = [jobs[seq] for seq in sorted(jobs) if seq > acked]
+        self._seq = max([acked, *jobs])
+        self._rewrite_spool(pending)
+        if pending:
+            self._queue.extend(pending)
+            self.stats["replayed"] = len(pending)
+            logger.info(f"WriteBehind: {len(pending)} Jobs aus Spool wiederhergestellt")
+            self._ensure_worker()
+
+    def _rewrite_spool(self, pending: list[dict]):
+        """Ersetzt den Spool durch die noch offenen Jobs (atomar via tmp + replace)."""
+        try:
+            self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.spool_path.with_suffix(".tmp")
+            with open(temp_file, "w", encoding="utf-8") as f:
+                for job in pending:
+                    f.write(json.dumps(job, default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            temp_file.replace(self.spool_path)
+        except OSError as e:
+            logger.warning(f"WriteBehind: Spool-Kompaktierung fehlgeschlagen: {e}")
+
+    def _dead_letter(self, job: dict, error: Exception):
+        """Nicht schreibbare Jobs beiseitelegen statt die Queue zu blockieren."""
+        self.stats["failed"] += 1
+        logger.error(f"WriteBehind: Job {job['seq']} ({job['kind']}) verworfen: {error}")
+        try:
+            with open(self.spool_path.with_suffix(".failed.jsonl"), "a", encoding="utf-8") as f:
+                f.write(json.dumps({**job, "error": str(error)}, default=str) + "\n")
+        except OSError:
+            pass
+
+    # ═══════════════════════════════════════════════════════════════
+    # WORKER
+    # ═══════════════════════════════════════════════════════════════
+
+    def _ensure_worker(self):
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.close)
+                self._atexit_registered = True
+
+    def _run(self):
+        failures = 0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._stopping)
+                # Beim Stoppen nach Fehlern nicht endlos retryen: Rest bleibt im Spool
+                if self._stopping and (not self._queue or failures):
+                    return
+                # Kurz sammeln, damit mehrere Fills in einem Batch landen
+                self._cond.wait_for(
+                    lambda: len(self._queue) >= self.batch_size or self._stopping,
+                    timeout=self.flush_interval,
+                )
+                batch = [
+                    self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))
+                ]
+                self._inflight = len(batch)
+
+            self._prepare(batch)
+            try:
+                self._write(batch)
+            except Exception as e:
+                if isinstance(e, _PartialWrite):
+                    self._ack(batch[: e.committed])
+                    batch = batch[e.committed :]
+                failures += 1
+                self.stats["retries"] += 1
+                delay = min(self.RETRY_BASE_DELAY * 2 ** (failures - 1), self.RETRY_MAX_DELAY)
+                logger.warning(f"WriteBehind: DB nicht erreichbar, Retry in {delay:.0f}s: {e}")
+                with self._cond:
+                    self._queue.extendleft(reversed(batch))
+                    self._inflight -= len(batch)
+                    self._cond.notify_all()
+                    if self._stopping:
+                        return
+                    self._cond.wait(timeout=delay)
+                continue
+
+            failures = 0
+            self._ack(batch)
+
+    def _prepare(self, batch: list[dict]):
+        """Reichert Jobs an (Netzwerk-I/O hier statt im Fill-Pfad oder in der Transaktion).
+
+        Das Ergebnis bleibt am Job hängen, Retries bauen es nicht neu. Der Spool
+        enthält den rohen Job und wird nach einem Neustart erneut angereichert.
+        """
+        for job in batch:
+            preparer = PREPARERS.get(job["kind"])
+            if preparer is None or job.get("prepared"):
+                continue
+            try:
+                job["payload"] = preparer(job["payload"])
+            except Exception as e:
+                # Roh weiterreichen: der Handler schlägt fehl → Dead-Letter
+                logger.warning(f"WriteBehind: Job {job['seq']} nicht anreicherbar: {e}")
+            job["prepared"] = True
+
+    def _ack(self, jobs: list[dict]):
+        """Markiert Jobs als committed (Spool wird geleert, sobald nichts mehr offen ist)."""
+        with self._cond:
+            self._inflight -= len(jobs)
+            if jobs:
+                self._append_spool({"ack": jobs[-1]["seq"]})
+            if not self._queue and self._inflight == 0:
+                self._rewrite_spool([])
+            self._cond.notify_all()
+
+    def _get_db(self):
+        if self._db is None:
+            from src.data.database import DatabaseManager
+
+            self._db = DatabaseManager.get_instance()
+        return self._db
+
+    def _write(self, batch: list[dict]):
+        """
+        Schreibt einen Batch in einer Transaktion.
+
+        Verbindungsfehler werden an den Aufrufer gereicht (Retry des ganzen
+        Batches). Andere Fehler (z.B. Constraint-Verletzungen) führen zu
+        Einzel-Transaktionen pro Job, fehlerhafte Jobs landen im Dead-Letter.
+        """
+        db = self._get_db()
+        if not db._ensure_pool():
+            raise RuntimeError("Datenbank nicht verfügbar")
+
+        try:
+            self._write_jobs(db, batch)
+        except (RuntimeError, *CONNECTION_ERRORS):
+            raise
+        except Exception as e:
+            if len(batch) == 1:
+                self._dead_letter(batch[0], e)
+                return
+            for index, job in enumerate(batch):
+                try:
+                    self._write_jobs(db, [job])
+                except (RuntimeError, *CONNECTION_ERRORS) as conn_error:
+                    raise _PartialWrite(index, conn_error) from conn_error
+                except Exception as job_error:
+                    self._dead_letter(job, job_error)
+            return
+
+        self.stats["batches"] += 1
+        self.stats["written"] += len(batch)
+
+    @staticmethod
+    def _write_jobs(db, jobs: list[dict]):
+        with db.transaction() as conn, conn.cursor() as cur:
+            for kind, group in groupby(jobs, key=lambda job: job["kind"]):
+                HANDLERS[kind](cur, [job["payload"] for job in group])
+
+
+# Convenience wrappers — delegate to SingletonMixin
+def get_write_behind() -> WriteBehindWriter:
+    """Gibt die globale WriteBehindWriter-Instanz zurück."""
+    return WriteBehindWriter.get_instance()
+
+
+def reset_write_behind():
+    """Reset the global writer, flushing pending jobs first."""
+    WriteBehindWriter.reset_instance()
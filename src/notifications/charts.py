@@ -3,21 +3,18 @@ Chart Generator für Telegram Reports
 Erstellt visuelle Portfolio-Analysen
 """
 
+from __future__ import annotations
+
+import functools
 import io
 from datetime import datetime
+from typing import TYPE_CHECKING
 
-# Matplotlib mit nicht-interaktivem Backend (für Server)
-import matplotlib
 import numpy as np
-import pandas as pd
 
-matplotlib.use("Agg")
-import matplotlib.dates as mdates
-import matplotlib.pyplot as plt
-from matplotlib.patches import Wedge
+if TYPE_CHECKING:
+    import pandas as pd
 
-# Style konfigurieren
-plt.style.use("dark_background")
 COLORS = {
     "green": "#00ff88",
     "red": "#ff4444",
@@ -34,6 +31,20 @@ COLORS = {
 }
 
 
+@functools.cache
+def _pyplot():
+    """Matplotlib erst beim ersten Chart laden (~1s Importzeit)."""
+    # Nicht-interaktives Backend (für Server)
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    # Style konfigurieren
+    plt.style.use("dark_background")
+    return plt
+
+
 def create_portfolio_chart(
     portfolio_history: pd.DataFrame,
     benchmark_data: pd.DataFrame | None = None,
@@ -50,6 +61,9 @@ def create_portfolio_chart(
     Returns:
         PNG als Bytes
     """
+    import matplotlib.dates as mdates
+
+    plt = _pyplot()
     _fig, ax = plt.subplots(figsize=(10, 6), facecolor=COLORS["bg"])
     ax.set_facecolor(COLORS["bg"])
 
@@ -132,6 +146,7 @@ def create_allocation_pie(
     Returns:
         PNG als Bytes
     """
+    plt = _pyplot()
     _fig, ax = plt.subplots(figsize=(8, 8), facecolor=COLORS["bg"])
 
     # Farben für Coins
@@ -199,6 +214,9 @@ def create_trade_chart(price_data: pd.Series, trades: list[dict], symbol: str) -
     Returns:
         PNG als Bytes
     """
+    import matplotlib.dates as mdates
+
+    plt = _pyplot()
     _fig, ax = plt.subplots(figsize=(10, 6), facecolor=COLORS["bg"])
     ax.set_facecolor(COLORS["bg"])
 
@@ -244,6 +262,9 @@ def create_fear_greed_gauge(value: int) -> bytes:
     Returns:
         PNG als Bytes
     """
+    from matplotlib.patches import Wedge
+
+    plt = _pyplot()
     _fig, ax = plt.subplots(figsize=(6, 4), facecolor=COLORS["bg"])
     ax.set_facecolor(COLORS["bg"])
 
@@ -345,6 +366,7 @@ def create_daily_summary_image(
     Returns:
         PNG als Bytes
     """
+    plt = _pyplot()
     fig = plt.figure(figsize=(12, 8), facecolor=COLORS["bg"])
 
     # Layout: 2x2 Grid
@@ -0,0 +1,268 @@
+"""
+Vektorisierte Statistik für A/B Tests
+
+Alle Resamples werden als eine Index-Matrix aus einem geseedeten
+np.random.Generator gezogen, statt pro Iteration np.random.choice
+aufzurufen. Mehrere Experimente werden dabei gemeinsam verarbeitet:
+die Stichproben liegen hintereinander in einem Array, jede Gruppe
+belegt ein Segment.
+
+Methoden:
+- Bootstrap Confidence Intervals für Mean-Differenzen
+- Permutationstest (exakt bis auf Monte-Carlo-Fehler, keine Normalannahme)
+- Sequentieller Test (mSPRT, always-valid p-Werte) für tägliches Prüfen
+  ohne Alpha-Inflation durch wiederholtes Hinschauen
+"""
+
+import importlib.util
+import math
+import os
+from collections.abc import Sequence
+
+import numpy as np
+
+# scipy wird erst bei der ersten Auswertung importiert (~1s Importzeit)
+SCIPY_AVAILABLE = importlib.util.find_spec("scipy") is not None
+
+# Standard-Anzahl Resamples (Bootstrap und Permutation)
+DEFAULT_RESAMPLES = 10_000
+
+# Obergrenze für Zellen einer Resample-Matrix (Speicher ~ 8 Byte pro Zelle)
+MAX_MATRIX_CELLS = 4_000_000
+
+# Mixing-Verteilung des mSPRT in Cohen's d Einheiten
+DEFAULT_MIXING_EFFECT = 0.5
+
+Pair = tuple[Sequence[float], Sequence[float]]  # (control, treatment)
+
+
+def make_rng(seed: int | None = None) -> np.random.Generator:
+    """Generator mit Seed aus Argument oder AB_TEST_SEED (sonst zufällig)"""
+    if seed is None:
+        env_seed = os.getenv("AB_TEST_SEED")
+        seed = int(env_seed) if env_seed else None
+    return np.random.default_rng(seed)
+
+
+# ═══════════════════════════════════════════════════════════════
+# PARAMETRISCH
+# ═══════════════════════════════════════════════════════════════
+
+
+def normal_cdf(x: float | np.ndarray) -> float | np.ndarray:
+    """Standardnormal-CDF, skalar oder elementweise"""
+    if SCIPY_AVAILABLE:
+        from scipy.special import ndtr
+
+        result = ndtr(x)
+    else:
+        erfc = np.frompyfunc(math.erfc, 1, 1)
+        # frompyfunc liefert für Skalare ein Python-float, daher asarray statt astype
+        result = 0.5 * np.asarray(erfc(-np.asarray(x, dtype=float) / math.sqrt(2)), dtype=float)
+    return float(result) if np.ndim(result) == 0 else result
+
+
+def z_test_pvalue(mean_diff: float | np.ndarray, se: float | np.ndarray) -> float | np.ndarray:
+    """Zweiseitiger z-Test; p = 1.0 wo der Standardfehler 0 ist"""
+    mean_diff = np.asarray(mean_diff, dtype=float)
+    se = np.asarray(se, dtype=float)
+    z = np.divide(np.abs(mean_diff), se, out=np.zeros_like(se), where=se > 0)
+    p = np.where(se > 0, 2 * (1 - normal_cdf(z)), 1.0)
+    return float(p) if p.ndim == 0 else p
+
+
+# ═══════════════════════════════════════════════════════════════
+# RESAMPLING
+# ═══════════════════════════════════════════════════════════════
+
+
+def _segments(groups: Sequence[Sequence[float]]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Konkateniere Gruppen: (values, lengths, offsets)"""
+    lengths = np.array([len(g) for g in groups], dtype=np.intp)
+    if len(lengths) == 0 or (lengths == 0).any():
+        raise ValueError("Jede Gruppe braucht mindestens einen Wert")
+    values = np.concatenate([np.asarray(g, dtype=float) for g in groups])
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.intp)
+    return values, lengths, offsets
+
+
+def _chunks(n_resamples: int, n_columns: int):
+    """Zeilenblöcke, damit eine Matrix MAX_MATRIX_CELLS nicht überschreitet"""
+    rows = max(1, MAX_MATRIX_CELLS // max(1, n_columns))
+    for start in range(0, n_resamples, rows):
+        yield start, min(rows, n_resamples - start)
+
+
+def bootstrap_means(
+    groups: Sequence[Sequence[float]],
+    *,
+    n_resamples: int = DEFAULT_RESAMPLES,
+    rng: np.random.Generator | None = None,
+) -> np.ndarray:
+    """
+    Bootstrap-Mittelwerte aller Gruppen aus einer Index-Matrix.
+
+    Returns:
+        Array (n_resamples, len(groups))
+    """
+    rng = rng or make_rng()
+    values, lengths, offsets = _segments(groups)
+    col_group = np.repeat(np.arange(len(lengths)), lengths)
+    col_offset = offsets[col_group]
+    col_length = lengths[col_group]
+
+    means = np.empty((n_resamples, len(lengths)))
+    for start, rows in _chunks(n_resamples, len(values)):
+        idx = col_offset + rng.integers(0, col_length, size=(rows, len(values)))
+        sums = np.add.reduceat(values[idx], offsets, axis=1)
+        means[start : start + rows] = sums / lengths
+    return means
+
+
+def bootstrap_mean_diff_ci(
+    pairs: Sequence[Pair],
+    *,
+    n_resamples: int = DEFAULT_RESAMPLES,
+    confidence: float = 0.95,
+    rng: np.random.Generator | None = None,
+) -> list[tuple[float, float]]:
+    """Bootstrap-CI für mean(treatment) - mean(control), für alle Paare gemeinsam"""
+    if not pairs:
+        return []
+
+    groups = [group for pair in pairs for group in pair]
+    means = bootstrap_means(groups, n_resamples=n_resamples, rng=rng)
+    diffs = means[:, 1::2] - means[:, 0::2]
+
+    alpha = 1 - confidence
+    lower, upper = np.percentile(diffs, [alpha / 2 * 100, (1 - alpha / 2) * 100], axis=0)
+    return list(zip(lower.tolist(), upper.tolist(), strict=True))
+
+
+def permutation_pvalues(
+    pairs: Sequence[Pair],
+    *,
+    n_permutations: int = DEFAULT_RESAMPLES,
+    alternative: str = "greater",
+    rng: np.random.Generator | None = None,
+) -> np.ndarray:
+    """
+    Permutationstest der Mean-Differenz (treatment - control) für alle Paare.
+
+    Pro Resample wird jedes gepoolte Segment per argsort auf Zufallsschlüsseln
+    gemischt; die Schlüssel enthalten den Segment-Index, so bleiben Segmente
+    getrennt.
+
+    Args:
+        alternative: "greater" (treatment besser), "less" oder "two-sided"
+
+    Returns:
+        Array der p-Werte (mit +1 Korrektur, nie 0)
+    """
+    if alternative not in {"greater", "less", "two-sided"}:
+        raise ValueError(f"Unbekannte Alternative: {alternative}")
+    if not pairs:
+        return np.empty(0)
+
+    rng = rng or make_rng()
+    pooled = [np.concatenate((np.asarray(t, float), np.asarray(c, float))) for c, t in pairs]
+    values, lengths, offsets = _segments(pooled)
+    n_treatment = np.array([len(t) for _, t in pairs], dtype=np.intp)
+    n_control = lengths - n_treatment
+    if (n_treatment == 0).any() or (n_control == 0).any():
+        raise ValueError("Control und Treatment brauchen mindestens einen Wert")
+
+    totals = np.add.reduceat(values, offsets)
+    treatment_end = offsets + n_treatment - 1
+
+    def diff(treatment_sums: np.ndarray) -> np.ndarray:
+        return treatment_sums / n_treatment - (totals - treatment_sums) / n_control
+
+    observed = diff(np.array([np.sum(np.asarray(t, float)) for _, t in pairs]))
+    col_group = np.repeat(np.arange(len(lengths)), lengths)
+    start_before = np.where(offsets > 0, offsets - 1, 0)
+
+    exceed = np.zeros(len(pairs), dtype=np.int64)
+    tolerance = 1e-12 * np.maximum(1.0, np.abs(observed))
+    for _, rows in _chunks(n_permutations, len(values)):
+        keys = rng.random((rows, len(values))) + col_group
+        cumulative = np.cumsum(values[np.argsort(keys, axis=1)], axis=1)
+        before = np.where(offsets > 0, cumulative[:, start_before], 0.0)
+        stats = diff(cumulative[:, treatment_end] - before)
+
+        if alternative == "greater":
+            exceed += (stats >= observed - tolerance).sum(axis=0)
+        elif alternative == "less":
+            exceed += (stats <= observed + tolerance).sum(axis=0)
+        else:
+            exceed += (np.abs(stats) >= np.abs(observed) - tolerance).sum(axis=0)
+
+    return (exceed + 1) / (n_permutations + 1)
+
+
+# ═══════════════════════════════════════════════════════════════
+# SEQUENTIAL
+# ═══════════════════════════════════════════════════════════════
+
+
+def always_valid_pvalue(
+    control: Sequence[float],
+    treatment: Sequence[float],
+    *,
+    mixing_effect: float = DEFAULT_MIXING_EFFECT,
+    min_samples: int = 10,
+) -> float:
+    """
+    Always-valid p-Wert der Mean-Differenz (mSPRT mit Normal-Mixture).
+
+    Ausgewertet wird an jedem Look k (erste k Trades beider Varianten, plus
+    der vollständige Datensatz). Der p-Wert ist das laufende Minimum von
+    1/Λ_k und bleibt unter beliebig häufigem Prüfen gültig.
+
+    Λ = sqrt(V / (V + τ²)) · exp(τ²θ² / (2V(V + τ²)))
+    mit θ = Mean-Differenz, V = Varianz von θ, τ = mixing_effect · sigma_pooled
+    """
+    c = np.asarray(control, dtype=float)
+    t = np.asarray(treatment, dtype=float)
+    if len(c) < min_samples or len(t) < min_samples:
+        return 1.0
+
+    pooled_std = np.std(np.concatenate((c, t)), ddof=1)
+    tau2 = (mixing_effect * pooled_std) ** 2
+    if tau2 <= 0:
+        return 1.0
+
+    looks = np.arange(min_samples, min(len(c), len(t)) + 1)
+    n_c = np.append(looks, len(c)).astype(float)
+    n_t = np.append(looks, len(t)).astype(float)
+
+    def prefix_moments(x: np.ndarray, n: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        idx = n.astype(np.intp) - 1
+        sums = np.cumsum(x)[idx]
+        squares = np.cumsum(x * x)[idx]
+        mean = sums / n
+        var = np.maximum(squares - n * mean**2, 0.0) / (n - 1)
+        return mean, var
+
+    mean_c, var_c = prefix_moments(c, n_c)
+    mean_t, var_t = prefix_moments(t, n_t)
+    theta = mean_t - mean_c
+    v = var_t / n_t + var_c / n_c
+
+    valid = v > 0
+    if not valid.any():
+        return 1.0
+    v, theta = v[valid], theta[valid]
+    log_lambda = 0.5 * np.log(v / (v + tau2)) + tau2 * theta**2 / (2 * v * (v + tau2))
+    return float(min(1.0, math.exp(-float(np.max(log_lambda)))))
+
+
+def always_valid_pvalues(
+    pairs: Sequence[Pair],
+    *,
+    mixing_effect: float = DEFAULT_MIXING_EFFECT,
+) -> np.ndarray:
+    """always_valid_pvalue für mehrere Paare"""
+    return np.array(
+        [always_valid_pvalue(c, t, mixing_effect=mixing_effect) for c, t in pairs], dtype=float
+    )
@@ -10,8 +10,9 @@ Ermöglicht systematischen Vergleich von:
 Statistische Methoden:
 - Welch's t-Test für Mittelwert-Vergleich
 - Mann-Whitney U Test für nicht-normale Verteilungen
-- Bootstrap Confidence Intervals
-- Bayes Factor für Evidenz-Stärke
+- Bootstrap Confidence Intervals (vektorisiert, siehe ab_stats)
+- Permutationstest als Fallback ohne scipy
+- Sequentieller mSPRT-Test (always-valid p-Werte) für tägliches Prüfen
 
 Features:
 - Automatische Experiment-Erstellung
@@ -31,6 +32,8 @@ from typing import Any
 import numpy as np
 from dotenv import load_dotenv
 
+from src.data.database import get_pooled_connection
+from src.optimization import ab_stats
 from src.utils.singleton import SingletonMixin
 
 load_dotenv()
@@ -38,19 +41,15 @@ load_dotenv()
 logger = logging.getLogger("trading_bot")
 
 try:
-    import psycopg2
     from psycopg2.extras import RealDictCursor
 
     POSTGRES_AVAILABLE = True
 except ImportError:
     POSTGRES_AVAILABLE = False
 
-try:
-    from scipy import stats
-
-    SCIPY_AVAILABLE = True
-except ImportError:
-    SCIPY_AVAILABLE = False
+# scipy wird erst beim ersten Variantenvergleich importiert
+SCIPY_AVAILABLE = ab_stats.SCIPY_AVAILABLE
+if not SCIPY_AVAILABLE:
     logger.warning("scipy nicht verfügbar - eingeschränkte statistische Tests")
 
 
@@ -151,6 +150,7 @@ class Experiment:
 DEFAULT_MIN_SAMPLE_SIZE = 30  # Minimum für statistische Aussagekraft
 DEFAULT_MAX_DURATION = 14  # Tage
 DEFAULT_ALPHA = 0.05  # Signifikanz-Level
+BOOTSTRAP_SAMPLES = int(os.getenv("AB_BOOTSTRAP_SAMPLES", str(ab_stats.DEFAULT_RESAMPLES)))
 
 
 class ABTestingFramework(SingletonMixin):
@@ -164,9 +164,12 @@ class ABTestingFramework(SingletonMixin):
     4. Promotion der besten Variante
     """
 
+    rng: np.random.Generator | None = None
+
     def __init__(self):
         self.conn = None
         self.experiments: dict[str, Experiment] = {}
+        self.rng = ab_stats.make_rng()
         self._connect_db()
         self._load_experiments()
 
@@ -176,9 +179,8 @@ class ABTestingFramework(SingletonMixin):
             return
 
         try:
-            database_url = os.getenv("DATABASE_URL")
-            if database_url:
-                self.conn = psycopg2.connect(database_url)
+            self.conn = get_pooled_connection()
+            if self.conn:
                 logger.info("ABTestingFramework: DB verbunden")
         except Exception as e:
             logger.error(f"ABTestingFramework: DB Fehler: {e}")
@@ -311,7 +313,11 @@ class ABTestingFramework(SingletonMixin):
         return False
 
     def complete_experiment(
-        self, experiment_id: str, promote_winner: bool = False
+        self,
+        experiment_id: str,
+        promote_winner: bool = False,
+        *,
+        result: StatisticalResult | None = None,
     ) -> StatisticalResult | None:
         """
         Beende ein Experiment und analysiere Ergebnisse.
@@ -319,6 +325,7 @@ class ABTestingFramework(SingletonMixin):
         Args:
             experiment_id: Experiment ID
             promote_winner: Automatisch Gewinner promoten
+            result: Optional bereits berechnete Analyse (check_running_experiments)
 
         Returns:
             StatisticalResult oder None
@@ -329,7 +336,8 @@ class ABTestingFramework(SingletonMixin):
         exp = self.experiments[experiment_id]
 
         # Analysiere Ergebnisse
-        result = self.analyze_experiment(experiment_id)
+        if result is None:
+            result = self.analyze_experiment(experiment_id)
 
         if result:
             exp.results = result
@@ -440,6 +448,34 @@ class ABTestingFramework(SingletonMixin):
         except Exception as e:
             logger.error(f"Trade Load Fehler: {e}")
 
+    def load_trades_for(self, experiment_ids: list[str]):
+        """Lade Trade-Daten mehrerer Experimente mit einer Query"""
+        experiments = [self.experiments[i] for i in experiment_ids if i in self.experiments]
+        if not self.conn or not experiments:
+            return
+
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT variant_id::text, pnl FROM ab_test_trades
+                    WHERE experiment_id::text = ANY(%s)
+                    ORDER BY created_at
+                """,
+                    ([exp.id for exp in experiments],),
+                )
+                trades: dict[str, list[float]] = {}
+                for variant_id, pnl in cur.fetchall():
+                    trades.setdefault(variant_id, []).append(float(pnl))
+
+            for exp in experiments:
+                for variant in [exp.control, *exp.treatments]:
+                    variant.trades = trades.get(str(variant.id), [])
+                    self._update_variant_stats(variant)
+
+        except Exception as e:
+            logger.error(f"Trade Load Fehler: {e}")
+
     def _update_variant_stats(self, variant: Variant):
         """Aktualisiere Statistiken einer Variante"""
         if not variant.trades:
@@ -480,7 +516,17 @@ class ABTestingFramework(SingletonMixin):
             )
             return None
 
-        # Finde beste Treatment
+        best_treatment = self._best_treatment(exp)
+        if best_treatment is None:
+            return self._control_wins_result()
+
+        # Statistischer Test
+        result = self._compare_variants(exp.control, best_treatment, exp.alpha)
+
+        return result
+
+    def _best_treatment(self, exp: Experiment) -> Variant | None:
+        """Treatment mit höchstem Mean-PnL über Control (mit genug Samples)"""
         best_treatment = None
         best_mean = exp.control.mean_pnl
 
@@ -489,29 +535,38 @@ class ABTestingFramework(SingletonMixin):
                 best_mean = treatment.mean_pnl
                 best_treatment = treatment
 
-        if best_treatment is None:
-            # Kein Treatment besser als Control
-            return StatisticalResult(
-                test_name="welch_t_test",
-                p_value=1.0,
-                significance=SignificanceLevel.NOT_SIGNIFICANT,
-                effect_size=0.0,
-                confidence_interval=(0.0, 0.0),
-                winner="control",
-                winner_improvement=0.0,
-            )
-
-        # Statistischer Test
-        result = self._compare_variants(exp.control, best_treatment, exp.alpha)
+        return best_treatment
 
-        return result
+    def _control_wins_result(self) -> StatisticalResult:
+        """Ergebnis wenn kein Treatment besser als Control ist"""
+        return StatisticalResult(
+            test_name="welch_t_test",
+            p_value=1.0,
+            significance=SignificanceLevel.NOT_SIGNIFICANT,
+            effect_size=0.0,
+            confidence_interval=(0.0, 0.0),
+            winner="control",
+            winner_improvement=0.0,
+        )
 
     def _compare_variants(
-        self, control: Variant, treatment: Variant, alpha: float
+        self,
+        control: Variant,
+        treatment: Variant,
+        alpha: float,
+        *,
+        ci: tuple[float, float] | None = None,
+        fallback_p_value: float | None = None,
     ) -> StatisticalResult:
-        """Vergleiche zwei Varianten statistisch"""
+        """
+        Vergleiche zwei Varianten statistisch.
+
+        ci / fallback_p_value können aus einer Batch-Berechnung übergeben werden.
+        """
 
         if SCIPY_AVAILABLE:
+            from scipy import stats
+
             # Welch's t-Test (ungleiche Varianzen)
             _t_stat, p_value = stats.ttest_ind(treatment.trades, control.trades, equal_var=False)
 
@@ -526,8 +581,16 @@ class ABTestingFramework(SingletonMixin):
                 pass
 
         else:
-            # Fallback: Einfacher z-Test
-            p_value = self._simple_z_test(control, treatment)
+            # Fallback: Permutationstest (one-tailed, keine Normalannahme)
+            if fallback_p_value is None:
+                fallback_p_value = float(
+                    ab_stats.permutation_pvalues(
+                        [(control.trades, treatment.trades)],
+                        n_permutations=BOOTSTRAP_SAMPLES,
+                        rng=self.rng,
+                    )[0]
+                )
+            p_value = fallback_p_value
 
         # Effect Size (Cohen's d)
         pooled_std = np.sqrt(
@@ -540,7 +603,8 @@ class ABTestingFramework(SingletonMixin):
         effect_size = (treatment.mean_pnl - control.mean_pnl) / pooled_std if pooled_std > 0 else 0
 
         # Confidence Interval (Bootstrap)
-        ci = self._bootstrap_ci(control.trades, treatment.trades)
+        if ci is None:
+            ci = self._bootstrap_ci(control.trades, treatment.trades)
 
         # Signifikanz-Level
         if p_value < 0.01:
@@ -586,55 +650,27 @@ class ABTestingFramework(SingletonMixin):
         if se == 0:
             return 1.0
 
-        z = mean_diff / se
-
-        # Approximation der p-Value (two-tailed)
-        p_value = 2 * (1 - self._normal_cdf(abs(z)))
-
-        return p_value
+        # p-Value (two-tailed)
+        return ab_stats.z_test_pvalue(mean_diff, se)
 
     def _normal_cdf(self, x: float) -> float:
-        """Approximation der Normal CDF"""
-        # Abramowitz and Stegun approximation
-        a1 = 0.254829592
-        a2 = -0.284496736
-        a3 = 1.421413741
-        a4 = -1.453152027
-        a5 = 1.061405429
-        p = 0.3275911
-
-        sign = 1 if x >= 0 else -1
-        x = abs(x) / np.sqrt(2)
-
-        t = 1.0 / (1.0 + p * x)
-        y = 1.0 - (((((a5 * t + a4) * t) + a3) * t + a2) * t + a1) * t * np.exp(-x * x)
-
-        return 0.5 * (1.0 + sign * y)
+        """Normal CDF"""
+        return ab_stats.normal_cdf(x)
 
     def _bootstrap_ci(
         self,
         control_trades: list[float],
         treatment_trades: list[float],
-        n_bootstrap: int = 1000,
+        n_bootstrap: int = BOOTSTRAP_SAMPLES,
         confidence: float = 0.95,
     ) -> tuple[float, float]:
         """Bootstrap Confidence Interval für Mean-Differenz"""
-        differences = []
-
-        for _ in range(n_bootstrap):
-            control_sample = np.random.choice(
-                control_trades, size=len(control_trades), replace=True
-            )
-            treatment_sample = np.random.choice(
-                treatment_trades, size=len(treatment_trades), replace=True
-            )
-            differences.append(np.mean(treatment_sample) - np.mean(control_sample))
-
-        alpha = 1 - confidence
-        lower = np.percentile(differences, alpha / 2 * 100)
-        upper = np.percentile(differences, (1 - alpha / 2) * 100)
-
-        return (lower, upper)
+        return ab_stats.bootstrap_mean_diff_ci(
+            [(control_trades, treatment_trades)],
+            n_resamples=n_bootstrap,
+            confidence=confidence,
+            rng=self.rng,
+        )[0]
 
     # ═══════════════════════════════════════════════════════════════
     # SEQUENTIAL ANALYSIS
@@ -669,10 +705,31 @@ class ABTestingFramework(SingletonMixin):
         if result is None:
             return False, "Analyse nicht möglich"
 
+        best = self._best_treatment(exp)
+        sequential_p = (
+            ab_stats.always_valid_pvalue(exp.control.trades, best.trades) if best else 1.0
+        )
+
+        return self._stopping_decision(exp, result, sequential_p, min_effect_size)
+
+    def _stopping_decision(
+        self,
+        exp: Experiment,
+        result: StatisticalResult,
+        sequential_p: float,
+        min_effect_size: float,
+    ) -> tuple[bool, str]:
+        """Stopp-Regeln für ein analysiertes Experiment"""
         # Frühes Stoppen bei sehr hoher Signifikanz
         if result.p_value < 0.001 and abs(result.effect_size) > min_effect_size:
             return True, f"Klarer Gewinner: {result.winner} (p={result.p_value:.4f})"
 
+        # Sequentieller Test: gültig trotz täglichem Prüfen
+        if sequential_p < exp.alpha and result.winner != "control":
+            return True, (
+                f"Sequentieller Test: {result.winner} (always-valid p={sequential_p:.4f})"
+            )
+
         # Futility Check: Kein Effekt erkennbar
         if (
             exp.control.sample_size >= exp.min_sample_size
@@ -689,6 +746,73 @@ class ABTestingFramework(SingletonMixin):
 
         return False, "Weiter laufen lassen"
 
+    def check_running_experiments(
+        self, min_effect_size: float = 0.5
+    ) -> dict[str, tuple[bool, str, StatisticalResult | None]]:
+        """
+        Early-Stopping-Check für alle laufenden Experimente in einem Batch.
+
+        Eine Query für alle Trades; Bootstrap-CIs, Permutations- und
+        sequentielle p-Werte aller Experimente werden gemeinsam berechnet.
+
+        Returns:
+            {experiment_id: (should_stop, reason, result)}
+        """
+        running = [
+            exp for exp in self.experiments.values() if exp.status == ExperimentStatus.RUNNING
+        ]
+        self.load_trades_for([exp.id for exp in running])
+
+        decisions: dict[str, tuple[bool, str, StatisticalResult | None]] = {}
+        candidates: list[tuple[Experiment, Variant]] = []
+
+        for exp in running:
+            if exp.control.sample_size < exp.min_sample_size:
+                reason = (
+                    "Nicht genug Daten"
+                    if exp.control.sample_size < exp.min_sample_size // 2
+                    else "Analyse nicht möglich"
+                )
+                decisions[exp.id] = (False, reason, None)
+                continue
+
+            best = self._best_treatment(exp)
+            if best is None:
+                result = self._control_wins_result()
+                decisions[exp.id] = (
+                    *self._stopping_decision(exp, result, 1.0, min_effect_size),
+                    result,
+                )
+            else:
+                candidates.append((exp, best))
+
+        if not candidates:
+            return decisions
+
+        pairs = [(exp.control.trades, best.trades) for exp, best in candidates]
+        cis = ab_stats.bootstrap_mean_diff_ci(pairs, n_resamples=BOOTSTRAP_SAMPLES, rng=self.rng)
+        sequential = ab_stats.always_valid_pvalues(pairs)
+        fallback = (
+            [None] * len(pairs)
+            if SCIPY_AVAILABLE
+            else ab_stats.permutation_pvalues(
+                pairs, n_permutations=BOOTSTRAP_SAMPLES, rng=self.rng
+            ).tolist()
+        )
+
+        for (exp, best), ci, seq_p, perm_p in zip(
+            candidates, cis, sequential, fallback, strict=True
+        ):
+            result = self._compare_variants(
+                exp.control, best, exp.alpha, ci=ci, fallback_p_value=perm_p
+            )
+            decisions[exp.id] = (
+                *self._stopping_decision(exp, result, float(seq_p), min_effect_size),
+                result,
+            )
+
+        return decisions
+
     # ═══════════════════════════════════════════════════════════════
     # WINNER PROMOTION
     # ═══════════════════════════════════════════════════════════════
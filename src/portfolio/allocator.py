@@ -11,12 +11,12 @@ Verteilt Kapital intelligent auf Coins basierend auf:
 from __future__ import annotations
 
 import logging
-import os
 from dataclasses import dataclass, field
 from datetime import datetime
 
 from dotenv import load_dotenv
 
+from src.data.database import get_pooled_connection
 from src.portfolio.constraints import (
     AGGRESSIVE_CONSTRAINTS,
     BALANCED_CONSTRAINTS,
@@ -32,7 +32,6 @@ logger = logging.getLogger("trading_bot")
 
 # PostgreSQL
 try:
-    import psycopg2
     from psycopg2.extras import RealDictCursor
 
     POSTGRES_AVAILABLE = True
@@ -101,17 +100,10 @@ class PortfolioAllocator(SingletonMixin):
             return False
 
         try:
-            database_url = os.getenv("DATABASE_URL")
-            if database_url:
-                self.conn = psycopg2.connect(database_url)
-            else:
-                self.conn = psycopg2.connect(
-                    host=os.getenv("POSTGRES_HOST", "localhost"),
-                    port=os.getenv("POSTGRES_PORT", 5432),
-                    database=os.getenv("POSTGRES_DB", "trading_bot"),
-                    user=os.getenv("POSTGRES_USER", "trading"),
-                    password=os.getenv("POSTGRES_PASSWORD", ""),
-                )
+            self.conn = get_pooled_connection()
+            if not self.conn:
+                logger.warning("PortfolioAllocator: DatabaseManager Pool nicht verfügbar")
+                return False
             logger.info("PortfolioAllocator: PostgreSQL verbunden")
             return True
         except Exception as e:
@@ -231,17 +231,15 @@ class PortfolioManager:
 
             market_data = get_market_data()
 
-            for symbol, holding in self.index_tier._holdings.items():
-                price = market_data.get_price(symbol)
-                if price and price > 0:
-                    holding.current_price = price
+            prices = market_data.get_prices(list(self.index_tier._holdings))
+            self.index_tier.update_prices(prices)
 
             # Check trailing stops
             triggered = self.index_tier.update_trailing_stops()
             if triggered:
                 logger.warning(f"Index trailing stops triggered: {triggered}")
 
-            # Save to DB
+            # Save changed rows to DB
             conn = get_db_connection()
             if conn:
                 self.index_tier.conn = conn
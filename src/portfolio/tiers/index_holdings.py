@@ -1,9 +1,18 @@
-"""Index Holdings Tier - ETF-style buy-and-hold of top cryptocurrencies."""
+"""Index Holdings Tier - ETF-style buy-and-hold of top cryptocurrencies.
+
+Numeric holding state (quantity, entry, price, high-water mark, stop) is
+kept column-wise in ``HoldingsArrays``. Price updates, trailing stops,
+valuation and rebalance diffs run as one vectorized step over all symbols.
+The ``IndexHolding`` objects stay as the per-symbol view and are written
+back only for rows that changed; ``save_holdings`` upserts exactly those
+rows in one batch.
+"""
 
 import logging
 from dataclasses import dataclass, field
 
-from psycopg2.extras import RealDictCursor
+import numpy as np
+from psycopg2.extras import RealDictCursor, execute_values
 
 logger = logging.getLogger("trading_bot")
 
@@ -47,6 +56,59 @@ class IndexHolding:
         return 0.0
 
 
+@dataclass
+class HoldingsArrays:
+    """Column view of the holdings: one row per symbol, in ``symbols`` order."""
+
+    symbols: list[str]
+    quantity: np.ndarray
+    avg_entry_price: np.ndarray
+    current_price: np.ndarray
+    highest_price: np.ndarray
+    trailing_stop_price: np.ndarray
+    index: dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_holdings(cls, holdings: dict[str, IndexHolding]) -> "HoldingsArrays":
+        values = list(holdings.values())
+
+        def column(attr: str) -> np.ndarray:
+            return np.array([getattr(h, attr) for h in values], dtype=float)
+
+        symbols = list(holdings)
+        return cls(
+            symbols=symbols,
+            quantity=column("quantity"),
+            avg_entry_price=column("avg_entry_price"),
+            current_price=column("current_price"),
+            highest_price=column("highest_price"),
+            trailing_stop_price=column("trailing_stop_price"),
+            index={symbol: i for i, symbol in enumerate(symbols)},
+        )
+
+    @property
+    def value_usd(self) -> np.ndarray:
+        return np.where(self.current_price > 0, self.quantity * self.current_price, 0.0)
+
+
+INDEX_HOLDINGS_UPSERT = """
+    INSERT INTO index_holdings
+        (symbol, target_weight_pct, current_weight_pct,
+         quantity, avg_entry_price, current_price,
+         trailing_stop_price, highest_price, market_cap_rank)
+    VALUES %s
+    ON CONFLICT (symbol) DO UPDATE SET
+        target_weight_pct = EXCLUDED.target_weight_pct,
+        current_weight_pct = EXCLUDED.current_weight_pct,
+        quantity = EXCLUDED.quantity,
+        current_price = EXCLUDED.current_price,
+        trailing_stop_price = EXCLUDED.trailing_stop_price,
+        highest_price = EXCLUDED.highest_price,
+        market_cap_rank = EXCLUDED.market_cap_rank,
+        updated_at = NOW()
+"""
+
+
 @dataclass
 class IndexStatus:
     """Current state of the index holdings tier."""
@@ -80,6 +142,25 @@ class IndexHoldingsTier:
         self.conn = conn
         self.target_pct = target_pct
         self._holdings: dict[str, IndexHolding] = {}
+        self._arrays: HoldingsArrays | None = None
+        self._arrays_source: dict[str, IndexHolding] | None = None
+        # Symbols whose row differs from the DB since the last save
+        self._dirty: set[str] = set()
+
+    def _book(self) -> HoldingsArrays:
+        """Arrays for the current holdings, rebuilt when the holdings set changed."""
+        arrays = self._arrays
+        if (
+            arrays is None
+            or self._arrays_source is not self._holdings
+            or arrays.symbols != list(self._holdings)
+        ):
+            arrays = HoldingsArrays.from_holdings(self._holdings)
+            self._arrays = arrays
+            self._arrays_source = self._holdings
+            # Unknown origin (e.g. holdings assigned directly): persist everything
+            self._dirty = set(self._holdings)
+        return arrays
 
     def load_holdings(self) -> dict[str, IndexHolding]:
         """Load current holdings from DB."""
@@ -110,6 +191,8 @@ class IndexHoldingsTier:
         except Exception as e:
             logger.error(f"Failed to load index holdings: {e}")
 
+        self._book()
+        self._dirty.clear()
         return self._holdings
 
     def get_top20_composition(self) -> list[dict]:
@@ -161,111 +244,123 @@ class IndexHoldingsTier:
 
         Returns list of {"symbol": str, "action": "BUY"|"SELL", "amount_usd": float}
         """
-        orders = []
+        book = self._book()
+        values = book.value_usd
 
-        # Current holdings by symbol
-        current = {s: h.value_usd for s, h in self._holdings.items()}
-
-        for target in target_composition:
-            symbol = target["symbol"]
-            target_usd = available_capital * (target["weight_pct"] / 100)
-            current_usd = current.get(symbol, 0)
+        orders = []
+        if target_composition:
+            target_usd = available_capital * (
+                np.array([t["weight_pct"] for t in target_composition], dtype=float) / 100
+            )
+            rows = np.array([book.index.get(t["symbol"], -1) for t in target_composition])
+            current_usd = np.where(rows >= 0, values[rows], 0.0)
             diff = target_usd - current_usd
 
-            if abs(diff) < self.MIN_POSITION_USD:
-                continue
-
-            if diff > 0:
-                orders.append({"symbol": symbol, "action": "BUY", "amount_usd": diff})
-            elif diff < 0:
-                orders.append({"symbol": symbol, "action": "SELL", "amount_usd": abs(diff)})
-
-        # Sell positions not in target
-        target_symbols = {t["symbol"] for t in target_composition}
-        for symbol, holding in self._holdings.items():
-            if symbol not in target_symbols and holding.value_usd > self.MIN_POSITION_USD:
+            for i in np.flatnonzero(np.abs(diff) >= self.MIN_POSITION_USD):
+                action = "BUY" if diff[i] > 0 else "SELL"
                 orders.append(
                     {
-                        "symbol": symbol,
-                        "action": "SELL",
-                        "amount_usd": holding.value_usd,
+                        "symbol": target_composition[i]["symbol"],
+                        "action": action,
+                        "amount_usd": float(abs(diff[i])),
                     }
                 )
 
+        # Sell positions not in target
+        target_symbols = {t["symbol"] for t in target_composition}
+        in_target = np.array([symbol in target_symbols for symbol in book.symbols], dtype=bool)
+        for i in np.flatnonzero(~in_target & (values > self.MIN_POSITION_USD)):
+            orders.append(
+                {
+                    "symbol": book.symbols[i],
+                    "action": "SELL",
+                    "amount_usd": float(values[i]),
+                }
+            )
+
         return orders
 
-    def update_trailing_stops(self) -> list[str]:
-        """Update trailing stops and return symbols that triggered.
+    def update_prices(self, prices: dict[str, float]) -> int:
+        """Apply fresh prices (e.g. from one bulk ticker call).
 
-        For each holding: if current_price > highest_price, update highest
-        and trailing stop. If current_price <= trailing_stop, return as triggered.
+        Returns:
+            Number of holdings whose price changed
         """
-        triggered = []
+        book = self._book()
+        pairs = [(book.index[s], p) for s, p in prices.items() if s in book.index and p > 0]
+        if not pairs:
+            return 0
 
-        for symbol, holding in self._holdings.items():
-            if holding.quantity <= 0 or holding.current_price <= 0:
-                continue
+        rows, new_prices = (np.array(col) for col in zip(*pairs, strict=True))
+        changed = rows[book.current_price[rows] != new_prices]
+        book.current_price[rows] = new_prices
 
-            # Update highest price
-            if holding.current_price > holding.highest_price:
-                holding.highest_price = holding.current_price
-                holding.trailing_stop_price = holding.current_price * (
-                    1 - self.TRAILING_STOP_PCT / 100
-                )
+        for i in changed:
+            symbol = book.symbols[i]
+            self._holdings[symbol].current_price = float(book.current_price[i])
+            self._dirty.add(symbol)
+        return len(changed)
 
-            # Check trigger
-            if (
-                holding.trailing_stop_price > 0
-                and holding.current_price <= holding.trailing_stop_price
-            ):
-                triggered.append(symbol)
+    def update_trailing_stops(self) -> list[str]:
+        """Update trailing stops and return symbols that triggered.
 
-        return triggered
+        For each holding: if current_price > highest_price, update highest
+        and trailing stop. If current_price <= trailing_stop, return as triggered.
+        All holdings are evaluated in one vectorized step.
+        """
+        book = self._book()
+        price = book.current_price
+        active = (book.quantity > 0) & (price > 0)
+
+        raised = np.flatnonzero(active & (price > book.highest_price))
+        if raised.size:
+            book.highest_price[raised] = price[raised]
+            book.trailing_stop_price[raised] = price[raised] * (1 - self.TRAILING_STOP_PCT / 100)
+            for i in raised:
+                holding = self._holdings[book.symbols[i]]
+                holding.highest_price = float(book.highest_price[i])
+                holding.trailing_stop_price = float(book.trailing_stop_price[i])
+                self._dirty.add(holding.symbol)
+
+        stop = book.trailing_stop_price
+        triggered = active & (stop > 0) & (price <= stop)
+        return [book.symbols[i] for i in np.flatnonzero(triggered)]
 
     def save_holdings(self):
-        """Persist current holdings to DB."""
+        """Persist changed holdings to DB (one batched upsert)."""
         if not self.conn:
             return
 
+        self._book()
+        rows = [
+            (
+                h.symbol,
+                h.target_weight_pct,
+                h.current_weight_pct,
+                h.quantity,
+                h.avg_entry_price,
+                h.current_price,
+                h.trailing_stop_price,
+                h.highest_price,
+                h.market_cap_rank,
+            )
+            for symbol, h in self._holdings.items()
+            if symbol in self._dirty
+        ]
+        if not rows:
+            return
+
         try:
             with self.conn.cursor() as cur:
-                for symbol, h in self._holdings.items():
-                    cur.execute(
-                        """
-                        INSERT INTO index_holdings
-                            (symbol, target_weight_pct, current_weight_pct,
-                             quantity, avg_entry_price, current_price,
-                             trailing_stop_price, highest_price, market_cap_rank)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (symbol) DO UPDATE SET
-                            target_weight_pct = EXCLUDED.target_weight_pct,
-                            current_weight_pct = EXCLUDED.current_weight_pct,
-                            quantity = EXCLUDED.quantity,
-                            current_price = EXCLUDED.current_price,
-                            trailing_stop_price = EXCLUDED.trailing_stop_price,
-                            highest_price = EXCLUDED.highest_price,
-                            market_cap_rank = EXCLUDED.market_cap_rank,
-                            updated_at = NOW()
-                        """,
-                        (
-                            symbol,
-                            h.target_weight_pct,
-                            h.current_weight_pct,
-                            h.quantity,
-                            h.avg_entry_price,
-                            h.current_price,
-                            h.trailing_stop_price,
-                            h.highest_price,
-                            h.market_cap_rank,
-                        ),
-                    )
-                self.conn.commit()
+                execute_values(cur, INDEX_HOLDINGS_UPSERT, rows)
+            self.conn.commit()
+            self._dirty.clear()
         except Exception as e:
             logger.error(f"Failed to save index holdings: {e}")
 
     def get_status(self, total_portfolio_value: float) -> IndexStatus:
         """Return current index tier status."""
-        total_value = sum(h.value_usd for h in self._holdings.values())
+        total_value = self.get_total_value()
         target_value = total_portfolio_value * (self.target_pct / 100)
 
         return IndexStatus(
@@ -277,4 +372,4 @@ class IndexHoldingsTier:
 
     def get_total_value(self) -> float:
         """Return total value of all index holdings."""
-        return sum(h.value_usd for h in self._holdings.values())
+        return float(self._book().value_usd.sum())
@@ -13,17 +13,28 @@ Position Sizing basiert auf:
 1. Maximum Verlust pro Trade = Risk Budget * Portfolio Value
 2. Position Size = Max Loss / CVaR
 3. Anpassung nach Signal-Confidence
+
+Risk-Budgets:
+- Metriken, Kelly-Anteil und Regime-CVaR pro Symbol werden im Hintergrund
+  vorberechnet (task_refresh_risk_budgets, Tabelle risk_budgets)
+- calculate_position_size liest nur das Budget aus dem Speicher (O(1), kein I/O)
+- Der Bot lädt die Tabelle nur zeitgesteuert nach (refresh_if_stale); nachgerechnet
+  wird im Scheduler, lokal nur ohne DB
 """
 
 import logging
 import os
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
 import numpy as np
 from dotenv import load_dotenv
 
+from src.data.database import get_pooled_connection
 from src.utils.singleton import SingletonMixin
 
 load_dotenv()
@@ -31,7 +42,6 @@ load_dotenv()
 logger = logging.getLogger("trading_bot")
 
 try:
-    import psycopg2
     from psycopg2.extras import RealDictCursor
 
     POSTGRES_AVAILABLE = True
@@ -82,6 +92,89 @@ MIN_POSITION_PCT = 0.01  # Min 1% für sinnvolle Trades
 CONFIDENCE_LEVEL = 0.95  # 95% CVaR
 LOOKBACK_DAYS = 30  # Tage für historische Berechnung
 
+# CVaR-Multiplikatoren pro Markt-Regime
+REGIME_CVAR_MULTIPLIERS = {
+    "BULL": 0.9,  # Etwas weniger konservativ
+    "BEAR": 1.5,  # Deutlich konservativer
+    "SIDEWAYS": 1.1,  # Leicht konservativer
+    "TRANSITION": 1.3,  # Mehr Unsicherheit
+}
+
+# Risk-Budget Tabelle: Zeile ohne Regime-Anpassung
+DEFAULT_BUDGET_REGIME = "DEFAULT"
+RISK_BUDGET_MAX_AGE_HOURS = 6  # Ältere Budgets werden neu berechnet
+DEFAULT_BUDGET_RELOAD_SECONDS = 300.0
+
+
+def budget_reload_interval() -> float:
+    """Intervall für das Nachladen der Risk-Budgets (RISK_BUDGET_RELOAD_SECONDS)."""
+    try:
+        return float(os.getenv("RISK_BUDGET_RELOAD_SECONDS", str(DEFAULT_BUDGET_RELOAD_SECONDS)))
+    except ValueError:
+        return DEFAULT_BUDGET_RELOAD_SECONDS
+
+
+UPSERT_RISK_BUDGET_SQL = """
+    INSERT INTO risk_budgets (
+        symbol, regime, var_95, var_99, cvar_95, cvar_99,
+        max_loss_observed, volatility, downside_volatility,
+        kelly_fraction, adjusted_cvar, max_position_pct,
+        sample_size, computed_at
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON CONFLICT (symbol, regime) DO UPDATE SET
+        var_95 = EXCLUDED.var_95,
+        var_99 = EXCLUDED.var_99,
+        cvar_95 = EXCLUDED.cvar_95,
+        cvar_99 = EXCLUDED.cvar_99,
+        max_loss_observed = EXCLUDED.max_loss_observed,
+        volatility = EXCLUDED.volatility,
+        downside_volatility = EXCLUDED.downside_volatility,
+        kelly_fraction = EXCLUDED.kelly_fraction,
+        adjusted_cvar = EXCLUDED.adjusted_cvar,
+        max_position_pct = EXCLUDED.max_position_pct,
+        sample_size = EXCLUDED.sample_size,
+        computed_at = EXCLUDED.computed_at
+"""
+
+LOAD_RISK_BUDGETS_SQL = """
+    SELECT symbol, regime, var_95, var_99, cvar_95, cvar_99,
+           max_loss_observed, volatility, downside_volatility,
+           kelly_fraction, adjusted_cvar, sample_size, computed_at
+    FROM risk_budgets
+    WHERE computed_at >= NOW() - make_interval(hours => %s)
+"""
+
+
+@dataclass
+class RiskBudget:
+    """Vorberechnetes Risiko-Budget eines Symbols"""
+
+    symbol: str
+    metrics: RiskMetrics
+    kelly_fraction: float  # Half-Kelly Anteil am Portfolio (0 - 0.25)
+    sample_size: int
+    computed_at: datetime
+    regime_cvar: dict[str, float] = field(default_factory=dict)  # Regime -> angepasster CVaR
+
+    def adjusted_cvar(self, regime: str | None = None) -> float:
+        """CVaR(95%) nach Regime-Anpassung"""
+        if regime is None:
+            return self.metrics.cvar_95
+        return self.regime_cvar.get(regime.upper(), self.metrics.cvar_95)
+
+    def max_position_pct(
+        self, regime: str | None = None, risk_budget: float = DEFAULT_RISK_BUDGET
+    ) -> float:
+        """Größte Position als Anteil am Portfolio (volle Confidence, inkl. Limits)"""
+        cvar = self.adjusted_cvar(regime)
+        pct = risk_budget / cvar if cvar > 0 else 0.0
+        if self.kelly_fraction > 0:
+            pct = min(pct, self.kelly_fraction)
+        return max(MIN_POSITION_PCT, min(MAX_POSITION_PCT, pct))
+
+    def is_stale(self, max_age_hours: float = RISK_BUDGET_MAX_AGE_HOURS) -> bool:
+        return datetime.now(UTC) - self.computed_at > timedelta(hours=max_age_hours)
+
 
 class CVaRPositionSizer(SingletonMixin):
     """
@@ -102,15 +195,21 @@ class CVaRPositionSizer(SingletonMixin):
         # Cache für historische Daten
         self._returns_cache: dict[str, tuple[datetime, np.ndarray]] = {}
 
+        # Vorberechnete Risk-Budgets (gelesen im Order-Pfad)
+        self._budgets: dict[str, RiskBudget] = {}
+        self._budgets_lock = threading.Lock()
+        self._missing_budgets: set[str] = set()
+        self._budgets_loaded_at: float | None = None
+        self.reload_interval = budget_reload_interval()
+
     def _connect_db(self):
         """Verbinde mit PostgreSQL"""
         if not POSTGRES_AVAILABLE:
             return
 
         try:
-            database_url = os.getenv("DATABASE_URL")
-            if database_url:
-                self.conn = psycopg2.connect(database_url)
+            self.conn = get_pooled_connection()
+            if self.conn:
                 logger.debug("CVaRPositionSizer: DB verbunden")
         except Exception as e:
             logger.error(f"CVaRPositionSizer: DB Fehler: {e}")
@@ -222,14 +321,11 @@ class CVaRPositionSizer(SingletonMixin):
         Returns:
             PositionSizeResult mit empfohlener Größe
         """
-        # 1. Hole historische Returns
-        returns = self._get_historical_returns(symbol)
-
-        # 2. Berechne Risiko-Metriken
-        metrics = self.calculate_risk_metrics(returns)
+        # 1.+2. Vorberechnetes Risk-Budget (Metriken + Kelly, kein I/O)
+        budget = self.get_risk_budget(symbol)
 
         # 3. Regime-Anpassung
-        adjusted_cvar = self._adjust_cvar_for_regime(metrics.cvar_95, regime)
+        adjusted_cvar = budget.adjusted_cvar(regime)
 
         # 4. Basis Position Sizing: Risk Budget / CVaR
         max_loss_allowed = portfolio_value * risk_budget
@@ -238,7 +334,7 @@ class CVaRPositionSizer(SingletonMixin):
         # 5. Kelly Criterion (optional)
         kelly_size = 0.0
         if use_kelly:
-            kelly_size = self._calculate_kelly_position(returns, portfolio_value, signal_confidence)
+            kelly_size = portfolio_value * budget.kelly_fraction
 
         # 6. Confidence Adjustment
         # Höhere Confidence = größere Position
@@ -286,14 +382,7 @@ class CVaRPositionSizer(SingletonMixin):
 
         # In bearischen Regimes: Erhöhe CVaR (konservativer)
         # In bullischen Regimes: Leicht reduzieren
-        regime_multipliers = {
-            "BULL": 0.9,  # Etwas weniger konservativ
-            "BEAR": 1.5,  # Deutlich konservativer
-            "SIDEWAYS": 1.1,  # Leicht konservativer
-            "TRANSITION": 1.3,  # Mehr Unsicherheit
-        }
-
-        multiplier = regime_multipliers.get(regime.upper(), 1.0)
+        multiplier = REGIME_CVAR_MULTIPLIERS.get(regime.upper(), 1.0)
         return cvar * multiplier
 
     def _calculate_kelly_position(
@@ -310,6 +399,10 @@ class CVaRPositionSizer(SingletonMixin):
         - q = Loss-Wahrscheinlichkeit (1 - p)
         - b = Win/Loss Ratio
         """
+        return portfolio_value * self._kelly_fraction(returns)
+
+    def _kelly_fraction(self, returns: np.ndarray) -> float:
+        """Half-Kelly Anteil am Portfolio (0 - 0.25)"""
         if len(returns) < 20:
             return 0.0
 
@@ -343,9 +436,192 @@ class CVaRPositionSizer(SingletonMixin):
         half_kelly = kelly_fraction / 2
 
         # Limit auf sinnvollen Bereich
-        half_kelly = max(0, min(0.25, half_kelly))
+        return float(max(0, min(0.25, half_kelly)))
+
+    # ═══════════════════════════════════════════════════════════════
+    # RISK BUDGETS (vorberechnet)
+    # ═══════════════════════════════════════════════════════════════
+
+    def build_risk_budget(self, symbol: str, returns: np.ndarray) -> RiskBudget:
+        """Berechne Risk-Budget aus Returns (reine Rechnung, kein I/O)"""
+        metrics = self.calculate_risk_metrics(returns)
+        return RiskBudget(
+            symbol=symbol,
+            metrics=metrics,
+            kelly_fraction=self._kelly_fraction(returns),
+            sample_size=len(returns),
+            computed_at=datetime.now(UTC),
+            regime_cvar={
+                regime: self._adjust_cvar_for_regime(metrics.cvar_95, regime)
+                for regime in REGIME_CVAR_MULTIPLIERS
+            },
+        )
+
+    def compute_risk_budget(self, symbol: str) -> RiskBudget:
+        """Berechne Risk-Budget mit frischen Returns (DB -> API -> Fallback)"""
+        self._returns_cache.pop(symbol, None)
+        return self.build_risk_budget(symbol, self._get_historical_returns(symbol))
+
+    def get_risk_budget(self, symbol: str) -> RiskBudget:
+        """
+        Risk-Budget für den Order-Pfad - ohne DB- oder API-Zugriff.
+
+        Fehlt das Budget, wird es aus bereits geladenen Returns berechnet
+        oder das konservative Fallback-Budget genutzt, bis der Scheduler das
+        Budget liefert (ohne DB: bis refresh_if_stale() es lokal nachrechnet).
+        """
+        with self._budgets_lock:
+            budget = self._budgets.get(symbol)
+        if budget is not None:
+            return budget
+
+        cached = self._returns_cache.get(symbol)
+        if cached is not None:
+            budget = self.build_risk_budget(symbol, cached[1])
+            self._store_budgets([budget])
+            return budget
+
+        logger.debug(f"CVaRPositionSizer: kein Risk-Budget für {symbol}, nutze Fallback")
+        self._missing_budgets.add(symbol)
+        return self.build_risk_budget(symbol, np.array([]))
+
+    def _store_budgets(self, budgets: Iterable[RiskBudget]):
+        with self._budgets_lock:
+            for budget in budgets:
+                self._budgets[budget.symbol] = budget
+
+    def refresh_risk_budgets(self, symbols: Iterable[str]) -> dict[str, RiskBudget]:
+        """
+        Berechne Risk-Budgets neu und speichere sie (Speicher + risk_budgets).
+
+        Läuft im Scheduler; der Bot-Prozess liest das Ergebnis über
+        load_risk_budgets().
+        """
+        budgets = {}
+        for symbol in symbols:
+            try:
+                budgets[symbol] = self.compute_risk_budget(symbol)
+            except Exception as e:
+                logger.warning(f"Risk-Budget für {symbol} fehlgeschlagen: {e}")
+
+        self._store_budgets(budgets.values())
+        self.save_risk_budgets(budgets.values())
+        return budgets
+
+    def save_risk_budgets(self, budgets: Iterable[RiskBudget]):
+        """Schreibe Risk-Budgets (eine Zeile pro Symbol und Regime)"""
+        if not self.conn:
+            return
+
+        rows = []
+        for budget in budgets:
+            m = budget.metrics
+            for regime in (DEFAULT_BUDGET_REGIME, *REGIME_CVAR_MULTIPLIERS):
+                key = None if regime == DEFAULT_BUDGET_REGIME else regime
+                rows.append(
+                    (
+                        budget.symbol,
+                        regime,
+                        m.var_95,
+                        m.var_99,
+                        m.cvar_95,
+                        m.cvar_99,
+                        m.max_loss_observed,
+                        m.volatility,
+                        m.downside_volatility,
+                        budget.kelly_fraction,
+                        budget.adjusted_cvar(key),
+                        budget.max_position_pct(key),
+                        budget.sample_size,
+                        budget.computed_at,
+                    )
+                )
+        if not rows:
+            return
+
+        try:
+            with self.conn.cursor() as cur:
+                cur.executemany(UPSERT_RISK_BUDGET_SQL, rows)
+            self.conn.commit()
+        except Exception as e:
+            logger.error(f"Risk-Budgets speichern fehlgeschlagen: {e}")
+            self.conn.rollback()
+
+    def load_risk_budgets(self, max_age_hours: float = RISK_BUDGET_MAX_AGE_HOURS) -> int:
+        """Lade vorberechnete Risk-Budgets aus der DB (eine Abfrage)"""
+        if not self.conn:
+            return 0
+
+        try:
+            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(LOAD_RISK_BUDGETS_SQL, (max_age_hours,))
+                rows = cur.fetchall()
+        except Exception as e:
+            logger.debug(f"Risk-Budgets laden fehlgeschlagen: {e}")
+            self.conn.rollback()
+            return 0
+
+        defaults = {r["symbol"]: r for r in rows if r["regime"] == DEFAULT_BUDGET_REGIME}
+        budgets = {
+            symbol: RiskBudget(
+                symbol=symbol,
+                metrics=RiskMetrics(
+                    var_95=float(r["var_95"]),
+                    var_99=float(r["var_99"]),
+                    cvar_95=float(r["cvar_95"]),
+                    cvar_99=float(r["cvar_99"]),
+                    max_loss_observed=float(r["max_loss_observed"]),
+                    volatility=float(r["volatility"]),
+                    downside_volatility=float(r["downside_volatility"]),
+                ),
+                kelly_fraction=float(r["kelly_fraction"]),
+                sample_size=int(r["sample_size"]),
+                computed_at=r["computed_at"],
+            )
+            for symbol, r in defaults.items()
+        }
+        for r in rows:
+            budget = budgets.get(r["symbol"])
+            if budget is not None and r["regime"] != DEFAULT_BUDGET_REGIME:
+                budget.regime_cvar[r["regime"]] = float(r["adjusted_cvar"])
+
+        self._store_budgets(budgets.values())
+        return len(budgets)
+
+    def refresh_if_stale(self, symbols: Iterable[str] = ()):
+        """
+        Halte die Risk-Budgets aktuell - läuft im Bot-Tick, daher ohne Klines-I/O.
+
+        Lädt höchstens alle reload_interval Sekunden die vom Scheduler
+        (task_refresh_risk_budgets) berechnete Tabelle. Nur ohne DB gibt es
+        keinen Scheduler-Feed; dann werden fehlende oder veraltete Budgets
+        lokal nachgerechnet, Fehler pro Symbol bleiben auf das Symbol begrenzt.
+        """
+        now = time.monotonic()
+        if self._budgets_loaded_at is not None and now - self._budgets_loaded_at < (
+            self.reload_interval
+        ):
+            return
+        self._budgets_loaded_at = now
+
+        if self.conn:
+            self.load_risk_budgets()
+            self._missing_budgets.clear()
+            return
 
-        return portfolio_value * half_kelly
+        with self._budgets_lock:
+            pending = {s for s in symbols if s not in self._budgets or self._budgets[s].is_stale()}
+        pending |= self._missing_budgets
+        self._missing_budgets.clear()
+
+        budgets = []
+        for symbol in sorted(pending):
+            try:
+                budgets.append(self.compute_risk_budget(symbol))
+            except Exception as e:
+                logger.warning(f"Risk-Budget für {symbol} fehlgeschlagen: {e}")
+                self._missing_budgets.add(symbol)
+        self._store_budgets(budgets)
 
     # ═══════════════════════════════════════════════════════════════
     # HISTORICAL DATA
@@ -9,16 +9,58 @@ Typen:
 
 Wichtig: Stop-Loss schützt vor katastrophalen Verlusten,
 aber kann bei hoher Volatilität zu früh auslösen.
+
+Trigger-Index: Stops sind pro Symbol gebucht und werden nur angefasst, wenn
+sich der Preis des Symbols ändert. FIXED-Stops liegen sortiert nach
+Trigger-Preis (Bisect statt Scan), Trailing-Stops werden pro Symbol als
+Array-Batch nachgezogen.
 """
 
 import logging
 import threading
+from bisect import bisect_left, insort
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
+import numpy as np
+
 logger = logging.getLogger("trading_bot")
 
+# Persistenz (auch vom Write-Behind Writer genutzt)
+STOP_LOSS_COLUMNS = (
+    "id",
+    "symbol",
+    "entry_price",
+    "stop_price",
+    "quantity",
+    "stop_type",
+    "stop_percentage",
+    "trailing_distance",
+    "highest_price",
+    "is_active",
+)
+_STOP_LOSS_UPSERT = f"""
+    INSERT INTO stop_loss_orders ({", ".join(STOP_LOSS_COLUMNS)})
+    VALUES {{values}}
+    ON CONFLICT (id) DO UPDATE SET
+        stop_price = EXCLUDED.stop_price,
+        highest_price = EXCLUDED.highest_price,
+        is_active = EXCLUDED.is_active
+"""
+# execute_values-Variante (VALUES %s) und Einzel-Insert
+STOP_LOSS_UPSERT = _STOP_LOSS_UPSERT.format(values="%s")
+_STOP_LOSS_UPSERT_ONE = _STOP_LOSS_UPSERT.format(
+    values="(" + ", ".join(f"%({column})s" for column in STOP_LOSS_COLUMNS) + ")"
+)
+STOP_LOSS_UPDATE = """
+    UPDATE stop_loss_orders
+    SET is_active = %(is_active)s, triggered_at = %(triggered_at)s,
+        triggered_price = %(triggered_price)s, result_pnl = %(result_pnl)s,
+        stop_price = %(stop_price)s, highest_price = %(highest_price)s
+    WHERE id = %(id)s
+"""
+
 
 class StopType(Enum):
     FIXED = "fixed"  # Fester Prozentsatz
@@ -97,7 +139,11 @@ class StopLossOrder:
                     self.current_stop_price, self.entry_price
                 )  # Break-Even
 
-        # Check ob Stop getriggert — does NOT deactivate, caller must confirm
+        return self.check_trigger(current_price)
+
+    def check_trigger(self, current_price: float) -> bool:
+        """Prüft den Stop-Preis ohne Nachziehen (True wenn getriggert)."""
+        # Does NOT deactivate, caller must confirm
         if current_price <= self.current_stop_price:
             self.triggered_price = current_price
             self.triggered_at = datetime.now()
@@ -135,6 +181,98 @@ class StopLossOrder:
         }
 
 
+class _SymbolStops:
+    """
+    Trigger-Index der Stops eines Symbols.
+
+    - FIXED: Stop-Preis ändert sich nie, sortiert nach (stop_price, id);
+      getriggert sind alle Einträge mit stop_price >= Preis
+    - TRAILING: highest/stop/Faktor als Arrays, ein Vergleich pro Update
+    - ATR/BREAK_EVEN: skalar über StopLossOrder.update()
+    """
+
+    def __init__(self):
+        self.stops: dict[str, StopLossOrder] = {}
+        self.fixed: list[tuple[float, str]] = []
+        self.trailing: list[StopLossOrder] = []
+        self.other: list[StopLossOrder] = []
+        # (highest, stop, factor) - None = aus den Stops neu aufbauen
+        self._arrays: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None
+        # Letztes (Preis, ATR) - gleicher Input kann nichts Neues triggern
+        self.last_input: tuple[float, float | None] | None = None
+
+    def add(self, stop: StopLossOrder):
+        self.stops[stop.id] = stop
+        if stop.stop_type == StopType.FIXED:
+            insort(self.fixed, (stop.current_stop_price, stop.id))
+        elif stop.stop_type == StopType.TRAILING:
+            self.trailing.append(stop)
+            self._arrays = None
+        else:
+            self.other.append(stop)
+        self.last_input = None
+
+    def remove(self, stop_id: str):
+        stop = self.stops.pop(stop_id, None)
+        if stop is None:
+            return
+        if stop.stop_type == StopType.FIXED:
+            entry = (stop.current_stop_price, stop.id)
+            i = bisect_left(self.fixed, entry)
+            if i < len(self.fixed) and self.fixed[i] == entry:
+                del self.fixed[i]
+        elif stop.stop_type == StopType.TRAILING:
+            self.trailing.remove(stop)
+            self._arrays = None
+        else:
+            self.other.remove(stop)
+
+    def update(self, price: float, atr: float | None) -> list[StopLossOrder]:
+        if (price, atr) == self.last_input:
+            return []
+
+        triggered = [
+            stop
+            for _, stop_id in self.fixed[bisect_left(self.fixed, (price,)) :]
+            if (stop := self.stops[stop_id]).is_active and stop.check_trigger(price)
+        ]
+        triggered += self._update_trailing(price)
+        triggered += [stop for stop in self.other if stop.update(price, atr)]
+
+        # Getriggerte Stops können reaktiviert werden (Sell fehlgeschlagen) -
+        # dann muss der nächste Tick sie auch bei gleichem Preis erneut prüfen
+        self.last_input = None if triggered else (price, atr)
+        return triggered
+
+    def _update_trailing(self, price: float) -> list[StopLossOrder]:
+        if not self.trailing:
+            return []
+        if self._arrays is None:
+            self._arrays = (
+                np.array([s.highest_price for s in self.trailing], dtype=float),
+                np.array([s.current_stop_price for s in self.trailing], dtype=float),
+                np.array([1 - s.trailing_distance / 100 for s in self.trailing], dtype=float),
+            )
+        highest, stop_prices, factor = self._arrays
+
+        # Neues Hoch: highest + Stop nachziehen (Stop fällt nie)
+        raised = np.flatnonzero(price > highest)
+        if raised.size:
+            highest[raised] = price
+            stop_prices[raised] = np.maximum(stop_prices[raised], price * factor[raised])
+            for i in raised:
+                stop = self.trailing[i]
+                if stop.is_active:
+                    stop.highest_price = price
+                    stop.current_stop_price = float(stop_prices[i])
+
+        return [
+            stop
+            for i in np.flatnonzero(price <= stop_prices)
+            if (stop := self.trailing[i]).is_active and stop.check_trigger(price)
+        ]
+
+
 class StopLossManager:
     """
     Verwaltet alle Stop-Loss Orders.
@@ -145,10 +283,14 @@ class StopLossManager:
     - Portfolio-weiter Drawdown-Schutz
     """
 
-    def __init__(self, db_manager=None, telegram_bot=None):
+    def __init__(self, db_manager=None, telegram_bot=None, write_behind=None):
         self.db = db_manager
         self.telegram = telegram_bot
+        # Optional: WriteBehindWriter - DB-Writes asynchron statt im Order-Pfad
+        self.write_behind = write_behind
         self.stops: dict[str, StopLossOrder] = {}
+        # Trigger-Index pro Symbol (nur aktive Stops)
+        self._books: dict[str, _SymbolStops] = {}
         self.lock = threading.Lock()
 
         # Portfolio Protection
@@ -188,7 +330,7 @@ class StopLossManager:
         )
 
         with self.lock:
-            self.stops[stop.id] = stop
+            self._add(stop)
 
         # In DB speichern
         self._save_to_db(stop)
@@ -199,7 +341,10 @@ class StopLossManager:
         self, prices: dict[str, float], atrs: dict[str, float] | None = None
     ) -> list[StopLossOrder]:
         """
-        Aktualisiert alle Stops mit aktuellen Preisen.
+        Aktualisiert die Stops der Symbole in ``prices``.
+
+        Nur Symbole mit geändertem Preis (oder ATR) werden geprüft; siehe
+        _SymbolStops für den Trigger-Index.
 
         Returns:
             Liste der getriggerten Stops
@@ -207,23 +352,35 @@ class StopLossManager:
         triggered = []
 
         with self.lock:
-            for stop_id, stop in list(self.stops.items()):
-                if not stop.is_active:
+            for symbol, price in prices.items():
+                book = self._books.get(symbol)
+                if not price or book is None:
                     continue
 
-                price = prices.get(stop.symbol)
-                if not price:
-                    continue
+                atr = atrs.get(symbol) if atrs else None
+                triggered.extend(book.update(price, atr))
 
-                atr = atrs.get(stop.symbol) if atrs else None
+        return triggered
 
-                if stop.update(price, atr):
-                    triggered.append(stop)
+    def _add(self, stop: StopLossOrder):
+        """Registriert einen Stop (Aufrufer hält self.lock)."""
+        self.stops[stop.id] = stop
+        self._books.setdefault(stop.symbol, _SymbolStops()).add(stop)
 
-        return triggered
+    def _unindex(self, stop: StopLossOrder):
+        """Entfernt einen inaktiven Stop aus dem Trigger-Index (Aufrufer hält self.lock)."""
+        book = self._books.get(stop.symbol)
+        if book is None:
+            return
+        book.remove(stop.id)
+        if not book.stops:
+            del self._books[stop.symbol]
 
     def notify_and_persist_trigger(self, stop: StopLossOrder):
         """Call after confirm_trigger() to send notifications and update DB."""
+        if not stop.is_active:
+            with self.lock:
+                self._unindex(stop)
         self._on_stop_triggered(stop)
 
     def _on_stop_triggered(self, stop: StopLossOrder):
@@ -282,7 +439,9 @@ Type: {stop.stop_type.value}
         """Storniert einen Stop"""
         with self.lock:
             if stop_id in self.stops:
-                self.stops[stop_id].is_active = False
+                stop = self.stops[stop_id]
+                stop.is_active = False
+                self._unindex(stop)
                 return True
         return False
 
@@ -321,7 +480,7 @@ Type: {stop.stop_type.value}
                     stop.highest_price = float(row["highest_price"])
 
                 with self.lock:
-                    self.stops[stop.id] = stop
+                    self._add(stop)
 
             if rows:
                 logger.info(f"Stop-Loss Manager: {len(rows)} aktive Stops aus DB geladen")
@@ -334,32 +493,25 @@ Type: {stop.stop_type.value}
         if not self.db:
             return
 
+        row = {
+            "id": stop.id,
+            "symbol": stop.symbol,
+            "entry_price": stop.entry_price,
+            "stop_price": stop.current_stop_price,
+            "quantity": stop.quantity,
+            "stop_type": stop.stop_type.value,
+            "stop_percentage": stop.stop_percentage,
+            "trailing_distance": stop.trailing_distance,
+            "highest_price": stop.highest_price,
+            "is_active": stop.is_active,
+        }
+        if self.write_behind:
+            self.write_behind.submit("stop_loss_save", row)
+            return
+
         try:
             with self.db.get_cursor() as cur:
-                cur.execute(
-                    """
-                    INSERT INTO stop_loss_orders
-                    (id, symbol, entry_price, stop_price, quantity, stop_type,
-                     stop_percentage, trailing_distance, highest_price, is_active)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (id) DO UPDATE SET
-                        stop_price = EXCLUDED.stop_price,
-                        highest_price = EXCLUDED.highest_price,
-                        is_active = EXCLUDED.is_active
-                    """,
-                    (
-                        stop.id,
-                        stop.symbol,
-                        stop.entry_price,
-                        stop.current_stop_price,
-                        stop.quantity,
-                        stop.stop_type.value,
-                        stop.stop_percentage,
-                        stop.trailing_distance,
-                        stop.highest_price,
-                        stop.is_active,
-                    ),
-                )
+                cur.execute(_STOP_LOSS_UPSERT_ONE, row)
         except Exception as e:
             logger.error(f"Stop-Loss DB Save Error: {e}")
 
@@ -368,26 +520,22 @@ Type: {stop.stop_type.value}
         if not self.db:
             return
 
+        row = {
+            "id": stop.id,
+            "is_active": stop.is_active,
+            "triggered_at": stop.triggered_at,
+            "triggered_price": stop.triggered_price,
+            "result_pnl": stop.result_pnl_pct,
+            "stop_price": stop.current_stop_price,
+            "highest_price": stop.highest_price,
+        }
+        if self.write_behind:
+            self.write_behind.submit("stop_loss_update", row)
+            return
+
         try:
             with self.db.get_cursor() as cur:
-                cur.execute(
-                    """
-                    UPDATE stop_loss_orders
-                    SET is_active = %s, triggered_at = %s,
-                        triggered_price = %s, result_pnl = %s,
-                        stop_price = %s, highest_price = %s
-                    WHERE id = %s
-                    """,
-                    (
-                        stop.is_active,
-                        stop.triggered_at,
-                        stop.triggered_price,
-                        stop.result_pnl_pct,
-                        stop.current_stop_price,
-                        stop.highest_price,
-                        stop.id,
-                    ),
-                )
+                cur.execute(STOP_LOSS_UPDATE, row)
         except Exception as e:
             logger.error(f"Stop-Loss DB Update Error: {e}")
 
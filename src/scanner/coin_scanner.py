@@ -9,11 +9,11 @@ from __future__ import annotations
 
 import json
 import logging
-import os
 from datetime import datetime, timedelta
 
 from dotenv import load_dotenv
 
+from src.data.database import POSTGRES_AVAILABLE, get_pooled_connection
 from src.scanner.opportunity import Opportunity, OpportunityDirection, OpportunityRisk
 from src.utils.singleton import SingletonMixin
 
@@ -21,14 +21,6 @@ load_dotenv()
 
 logger = logging.getLogger("trading_bot")
 
-# PostgreSQL
-try:
-    import psycopg2
-
-    POSTGRES_AVAILABLE = True
-except ImportError:
-    POSTGRES_AVAILABLE = False
-
 
 class CoinScanner(SingletonMixin):
     """
@@ -84,17 +76,10 @@ class CoinScanner(SingletonMixin):
             return False
 
         try:
-            database_url = os.getenv("DATABASE_URL")
-            if database_url:
-                self.conn = psycopg2.connect(database_url)
-            else:
-                self.conn = psycopg2.connect(
-                    host=os.getenv("POSTGRES_HOST", "localhost"),
-                    port=os.getenv("POSTGRES_PORT", 5432),
-                    database=os.getenv("POSTGRES_DB", "trading_bot"),
-                    user=os.getenv("POSTGRES_USER", "trading"),
-                    password=os.getenv("POSTGRES_PASSWORD", ""),
-                )
+            self.conn = get_pooled_connection()
+            if not self.conn:
+                logger.warning("CoinScanner: DatabaseManager Pool nicht verfügbar")
+                return False
             logger.info("CoinScanner: PostgreSQL verbunden")
             return True
         except Exception as e:
@@ -237,9 +222,9 @@ class CoinScanner(SingletonMixin):
 
         try:
             from src.analysis.technical_indicators import TechnicalIndicators
-            from src.api.binance_client import BinanceClient
+            from src.api.binance_client import get_binance_client
 
-            client = BinanceClient()
+            client = get_binance_client()
             indicators = TechnicalIndicators()
 
             # Hole Klines (4h für mittelfristige Signale)
@@ -449,9 +434,9 @@ class CoinScanner(SingletonMixin):
         signals = []
 
         try:
-            from src.api.binance_client import BinanceClient
+            from src.api.binance_client import get_binance_client
 
-            client = BinanceClient()
+            client = get_binance_client()
             ticker = client.get_24h_ticker(coin.symbol)
 
             if not ticker:
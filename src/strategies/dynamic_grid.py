@@ -16,7 +16,6 @@ Features:
 """
 
 import logging
-import os
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -25,6 +24,8 @@ from typing import Any
 import numpy as np
 from dotenv import load_dotenv
 
+from src.core.replay import recorded_input
+from src.data.database import get_pooled_connection
 from src.utils.singleton import SingletonMixin
 
 load_dotenv()
@@ -32,7 +33,6 @@ load_dotenv()
 logger = logging.getLogger("trading_bot")
 
 try:
-    import psycopg2
     from psycopg2.extras import RealDictCursor
 
     POSTGRES_AVAILABLE = True
@@ -160,9 +160,8 @@ class DynamicGridStrategy(SingletonMixin):
             return
 
         try:
-            database_url = os.getenv("DATABASE_URL")
-            if database_url:
-                self.conn = psycopg2.connect(database_url)
+            self.conn = get_pooled_connection()
+            if self.conn:
                 logger.debug("DynamicGridStrategy: DB verbunden")
         except Exception as e:
             logger.error(f"DynamicGridStrategy: DB Fehler: {e}")
@@ -704,7 +703,10 @@ class DynamicGridStrategy(SingletonMixin):
                 "limit": limit,
             }
 
-            response = self.http.get(url, params=params, timeout=10)
+            response = recorded_input(
+                f"klines:{symbol.upper()}:{timeframe}:{limit}",
+                lambda: self.http.get(url, params=params, timeout=10),
+            )
 
             if response:
                 data = np.array(response)
@@ -7,6 +7,14 @@ from psycopg2.extras import RealDictCursor
 from src.tasks.base import get_db_connection, logger
 from src.utils.task_lock import task_locked
 
+# Symbole mit Risk-Budget: Watchlist + zuletzt gehandelte Paare
+RISK_BUDGET_SYMBOLS_QUERY = """
+    SELECT symbol FROM watchlist
+    UNION
+    SELECT symbol FROM trade_pairs
+    WHERE created_at >= NOW() - make_interval(days => %s)
+"""
+
 
 @task_locked
 def task_regime_detection():
@@ -65,6 +73,35 @@ Confidence: {regime_state.model_confidence:.1%}
         trading_logger.error("Regime detection failed", e, {"task": "regime_detection"})
 
 
+@task_locked
+def task_refresh_risk_budgets():
+    """Berechnet CVaR Risk-Budgets pro Symbol und Regime vor. Läuft stündlich."""
+    logger.info("Refreshing risk budgets...")
+
+    conn = get_db_connection()
+    if not conn:
+        return
+
+    try:
+        from src.risk.cvar_sizing import LOOKBACK_DAYS, CVaRPositionSizer
+
+        with conn.cursor() as cur:
+            cur.execute(RISK_BUDGET_SYMBOLS_QUERY, (LOOKBACK_DAYS,))
+            symbols = sorted(row[0] for row in cur.fetchall())
+
+        if not symbols:
+            logger.info("No symbols — skipping risk budgets")
+            return
+
+        budgets = CVaRPositionSizer.get_instance().refresh_risk_budgets(symbols)
+        logger.info(f"Risk budgets: refreshed {len(budgets)}/{len(symbols)} symbols")
+
+    except Exception as e:
+        logger.error(f"Risk Budget Refresh Error: {e}")
+    finally:
+        conn.close()
+
+
 def task_update_signal_weights():
     """Aktualisiert Bayesian Signal Weights. Läuft täglich um 22:00."""
     from src.core.logging_system import get_logger
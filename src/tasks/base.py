@@ -6,12 +6,15 @@ logger = logging.getLogger("trading_bot")
 
 
 def get_db_connection():
-    """Erstellt Datenbankverbindung aus dem DatabaseManager Pool."""
+    """Connection-Handle aus dem DatabaseManager Pool.
+
+    Das Handle leiht sich pro Transaktion eine Connection; ``conn.close()``
+    gibt sie an den Pool zurück statt die Server-Verbindung zu schließen.
+    """
     try:
-        from src.data.database import DatabaseManager
+        from src.data.database import get_pooled_connection
 
-        db = DatabaseManager.get_instance()
-        return db.get_connection()
+        return get_pooled_connection()
     except Exception as e:
         logger.error(f"DB Connection Error: {e}")
         return None
@@ -120,23 +120,21 @@ def task_ab_test_check():
 
         framework = ABTestingFramework.get_instance()
 
-        summaries = framework.get_all_experiments_summary()
-        running = [s for s in summaries if s.get("status") == "RUNNING"]
+        # Ein Batch für alle laufenden Experimente (eine Query, gemeinsame Resamples)
+        decisions = framework.check_running_experiments()
 
-        for exp in running:
-            exp_id = exp["id"]
-
-            should_stop, reason = framework.check_early_stopping(exp_id)
+        for exp_id, (should_stop, reason, analysis) in decisions.items():
+            name = framework.experiments[exp_id].name
 
             if should_stop:
-                result = framework.complete_experiment(exp_id, promote_winner=True)
+                result = framework.complete_experiment(exp_id, promote_winner=True, result=analysis)
 
                 if result:
                     telegram = get_telegram()
                     telegram.send(f"""
 🧪 <b>A/B TEST ABGESCHLOSSEN</b>
 
-<b>{exp["name"]}</b>
+<b>{name}</b>
 Grund: {reason}
 
 <b>Ergebnis:</b>
@@ -146,7 +144,7 @@ Grund: {reason}
 🎯 Signifikanz: {result.significance.value}
 """)
             else:
-                logger.info(f"A/B Test '{exp['name']}': {reason}")
+                logger.info(f"A/B Test '{name}': {reason}")
 
     except Exception as e:
         logger.error(f"A/B Test Check Error: {e}")
@@ -51,9 +51,7 @@ def task_fetch_social_sentiment():
 
         symbols = ["BTC", "ETH", "SOL"]
 
-        for symbol in symbols:
-            metrics = provider.get_aggregated_sentiment(symbol)
-
+        for symbol, metrics in provider.get_aggregated_sentiments(symbols).items():
             if metrics:
                 logger.info(
                     f"Social Sentiment {symbol}: "
@@ -0,0 +1,284 @@
+"""Priority task executor for the scheduler.
+
+``schedule.run_pending()`` runs due jobs one after another in the main
+thread, so a slow export or AI call delayed stop checks due in the same
+minute. The executor moves execution off the main thread:
+
+- One lane (FIFO queue + worker threads) per priority class. Classes do not
+  share workers, so risk tasks never queue behind reporting.
+- Overlap-aware: a task that is still queued or running is not submitted
+  again (counted as ``skipped``); ``task_locked`` stays as the inner guard.
+- Timeouts: Python threads cannot be killed. A watchdog marks runs that
+  exceed their timeout, logs them and starts a replacement worker so the
+  lane keeps its capacity; the stuck thread exits once its task returns.
+- Metrics: each run is a telemetry span (src/utils/telemetry.py), so runs,
+  failures, timeouts, skips, duration, start lag (including queue wait), DB
+  and HTTP time live in the one TaskTelemetry registry the endpoint serves.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any
+
+from src.utils.telemetry import TaskTelemetry, get_task_telemetry
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+logger = logging.getLogger("trading_bot")
+
+
+class Priority(IntEnum):
+    """Priority class of a scheduled task (lower value = more important)."""
+
+    RISK = 0
+    TRADING = 1
+    DATA = 2
+    REPORTING = 3
+
+
+DEFAULT_WORKERS = {
+    Priority.RISK: 1,
+    Priority.TRADING: 1,
+    Priority.DATA: 2,
+    Priority.REPORTING: 1,
+}
+
+# Seconds after which a run is reported as hung (per-task overrides via wrap_jobs)
+DEFAULT_TIMEOUTS = {
+    Priority.RISK: 120.0,
+    Priority.TRADING: 300.0,
+    Priority.DATA: 900.0,
+    Priority.REPORTING: 1800.0,
+}
+
+WATCHDOG_INTERVAL_SECONDS = 5.0
+
+_STOP = object()
+
+
+@dataclass
+class _Run:
+    name: str
+    func: Callable[[], Any]
+    priority: Priority
+    timeout: float
+    submitted_at: float
+    # Seconds the job was already overdue when schedule handed it over
+    late: float = 0.0
+    started_at: float | None = None
+    timed_out: bool = False
+    worker: threading.Thread | None = field(default=None, repr=False)
+
+
+class _Lane:
+    """Worker threads serving one priority class."""
+
+    def __init__(self, executor: TaskExecutor, priority: Priority, workers: int):
+        self.executor = executor
+        self.priority = priority
+        self.size = max(workers, 1)
+        self.queue: queue.Queue = queue.Queue()
+        self.workers: set[threading.Thread] = set()
+        self.retired: set[threading.Thread] = set()
+
+    def start(self) -> None:
+        for _ in range(self.size - len(self.workers)):
+            self.add_worker()
+
+    def add_worker(self) -> None:
+        thread = threading.Thread(
+            target=self._work,
+            name=f"scheduler-{self.priority.name.lower()}-{len(self.workers) + len(self.retired)}",
+            daemon=True,
+        )
+        self.workers.add(thread)
+        thread.start()
+
+    def retire(self, thread: threading.Thread) -> None:
+        """Replace a worker stuck in a timed-out task (called under executor lock)."""
+        if thread in self.workers:
+            self.workers.discard(thread)
+            self.retired.add(thread)
+            self.add_worker()
+
+    def _work(self) -> None:
+        me = threading.current_thread()
+        while True:
+            run = self.queue.get()
+            if run is _STOP:
+                return
+            self.executor._execute(run)
+            with self.executor._lock:
+                if me in self.retired:
+                    self.retired.discard(me)
+                    return
+
+
+class TaskExecutor:
+    """Runs scheduled tasks on per-priority worker lanes."""
+
+    def __init__(
+        self,
+        workers: dict[Priority, int] | None = None,
+        timeouts: dict[Priority, float] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        telemetry: TaskTelemetry | None = None,
+    ):
+        self._clock = clock
+        self.telemetry = telemetry or get_task_telemetry()
+        self._lock = threading.Lock()
+        self._timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+        sizes = {**DEFAULT_WORKERS, **(workers or {})}
+        self._lanes = {p: _Lane(self, p, sizes[p]) for p in Priority}
+        self._active: dict[str, _Run] = {}
+        self._stopped = threading.Event()
+        self._watchdog: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start lane workers and the timeout watchdog."""
+        for lane in self._lanes.values():
+            lane.start()
+        if self._watchdog is None:
+            self._watchdog = threading.Thread(
+                target=self._watch, name="scheduler-watchdog", daemon=True
+            )
+            self._watchdog.start()
+
+    def submit(
+        self,
+        func: Callable[[], Any],
+        priority: Priority = Priority.DATA,
+        timeout: float | None = None,
+        name: str | None = None,
+        late: float = 0.0,
+    ) -> bool:
+        """Queue ``func`` on its priority lane.
+
+        Args:
+            late: Seconds past the scheduled time at submission (start lag
+                adds the queue wait on top).
+
+        Returns:
+            False if the same task is still queued or running (skipped).
+        """
+        name = name or getattr(func, "__name__", repr(func))
+        with self._lock:
+            if name in self._active:
+                self.telemetry.record_skip(name)
+                logger.warning(f"Scheduler: {name} still queued/running, skipping this run")
+                return False
+            run = _Run(
+                name=name,
+                func=func,
+                priority=priority,
+                timeout=self._timeouts[priority] if timeout is None else timeout,
+                submitted_at=self._clock(),
+                late=late,
+            )
+            self._active[name] = run
+        self._lanes[priority].queue.put(run)
+        return True
+
+    def wrap_jobs(
+        self,
+        jobs: Iterable[Any],
+        priorities: dict[str, Priority],
+        timeouts: dict[str, float] | None = None,
+        default: Priority = Priority.DATA,
+    ) -> None:
+        """Make ``schedule`` jobs submit to the executor instead of running inline.
+
+        ``schedule`` still computes the next run time; the job function
+        returns as soon as the task is queued.
+        """
+        timeouts = timeouts or {}
+        for job in jobs:
+            func = job.job_func
+            while isinstance(func, functools.partial) and not func.args and not func.keywords:
+                func = func.func
+            name = getattr(func, "__name__", repr(func))
+            submit = functools.partial(
+                self._submit_job,
+                job,
+                func,
+                priority=priorities.get(name, default),
+                timeout=timeouts.get(name),
+                name=name,
+            )
+            job.job_func = functools.update_wrapper(submit, func)
+
+    def _submit_job(self, job: Any, func: Callable[[], Any], **kwargs: Any) -> bool:
+        # job.next_run is still the due time while schedule runs the job function
+        late = 0.0
+        if job.next_run is not None:
+            late = max((datetime.now() - job.next_run).total_seconds(), 0.0)
+        return self.submit(func, late=late, **kwargs)
+
+    def _execute(self, run: _Run) -> None:
+        started = self._clock()
+        with self._lock:
+            run.started_at = started
+            run.worker = threading.current_thread()
+        lag = run.late + (started - run.submitted_at)
+        try:
+            with self.telemetry.track(run.name, lag=lag):
+                run.func()
+        except Exception as e:
+            logger.error(f"Scheduler: {run.name} failed: {e}", exc_info=True)
+        finally:
+            duration = self._clock() - started
+            with self._lock:
+                self._active.pop(run.name, None)
+            if run.timed_out:
+                logger.warning(f"Scheduler: {run.name} finished after {duration:.1f}s (timed out)")
+
+    def check_timeouts(self) -> list[str]:
+        """Flag runs over their timeout and replace their workers."""
+        now = self._clock()
+        flagged = []
+        with self._lock:
+            for run in self._active.values():
+                if run.timed_out or run.started_at is None:
+                    continue
+                if now - run.started_at > run.timeout:
+                    run.timed_out = True
+                    if run.worker is not None:
+                        self._lanes[run.priority].retire(run.worker)
+                    flagged.append(run.name)
+        for name in flagged:
+            self.telemetry.record_timeout(name)
+            logger.error(f"Scheduler: {name} exceeded its timeout, lane worker replaced")
+        return flagged
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(WATCHDOG_INTERVAL_SECONDS):
+            self.check_timeouts()
+
+    def running(self) -> list[str]:
+        """Names of tasks currently executing (queued ones excluded)."""
+        with self._lock:
+            return sorted(n for n, r in self._active.items() if r.started_at is not None)
+
+    def shutdown(self, timeout: float = 30.0) -> None:
+        """Stop accepting work and wait up to ``timeout`` seconds for running tasks."""
+        self._stopped.set()
+        with self._lock:
+            threads = [t for lane in self._lanes.values() for t in lane.workers]
+        for lane in self._lanes.values():
+            for _ in range(len(lane.workers)):
+                lane.queue.put(_STOP)
+        deadline = self._clock() + timeout
+        for thread in threads:
+            thread.join(max(deadline - self._clock(), 0))
+        still_running = self.running()
+        if still_running:
+            logger.warning(f"Scheduler: shutdown with tasks still running: {still_running}")
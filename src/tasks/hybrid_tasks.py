@@ -136,29 +136,19 @@ def task_hybrid_rebalance():
     logger.info("Running hybrid rebalance check...")
 
     try:
-        import json
-        from pathlib import Path
-
-        config_dir = Path("/app/config")
-        state_files = sorted(config_dir.glob("hybrid_state_*.json"))
-        if not state_files:
-            # Fallback to single state file
-            single = config_dir / "hybrid_state.json"
-            if single.exists():
-                state_files = [single]
-            else:
-                logger.info("Hybrid rebalance: no state files, orchestrator not active")
-                return
+        from src.core.state_store import load_hybrid_states
+
+        # Per-cohort states, falling back to the single state as "default"
+        hybrid_states = load_hybrid_states("/app/config", include_single=True)
+        if not hybrid_states:
+            logger.info("Hybrid rebalance: no state files, orchestrator not active")
+            return
 
         market_data = get_market_data()
         all_drift = []
 
-        for sf in state_files:
+        for cohort_name, state in hybrid_states.items():
             try:
-                with open(sf) as f:
-                    state = json.load(f)
-
-                cohort_name = sf.stem.replace("hybrid_state_", "")
                 symbols = state.get("symbols", {})
 
                 for symbol, sdata in symbols.items():
@@ -188,7 +178,7 @@ def task_hybrid_rebalance():
                     except Exception:
                         continue
             except Exception as e:
-                logger.debug(f"Rebalance: failed to read {sf}: {e}")
+                logger.debug(f"Rebalance: failed to check cohort {cohort_name}: {e}")
 
         if all_drift:
             report_lines = []
@@ -1,10 +1,11 @@
 """Monitoring and plausibility tasks for the trading system."""
 
-import json
 import os
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from src.core.live_snapshot import read_snapshot, snapshot_grid_states
+from src.core.state_store import load_grid_states, load_hybrid_states
 from src.tasks.base import logger
 from src.utils.task_lock import task_locked
 
@@ -12,42 +13,31 @@ CONFIG_DIR = Path("config")
 
 
 def _load_grid_states() -> dict[str, dict]:
-    """Load all grid_state_*_*.json files from config/.
+    """Load all per-cohort grid states.
+
+    Uses the live snapshot published by the trading process when it is fresh
+    (one consistent view of all cohorts), otherwise the JSON files and state
+    store in config/.
 
     Returns:
         Dict keyed by "cohort:SYMBOL" -> state dict.
     """
-    states: dict[str, dict] = {}
-    for gs_file in CONFIG_DIR.glob("grid_state_*_*.json"):
-        try:
-            with open(gs_file) as f:
-                data = json.load(f)
-            # Filename: grid_state_BTCUSDT_conservative.json
-            parts = gs_file.stem.replace("grid_state_", "").rsplit("_", 1)
-            if len(parts) == 2:
-                symbol, cohort = parts
-                states[f"{cohort}:{symbol}"] = data
-        except (json.JSONDecodeError, OSError) as e:
-            logger.warning(f"Could not load {gs_file}: {e}")
-    return states
+    snapshot = read_snapshot()
+    if snapshot is not None:
+        return snapshot_grid_states(snapshot)
+    return load_grid_states(CONFIG_DIR)
 
 
 def _load_hybrid_states() -> dict[str, dict]:
-    """Load all hybrid_state_*.json files from config/.
+    """Load all per-cohort orchestrator states (live snapshot or files in config/).
 
     Returns:
         Dict keyed by cohort name -> state dict.
     """
-    states: dict[str, dict] = {}
-    for hs_file in CONFIG_DIR.glob("hybrid_state_*.json"):
-        try:
-            with open(hs_file) as f:
-                data = json.load(f)
-            cohort = hs_file.stem.replace("hybrid_state_", "")
-            states[cohort] = data
-        except (json.JSONDecodeError, OSError) as e:
-            logger.warning(f"Could not load {hs_file}: {e}")
-    return states
+    snapshot = read_snapshot()
+    if snapshot is not None:
+        return snapshot.get("cohorts", {})
+    return load_hybrid_states(CONFIG_DIR)
 
 
 def _is_paper_mode() -> bool:
@@ -63,15 +53,16 @@ def _get_binance_client():
         initial = float(os.getenv("PAPER_INITIAL_USDT", "6000"))
         return PaperBinanceClient(initial_usdt=initial)
 
-    from src.api.binance_client import BinanceClient
+    from src.api.binance_client import get_binance_client
 
-    testnet = os.getenv("BINANCE_TESTNET", "true").lower() == "true"
-    return BinanceClient(testnet=testnet)
+    return get_binance_client()
 
 
 @task_locked
 def task_reconcile_orders():
-    """Compare grid state files with actual Binance open orders (every 30 min).
+    """Compare grid states with actual Binance open orders (every 30 min).
+
+    Fetches the open orders of all symbols with one exchange call.
 
     Detects:
     - ORPHAN: Order in state file but not on Binance (may have been filled/cancelled)
@@ -100,31 +91,36 @@ def task_reconcile_orders():
             except (ValueError, TypeError):
                 pass
 
+    # One request for all symbols instead of one per symbol
+    try:
+        open_orders = client.get_all_open_orders()
+    except Exception as e:
+        logger.error(f"Reconciliation failed: {e}")
+        return
+    if open_orders is None:
+        logger.error("Reconciliation skipped: open orders unavailable")
+        return
+
+    binance_orders: dict[str, set[int]] = {}  # symbol -> set of order IDs
+    for order in open_orders:
+        binance_orders.setdefault(order["symbol"], set()).add(int(order["orderId"]))
+
     total_orphans = 0
     total_unknown = 0
 
     for symbol, state_ids in state_orders.items():
-        try:
-            binance_orders = client.get_open_orders(symbol)
-            binance_ids = {int(o["orderId"]) for o in binance_orders}
+        binance_ids = binance_orders.get(symbol, set())
 
-            orphans = state_ids - binance_ids
-            unknown = binance_ids - state_ids
+        orphans = state_ids - binance_ids
+        unknown = binance_ids - state_ids
 
-            if orphans:
-                total_orphans += len(orphans)
-                logger.warning(
-                    f"ORPHAN orders for {symbol}: {orphans} (in state but not on Binance)"
-                )
-
-            if unknown:
-                total_unknown += len(unknown)
-                logger.warning(
-                    f"UNKNOWN orders for {symbol}: {unknown} (on Binance but not in state)"
-                )
+        if orphans:
+            total_orphans += len(orphans)
+            logger.warning(f"ORPHAN orders for {symbol}: {orphans} (in state but not on Binance)")
 
-        except Exception as e:
-            logger.error(f"Reconciliation failed for {symbol}: {e}")
+        if unknown:
+            total_unknown += len(unknown)
+            logger.warning(f"UNKNOWN orders for {symbol}: {unknown} (on Binance but not in state)")
 
     if total_orphans > 0 or total_unknown > 0:
         from src.notifications.telegram_service import get_telegram
@@ -5,6 +5,7 @@ import os
 from psycopg2.extras import RealDictCursor
 
 from src.tasks.base import get_db_connection, logger
+from src.utils.task_lock import task_locked
 
 COHORT_EMOJIS = {
     "conservative": "🛡️",
@@ -183,116 +184,86 @@ def _build_tier_report() -> str:
     return "\n".join(lines)
 
 
-def _build_cohort_status() -> str:
-    """Build per-cohort dashboard for Telegram.
+def _load_cohort_metrics() -> dict:
+    """All active cohort metrics with one grouped query (empty without DB)."""
+    from src.data.cohort_metrics import fetch_cohort_metrics
+
+    conn = get_db_connection()
+    if not conn:
+        return {}
+    try:
+        return fetch_cohort_metrics(conn)
+    finally:
+        conn.close()
 
-    Reads hybrid_state_{cohort}.json files and shows per-cohort
-    performance with coins, orders, and P&L in a visual dashboard format.
+
+def _load_live_states() -> tuple[dict, dict, dict | None]:
+    """Orchestrator + grid states for the dashboard.
+
+    Prefers the live snapshot published by the trading process (one file,
+    includes last prices); falls back to the persisted state files.
+
+    Returns:
+        (hybrid_states, grid_states, prices) — prices is None without snapshot.
     """
-    import json
     from pathlib import Path
 
+    from src.core.live_snapshot import read_snapshot, snapshot_grid_states
+    from src.core.state_store import load_grid_states, load_hybrid_states
+
+    snapshot = read_snapshot()
+    if snapshot and snapshot.get("cohorts"):
+        cohorts = snapshot["cohorts"]
+        prices = {
+            f"{name}:{symbol}": price
+            for name, state in cohorts.items()
+            for symbol, price in state.get("prices", {}).items()
+        }
+        return cohorts, snapshot_grid_states(snapshot), prices
+
     config_dir = Path("config")
     if not config_dir.exists():
-        return ""
+        return {}, {}, None
+
+    hybrid_states = load_hybrid_states(config_dir, include_single=True)
+    if not hybrid_states:
+        return {}, {}, None
+    return hybrid_states, load_grid_states(config_dir), None
 
-    state_files = sorted(config_dir.glob("hybrid_state_*.json"))
-    if not state_files:
-        single = config_dir / "hybrid_state.json"
-        if single.exists():
-            state_files = [single]
-        else:
-            return ""
 
+def _get_report_client():
+    """Exchange client for prices not covered by the live snapshot."""
     try:
         paper_mode = os.getenv("PAPER_TRADING", "false").lower() == "true"
         if paper_mode:
             from src.api.paper_client import PaperBinanceClient
 
             initial = float(os.getenv("PAPER_INITIAL_USDT", "6000"))
-            client = PaperBinanceClient(initial_usdt=initial)
-        else:
-            from src.api.binance_client import BinanceClient
+            return PaperBinanceClient(initial_usdt=initial)
+
+        from src.api.binance_client import get_binance_client
 
-            testnet = os.getenv("BINANCE_TESTNET", "true").lower() == "true"
-            client = BinanceClient(testnet=testnet)
+        return get_binance_client()
     except Exception:
-        client = None
+        return None
 
-    # Load cohort info + realized P&L from DB
-    cohort_info = {}
-    open_pairs_by_cohort: dict[str, dict] = {}
-    conn = get_db_connection()
-    if conn:
-        try:
-            from psycopg2.extras import RealDictCursor as RDC
 
-            with conn.cursor(cursor_factory=RDC) as cur:
-                cur.execute(
-                    "SELECT id, name, starting_capital, current_capital, config "
-                    "FROM cohorts WHERE is_active = true"
-                )
-                for row in cur.fetchall():
-                    cohort_info[row["name"]] = row
-
-                # Per-cohort: realized P&L + open positions for unrealized P&L
-                open_pairs_by_cohort: dict[str, dict] = {}
-                for name, info in cohort_info.items():
-                    try:
-                        cur.execute(
-                            "SELECT COALESCE(SUM(net_pnl), 0) as realized_pnl, "
-                            "COUNT(*) as trade_count "
-                            "FROM trade_pairs "
-                            "WHERE cohort_id = %s AND status = 'closed'",
-                            (info["id"],),
-                        )
-                        pnl_row = cur.fetchone()
-                        info["realized_pnl"] = float(pnl_row["realized_pnl"])
-                        info["trade_count"] = pnl_row["trade_count"]
-                    except Exception:
-                        info["realized_pnl"] = 0.0
-                        info["trade_count"] = 0
-
-                    # Open trade pairs for per-coin unrealized P&L
-                    try:
-                        cur.execute(
-                            "SELECT symbol, "
-                            "COALESCE(SUM(entry_value_usd), 0) as cost_basis, "
-                            "COALESCE(SUM(remaining_quantity), 0) as total_qty "
-                            "FROM trade_pairs "
-                            "WHERE cohort_id = %s AND status = 'open' "
-                            "GROUP BY symbol",
-                            (info["id"],),
-                        )
-                        pairs = {}
-                        for row in cur.fetchall():
-                            pairs[row["symbol"]] = {
-                                "cost_basis": float(row["cost_basis"]),
-                                "total_qty": float(row["total_qty"]),
-                            }
-                        open_pairs_by_cohort[name] = pairs
-                    except Exception:
-                        open_pairs_by_cohort[name] = {}
-        except Exception as e:
-            logger.debug(f"Cohort info query failed: {e}")
-        finally:
-            conn.close()
+def _build_cohort_status() -> str:
+    """Build per-cohort dashboard for Telegram.
 
-    # Pre-load all grid state files to get actual held quantities per cohort+symbol.
-    # SELL orders in grid state = coins the bot bought and is holding.
-    # Using account balance would include pre-loaded testnet balances.
-    grid_states: dict[str, dict] = {}  # key: "{cohort}:{symbol}" -> grid state
-    for gs_file in config_dir.glob("grid_state_*_*.json"):
-        try:
-            with open(gs_file) as gf:
-                gs = json.load(gf)
-            # filename: grid_state_BTCUSDT_conservative.json
-            parts = gs_file.stem.replace("grid_state_", "").rsplit("_", 1)
-            if len(parts) == 2:
-                grid_sym, grid_cohort = parts
-                grid_states[f"{grid_cohort}:{grid_sym}"] = gs
-        except Exception:
-            pass
+    Reads the live snapshot published by the trading process (or the per-cohort
+    orchestrator states as fallback) and shows per-cohort performance with coins,
+    orders, and P&L in a visual dashboard format. Cohort metrics come from one
+    grouped query; the exchange is only queried for symbols the snapshot lacks.
+    """
+    hybrid_states, grid_states, live_prices = _load_live_states()
+    if not hybrid_states:
+        return ""
+
+    cohort_info = _load_cohort_metrics()
+
+    client = None
+    client_loaded = False
 
     lines = ["<b>📊 PORTFOLIO DASHBOARD</b>", "━━━━━━━━━━━━━━━━━━━━━"]
 
@@ -305,17 +276,11 @@ def _build_cohort_status() -> str:
     total_sell_orders = 0
     total_coins = 0
 
-    for sf in state_files:
+    for cohort_name, state in hybrid_states.items():
         try:
-            with open(sf) as f:
-                state = json.load(f)
-
-            fname = sf.stem
-            cohort_name = fname.replace("hybrid_state_", "") if "_" in fname else "default"
-
-            db_info = cohort_info.get(cohort_name, {})
-            starting = float(db_info.get("starting_capital", 1000)) if db_info else 1000.0
-            config_data = db_info.get("config", {}) if db_info else {}
+            db_info = cohort_info.get(cohort_name)
+            starting = db_info.starting_capital if db_info else 1000.0
+            config_data = db_info.config if db_info else {}
             grid_pct = config_data.get("grid_range_pct", "?") if config_data else "?"
 
             total_investment = state.get("config", {}).get("total_investment", starting)
@@ -333,12 +298,28 @@ def _build_cohort_status() -> str:
                 mkt_val = 0.0
                 n_buy = 0
                 n_sell = 0
-                if client:
-                    try:
-                        price = client.get_current_price(sym)
-                        orders = client.get_open_orders(sym)
-                        n_buy = sum(1 for o in orders if o["side"] == "BUY")
-                        n_sell = sum(1 for o in orders if o["side"] == "SELL")
+                gs_key = f"{cohort_name}:{sym}"
+                gs = grid_states.get(gs_key, {})
+                active = gs.get("active_orders", {})
+
+                price = None
+                try:
+                    if live_prices is not None:
+                        # Live snapshot: last tick price + tracked grid orders
+                        price = live_prices.get(gs_key)
+                        n_buy = sum(1 for o in active.values() if o.get("type") == "BUY")
+                        n_sell = sum(1 for o in active.values() if o.get("type") == "SELL")
+                    if price is None:
+                        if not client_loaded:
+                            client = _get_report_client()
+                            client_loaded = True
+                        if client:
+                            price = client.get_current_price(sym)
+                            if live_prices is None:
+                                orders = client.get_open_orders(sym)
+                                n_buy = sum(1 for o in orders if o["side"] == "BUY")
+                                n_sell = sum(1 for o in orders if o["side"] == "SELL")
+                    if price is not None:
                         price_str = _format_price(price) if price else "—"
                         order_str = f"{n_buy}B/{n_sell}S"
 
@@ -348,9 +329,6 @@ def _build_cohort_status() -> str:
                         # - BUY orders = USDT locked, no P&L swing
                         #   → use their cost basis (price * qty)
                         # Remaining alloc not in any order stays at face value
-                        gs_key = f"{cohort_name}:{sym}"
-                        gs = grid_states.get(gs_key, {})
-                        active = gs.get("active_orders", {})
                         buy_cost = sum(
                             float(o.get("price", 0)) * float(o.get("quantity", 0))
                             for o in active.values()
@@ -376,8 +354,8 @@ def _build_cohort_status() -> str:
                         remainder = max(0, alloc - order_cost)
                         if active:
                             mkt_val = buy_cost + held_value + remainder
-                    except Exception:
-                        pass
+                except Exception:
+                    pass
                 total_open_orders += n_buy + n_sell
                 total_buy_orders += n_buy
                 total_sell_orders += n_sell
@@ -388,7 +366,7 @@ def _build_cohort_status() -> str:
 
                 # Per-coin unrealized P&L from open trade pairs
                 coin_pnl_str = ""
-                op = open_pairs_by_cohort.get(cohort_name, {}).get(sym)
+                op = db_info.open_pairs.get(sym) if db_info else None
                 if op and price and op["cost_basis"] > 0:
                     coin_upnl = op["total_qty"] * price - op["cost_basis"]
                     coin_upnl_pct = coin_upnl / op["cost_basis"] * 100
@@ -402,8 +380,8 @@ def _build_cohort_status() -> str:
             # Total current value = cash reserve + market value of positions
             current_value = cash_reserve + cohort_market_value
 
-            realized_pnl = db_info.get("realized_pnl", 0.0) if db_info else 0.0
-            trade_count = db_info.get("trade_count", 0) if db_info else 0
+            realized_pnl = db_info.realized_pnl if db_info else 0.0
+            trade_count = db_info.trade_count if db_info else 0
 
             # Unrealized P&L = market value vs allocation cost
             unrealized_pnl = cohort_market_value - total_allocated
@@ -444,7 +422,7 @@ def _build_cohort_status() -> str:
                 lines.append("<code>" + "\n".join(coin_rows) + "</code>")
 
         except Exception as e:
-            logger.debug(f"Failed to read {sf}: {e}")
+            logger.debug(f"Failed to build status for cohort {cohort_name}: {e}")
 
     if len(lines) <= 2:
         return ""
@@ -457,7 +435,7 @@ def _build_cohort_status() -> str:
             f"📈 <b>Total:</b> ${total_starting:,.0f} → "
             f"${total_current:,.0f} ({total_pnl_pct:+.1f}%)"
         )
-        n_bots = len(state_files)
+        n_bots = len(hybrid_states)
         orders_str = f"📋 {total_open_orders} Orders ({total_buy_orders}B/{total_sell_orders}S)"
         if total_closed_trades > 0:
             orders_str += f" · ✅ {total_closed_trades} Closed"
@@ -470,80 +448,46 @@ def _build_cohort_comparison() -> str:
     """Build cohort comparison ranking for Telegram.
 
     Compares all active cohorts by realized P&L, win rate, and trade count.
-    Uses trade_pairs table for live data (not trading_cycles which need completed cycles).
+    Uses trade_pairs table for live data (not trading_cycles which need completed cycles),
+    aggregated for all cohorts in one grouped query.
     """
-    conn = get_db_connection()
-    if not conn:
+    cohorts = list(_load_cohort_metrics().values())
+    if len(cohorts) < 2:
         return ""
 
-    try:
-        from psycopg2.extras import RealDictCursor as RDC
-
-        with conn.cursor(cursor_factory=RDC) as cur:
-            cur.execute("SELECT id, name, starting_capital FROM cohorts WHERE is_active = true")
-            cohorts = cur.fetchall()
-
-            if len(cohorts) < 2:
-                return ""
-
-            rows = []
-            for c in cohorts:
-                cur.execute(
-                    "SELECT "
-                    "COALESCE(SUM(net_pnl), 0) as total_pnl, "
-                    "COUNT(*) as trades, "
-                    "SUM(CASE WHEN net_pnl > 0 THEN 1 ELSE 0 END) as wins "
-                    "FROM trade_pairs "
-                    "WHERE cohort_id = %s AND status = 'closed'",
-                    (c["id"],),
-                )
-                tp = cur.fetchone()
-                total_pnl = float(tp["total_pnl"])
-                trades = tp["trades"]
-                wins = tp["wins"] or 0
-                starting = float(c["starting_capital"])
-                pnl_pct = total_pnl / starting * 100 if starting > 0 else 0.0
-                win_rate = wins / trades * 100 if trades > 0 else 0.0
-
-                rows.append(
-                    {
-                        "name": c["name"],
-                        "pnl": total_pnl,
-                        "pnl_pct": pnl_pct,
-                        "trades": trades,
-                        "win_rate": win_rate,
-                    }
-                )
-
-            # Rank by P&L% descending
-            rows.sort(key=lambda r: r["pnl_pct"], reverse=True)
-
-            lines = [
-                "<b>🏆 COHORT COMPARISON</b>",
-                "━━━━━━━━━━━━━━━━━━━━━",
-                "<code>#  Cohort         P&L%  WinR Trades</code>",
-            ]
-
-            for i, r in enumerate(rows, 1):
-                emoji = COHORT_EMOJIS.get(r["name"], "🤖")
-                name = f"{emoji}{r['name']}"
-                lines.append(
-                    f"<code>{i}  {name:<14s} {r['pnl_pct']:+5.1f}% "
-                    f"{r['win_rate']:4.0f}%  {r['trades']:4d}</code>"
-                )
-
-            # Spread: best vs worst
-            if len(rows) >= 2:
-                spread = rows[0]["pnl_pct"] - rows[-1]["pnl_pct"]
-                lines.append(f"📊 Spread: {spread:.1f}pp ({rows[0]['name']} vs {rows[-1]['name']})")
+    rows = [
+        {
+            "name": c.name,
+            "pnl": c.realized_pnl,
+            "pnl_pct": c.pnl_pct,
+            "trades": c.trade_count,
+            "win_rate": c.win_rate,
+        }
+        for c in cohorts
+    ]
+
+    # Rank by P&L% descending
+    rows.sort(key=lambda r: r["pnl_pct"], reverse=True)
+
+    lines = [
+        "<b>🏆 COHORT COMPARISON</b>",
+        "━━━━━━━━━━━━━━━━━━━━━",
+        "<code>#  Cohort         P&L%  WinR Trades</code>",
+    ]
+
+    for i, r in enumerate(rows, 1):
+        emoji = COHORT_EMOJIS.get(r["name"], "🤖")
+        name = f"{emoji}{r['name']}"
+        lines.append(
+            f"<code>{i}  {name:<14s} {r['pnl_pct']:+5.1f}% "
+            f"{r['win_rate']:4.0f}%  {r['trades']:4d}</code>"
+        )
 
-            return "\n".join(lines)
+    # Spread: best vs worst
+    spread = rows[0]["pnl_pct"] - rows[-1]["pnl_pct"]
+    lines.append(f"📊 Spread: {spread:.1f}pp ({rows[0]['name']} vs {rows[-1]['name']})")
 
-    except Exception as e:
-        logger.debug(f"Cohort comparison failed: {e}")
-        return ""
-    finally:
-        conn.close()
+    return "\n".join(lines)
 
 
 def task_daily_summary():
@@ -652,6 +596,23 @@ def task_daily_summary():
         telegram.send_error(str(e), context="Daily Summary")
 
 
+@task_locked
+def task_refresh_analytics_rollups():
+    """Aktualisiert die Analytics-Rollups (geänderte Tage). Stündlich."""
+    from src.data.analytics_rollups import refresh_rollups
+
+    conn = get_db_connection()
+    if not conn:
+        return
+
+    try:
+        days = refresh_rollups(conn)
+        if days:
+            logger.info(f"Analytics Rollups: {days} Tage aktualisiert")
+    finally:
+        conn.close()
+
+
 def task_update_playbook():
     """Aktualisiert das Trading Playbook. Läuft wöchentlich (Sonntag 19:00)."""
     from src.notifications.telegram_service import get_telegram
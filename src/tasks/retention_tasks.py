@@ -1,24 +1,112 @@
-"""Data retention tasks — auto-cleanup of old records (D2)."""
+"""Data retention tasks — auto-cleanup of old records (D2).
+
+High-volume time-series tables are range-partitioned by month on
+``timestamp`` (see PARTITIONING in docker/init.sql). Retention detaches and
+drops whole monthly partitions once their newest possible row is older than
+the retention window, instead of deleting rows one by one; rows that landed
+in the ``{table}_default`` partition are still deleted row-wise. The same
+run creates the upcoming monthly partitions.
+
+Tables that have not been migrated yet (``convert_to_monthly_partitions``)
+keep the row-wise DELETE.
+"""
+
+import re
+from datetime import UTC, datetime, timedelta
 
 from src.tasks.base import get_db_connection, logger
 from src.utils.task_lock import task_locked
 
-# Table → retention days mapping
+# Table → (partition/timestamp column, retention days)
 RETENTION_CONFIG = {
-    "market_snapshots": ("created_at", 90),
-    "whale_alerts": ("created_at", 60),
-    "social_sentiment": ("created_at", 90),
-    "opportunities": ("created_at", 30),
-    "technical_indicators": ("created_at", 60),
-    "calculation_snapshots": ("created_at", 90),
-    "ai_conversations": ("created_at", 30),
-    "regime_history": ("created_at", 180),
+    "market_snapshots": ("timestamp", 90),
+    "whale_alerts": ("timestamp", 60),
+    "social_sentiment": ("timestamp", 90),
+    "opportunities": ("timestamp", 30),
+    "technical_indicators": ("timestamp", 60),
+    "calculation_snapshots": ("timestamp", 90),
+    "ai_conversations": ("timestamp", 30),
+    "regime_history": ("timestamp", 180),
 }
 
+# Monthly partitions created ahead of time on every run
+PARTITION_MONTHS_AHEAD = 2
+
+
+def _month_end(year: int, month: int) -> datetime:
+    """Exclusive upper bound of a monthly partition."""
+    if month == 12:
+        return datetime(year + 1, 1, 1, tzinfo=UTC)
+    return datetime(year, month + 1, 1, tzinfo=UTC)
+
+
+def expired_partitions(table: str, partitions: list[str], days: int, now: datetime) -> list[str]:
+    """Monthly partitions of ``table`` whose whole range is past retention.
+
+    Args:
+        table: Parent table name.
+        partitions: Child table names (``{table}_pYYYYMM``; others are ignored).
+        days: Retention window in days.
+        now: Reference time (timezone-aware).
+
+    Returns:
+        Partition names that can be dropped, oldest first.
+    """
+    pattern = re.compile(rf"^{re.escape(table)}_p(\d{{4}})(\d{{2}})$")
+    cutoff = now - timedelta(days=days)
+    expired = []
+    for name in partitions:
+        match = pattern.match(name)
+        if match and _month_end(int(match.group(1)), int(match.group(2))) <= cutoff:
+            expired.append(name)
+    return sorted(expired)
+
+
+def _is_partitioned(cur, table: str) -> bool:
+    cur.execute(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))",
+        (table,),
+    )
+    row = cur.fetchone()
+    return bool(row and row[0])
+
+
+def _cleanup_partitioned(cur, table: str, ts_column: str, days: int) -> int:
+    """Create upcoming partitions, drop expired ones, trim the default partition.
+
+    Returns:
+        Number of rows removed from the default partition.
+    """
+    cur.execute("SELECT ensure_monthly_partitions(%s, %s)", (table, PARTITION_MONTHS_AHEAD))
+
+    cur.execute(
+        """
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(%s)
+        """,
+        (table,),
+    )
+    children = [row[0] for row in cur.fetchall()]
+
+    for partition in expired_partitions(table, children, days, datetime.now(UTC)):
+        cur.execute(f"ALTER TABLE {table} DETACH PARTITION {partition}")
+        cur.execute(f"DROP TABLE {partition}")
+        logger.info(f"Retention: dropped partition {partition} (>{days}d)")
+
+    if f"{table}_default" not in children:
+        return 0
+    cur.execute(
+        f"DELETE FROM {table}_default WHERE {ts_column} < NOW() - INTERVAL '%s days'",
+        (days,),
+    )
+    return cur.rowcount
+
 
 @task_locked
 def task_cleanup_old_data():
-    """Delete old records based on retention policy. Runs daily at 03:00."""
+    """Drop expired partitions / delete old records. Runs daily at 03:00."""
     logger.info("Running data retention cleanup...")
 
     conn = get_db_connection()
@@ -31,11 +119,16 @@ def task_cleanup_old_data():
         with conn.cursor() as cur:
             for table, (ts_column, days) in RETENTION_CONFIG.items():
                 try:
-                    cur.execute(
-                        f"DELETE FROM {table} WHERE {ts_column} < NOW() - INTERVAL '%s days'",
-                        (days,),
-                    )
-                    deleted = cur.rowcount
+                    if _is_partitioned(cur, table):
+                        deleted = _cleanup_partitioned(cur, table, ts_column, days)
+                    else:
+                        cur.execute(
+                            f"DELETE FROM {table} WHERE {ts_column} < NOW() - INTERVAL '%s days'",
+                            (days,),
+                        )
+                        deleted = cur.rowcount
+                    # Commit per table: DETACH/DROP hold ACCESS EXCLUSIVE locks
+                    conn.commit()
                     if deleted > 0:
                         logger.info(f"Retention: deleted {deleted} rows from {table} (>{days}d)")
                         total_deleted += deleted
@@ -44,7 +137,6 @@ def task_cleanup_old_data():
                     conn.rollback()
                     continue
 
-        conn.commit()
         logger.info(f"Data retention cleanup complete: {total_deleted} total rows deleted")
 
     except Exception as e:
@@ -1,12 +1,41 @@
 """System operation tasks."""
 
-import os
-
 from psycopg2.extras import RealDictCursor
 
 from src.tasks.base import get_db_connection, logger
 from src.utils.task_lock import task_locked
 
+# Trades im Fenster (window, window + 1h] ohne Outcome.
+# Partial Index idx_trades_pending_{1h,4h,24h,7d} je Outcome-Spalte.
+PENDING_OUTCOMES_QUERY = """
+    SELECT id, symbol, price, action
+    FROM trades
+    WHERE timestamp < NOW() - make_interval(hours => %s)
+    AND timestamp > NOW() - make_interval(hours => %s)
+    AND {column} IS NULL
+"""
+
+# was_good_decision aus geschlossenen Paaren ({side} = entry | exit).
+# Direkter UUID-Vergleich, damit idx_pairs_{side}_trade greift; unveränderte
+# Bewertungen werden nicht erneut geschrieben.
+EVALUATE_DECISIONS_QUERY = """
+    UPDATE trades t
+    SET was_good_decision = (tp.net_pnl > 0)
+    FROM trade_pairs tp
+    WHERE tp.{side}_trade_id = t.id
+    AND tp.status = 'closed'
+    AND tp.net_pnl IS NOT NULL
+    AND t.was_good_decision IS DISTINCT FROM (tp.net_pnl > 0)
+"""
+
+# Trailing-Stop nachziehen (Scheduler Safety-Net, ein Batch pro Lauf)
+TRAILING_STOP_UPDATE = """
+    UPDATE stop_loss_orders
+    SET highest_price = %s,
+        stop_price = GREATEST(stop_price, %s)
+    WHERE id = %s AND is_active = true
+"""
+
 
 def task_system_health_check():
     """Prüft Systemgesundheit und loggt Metriken. Läuft alle 6 Stunden."""
@@ -26,6 +55,9 @@ def task_system_health_check():
         db_status = "healthy" if conn else "unavailable"
         if conn:
             conn.close()
+            from src.data.database import get_db
+
+            logger.info(f"DB Pool Metrics: {get_db().get_pool_metrics()}")
 
         try:
             market_data = get_market_data()
@@ -90,8 +122,15 @@ def task_check_stops():
             """)
             stops = cur.fetchall()
 
+        # Ein Preis-Lookup pro Symbol, Trailing-Updates gesammelt in einem Batch
+        prices: dict[str, float | None] = {}
+        trailing_updates = []
+
         for stop in stops:
-            current_price = market_data.get_price(stop["symbol"])
+            symbol = stop["symbol"]
+            if symbol not in prices:
+                prices[symbol] = market_data.get_price(symbol)
+            current_price = prices[symbol]
             if not current_price or current_price <= 0:
                 continue
 
@@ -101,17 +140,7 @@ def task_check_stops():
                 trailing_dist = float(stop.get("trailing_distance") or 3.0)
                 if current_price > highest:
                     new_stop = current_price * (1 - trailing_dist / 100)
-                    with conn.cursor() as cur:
-                        cur.execute(
-                            """
-                            UPDATE stop_loss_orders
-                            SET highest_price = %s,
-                                stop_price = GREATEST(stop_price, %s)
-                            WHERE id = %s AND is_active = true
-                            """,
-                            (current_price, new_stop, stop["id"]),
-                        )
-                    conn.commit()
+                    trailing_updates.append((current_price, new_stop, stop["id"]))
                     continue  # Price above stop, no trigger
 
             if current_price <= float(stop["stop_price"]):
@@ -119,10 +148,9 @@ def task_check_stops():
 
                 # Lazy-init BinanceClient
                 if client is None:
-                    from src.api.binance_client import BinanceClient
+                    from src.api.binance_client import get_binance_client
 
-                    testnet = os.getenv("BINANCE_TESTNET", "true").lower() == "true"
-                    client = BinanceClient(testnet=testnet)
+                    client = get_binance_client()
 
                 telegram = get_telegram()
                 result = execute_stop_loss_sell(
@@ -154,6 +182,11 @@ def task_check_stops():
                 else:
                     logger.critical(f"Scheduler stop-loss sell FAILED for {stop['symbol']}")
 
+        if trailing_updates:
+            with conn.cursor() as cur:
+                cur.executemany(TRAILING_STOP_UPDATE, trailing_updates)
+            conn.commit()
+
     except Exception as e:
         logger.error(f"Stop Check Error: {e}")
     finally:
@@ -166,10 +199,9 @@ def task_reset_daily_drawdown():
     logger.info("Resetting daily drawdown baseline...")
 
     try:
-        from src.api.binance_client import BinanceClient
+        from src.api.binance_client import get_binance_client
 
-        testnet = os.getenv("BINANCE_TESTNET", "true").lower() == "true"
-        client = BinanceClient(testnet=testnet)
+        client = get_binance_client()
         portfolio_value = client.get_account_balance("USDT")
 
         if portfolio_value <= 0:
@@ -199,13 +231,8 @@ def _update_outcomes_for_window(window_hours: int, column: str):
 
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
             cur.execute(
-                f"""
-                SELECT id, symbol, price, action
-                FROM trades
-                WHERE timestamp < NOW() - INTERVAL '{window_hours} hours'
-                AND timestamp > NOW() - INTERVAL '{window_hours + 1} hours'
-                AND {column} IS NULL
-                """,
+                PENDING_OUTCOMES_QUERY.format(column=column),
+                (window_hours, window_hours + 1),
             )
             trades = cur.fetchall()
 
@@ -329,25 +356,11 @@ def task_evaluate_trade_decisions():
     try:
         with conn.cursor() as cur:
             # BUY trades: link via entry_trade_id
-            cur.execute("""
-                UPDATE trades t
-                SET was_good_decision = (tp.net_pnl > 0)
-                FROM trade_pairs tp
-                WHERE tp.entry_trade_id::text = t.id::text
-                AND tp.status = 'closed'
-                AND tp.net_pnl IS NOT NULL
-            """)
+            cur.execute(EVALUATE_DECISIONS_QUERY.format(side="entry"))
             buy_updated = cur.rowcount
 
             # SELL trades: link via exit_trade_id
-            cur.execute("""
-                UPDATE trades t
-                SET was_good_decision = (tp.net_pnl > 0)
-                FROM trade_pairs tp
-                WHERE tp.exit_trade_id::text = t.id::text
-                AND tp.status = 'closed'
-                AND tp.net_pnl IS NOT NULL
-            """)
+            cur.execute(EVALUATE_DECISIONS_QUERY.format(side="exit"))
             sell_updated = cur.rowcount
 
             conn.commit()
@@ -0,0 +1,146 @@
+"""
+Import-time benchmark for the process entrypoints.
+
+Each module is imported in a fresh interpreter with ``python -X importtime``
+(best of ``--repeat`` runs), so results are cold-start numbers without
+this process's own imports. The report lists the cumulative import time,
+which heavy dependencies got loaded and the slowest individual modules.
+
+Usage:
+    python -m src.utils.import_benchmark
+    python -m src.utils.import_benchmark docker.scheduler --top 20
+    python -m src.utils.import_benchmark --budget-ms 500   # exit 1 if exceeded
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+ENTRYPOINTS = (
+    "main",
+    "main_hybrid",
+    "docker.scheduler",
+    "src.core.cohort_orchestrator",
+    "src.notifications.charts",
+    "src.analysis.regime_detection",
+    "src.analysis.technical_indicators",
+    "src.optimization.ab_testing",
+)
+
+# Dependencies that must only be imported when a code path actually needs them
+HEAVY_MODULES = ("binance", "pandas", "scipy", "matplotlib", "hmmlearn", "sklearn")
+
+# A plain import statement: importlib.import_module() skips the importtime
+# line of the requested module itself
+_PROBE = (
+    "import {module}\n"
+    "import json, sys\n"
+    "print(json.dumps([m for m in {heavy!r} if m in sys.modules]))\n"
+)
+
+
+@dataclass
+class ImportProfile:
+    """Import cost of one module in a fresh interpreter."""
+
+    module: str
+    total_ms: float
+    heavy_loaded: list[str] = field(default_factory=list)
+    # (module, self time in ms), slowest first
+    slowest: list[tuple[str, float]] = field(default_factory=list)
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[float, float]]:
+    """Parse ``-X importtime`` output into {module: (self_ms, cumulative_ms)}."""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        timings[name.strip()] = (int(self_us) / 1000, int(cumulative_us) / 1000)
+    return timings
+
+
+def profile_import(module: str, top: int = 10) -> ImportProfile:
+    """Import ``module`` in a subprocess and collect its import timings."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            _PROBE.format(module=module, heavy=HEAVY_MODULES),
+        ],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "unknown"
+        raise RuntimeError(f"import {module} failed: {error}")
+
+    timings = parse_importtime(result.stderr)
+    total_ms = timings.get(module, (0.0, 0.0))[1]
+    slowest = sorted(((name, t[0]) for name, t in timings.items()), key=lambda x: -x[1])
+    return ImportProfile(
+        module=module,
+        total_ms=total_ms,
+        heavy_loaded=json.loads(result.stdout.strip().splitlines()[-1]),
+        slowest=slowest[:top],
+    )
+
+
+def run_benchmark(modules=ENTRYPOINTS, repeat: int = 3, top: int = 10) -> list[ImportProfile]:
+    """Best-of-``repeat`` profile per module (first runs pay for cold .pyc/disk caches)."""
+    profiles = []
+    for module in modules:
+        runs = [profile_import(module, top=top) for _ in range(max(repeat, 1))]
+        profiles.append(min(runs, key=lambda p: p.total_ms))
+    return profiles
+
+
+def format_report(profiles: list[ImportProfile]) -> str:
+    lines = [f"{'Module':<36} {'Import ms':>10}  Heavy deps loaded"]
+    for p in profiles:
+        heavy = ", ".join(p.heavy_loaded) or "-"
+        lines.append(f"{p.module:<36} {p.total_ms:>10.1f}  {heavy}")
+    for p in profiles:
+        lines.append("")
+        lines.append(f"Slowest modules (self time) for {p.module}:")
+        lines.extend(f"  {ms:>8.1f} ms  {name}" for name, ms in p.slowest)
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Cold-start import times of the entrypoints")
+    parser.add_argument("modules", nargs="*", default=list(ENTRYPOINTS), help="Modules to import")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per module (best is kept)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules listed per entry")
+    parser.add_argument(
+        "--budget-ms", type=float, default=None, help="Exit 1 if any module exceeds this"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        profiles = run_benchmark(args.modules, repeat=args.repeat, top=args.top)
+    except RuntimeError as e:
+        print(f"Import benchmark failed: {e}")
+        return 1
+    print(format_report(profiles))
+
+    if args.budget_ms is not None:
+        over = [p.module for p in profiles if p.total_ms > args.budget_ms]
+        if over:
+            print(f"\nOver budget ({args.budget_ms:.0f} ms): {', '.join(over)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
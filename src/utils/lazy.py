@@ -0,0 +1,46 @@
+"""Deferred imports for fast process start.
+
+Task modules pull in heavy dependencies (pandas, scipy, python-binance, ...)
+through their own imports. Registering ``lazy_task("module:function")``
+instead of importing the function keeps those imports out of startup; the
+module is imported on the task's first run.
+"""
+
+import importlib
+import importlib.util
+from collections.abc import Callable
+from typing import Any
+
+
+def lazy_task(target: str) -> Callable[..., Any]:
+    """Callable that imports ``module:function`` on its first call.
+
+    The module is located (not executed) right away, so a misspelled module
+    still fails at registration instead of at the first scheduled run.
+    """
+    module_name, _, attr = target.partition(":")
+    if not attr:
+        raise ValueError(f"Expected 'module:function', got {target!r}")
+    if importlib.util.find_spec(module_name) is None:
+        raise ImportError(f"No module named {module_name!r}")
+
+    resolved: Callable[..., Any] | None = None
+
+    def run(*args, **kwargs):
+        nonlocal resolved
+        if resolved is None:
+            resolved = getattr(importlib.import_module(module_name), attr)
+        return resolved(*args, **kwargs)
+
+    run.__name__ = run.__qualname__ = attr
+    run.__module__ = module_name
+    run.lazy_target = target
+    return run
+
+
+def preload(tasks: list[Callable[..., Any]]) -> None:
+    """Import the modules behind lazy tasks now (fail fast on import errors)."""
+    for task in tasks:
+        target = getattr(task, "lazy_target", None)
+        if target:
+            importlib.import_module(target.partition(":")[0])
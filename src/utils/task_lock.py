@@ -4,6 +4,8 @@ import functools
 import logging
 import threading
 
+from src.utils.telemetry import get_task_telemetry
+
 logger = logging.getLogger("trading_bot")
 
 _task_locks: dict[str, threading.Lock] = {}
@@ -13,7 +15,9 @@ def task_locked(func):
     """Prevent concurrent execution of the same task.
 
     If a task is already running when called again, the second
-    invocation is skipped with a warning log.
+    invocation is skipped with a warning log. Runs are recorded in the
+    task telemetry (inside the scheduler executor the executor's span is
+    reused).
     """
 
     @functools.wraps(func)
@@ -24,9 +28,11 @@ def task_locked(func):
         lock = _task_locks[lock_key]
         if not lock.acquire(blocking=False):
             logger.warning(f"Task {lock_key} already running, skipping")
+            get_task_telemetry().record_skip(lock_key)
             return
         try:
-            return func(*args, **kwargs)
+            with get_task_telemetry().track(lock_key):
+                return func(*args, **kwargs)
         finally:
             lock.release()
 
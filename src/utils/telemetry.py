@@ -0,0 +1,378 @@
+"""Per-task execution telemetry for the scheduler.
+
+Every task run is tracked as a span (``TaskTelemetry.track``) that records:
+
+- start lag: seconds between the scheduled time and the actual start
+  (``schedule`` tick delay plus executor queue wait)
+- wall time, as a histogram per task
+- DB statements and time: ``_LeasedCursor`` and ``DatabaseManager.execute*``
+  call ``record_db()``
+- HTTP requests and time: ``HTTPClient`` calls ``record_http()`` per attempt
+- failures, skipped runs (overlap) and timeouts
+
+Spans live in a ContextVar, so ``record_db``/``record_http`` are attributed
+to the task running in the current worker thread and are no-ops outside of
+a task. Nested ``track`` calls (executor + ``task_locked``) reuse the outer
+span.
+
+Exposure:
+- ``render_prometheus()`` / ``snapshot()`` via ``start_metrics_server``
+  (``/metrics`` Prometheus text, ``/metrics.json``)
+- ``publish()`` writes the JSON snapshot to ``TASK_TELEMETRY_PATH`` (default
+  ``config/task_telemetry.json``, the volume shared with the Telegram
+  container), which ``/perf`` reads via ``read_published``.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+logger = logging.getLogger("trading_bot")
+
+DEFAULT_PATH = Path("config") / "task_telemetry.json"
+DEFAULT_MAX_AGE_SECONDS = 600.0
+
+# Upper bounds (seconds) of the histogram buckets; +Inf is implicit
+DURATION_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0, 900.0, 1800.0)
+LAG_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 900.0)
+
+
+def telemetry_path() -> Path:
+    """Configured snapshot location (TASK_TELEMETRY_PATH)."""
+    return Path(os.getenv("TASK_TELEMETRY_PATH", str(DEFAULT_PATH)))
+
+
+class Histogram:
+    """Fixed-bucket histogram (Prometheus semantics, cumulative on export)."""
+
+    __slots__ = ("bounds", "count", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        total = 0
+        out = []
+        for bound, n in zip((*self.bounds, math.inf), self.counts):
+            total += n
+            out.append(("+Inf" if bound == math.inf else f"{bound:g}", total))
+        return out
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket containing the q-quantile (inf if above all)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, (_label, cumulative) in zip((*self.bounds, math.inf), self.cumulative()):
+            if cumulative >= rank:
+                return bound
+        return math.inf
+
+
+@dataclass
+class _Span:
+    name: str
+    started: float
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    http_calls: int = 0
+    http_seconds: float = 0.0
+
+
+@dataclass
+class TaskMetrics:
+    """Aggregated telemetry of one task."""
+
+    runs: int = 0
+    failures: int = 0
+    skipped: int = 0
+    timeouts: int = 0
+    duration: Histogram = field(default_factory=lambda: Histogram(DURATION_BUCKETS))
+    lag: Histogram = field(default_factory=lambda: Histogram(LAG_BUCKETS))
+    max_duration: float = 0.0
+    last_duration: float = 0.0
+    last_run: float | None = None  # wall clock (time.time)
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    http_calls: int = 0
+    http_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        p95 = self.duration.quantile(0.95)
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "timeouts": self.timeouts,
+            "duration_sum": round(self.duration.sum, 3),
+            "duration_avg": round(self.duration.sum / self.runs, 3) if self.runs else 0.0,
+            "duration_p95_le": None if p95 is None or math.isinf(p95) else p95,
+            "duration_max": round(self.max_duration, 3),
+            "duration_last": round(self.last_duration, 3),
+            "duration_buckets": dict(self.duration.cumulative()),
+            "lag_avg": round(self.lag.sum / self.lag.count, 3) if self.lag.count else None,
+            "lag_buckets": dict(self.lag.cumulative()),
+            "lag_count": self.lag.count,
+            "lag_sum": round(self.lag.sum, 3),
+            "db_queries": self.db_queries,
+            "db_seconds": round(self.db_seconds, 3),
+            "http_calls": self.http_calls,
+            "http_seconds": round(self.http_seconds, 3),
+            "last_run": self.last_run,
+        }
+
+
+_current: ContextVar[_Span | None] = ContextVar("task_span", default=None)
+
+
+def record_db(seconds: float) -> None:
+    """Attribute one DB statement to the running task (no-op outside tasks)."""
+    span = _current.get()
+    if span is not None:
+        span.db_queries += 1
+        span.db_seconds += seconds
+
+
+def record_http(seconds: float) -> None:
+    """Attribute one HTTP request to the running task (no-op outside tasks)."""
+    span = _current.get()
+    if span is not None:
+        span.http_calls += 1
+        span.http_seconds += seconds
+
+
+class TaskTelemetry:
+    """Per-task metrics registry of the scheduler process."""
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tasks: dict[str, TaskMetrics] = {}
+
+    def _metrics(self, name: str) -> TaskMetrics:
+        metrics = self._tasks.get(name)
+        if metrics is None:
+            metrics = self._tasks[name] = TaskMetrics()
+        return metrics
+
+    @contextmanager
+    def track(self, name: str, lag: float | None = None) -> Iterator[_Span]:
+        """Record one run of ``name``; reuses the outer span when nested."""
+        outer = _current.get()
+        if outer is not None:
+            yield outer
+            return
+
+        span = _Span(name=name, started=self._clock())
+        token = _current.set(span)
+        failed = False
+        try:
+            yield span
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            _current.reset(token)
+            self._finish(span, failed, lag)
+
+    def _finish(self, span: _Span, failed: bool, lag: float | None) -> None:
+        duration = self._clock() - span.started
+        with self._lock:
+            m = self._metrics(span.name)
+            m.runs += 1
+            m.failures += failed
+            m.duration.observe(duration)
+            m.last_duration = duration
+            m.max_duration = max(m.max_duration, duration)
+            m.last_run = time.time()
+            if lag is not None:
+                m.lag.observe(max(lag, 0.0))
+            m.db_queries += span.db_queries
+            m.db_seconds += span.db_seconds
+            m.http_calls += span.http_calls
+            m.http_seconds += span.http_seconds
+
+    def record_skip(self, name: str) -> None:
+        with self._lock:
+            self._metrics(name).skipped += 1
+
+    def record_timeout(self, name: str) -> None:
+        with self._lock:
+            self._metrics(name).timeouts += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            tasks = {name: m.as_dict() for name, m in sorted(self._tasks.items())}
+        return {"generated_at": time.time(), "tasks": tasks}
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        snap = self.snapshot()["tasks"]
+        lines: list[str] = []
+
+        def histogram(metric: str, help_text: str, key: str, sum_key: str, count_key: str):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for task, m in snap.items():
+                for le, n in m[key].items():
+                    lines.append(f'{metric}_bucket{{task="{task}",le="{le}"}} {n}')
+                lines.append(f'{metric}_sum{{task="{task}"}} {m[sum_key]}')
+                lines.append(f'{metric}_count{{task="{task}"}} {m[count_key]}')
+
+        histogram(
+            "scheduler_task_duration_seconds",
+            "Wall time per task run",
+            "duration_buckets",
+            "duration_sum",
+            "runs",
+        )
+        histogram(
+            "scheduler_task_start_lag_seconds",
+            "Delay between scheduled and actual start",
+            "lag_buckets",
+            "lag_sum",
+            "lag_count",
+        )
+        for metric, key, help_text in (
+            ("scheduler_task_failures_total", "failures", "Runs that raised"),
+            ("scheduler_task_skipped_total", "skipped", "Runs skipped (still running)"),
+            ("scheduler_task_timeouts_total", "timeouts", "Runs over their timeout"),
+            ("scheduler_task_db_queries_total", "db_queries", "DB statements"),
+            ("scheduler_task_db_seconds_total", "db_seconds", "Time in DB statements"),
+            ("scheduler_task_http_requests_total", "http_calls", "HTTP requests"),
+            ("scheduler_task_http_seconds_total", "http_seconds", "Time in HTTP requests"),
+        ):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            lines.extend(f'{metric}{{task="{task}"}} {m[key]}' for task, m in snap.items())
+        return "\n".join(lines) + "\n"
+
+    def publish(self, path: str | Path | None = None) -> bool:
+        """Write the JSON snapshot atomically (temp file + replace)."""
+        target = Path(path) if path is not None else telemetry_path()
+        tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(self.snapshot()), encoding="utf-8")
+            tmp.replace(target)
+            return True
+        except OSError as e:
+            logger.warning(f"TaskTelemetry: publish to {target} failed: {e}")
+            return False
+
+
+_telemetry = TaskTelemetry()
+
+
+def get_task_telemetry() -> TaskTelemetry:
+    """Process-wide telemetry registry."""
+    return _telemetry
+
+
+def read_published(
+    path: str | Path | None = None, max_age: float = DEFAULT_MAX_AGE_SECONDS
+) -> dict[str, Any] | None:
+    """Snapshot published by the scheduler, None if missing, unreadable or stale."""
+    source = Path(path) if path is not None else telemetry_path()
+    try:
+        snapshot = json.loads(source.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if time.time() - snapshot.get("generated_at", 0) > max_age:
+        return None
+    return snapshot
+
+
+def format_perf_summary(snapshot: dict[str, Any], top: int = 10) -> str:
+    """Telegram HTML summary: slowest tasks by total wall time, lag and failures."""
+    tasks = snapshot.get("tasks", {})
+    if not tasks:
+        return "⏱ <b>Task Performance</b>\n\nNoch keine Task-Läufe erfasst."
+
+    ranked = sorted(tasks.items(), key=lambda item: item[1]["duration_sum"], reverse=True)
+    age = max(time.time() - snapshot.get("generated_at", time.time()), 0)
+    lines = [f"⏱ <b>Task Performance</b> <i>(Stand vor {age:.0f}s)</i>", ""]
+    for name, m in ranked[:top]:
+        p95 = m["duration_p95_le"]
+        p95_text = f"≤{p95:g}s" if p95 is not None else "-"
+        lag = f"{m['lag_avg']:.1f}s" if m["lag_avg"] is not None else "-"
+        lines.append(
+            f"<code>{name.removeprefix('task_')}</code>\n"
+            f"  {m['runs']}x Ø {m['duration_avg']:.1f}s p95 {p95_text} max "
+            f"{m['duration_max']:.1f}s | Lag Ø {lag}\n"
+            f"  DB {m['db_queries']}q/{m['db_seconds']:.1f}s | "
+            f"HTTP {m['http_calls']}/{m['http_seconds']:.1f}s"
+        )
+
+    problems = [
+        f"{name}: {m['failures']} Fehler, {m['timeouts']} Timeouts, {m['skipped']} übersprungen"
+        for name, m in tasks.items()
+        if m["failures"] or m["timeouts"] or m["skipped"]
+    ]
+    if problems:
+        lines.append("")
+        lines.append("⚠️ <b>Auffällig</b>")
+        lines.extend(problems)
+    return "\n".join(lines)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    telemetry: TaskTelemetry = _telemetry
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/metrics":
+            body = self.telemetry.render_prometheus().encode()
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path.rstrip("/") == "/metrics.json":
+            body = json.dumps(self.telemetry.snapshot()).encode()
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        logger.debug(f"metrics: {fmt % args}")
+
+
+def start_metrics_server(
+    port: int, host: str = "127.0.0.1", telemetry: TaskTelemetry | None = None
+) -> ThreadingHTTPServer | None:
+    """Serve /metrics and /metrics.json in a daemon thread (None if the port is taken)."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"telemetry": telemetry or _telemetry})
+    try:
+        server = ThreadingHTTPServer((host, port), handler)
+    except OSError as e:
+        logger.warning(f"TaskTelemetry: metrics endpoint {host}:{port} unavailable: {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info(f"TaskTelemetry: metrics on http://{host}:{server.server_port}/metrics")
+    return server
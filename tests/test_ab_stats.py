@@ -0,0 +1,124 @@
+"""Tests for src/optimization/ab_stats.py (vectorized A/B statistics)."""
+
+import numpy as np
+import pytest
+
+from src.optimization import ab_stats
+
+
+def _pairs(seed=1):
+    rng = np.random.default_rng(seed)
+    return [
+        (rng.normal(10, 5, 50), rng.normal(15, 5, 60)),
+        (rng.normal(0, 1, 40), rng.normal(0, 1, 35)),
+    ]
+
+
+class TestBootstrap:
+    def test_seeded_generator_is_reproducible(self):
+        pairs = _pairs()
+
+        first = ab_stats.bootstrap_mean_diff_ci(pairs, rng=np.random.default_rng(0))
+        second = ab_stats.bootstrap_mean_diff_ci(pairs, rng=np.random.default_rng(0))
+
+        assert first == second
+
+    def test_ci_covers_true_difference(self):
+        lower, upper = ab_stats.bootstrap_mean_diff_ci(_pairs(), rng=np.random.default_rng(0))[0]
+
+        assert lower < 5 < upper
+
+    def test_batched_groups_match_single_runs(self, monkeypatch):
+        monkeypatch.setattr(ab_stats, "MAX_MATRIX_CELLS", 500)  # erzwingt Chunks
+        groups = [[1.0, 2.0, 3.0], [10.0], [4.0, 4.0]]
+
+        means = ab_stats.bootstrap_means(groups, n_resamples=200, rng=np.random.default_rng(3))
+
+        assert means.shape == (200, 3)
+        assert set(np.unique(means[:, 0])) <= {v / 3 for v in range(3, 10)}
+        assert (means[:, 1] == 10.0).all()
+        assert (means[:, 2] == 4.0).all()
+
+    def test_empty_group_rejected(self):
+        with pytest.raises(ValueError):
+            ab_stats.bootstrap_means([[1.0], []])
+
+
+class TestPermutation:
+    def test_matches_scipy_permutation_test(self):
+        from scipy import stats
+
+        control, treatment = _pairs()[1]
+        expected = stats.permutation_test(
+            (treatment, control),
+            lambda x, y, axis: np.mean(x, axis=axis) - np.mean(y, axis=axis),
+            alternative="greater",
+            n_resamples=9_999,
+            vectorized=True,
+            random_state=0,
+        ).pvalue
+
+        p = ab_stats.permutation_pvalues(
+            [(control, treatment)], n_permutations=9_999, rng=np.random.default_rng(1)
+        )[0]
+
+        assert p == pytest.approx(expected, abs=0.03)
+
+    def test_clear_effect_and_alternatives(self):
+        pvalues = ab_stats.permutation_pvalues(
+            _pairs(), n_permutations=2_000, rng=np.random.default_rng(0)
+        )
+        less = ab_stats.permutation_pvalues(
+            _pairs(), n_permutations=2_000, alternative="less", rng=np.random.default_rng(0)
+        )
+
+        assert pvalues[0] == pytest.approx(1 / 2_001)
+        assert less[0] > 0.99
+        assert 0.05 < pvalues[1] < 0.95
+
+    def test_invalid_alternative(self):
+        with pytest.raises(ValueError):
+            ab_stats.permutation_pvalues(_pairs(), alternative="bigger")
+
+
+class TestSequential:
+    def test_always_valid_pvalue_detects_effect(self):
+        (control, treatment), (null_c, null_t) = _pairs()
+
+        assert ab_stats.always_valid_pvalue(control, treatment) < 0.001
+        assert ab_stats.always_valid_pvalue(null_c, null_t) > 0.1
+
+    def test_false_positive_rate_under_repeated_looks(self):
+        rng = np.random.default_rng(7)
+        pairs = [(rng.normal(0, 1, 100), rng.normal(0, 1, 100)) for _ in range(200)]
+
+        rejections = (ab_stats.always_valid_pvalues(pairs) < 0.05).mean()
+
+        assert rejections <= 0.08
+
+    def test_too_few_samples(self):
+        assert ab_stats.always_valid_pvalue([1.0], [2.0, 3.0]) == 1.0
+        assert ab_stats.always_valid_pvalue([1.0, 1.0], [1.0, 1.0]) == 1.0
+
+
+class TestParametric:
+    def test_normal_cdf_and_z_test(self):
+        assert ab_stats.normal_cdf(0.0) == pytest.approx(0.5)
+        assert ab_stats.normal_cdf(np.array([1.96]))[0] == pytest.approx(0.975, abs=1e-3)
+        assert ab_stats.z_test_pvalue(1.96, 1.0) == pytest.approx(0.05, abs=1e-3)
+        assert ab_stats.z_test_pvalue(1.0, 0.0) == 1.0
+
+    def test_normal_cdf_without_scipy(self, monkeypatch):
+        monkeypatch.setattr(ab_stats, "SCIPY_AVAILABLE", False)
+
+        assert ab_stats.normal_cdf(0.0) == pytest.approx(0.5)
+        assert isinstance(ab_stats.normal_cdf(0.0), float)
+        result = ab_stats.normal_cdf(np.array([-1.96, 0.0, 1.96]))
+        assert result.dtype == float
+        assert result == pytest.approx([0.025, 0.5, 0.975], abs=1e-3)
+        assert ab_stats.z_test_pvalue(1.96, 1.0) == pytest.approx(0.05, abs=1e-3)
+
+    def test_seed_from_env(self, monkeypatch):
+        monkeypatch.setenv("AB_TEST_SEED", "5")
+
+        assert ab_stats.make_rng().random() == np.random.default_rng(5).random()
@@ -224,3 +224,65 @@ class TestSignificanceLevel:
         assert SignificanceLevel.SIGNIFICANT.value == "SIGNIFICANT"
         assert SignificanceLevel.MARGINALLY_SIGNIFICANT.value == "MARGINALLY_SIGNIFICANT"
         assert SignificanceLevel.NOT_SIGNIFICANT.value == "NOT_SIGNIFICANT"
+
+
+class TestBatchedEarlyStopping:
+    """Tests für check_running_experiments (Batch über alle Experimente)"""
+
+    def _running(self, framework, name, control, treatment):
+        exp = framework.create_experiment(
+            name=name,
+            description="",
+            hypothesis="",
+            control_config={},
+            treatment_configs=[{}],
+            min_sample_size=20,
+        )
+        framework.start_experiment(exp.id)
+        exp.control.trades = list(control)
+        exp.treatments[0].trades = list(treatment)
+        framework._update_variant_stats(exp.control)
+        framework._update_variant_stats(exp.treatments[0])
+        return exp
+
+    def test_batch_matches_single_checks(self, reset_new_singletons):
+        from src.optimization.ab_testing import ABTestingFramework
+
+        framework = ABTestingFramework()
+        rng = np.random.default_rng(0)
+        clear = self._running(framework, "clear", rng.normal(0, 1, 60), rng.normal(2, 1, 60))
+        few = self._running(framework, "few", rng.normal(0, 1, 5), rng.normal(0, 1, 5))
+        worse = self._running(framework, "worse", rng.normal(1, 1, 40), rng.normal(0, 1, 40))
+
+        decisions = framework.check_running_experiments()
+
+        assert decisions[clear.id][0] is True
+        assert decisions[clear.id][2].winner == "treatment_A"
+        assert decisions[few.id][:2] == (False, "Nicht genug Daten")
+        assert decisions[worse.id][2].winner == "control"
+
+    def test_single_query_for_all_trades(self, reset_new_singletons):
+        from unittest.mock import MagicMock
+
+        from src.optimization.ab_testing import ABTestingFramework
+
+        framework = ABTestingFramework()
+        rng = np.random.default_rng(1)
+        exps = [
+            self._running(framework, f"exp{i}", rng.normal(0, 1, 30), rng.normal(0, 1, 30))
+            for i in range(3)
+        ]
+        framework.conn = MagicMock()
+        cur = framework.conn.cursor.return_value.__enter__.return_value
+        cur.fetchall.return_value = [
+            (str(v.id), pnl)
+            for exp in exps
+            for v in (exp.control, *exp.treatments)
+            for pnl in v.trades
+        ]
+
+        decisions = framework.check_running_experiments()
+
+        assert cur.execute.call_count == 1
+        assert set(decisions) == {exp.id for exp in exps}
+        framework.conn = None
@@ -0,0 +1,89 @@
+"""Tests for src/data/analytics_rollups.py and the rollup readers."""
+
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+
+from src.data import analytics_rollups
+from src.data.analytics_rollups import SIGNAL_COLUMNS, refresh_rollups
+
+
+def _conn(dirty_days):
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchall.return_value = [(d,) for d in dirty_days]
+    return conn, cur
+
+
+class TestRefreshRollups:
+    def test_rebuilds_only_dirty_days(self):
+        days = [date(2026, 3, 2), date(2026, 1, 15)]
+        conn, cur = _conn(days)
+
+        assert refresh_rollups(conn) == 2
+
+        statements = [c.args[0] for c in cur.execute.call_args_list]
+        assert statements[0] is analytics_rollups.DIRTY_DAYS_QUERY
+        assert cur.execute.call_args_list[0].args[1] == (analytics_rollups.ROLLUP_RECENT_DAYS,)
+        assert "DELETE FROM trade_rollup_daily" in statements[1]
+        assert statements[2] is analytics_rollups.TRADE_ROLLUP_INSERT
+        assert "DELETE FROM signal_rollup_daily" in statements[3]
+        assert statements[4] is analytics_rollups.SIGNAL_ROLLUP_INSERT
+
+        sorted_days = sorted(days)
+        assert cur.execute.call_args_list[1].args[1] == (sorted_days,)
+        # Lower timestamp bound keeps the trades scan on idx_trades_timestamp
+        assert cur.execute.call_args_list[2].args[1] == (sorted_days[0], sorted_days)
+        conn.commit.assert_called_once()
+
+    def test_nothing_dirty(self):
+        conn, cur = _conn([])
+
+        assert refresh_rollups(conn) == 0
+        cur.execute.assert_called_once()
+        conn.commit.assert_not_called()
+
+    def test_error_rolls_back(self):
+        conn, cur = _conn([date(2026, 3, 2)])
+        cur.execute.side_effect = [None, RuntimeError("relation does not exist")]
+
+        assert refresh_rollups(conn) == 0
+        conn.rollback.assert_called_once()
+
+    def test_signal_rollup_covers_all_signal_columns(self):
+        for col in SIGNAL_COLUMNS:
+            assert f"sc.{col}" in analytics_rollups.SIGNAL_ROLLUP_INSERT
+        assert f"'{analytics_rollups.OVERALL_SIGNAL}'" in analytics_rollups.SIGNAL_ROLLUP_INSERT
+
+
+class TestWeeklyExportRollups:
+    def _exporter(self, tmp_path):
+        from src.analysis.weekly_export import WeeklyExporter
+
+        with (
+            patch.object(WeeklyExporter, "EXPORT_DIR", tmp_path / "exports"),
+            patch.object(WeeklyExporter, "PLAYBOOK_HISTORY", tmp_path / "history"),
+        ):
+            return WeeklyExporter()
+
+    def test_trades_data_reads_rollup_by_day(self, tmp_path):
+        exporter = self._exporter(tmp_path)
+        conn = MagicMock()
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.fetchone.return_value = {
+            "total": 10,
+            "winning": 6,
+            "losing": 4,
+            "avg_outcome": 0.4,
+            "avg_confidence": 0.7,
+        }
+        cur.fetchall.return_value = []
+
+        with patch.object(exporter, "_get_db_connection", return_value=conn):
+            result = exporter._get_trades_data(datetime(2026, 3, 1, 23), datetime(2026, 3, 8, 23))
+
+        assert result["total_count"] == 10
+        assert result["win_rate"] == 0.6
+        for call in cur.execute.call_args_list:
+            assert "FROM trade_rollup_daily" in call.args[0]
+            assert call.args[1][:2] == (date(2026, 3, 1), date(2026, 3, 8))
+        conn.close.assert_called_once()
@@ -0,0 +1,113 @@
+"""
+Tests für src/api/async_http_client.py
+
+Nutzt einen lokalen aiohttp Server auf dem Event Loop des Clients.
+"""
+
+import asyncio
+
+import pytest
+from aiohttp import web
+
+
+@pytest.fixture
+def client():
+    from src.api.async_http_client import AsyncHTTPClient
+
+    c = AsyncHTTPClient(base_delay=0.01, max_per_host=2)
+    yield c
+    c.close()
+
+
+@pytest.fixture
+def server(client):
+    """Startet einen lokalen Testserver und liefert (base_url, state)."""
+    state = {"flaky_calls": 0, "in_flight": 0, "max_in_flight": 0}
+
+    async def ok(request):
+        return web.json_response({"n": int(request.query.get("n", 0))})
+
+    async def flaky(request):
+        state["flaky_calls"] += 1
+        if state["flaky_calls"] < 2:
+            return web.Response(status=503)
+        return web.json_response({"ok": True})
+
+    async def not_found(request):
+        return web.Response(status=404, text="nope")
+
+    async def slow(request):
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        await asyncio.sleep(0.05)
+        state["in_flight"] -= 1
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/ok", ok)
+    app.router.add_get("/flaky", flaky)
+    app.router.add_get("/missing", not_found)
+    app.router.add_get("/slow", slow)
+
+    async def start():
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return runner, f"http://127.0.0.1:{port}"
+
+    runner, base_url = client.run(start())
+    yield base_url, state
+    client.run(runner.cleanup())
+
+
+class TestAsyncHTTPClient:
+    def test_singleton_pattern(self, reset_new_singletons):
+        from src.api.async_http_client import get_async_http_client
+
+        assert get_async_http_client() is get_async_http_client()
+
+    def test_timeouts_match_sync_client(self, client):
+        from src.api.http_client import HTTPClient
+
+        assert client.DEFAULT_TIMEOUTS == HTTPClient.DEFAULT_TIMEOUTS
+
+    def test_fetch_all_preserves_order(self, client, server):
+        base_url, _ = server
+        requests = [{"url": f"{base_url}/ok", "params": {"n": i}} for i in range(10)]
+
+        results = client.fetch_all(requests)
+
+        assert [r["n"] for r in results] == list(range(10))
+        assert client.stats["successes"] == 10
+
+    def test_retries_server_error(self, client, server):
+        base_url, state = server
+
+        result = client.run(client.get(f"{base_url}/flaky"))
+
+        assert result == {"ok": True}
+        assert state["flaky_calls"] == 2
+        assert client.stats["retries"] == 1
+
+    def test_client_error_returned_not_raised(self, client, server):
+        from src.api.http_client import HTTPClientError
+
+        base_url, _ = server
+        results = client.fetch_all([{"url": f"{base_url}/missing"}, {"url": f"{base_url}/ok"}])
+
+        assert isinstance(results[0], HTTPClientError)
+        assert "404" in str(results[0])
+        assert results[1] == {"n": 0}
+        assert client.stats["failures"] == 1
+
+    def test_per_host_concurrency_limit(self, client, server):
+        base_url, state = server
+
+        client.fetch_all([{"url": f"{base_url}/slow"} for _ in range(6)])
+
+        assert state["max_in_flight"] <= client.max_per_host
+
+    def test_fetch_all_empty(self, client):
+        assert client.fetch_all([]) == []
@@ -0,0 +1,136 @@
+"""Tests for the in-process balance ledger."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.core.balance_ledger import BalanceLedger, get_balance_ledger, split_symbol
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _ledger(usdt=1000.0, interval=60.0):
+    client = MagicMock()
+    client.get_account_balance.return_value = usdt
+    clock = FakeClock()
+    return BalanceLedger(client, interval=interval, clock=clock), client, clock
+
+
+class TestBalanceLedger:
+    def test_serves_from_memory_until_stale(self):
+        ledger, client, clock = _ledger()
+
+        assert ledger.balance("USDT") == 1000.0
+        assert ledger.balance("USDT") == 1000.0
+        client.get_account_balance.assert_called_once_with("USDT")
+
+        clock.now = 61.0
+        ledger.balance("USDT")
+        assert client.get_account_balance.call_count == 2
+        assert ledger.metrics()["hits"] == 1
+
+    def test_limit_buy_lifecycle(self):
+        ledger, _, _ = _ledger()
+        ledger.balance("USDT")
+        ledger.balance("BTC")
+
+        ledger.on_order_placed("BTCUSDT", "BUY", 0.01, 50000.0)
+        assert ledger.balance("USDT") == pytest.approx(500.0)
+
+        # Filled below the limit: difference goes back to USDT, BTC net of fee
+        ledger.on_fill("BTCUSDT", "BUY", 0.01, fill_price=49000.0, order_price=50000.0)
+        assert ledger.balance("USDT") == pytest.approx(510.0)
+        assert ledger.balance("BTC") == pytest.approx(1000.0 + 0.01 * (1 - 0.001))
+
+    def test_sell_fill_and_cancel_release(self):
+        ledger, _, _ = _ledger()
+        ledger.balance("USDT")
+
+        ledger.on_fill(
+            "BTCUSDT", "SELL", 0.01, fill_price=50000.0, order_price=51000.0, fee_usd=0.5
+        )
+        assert ledger.balance("USDT") == pytest.approx(1499.5)
+
+        ledger.on_order_placed("BTCUSDT", "BUY", 0.002, 50000.0)
+        ledger.on_order_released("BTCUSDT", "BUY", 0.002, 50000.0)
+        assert ledger.balance("USDT") == pytest.approx(1499.5)
+
+    def test_untracked_assets_ignore_events(self):
+        ledger, client, _ = _ledger()
+
+        ledger.on_order_placed("ETHUSDT", "BUY", 1.0, 3000.0)
+
+        assert ledger.balance("USDT") == 1000.0
+        assert ledger.metrics()["balances"] == {"USDT": 1000.0}
+        client.get_account_balance.assert_called_once()
+
+    def test_reconcile_records_drift(self):
+        ledger, client, _ = _ledger()
+        ledger.balance("USDT")
+        ledger.on_order_placed("BTCUSDT", "BUY", 0.001, 50000.0)
+
+        # Order was canceled on the exchange without the ledger seeing it
+        client.get_account_balance.return_value = 1000.0
+        drift = ledger.reconcile("USDT")
+
+        assert drift == pytest.approx(50.0)
+        metrics = ledger.metrics()
+        assert metrics["last_drift"]["USDT"] == pytest.approx(50.0)
+        assert metrics["max_abs_drift"]["USDT"] == pytest.approx(50.0)
+        assert metrics["reconciliations"] == 2
+
+    def test_invalidate_forces_reconcile(self):
+        ledger, client, _ = _ledger()
+        ledger.balance("USDT")
+
+        ledger.invalidate()
+        ledger.balance("USDT")
+
+        assert client.get_account_balance.call_count == 2
+
+    def test_reconcile_error_keeps_cached_value(self):
+        ledger, client, clock = _ledger()
+        ledger.balance("USDT")
+        client.get_account_balance.side_effect = RuntimeError("timeout")
+        clock.now = 120.0
+
+        assert ledger.balance("USDT") == 1000.0
+
+    def test_shared_per_client(self):
+        client = MagicMock()
+
+        assert get_balance_ledger(client) is get_balance_ledger(client)
+        assert get_balance_ledger(client) is not get_balance_ledger(MagicMock())
+
+    def test_split_symbol(self):
+        assert split_symbol("SOLUSDT") == ("SOL", "USDT")
+
+
+class TestRiskGuardLedger:
+    def test_buy_validation_fetches_balance_once(self, bot):
+        sizer = MagicMock()
+        sizer.calculate_position_size.return_value = MagicMock(max_position=1000.0)
+        constraints = MagicMock()
+        constraints.get_available_capital.return_value = 1000.0
+        bot.cvar_sizer = sizer
+        bot.allocation_constraints = constraints
+
+        for _ in range(3):
+            allowed, _reason = bot._validate_order_risk("BUY", 0.001, 50000.0)
+            assert allowed is True
+
+        bot.client.get_account_balance.assert_called_once_with("USDT")
+
+    def test_placed_order_reserves_in_ledger(self, bot):
+        bot.balance_ledger.balance("USDT")
+
+        result = bot._place_limit_order("BUY", 0.001, 50000.0)
+
+        assert result["success"]
+        assert bot.balance_ledger.balance("USDT") == pytest.approx(950.0)
@@ -169,3 +169,115 @@ class TestBayesianWeights:
         assert weights.confidence == 0.85
         assert weights.sample_size == 100
         assert weights.regime == "BULL"
+
+
+def _reference_performance(rows):
+    """Alte Zeilen-Schleife als Referenz für die Matrix-Aggregation."""
+    import numpy as np
+
+    from src.analysis.bayesian_weights import SIGNAL_COLUMNS
+
+    result = {}
+    for j, name in enumerate(SIGNAL_COLUMNS):
+        pairs = [(float(r[4 + j]), float(r[3] or 0)) for r in rows if r[4 + j] is not None]
+        correct = sum(1 for s, p in pairs if (s > 0 and p > 0) or (s < 0 and not p > 0))
+        corr = 0.0
+        if len(pairs) >= 3:
+            sig = np.array([s for s, _ in pairs])
+            pnl = np.array([p for _, p in pairs])
+            if np.std(sig) > 0 and np.std(pnl) > 0:
+                corr = float(np.corrcoef(sig, pnl)[0, 1])
+        result[name] = (len(pairs), correct, corr)
+    return result
+
+
+def _outcome_rows(n=40, seed=7):
+    import numpy as np
+
+    from src.analysis.bayesian_weights import SIGNAL_COLUMNS
+
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(n):
+        signals = [
+            None if rng.random() < 0.2 else float(rng.uniform(-1, 1)) for _ in SIGNAL_COLUMNS
+        ]
+        pnl = None if i % 13 == 0 else float(rng.normal(0, 2))
+        rows.append(
+            (
+                ["c1", "c2"][i % 2],
+                ["BULL", "BEAR", None][i % 3],
+                float(i * 1.5),
+                pnl,
+                *signals,
+            )
+        )
+    return rows
+
+
+class TestSignalOutcomes:
+    """Tests für die set-basierte Signal-Performance"""
+
+    def test_matches_row_loop(self):
+        import pytest
+
+        from src.analysis.bayesian_weights import SignalOutcomes
+
+        rows = _outcome_rows()
+        performance = SignalOutcomes.from_rows(rows).performance()
+
+        for name, (total, correct, corr) in _reference_performance(rows).items():
+            assert performance[name].total_trades == total
+            assert performance[name].correct_predictions == correct
+            assert performance[name].correlation_with_pnl == pytest.approx(corr)
+        assert performance["ai"].total_trades == 0
+
+    def test_masks_match_filtered_rows(self):
+        from src.analysis.bayesian_weights import SignalOutcomes
+
+        rows = _outcome_rows()
+        outcomes = SignalOutcomes.from_rows(rows)
+
+        subset = outcomes.performance(
+            outcomes.mask(lookback_days=30, cohort_id="c1", regime="BULL")
+        )
+        expected = _reference_performance(
+            [r for r in rows if r[2] <= 30 and r[0] == "c1" and r[1] == "BULL"]
+        )
+        assert {n: p.total_trades for n, p in subset.items() if n != "ai"} == {
+            n: v[0] for n, v in expected.items()
+        }
+
+    def test_constant_signal_has_no_correlation(self):
+        from src.analysis.bayesian_weights import SIGNAL_COLUMNS, SignalOutcomes
+
+        k = len(SIGNAL_COLUMNS)
+        rows = [("c1", "BULL", 1.0, pnl, *([0.5] * k)) for pnl in (1.0, -2.0, 3.0)]
+        performance = SignalOutcomes.from_rows(rows).performance()
+
+        assert performance["rsi"].total_trades == 3
+        assert performance["rsi"].correct_predictions == 2
+        assert performance["rsi"].correlation_with_pnl == 0.0
+
+    def test_weekly_update_fetches_once(self, reset_new_singletons):
+        from unittest.mock import MagicMock, patch
+
+        from src.analysis.bayesian_weights import BayesianWeightLearner
+
+        learner = BayesianWeightLearner.get_instance()
+        learner.conn = MagicMock()
+        cur = learner.conn.cursor.return_value.__enter__.return_value
+        cur.fetchall.return_value = _outcome_rows(n=120)
+
+        with (
+            patch.object(learner, "_get_active_cohort_ids", return_value=["c1", "c2"]),
+            patch.object(learner, "_store_weights"),
+        ):
+            result = learner.weekly_update()
+
+        queries = [c.args[0] for c in cur.execute.call_args_list]
+        assert sum("FROM signal_components" in q for q in queries) == 1
+        assert sum("INSERT INTO regime_daily" in q for q in queries) == 1
+        assert not result["errors"]
+        assert {u["type"] for u in result["updates"]} >= {"global", "regime_BULL"}
+        learner.conn = None
@@ -0,0 +1,82 @@
+"""Smoke tests for the hot-path benchmark suite (tiny sizes, no timing asserts)."""
+
+import pytest
+
+from benchmarks.hot_paths import (
+    CASES,
+    CaseResult,
+    attach_baselines,
+    format_report,
+    load_baselines,
+    run_benchmarks,
+    save_baselines,
+)
+
+SMOKE_SIZES = {
+    "grid_strategy_build": 20,
+    "grid_strategy_fills": 20,
+    "check_orders": 30,
+    "paper_matching": 100,
+    "backtest_run": 30,
+    "divergence_analyze": 2,
+    "memory_similarity": 50,
+    "correlation_matrix": 3,
+}
+
+
+class TestBenchmarkSuite:
+    def test_every_case_has_a_baseline(self):
+        baselines = load_baselines()
+
+        assert set(baselines) == set(CASES)
+        for name, bench in CASES.items():
+            assert baselines[name]["size"] == bench.size
+
+    @pytest.mark.parametrize("name", sorted(CASES))
+    def test_case_runs_offline(self, name, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+
+        func = CASES[name].setup(SMOKE_SIZES[name])
+        func()
+
+    def test_check_orders_processes_fills(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        check_orders = CASES["check_orders"].setup(30)
+        bot = check_orders.__self__
+        placed_before = bot.client._next_order_id
+
+        check_orders()
+
+        # Every 10th order was filled and got a follow-up order
+        assert bot.client._next_order_id - placed_before == 3
+
+    def test_run_benchmarks_restores_cwd(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+
+        (result,) = run_benchmarks(["memory_similarity"], repeat=1, scale=0.05)
+
+        assert result.size == 50
+        assert result.median_ms >= 0
+        assert not (tmp_path / "config").exists()
+
+    def test_regression_is_flagged(self):
+        results = [CaseResult("check_orders", 500, median_ms=30.0, min_ms=29.0)]
+
+        attach_baselines(results, {"check_orders": {"size": 500, "median_ms": 10.0}})
+
+        assert results[0].ratio == 3.0
+        assert "REGRESSION" in format_report(results, tolerance=1.5)
+
+    def test_baseline_for_other_size_is_ignored(self):
+        results = [CaseResult("check_orders", 50, median_ms=3.0, min_ms=3.0)]
+
+        attach_baselines(results, {"check_orders": {"size": 500, "median_ms": 10.0}})
+
+        assert results[0].ratio is None
+
+    def test_save_baselines_merges(self, tmp_path):
+        path = tmp_path / "baselines.json"
+        save_baselines([CaseResult("a", 1, 1.0, 1.0)], path)
+        save_baselines([CaseResult("b", 2, 2.0, 2.0)], path)
+
+        assert set(load_baselines(path)) == {"a", "b"}
@@ -0,0 +1,80 @@
+"""Tests für den prozessweiten BinanceClient Pool."""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.api import binance_client
+from src.api.binance_client import (
+    get_binance_client,
+    get_shared_rate_limiter,
+    reset_binance_clients,
+)
+
+
+@pytest.fixture
+def mock_sdk(monkeypatch):
+    """python-binance Client ersetzen - kein Netzwerk, Aufrufe zählbar."""
+    monkeypatch.setenv("BINANCE_TESTNET_API_KEY", "test-key")
+    monkeypatch.setenv("BINANCE_TESTNET_API_SECRET", "test-secret")
+    monkeypatch.setenv("BINANCE_API_KEY", "live-key")
+    monkeypatch.setenv("BINANCE_API_SECRET", "live-secret")
+    with patch("src.api.binance_client.Client") as sdk:
+        yield sdk
+
+
+class TestClientPool:
+    def test_same_instance_per_key(self, mock_sdk):
+        assert get_binance_client(testnet=True) is get_binance_client(testnet=True)
+        assert mock_sdk.call_count == 1
+
+    def test_testnet_from_env(self, mock_sdk, monkeypatch):
+        monkeypatch.setenv("BINANCE_TESTNET", "true")
+
+        assert get_binance_client() is get_binance_client(testnet=True)
+
+    def test_different_keys_get_different_instances(self, mock_sdk, monkeypatch):
+        testnet = get_binance_client(testnet=True)
+        live = get_binance_client(testnet=False)
+        monkeypatch.setenv("BINANCE_TESTNET_API_KEY", "other-key")
+        other = get_binance_client(testnet=True)
+
+        assert len({id(testnet), id(live), id(other)}) == 3
+        assert mock_sdk.call_count == 3
+
+    def test_rotated_secret_gets_new_instance(self, mock_sdk, monkeypatch):
+        first = get_binance_client(testnet=True)
+        monkeypatch.setenv("BINANCE_TESTNET_API_SECRET", "rotated-secret")
+
+        assert get_binance_client(testnet=True) is not first
+
+    def test_secret_not_stored_in_pool_key(self, mock_sdk):
+        get_binance_client(testnet=True)
+
+        assert all("test-secret" not in key for key in binance_client._clients)
+
+    def test_clients_share_rate_limiter(self, mock_sdk):
+        testnet = get_binance_client(testnet=True)
+        live = get_binance_client(testnet=False)
+
+        assert testnet.rate_limiter is live.rate_limiter
+        assert testnet.rate_limiter is get_shared_rate_limiter()
+
+    def test_lazy_creation(self, mock_sdk):
+        get_shared_rate_limiter()
+        mock_sdk.assert_not_called()
+
+        get_binance_client(testnet=True)
+
+        mock_sdk.assert_called_once()
+
+    def test_reset_clears_pool(self, mock_sdk):
+        client = get_binance_client(testnet=True)
+        limiter = get_shared_rate_limiter()
+
+        reset_binance_clients()
+
+        assert binance_client._clients == {}
+        mock_sdk.return_value.session.close.assert_called_once()
+        assert get_binance_client(testnet=True) is not client
+        assert get_shared_rate_limiter() is not limiter
@@ -399,7 +399,7 @@ class TestBinanceDataFetcher:
         df = fetcher.fetch_klines("BTCUSDT", start_date="2024-01-01", end_date="2024-12-31")
         assert len(df) == 1
 
-    @patch("src.data.fetcher.get_http_client")
+    @patch("src.data.fetcher.get_async_http_client")
     def test_fetch_multiple_symbols(self, mock_http):
         from src.data.fetcher import BinanceDataFetcher
 
@@ -419,21 +419,25 @@ class TestBinanceDataFetcher:
                 "0",
             ],
         ]
-        mock_http.return_value.get.return_value = mock_data
+        mock_http.return_value.fetch_all.return_value = [mock_data, mock_data]
 
-        with patch("pathlib.Path.mkdir"), patch("time.sleep"):
+        with patch("pathlib.Path.mkdir"):
             fetcher = BinanceDataFetcher()
             result = fetcher.fetch_multiple_symbols(symbols=["BTCUSDT", "ETHUSDT"], days=30)
 
         assert isinstance(result, pd.DataFrame)
+        assert list(result.columns) == ["BTC", "ETH"]
+        requests = mock_http.return_value.fetch_all.call_args[0][0]
+        assert [r["params"]["symbol"] for r in requests] == ["BTCUSDT", "ETHUSDT"]
 
-    @patch("src.data.fetcher.get_http_client")
+    @patch("src.data.fetcher.get_async_http_client")
     def test_fetch_multiple_symbols_error(self, mock_http):
+        from src.api.http_client import HTTPClientError
         from src.data.fetcher import BinanceDataFetcher
 
-        mock_http.return_value.get.side_effect = Exception("API Error")
+        mock_http.return_value.fetch_all.return_value = [HTTPClientError("API Error")]
 
-        with patch("pathlib.Path.mkdir"), patch("time.sleep"):
+        with patch("pathlib.Path.mkdir"):
             fetcher = BinanceDataFetcher()
             result = fetcher.fetch_multiple_symbols(symbols=["BTCUSDT"], days=30)
 
@@ -261,6 +261,22 @@ class TestCohortOrchestrator:
         mock_orch1.tick.assert_called_once()
         mock_orch2.tick.assert_called_once()
 
+    def test_tick_saves_all_cohorts_in_one_pass(self, reset_new_singletons):
+        from unittest.mock import MagicMock
+
+        from src.core.cohort_orchestrator import CohortOrchestrator
+
+        co = CohortOrchestrator(client=MagicMock())
+        mock_orch1 = MagicMock(state_store=None)
+        mock_orch2 = MagicMock(state_store=None)
+        co.orchestrators = {"a": mock_orch1, "b": mock_orch2}
+
+        co.tick()
+
+        mock_orch1.tick.assert_called_once_with(persist=False)
+        mock_orch1.save_state.assert_called_once()
+        mock_orch2.save_state.assert_called_once()
+
     def test_stop_stops_all(self, reset_new_singletons):
         from unittest.mock import MagicMock
 
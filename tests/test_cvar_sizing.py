@@ -2,7 +2,10 @@
 Tests für CVaRPositionSizer
 """
 
+from unittest.mock import MagicMock
+
 import numpy as np
+import pytest
 
 
 class TestCVaRPositionSizer:
@@ -209,3 +212,143 @@ class TestRiskMetrics:
         assert metrics.var_95 == 0.04
         assert metrics.cvar_95 == 0.05
         assert metrics.volatility == 0.30
+
+
+class TestRiskBudgets:
+    """Tests für vorberechnete Risk-Budgets"""
+
+    def _sizer(self):
+        from src.risk.cvar_sizing import CVaRPositionSizer
+
+        sizer = CVaRPositionSizer()
+        sizer.conn = None
+        return sizer
+
+    def test_position_size_uses_budget_without_io(self, reset_new_singletons):
+        """Order-Pfad liest nur das vorberechnete Budget"""
+        sizer = self._sizer()
+        np.random.seed(42)
+        budget = sizer.build_risk_budget("BTCUSDT", np.random.normal(0.001, 0.03, 50))
+        sizer._store_budgets([budget])
+        sizer._get_historical_returns = MagicMock(side_effect=AssertionError("I/O"))
+
+        result = sizer.calculate_position_size("BTCUSDT", 10000.0, regime="BEAR")
+
+        assert result.cvar_used == pytest.approx(budget.metrics.cvar_95 * 1.5)
+        assert result.kelly_size == pytest.approx(10000.0 * budget.kelly_fraction)
+
+    def test_budget_matches_direct_calculation(self, reset_new_singletons):
+        """Budget liefert dieselben Werte wie die direkte Berechnung"""
+        sizer = self._sizer()
+        np.random.seed(7)
+        returns = np.random.normal(0.002, 0.04, 60)
+
+        budget = sizer.build_risk_budget("ETHUSDT", returns)
+
+        assert budget.metrics == sizer.calculate_risk_metrics(returns)
+        assert budget.kelly_fraction * 5000.0 == pytest.approx(
+            sizer._calculate_kelly_position(returns, 5000.0, 0.5)
+        )
+        for regime in ("BULL", "SIDEWAYS", "TRANSITION"):
+            assert budget.adjusted_cvar(regime) == pytest.approx(
+                sizer._adjust_cvar_for_regime(budget.metrics.cvar_95, regime)
+            )
+        assert budget.adjusted_cvar("unknown") == budget.metrics.cvar_95
+
+    def test_missing_budget_uses_fallback_and_refreshes_later(self, reset_new_singletons):
+        """Fehlendes Budget: konservativer Fallback, Nachrechnen in refresh_if_stale"""
+        sizer = self._sizer()
+        sizer._get_historical_returns = MagicMock(return_value=np.random.normal(0, 0.02, 40))
+
+        result = sizer.calculate_position_size("SOLUSDT", 10000.0)
+
+        assert result.cvar_used == 0.07
+        assert result.kelly_size == 0.0
+        sizer._get_historical_returns.assert_not_called()
+
+        sizer.refresh_if_stale()
+
+        sizer._get_historical_returns.assert_called_once_with("SOLUSDT")
+        assert sizer.get_risk_budget("SOLUSDT").sample_size == 40
+
+    def test_refresh_if_stale_is_time_gated(self, reset_new_singletons):
+        """Zwischen zwei Reloads wird nichts nachgeladen"""
+        sizer = self._sizer()
+        sizer._get_historical_returns = MagicMock(return_value=np.random.normal(0, 0.02, 40))
+
+        sizer.refresh_if_stale(["BTCUSDT"])
+        sizer.refresh_if_stale(["BTCUSDT", "ETHUSDT"])
+
+        sizer._get_historical_returns.assert_called_once_with("BTCUSDT")
+
+    def test_refresh_if_stale_keeps_budgets_of_healthy_symbols(self, reset_new_singletons):
+        """Ein fehlschlagendes Symbol verwirft die übrigen Budgets nicht"""
+        sizer = self._sizer()
+        returns = np.random.normal(0, 0.02, 40)
+
+        def historical_returns(symbol):
+            if symbol == "ETHUSDT":
+                raise ConnectionError("klines timeout")
+            return returns
+
+        sizer._get_historical_returns = MagicMock(side_effect=historical_returns)
+
+        sizer.refresh_if_stale(["BTCUSDT", "ETHUSDT"])
+
+        assert sizer.get_risk_budget("BTCUSDT").sample_size == 40
+        assert "ETHUSDT" in sizer._missing_budgets
+
+    def test_refresh_if_stale_with_db_only_loads(self, reset_new_singletons):
+        """Mit DB rechnet der Scheduler - der Tick lädt nur die Tabelle"""
+        sizer = self._sizer()
+        sizer.conn = MagicMock()
+        sizer._get_historical_returns = MagicMock()
+        sizer.load_risk_budgets = MagicMock(return_value=0)
+        sizer.calculate_position_size("SOLUSDT", 10000.0)
+
+        sizer.refresh_if_stale(["BTCUSDT"])
+
+        sizer.load_risk_budgets.assert_called_once()
+        sizer._get_historical_returns.assert_not_called()
+        sizer.conn = None
+
+    def test_save_and_load_round_trip(self, reset_new_singletons):
+        """Budgets werden pro Regime gespeichert und wieder geladen"""
+        from src.risk.cvar_sizing import REGIME_CVAR_MULTIPLIERS
+
+        sizer = self._sizer()
+        sizer.conn = MagicMock()
+        cur = sizer.conn.cursor.return_value.__enter__.return_value
+        np.random.seed(3)
+        budget = sizer.build_risk_budget("BTCUSDT", np.random.normal(0.001, 0.03, 50))
+
+        sizer.save_risk_budgets([budget])
+
+        rows = cur.executemany.call_args.args[1]
+        assert [r[1] for r in rows] == ["DEFAULT", *REGIME_CVAR_MULTIPLIERS]
+        columns = [
+            "symbol",
+            "regime",
+            "var_95",
+            "var_99",
+            "cvar_95",
+            "cvar_99",
+            "max_loss_observed",
+            "volatility",
+            "downside_volatility",
+            "kelly_fraction",
+            "adjusted_cvar",
+            "max_position_pct",
+            "sample_size",
+            "computed_at",
+        ]
+        cur.fetchall.return_value = [dict(zip(columns, r, strict=True)) for r in rows]
+
+        loaded = self._sizer()
+        loaded.conn = sizer.conn
+        assert loaded.load_risk_budgets() == 1
+
+        restored = loaded.get_risk_budget("BTCUSDT")
+        assert restored.metrics == budget.metrics
+        assert restored.adjusted_cvar("BEAR") == pytest.approx(budget.adjusted_cvar("BEAR"))
+        assert restored.max_position_pct("BEAR") == pytest.approx(rows[2][11])
@@ -314,6 +314,63 @@ class TestWhaleAlertTracker:
 
         assert isinstance(result, dict)
 
+    @patch("src.data.whale_alert.get_async_http_client")
+    @patch("src.data.whale_alert.get_config")
+    @patch("src.data.whale_alert.get_http_client")
+    def test_fetch_btc_whales_parallel(self, mock_http, mock_config, mock_async):
+        from src.data.whale_alert import WhaleAlertTracker
+
+        config = MagicMock()
+        config.whale.min_btc_amount = 100
+        config.api.blockchain_url = "https://blockchain.info/unconfirmed-transactions?format=json"
+        config.api.coingecko_url = "https://api.coingecko.com/api/v3"
+        mock_config.return_value = config
+        mock_async.return_value.fetch_all.return_value = [
+            {"txs": [{"hash": "a", "time": 1700000000, "out": [{"value": 200e8}]}]},
+            {"bitcoin": {"usd": 50000}},
+        ]
+
+        whales = WhaleAlertTracker().fetch_recent_whales(hours=1)
+
+        mock_async.return_value.fetch_all.assert_called_once()
+        mock_http.return_value.get.assert_not_called()
+        assert len(whales) == 1
+        assert whales[0].amount_usd == 200 * 50000
+
+    @patch("src.data.whale_alert.get_async_http_client")
+    @patch("src.data.whale_alert.get_config")
+    @patch("src.data.whale_alert.get_http_client")
+    def test_fetch_btc_whales_price_fallback(self, mock_http, mock_config, mock_async):
+        from src.api.http_client import HTTPClientError
+        from src.data.whale_alert import WhaleAlertTracker
+
+        config = MagicMock()
+        config.whale.min_btc_amount = 100
+        mock_config.return_value = config
+        mock_async.return_value.fetch_all.return_value = [
+            {"txs": [{"hash": "a", "out": [{"value": 200e8}]}]},
+            HTTPClientError("HTTP 429"),
+        ]
+
+        whales = WhaleAlertTracker().fetch_recent_whales(hours=1)
+
+        assert whales[0].amount_usd == 200 * 100000
+
+    @patch("src.data.whale_alert.get_async_http_client")
+    @patch("src.data.whale_alert.get_config")
+    @patch("src.data.whale_alert.get_http_client")
+    def test_fetch_btc_whales_source_error(self, mock_http, mock_config, mock_async):
+        from src.api.http_client import HTTPClientError
+        from src.data.whale_alert import WhaleAlertTracker
+
+        mock_config.return_value = MagicMock()
+        mock_async.return_value.fetch_all.return_value = [
+            HTTPClientError("HTTP 503"),
+            {"bitcoin": {"usd": 50000}},
+        ]
+
+        assert WhaleAlertTracker().fetch_recent_whales(hours=1) == []
+
 
 # ═══════════════════════════════════════════════════════════════
 # playbook.py
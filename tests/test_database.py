@@ -0,0 +1,244 @@
+"""Tests for src/data/database.py (pool sizing and PooledConnection handle)."""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.data.database import (
+    TRANSACTION_STATUS_IDLE,
+    DatabaseManager,
+    PooledConnection,
+    pool_size_from_env,
+)
+
+
+def _new_connection():
+    conn = MagicMock(closed=0)
+    conn.get_transaction_status.return_value = TRANSACTION_STATUS_IDLE
+    return conn
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """DatabaseManager mit gemocktem ThreadedConnectionPool."""
+    monkeypatch.setenv("DB_POOL_MIN", "1")
+    monkeypatch.setenv("DB_POOL_MAX", "2")
+    monkeypatch.setenv("DB_POOL_TIMEOUT", "0")
+    pool = MagicMock()
+    pool.getconn.side_effect = _new_connection
+    with patch("src.data.database.ThreadedConnectionPool", return_value=pool):
+        manager = DatabaseManager()
+    yield manager
+    manager.close()
+
+
+class TestPoolSizing:
+    def test_defaults_follow_scheduler_workers(self, monkeypatch):
+        monkeypatch.delenv("DB_POOL_MIN", raising=False)
+        monkeypatch.delenv("DB_POOL_MAX", raising=False)
+        monkeypatch.setenv("SCHEDULER_WORKERS", "8")
+
+        assert pool_size_from_env() == (9, 18)
+
+    def test_explicit_values_and_invalid_input(self, monkeypatch):
+        monkeypatch.setenv("DB_POOL_MIN", "3")
+        monkeypatch.setenv("DB_POOL_MAX", "abc")
+        monkeypatch.setenv("SCHEDULER_WORKERS", "1")
+
+        assert pool_size_from_env() == (3, 10)
+
+    def test_max_never_below_min(self, monkeypatch):
+        monkeypatch.setenv("DB_POOL_MIN", "5")
+        monkeypatch.setenv("DB_POOL_MAX", "2")
+
+        assert pool_size_from_env() == (5, 5)
+
+
+class TestDatabaseManager:
+    def test_checkout_waits_for_free_slot(self, db):
+        first = db.get_connection()
+        second = db.get_connection()
+
+        assert first is not None and second is not None
+        assert db.get_connection() is None
+
+        db.return_connection(first)
+        assert db.get_connection() is not None
+
+    def test_pgbouncer_skips_health_check(self, db):
+        db.pgbouncer = True
+        conn = db.get_connection()
+
+        conn.cursor.assert_not_called()
+
+
+class TestConnectionValidation:
+    def test_hot_connection_skips_health_check(self, db):
+        conn = db.get_connection()
+        db.return_connection(conn)
+        conn.cursor.reset_mock()
+        db._pool.getconn.side_effect = None
+        db._pool.getconn.return_value = conn
+
+        assert db.get_connection() is conn
+        conn.cursor.assert_not_called()
+        assert db.get_pool_metrics()["validations"] == 1
+
+    def test_idle_connection_is_validated(self, db):
+        db.validate_idle_seconds = 0
+        conn = db.get_connection()
+        db.return_connection(conn)
+        db._pool.getconn.side_effect = None
+        db._pool.getconn.return_value = conn
+
+        with patch("src.data.database.time.monotonic", return_value=time.monotonic() + 1):
+            db.get_connection()
+
+        assert db.get_pool_metrics()["validations"] == 2
+
+    def test_closed_connection_replaced_without_round_trip(self, db):
+        dead = _new_connection()
+        dead.closed = 2
+        fresh = _new_connection()
+        db._pool.getconn.side_effect = [dead, fresh]
+
+        assert db.get_connection() is fresh
+        dead.cursor.assert_not_called()
+        db._pool.putconn.assert_called_once_with(dead, close=True)
+        assert db.get_pool_metrics()["validation_failures"] == 1
+
+    def test_aborted_transaction_rolled_back(self, db):
+        conn = _new_connection()
+        conn.get_transaction_status.return_value = 3  # INERROR
+        db._pool.getconn.side_effect = [conn]
+
+        assert db.get_connection() is conn
+        assert conn.rollback.called
+
+    def test_lost_connection_discarded_and_retried(self, db):
+        from src.data.database import OperationalError
+
+        dead = _new_connection()
+
+        def execute(query, *args):
+            if query != "SELECT 1":
+                dead.closed = 2
+                raise OperationalError("server closed the connection unexpectedly")
+
+        dead.cursor.return_value.__enter__.return_value.execute.side_effect = execute
+        db._pool.getconn.side_effect = [dead, _new_connection()]
+
+        db.execute("INSERT INTO trades VALUES (1)")
+
+        db._pool.putconn.assert_any_call(dead, close=True)
+        metrics = db.get_pool_metrics()
+        assert metrics["connection_errors"] == 1
+        assert metrics["checkouts"] == 2
+
+    def test_write_not_retried_when_commit_was_sent(self, db):
+        from src.data.database import OperationalError
+
+        dead = _new_connection()
+
+        def commit():
+            dead.closed = 2
+            raise OperationalError("server closed the connection unexpectedly")
+
+        dead.commit.side_effect = commit
+        fresh = _new_connection()
+        db._pool.getconn.side_effect = [dead, fresh]
+
+        with pytest.raises(OperationalError):
+            db.execute("INSERT INTO trades VALUES (1)")
+
+        # Kein zweites INSERT: das erste könnte bereits committed sein
+        fresh.cursor.assert_not_called()
+        assert db.get_pool_metrics()["checkouts"] == 1
+
+    def test_read_retried_when_commit_was_sent(self, db):
+        from src.data.database import OperationalError
+
+        dead = _new_connection()
+
+        def commit():
+            dead.closed = 2
+            raise OperationalError("server closed the connection unexpectedly")
+
+        dead.commit.side_effect = commit
+        db._pool.getconn.side_effect = [dead, _new_connection()]
+
+        db.execute("SELECT * FROM trades", fetch=True)
+
+        assert db.get_pool_metrics()["checkouts"] == 2
+
+    def test_wait_metrics(self, db):
+        db.get_connection()
+        db.get_connection()
+
+        assert db.get_connection() is None
+        metrics = db.get_pool_metrics()
+        assert metrics["waits"] == 1
+        assert metrics["timeouts"] == 1
+        assert metrics["checkouts"] == 2
+
+
+class TestPooledConnection:
+    def test_read_only_cursor_returns_connection(self, db):
+        handle = PooledConnection(db)
+
+        with handle.cursor() as cur:
+            cur.execute("SELECT 1")
+
+        raw = db._pool.putconn.call_args.args[0]
+        raw.commit.assert_called_once()
+        assert db._pool.putconn.call_count == 1
+
+    def test_write_holds_connection_until_commit(self, db):
+        handle = PooledConnection(db)
+
+        with handle.cursor() as cur:
+            cur.execute("INSERT INTO trades VALUES (1)")
+        with handle.cursor() as cur:
+            cur.execute("SELECT 1")
+
+        assert db._pool.getconn.call_count == 1
+        db._pool.putconn.assert_not_called()
+
+        handle.commit()
+        assert db._pool.putconn.call_count == 1
+
+    def test_close_releases_lease(self, db):
+        handle = PooledConnection(db)
+        handle.cursor().execute("UPDATE trades SET x = 1")
+
+        handle.close()
+
+        db._pool.putconn.assert_called_once()
+        assert handle.closed is False
+
+    def test_failed_cursor_rolls_back(self, db):
+        handle = PooledConnection(db)
+
+        with pytest.raises(ValueError), handle.cursor() as cur:
+            cur.execute("SELECT 1")
+            raise ValueError("boom")
+
+        raw = db._pool.putconn.call_args.args[0]
+        assert raw.rollback.call_count == 2  # Validierung + Fehlerfall
+        raw.commit.assert_not_called()
+
+    def test_handles_do_not_leak_slots(self, db):
+        for _ in range(5):
+            handle = PooledConnection(db)
+            handle.cursor().execute("DELETE FROM trades")
+            handle.close()
+
+        assert db.get_connection() is not None
+
+    def test_task_connection_is_pooled_handle(self):
+        from src.tasks.base import get_db_connection
+
+        handle = MagicMock(spec=PooledConnection)
+        with patch("src.data.database.get_pooled_connection", return_value=handle):
+            assert get_db_connection() is handle
@@ -2,6 +2,7 @@
 Tests für src/api/http_client.py
 """
 
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -274,3 +275,124 @@ class TestHTTPClientExceptions:
 
         error = TimeoutError("Request timed out")
         assert str(error) == "Request timed out"
+
+
+class TestHTTPClientResponseCache:
+    """Tests für den persistenten Response Cache (ETag/Last-Modified)"""
+
+    @staticmethod
+    def _response(status, body=None, headers=None):
+        response = MagicMock()
+        response.status_code = status
+        response.json.return_value = body
+        response.headers = headers or {}
+        return response
+
+    @pytest.fixture
+    def client(self, tmp_path):
+        from src.api.http_client import HTTPClient
+        from src.api.response_cache import HTTPResponseCache
+
+        return HTTPClient(
+            max_retries=2,
+            base_delay=0.01,
+            max_delay=0.05,
+            response_cache=HTTPResponseCache(tmp_path),
+        )
+
+    @patch("requests.Session.get")
+    def test_fresh_entry_served_locally(self, mock_get, client):
+        mock_get.return_value = self._response(200, {"value": 42})
+
+        assert client.get("https://api.example.com/fng", cache_ttl=60) == {"value": 42}
+        assert client.get("https://api.example.com/fng", cache_ttl=60) == {"value": 42}
+
+        assert mock_get.call_count == 1
+        assert client.stats["cache_hits"] == 1
+
+    @patch("requests.Session.get")
+    def test_expired_entry_revalidates_with_etag(self, mock_get, client):
+        mock_get.return_value = self._response(
+            200, {"value": 42}, {"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+        )
+        client.get("https://api.example.com/fng", cache_ttl=0)
+
+        mock_get.return_value = self._response(304)
+        result = client.get("https://api.example.com/fng", cache_ttl=0)
+
+        assert result == {"value": 42}
+        headers = mock_get.call_args[1]["headers"]
+        assert headers["If-None-Match"] == '"abc"'
+        assert headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+        assert client.stats["not_modified"] == 1
+
+    @patch("requests.Session.get")
+    def test_cache_control_max_age_overrides_default(self, mock_get, client):
+        mock_get.return_value = self._response(200, {"v": 1}, {"Cache-Control": "max-age=3600"})
+
+        client.get("https://api.example.com/x", cache_ttl=0)
+        client.get("https://api.example.com/x", cache_ttl=0)
+
+        assert mock_get.call_count == 1
+
+    @patch("requests.Session.get")
+    def test_no_store_not_cached(self, mock_get, client):
+        mock_get.return_value = self._response(200, {"v": 1}, {"Cache-Control": "no-store"})
+
+        client.get("https://api.example.com/x", cache_ttl=60)
+        client.get("https://api.example.com/x", cache_ttl=60)
+
+        assert mock_get.call_count == 2
+
+    @patch("requests.Session.get")
+    def test_survives_restart(self, mock_get, tmp_path):
+        from src.api.http_client import HTTPClient
+        from src.api.response_cache import HTTPResponseCache
+
+        mock_get.return_value = self._response(200, {"v": 1})
+        HTTPClient(response_cache=HTTPResponseCache(tmp_path)).get(
+            "https://api.example.com/x", params={"a": 1}, cache_ttl=60
+        )
+
+        restarted = HTTPClient(response_cache=HTTPResponseCache(tmp_path))
+        assert restarted.get("https://api.example.com/x", params={"a": 1}, cache_ttl=60) == {"v": 1}
+        assert mock_get.call_count == 1
+
+    @patch("requests.Session.get")
+    def test_stale_served_on_server_error(self, mock_get, client):
+        mock_get.return_value = self._response(200, {"v": 1})
+        client.get("https://api.example.com/x", cache_ttl=0)
+
+        mock_get.return_value = self._response(503)
+        assert client.get("https://api.example.com/x", cache_ttl=0) == {"v": 1}
+
+    @patch("requests.Session.get")
+    def test_too_stale_entry_raises(self, mock_get, client):
+        from src.api.http_client import HTTPClientError
+
+        mock_get.return_value = self._response(200, {"v": 1})
+        client.get("https://api.example.com/x", cache_ttl=0)
+
+        mock_get.return_value = self._response(503)
+        expired = time.time() + 2 * 3600
+        with patch("src.api.response_cache.time.time", return_value=expired):
+            assert client.get("https://api.example.com/x", cache_ttl=0, stale_if_error=3 * 3600)
+            with pytest.raises(HTTPClientError):
+                client.get("https://api.example.com/x", cache_ttl=0, stale_if_error=3600)
+
+    def test_stale_limit_from_env(self, monkeypatch):
+        from src.api.http_client import HTTPClient
+
+        monkeypatch.setenv("HTTP_STALE_IF_ERROR", "600")
+
+        assert HTTPClient().stale_if_error == 600
+
+    @patch("requests.Session.get")
+    def test_uncached_by_default(self, mock_get, client):
+        mock_get.return_value = self._response(200, {"v": 1})
+
+        client.get("https://api.example.com/x")
+        client.get("https://api.example.com/x")
+
+        assert mock_get.call_count == 2
+        assert not list(client._response_cache.cache_dir.glob("*.json"))
@@ -280,6 +280,22 @@ class TestMarketSell:
         assert state.hold_stop_id is None
         assert state.cash_exit_started is None
 
+    @patch("src.risk.stop_loss_executor.execute_stop_loss_sell")
+    def test_market_sell_invalidates_balance_ledger(self, mock_executor, orchestrator, mock_client):
+        from src.core.balance_ledger import get_balance_ledger
+
+        mock_executor.return_value = {"success": True, "order": {}}
+        ledger = get_balance_ledger(mock_client)
+        mock_client.get_account_balance.return_value = 100.0
+        ledger.balance("USDT")
+        state = orchestrator.symbols["BTCUSDT"]
+        state.hold_quantity = 0.001
+
+        orchestrator._market_sell_position(state)
+        mock_client.get_account_balance.return_value = 150.0
+
+        assert ledger.balance("USDT") == 150.0
+
     @patch("src.risk.stop_loss_executor.execute_stop_loss_sell")
     def test_market_sell_handles_failure(self, mock_executor, orchestrator, mock_client):
         mock_executor.return_value = {
@@ -294,6 +310,41 @@ class TestMarketSell:
         # On failure, state should NOT be reset (will retry next tick)
         assert state.hold_quantity == 0.001
 
+    @patch("src.risk.stop_loss_executor.execute_stop_loss_sell")
+    def test_market_sell_queues_pair_close_with_write_behind(
+        self, mock_executor, orchestrator, mock_client
+    ):
+        mock_executor.return_value = {"success": True, "order": {}}
+        orchestrator._trade_pair_tracker = MagicMock(cohort_id="c1")
+        orchestrator.write_behind = MagicMock()
+        state = orchestrator.symbols["BTCUSDT"]
+        state.hold_quantity = 0.002
+
+        orchestrator._market_sell_position(state)
+
+        orchestrator._trade_pair_tracker.close_pairs_by_symbol.assert_not_called()
+        kind, payload = orchestrator.write_behind.submit.call_args.args
+        assert kind == "pair_close_symbol"
+        assert payload["cohort_id"] == "c1"
+        assert payload["symbol"] == "BTCUSDT"
+        assert payload["exit_price"] == 50000.0
+        assert payload["exit_reason"] == "cash_exit"
+
+    @patch("src.risk.stop_loss_executor.execute_stop_loss_sell")
+    def test_market_sell_closes_pairs_directly_without_write_behind(
+        self, mock_executor, orchestrator, mock_client
+    ):
+        mock_executor.return_value = {"success": True, "order": {}}
+        orchestrator._trade_pair_tracker = MagicMock(cohort_id="c1")
+        state = orchestrator.symbols["BTCUSDT"]
+        state.hold_quantity = 0.002
+
+        orchestrator._market_sell_position(state)
+
+        orchestrator._trade_pair_tracker.close_pairs_by_symbol.assert_called_once_with(
+            "BTCUSDT", 50000.0, 0.002, "cash_exit"
+        )
+
 
 # ------------------------------------------------------------------
 # Transitions
@@ -473,6 +524,29 @@ class TestStatePersistence:
         orchestrator.load_state()
         assert "ETHUSDT" not in orchestrator.symbols
 
+    def test_save_state_skips_when_unchanged(self, orchestrator, tmp_path):
+        orchestrator.state_file = tmp_path / "hybrid_state.json"
+        orchestrator.save_state()
+        orchestrator.state_file.unlink()
+
+        orchestrator.save_state()
+        assert not orchestrator.state_file.exists()
+
+        orchestrator.symbols["BTCUSDT"].hold_quantity = 0.5
+        orchestrator.save_state()
+        assert orchestrator.state_file.exists()
+
+    def test_symbol_state_version_only_bumps_on_change(self):
+        state = SymbolState("BTCUSDT")
+        version = state.version
+
+        state.hold_quantity = 0.0
+        state.grid_init_failures = 2
+        assert state.version == version
+
+        state.hold_quantity = 1.0
+        assert state.version > version
+
 
 # ------------------------------------------------------------------
 # Stop loss updates
@@ -506,6 +580,22 @@ class TestStopLossUpdates:
         mock_stop.confirm_trigger.assert_called_once()
         assert orchestrator.symbols["BTCUSDT"].hold_quantity == 0.0
 
+    @patch("src.risk.stop_loss_executor.execute_stop_loss_sell")
+    def test_stop_sell_invalidates_balance_ledger(self, mock_executor, orchestrator, mock_client):
+        from src.core.balance_ledger import get_balance_ledger
+
+        mock_executor.return_value = {"success": True, "order": {}}
+        ledger = get_balance_ledger(mock_client)
+        mock_client.get_account_balance.return_value = 100.0
+        ledger.balance("USDT")
+        mock_stop = MagicMock(symbol="BTCUSDT", triggered_price=45000.0, quantity=0.001)
+        orchestrator.stop_loss_manager.update_all.return_value = [mock_stop]
+
+        orchestrator._update_stop_losses()
+        mock_client.get_account_balance.return_value = 145.0
+
+        assert ledger.balance("USDT") == 145.0
+
     def test_update_stop_losses_skips_zero_price(self, orchestrator, mock_client):
         mock_client.get_current_price.return_value = 0.0
         orchestrator.stop_loss_manager.update_all.return_value = []
@@ -0,0 +1,127 @@
+"""Tests for the query-plan index advisor."""
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from src.data import index_advisor
+from src.data.index_advisor import (
+    CANDIDATE_INDEXES,
+    CaseResult,
+    PlanStats,
+    QueryCase,
+    apply_indexes,
+    format_report,
+    query_cases,
+    summarize_plan,
+)
+
+INIT_SQL = Path(__file__).resolve().parents[1] / "docker" / "init.sql"
+
+EXPLAIN_JSON = [
+    {
+        "Plan": {
+            "Node Type": "Limit",
+            "Plans": [
+                {
+                    "Node Type": "Index Scan",
+                    "Index Name": "idx_trades_evaluated",
+                    "Plans": [{"Node Type": "Bitmap Index Scan", "Index Name": "idx_trades_fg"}],
+                }
+            ],
+        },
+        "Planning Time": 0.2,
+        "Execution Time": 1.5,
+    }
+]
+
+
+def _stats(ms, indexes=()):
+    return PlanStats(
+        execution_ms=ms, planning_ms=0.1, node_type="Seq Scan", indexes_used=set(indexes)
+    )
+
+
+class TestPlanSummary:
+    def test_collects_nested_indexes_and_times(self):
+        stats = summarize_plan(EXPLAIN_JSON)
+
+        assert stats.execution_ms == 1.5
+        assert stats.planning_ms == 0.2
+        assert stats.node_type == "Limit"
+        assert stats.indexes_used == {"idx_trades_evaluated", "idx_trades_fg"}
+
+    def test_justified_requires_use_and_speedup(self):
+        case = QueryCase("q", "SELECT 1", indexes=("idx_a", "idx_b"))
+
+        fast = CaseResult(case, _stats(100), _stats(2, ["idx_a"]))
+        marginal = CaseResult(case, _stats(10), _stats(9, ["idx_a"]))
+
+        assert fast.justified == {"idx_a"}
+        assert marginal.justified == set()
+
+    def test_report_marks_justified_candidates(self):
+        case = QueryCase("similar_situations", "SELECT 1", indexes=("idx_trades_evaluated",))
+        report = format_report([CaseResult(case, _stats(80), _stats(4, ["idx_trades_evaluated"]))])
+
+        assert "similar_situations" in report
+        assert "20.0x" in report
+        assert "✓ CREATE INDEX IF NOT EXISTS idx_trades_evaluated" in report
+        assert "✗ CREATE INDEX IF NOT EXISTS idx_pairs_exit_trade" in report
+
+
+class TestQueryCases:
+    def test_uses_application_sql(self):
+        from src.core.cycle_manager import DAILY_RETURNS_QUERY
+        from src.data.memory import SIMILAR_SITUATIONS_QUERY
+
+        cases = {case.name: case for case in query_cases("cycle-1")}
+
+        assert cases["similar_situations"].sql is SIMILAR_SITUATIONS_QUERY
+        assert cases["cycle_daily_returns"].sql is DAILY_RETURNS_QUERY
+        assert cases["cycle_daily_returns"].params == ("cycle-1",)
+        assert "outcome_7d IS NULL" in cases["pending_outcomes_7d"].sql
+        assert "tp.exit_trade_id = t.id" in cases["evaluate_exit_decisions"].sql
+
+    def test_every_case_index_is_a_candidate(self):
+        names = {c.name for c in CANDIDATE_INDEXES}
+
+        for case in query_cases("cycle-1"):
+            assert set(case.indexes) <= names
+
+    def test_candidates_ship_in_init_sql(self):
+        schema = INIT_SQL.read_text()
+
+        for candidate in CANDIDATE_INDEXES:
+            assert candidate.ddl in schema
+
+
+class TestBenchmarkRun:
+    def test_rolls_back_and_measures_with_and_without(self, monkeypatch):
+        conn = MagicMock()
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.fetchone.side_effect = lambda: [EXPLAIN_JSON]
+        monkeypatch.setattr(index_advisor, "seed_synthetic_data", lambda *a: "cycle-1")
+
+        results = index_advisor.run_benchmark(conn, trades=10)
+
+        statements = [c.args[0] for c in cur.execute.call_args_list]
+        assert "DROP INDEX IF EXISTS idx_trades_evaluated" in statements
+        assert CANDIDATE_INDEXES[0].ddl in statements
+        assert statements.index("DROP INDEX IF EXISTS idx_trades_evaluated") < statements.index(
+            CANDIDATE_INDEXES[0].ddl
+        )
+        assert len(results) == len(query_cases("cycle-1"))
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+
+    def test_apply_uses_concurrent_ddl_and_restores_autocommit(self):
+        conn = MagicMock(autocommit=False)
+        cur = conn.cursor.return_value.__enter__.return_value
+
+        applied = apply_indexes(conn, {"idx_pairs_entry_trade"})
+
+        assert applied == ["idx_pairs_entry_trade"]
+        cur.execute.assert_called_once_with(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_pairs_entry_trade ON trade_pairs(entry_trade_id)"
+        )
+        assert conn.autocommit is False
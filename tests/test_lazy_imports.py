@@ -0,0 +1,93 @@
+"""Tests for deferred imports and the import-time benchmark."""
+
+import importlib
+import logging
+import sys
+from logging.handlers import RotatingFileHandler
+
+import pytest
+
+from src.utils.import_benchmark import parse_importtime, profile_import
+from src.utils.lazy import lazy_task, preload
+
+
+class TestLazyTask:
+    def test_imports_on_first_call(self, monkeypatch):
+        monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+
+        task = lazy_task("colorsys:rgb_to_hsv")
+
+        assert "colorsys" not in sys.modules
+        assert task(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+        assert "colorsys" in sys.modules
+        assert task.__name__ == "rgb_to_hsv"
+
+    def test_missing_module_fails_at_registration(self):
+        with pytest.raises(ImportError):
+            lazy_task("src.tasks.does_not_exist:task_x")
+        with pytest.raises(ValueError):
+            lazy_task("src.tasks.system_tasks")
+
+    def test_preload(self, monkeypatch):
+        monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+
+        preload([lazy_task("colorsys:rgb_to_hsv"), print])
+
+        assert "colorsys" in sys.modules
+
+    def test_scheduler_targets_resolve(self):
+        scheduler = importlib.import_module("docker.scheduler")
+        tasks = [v for v in vars(scheduler).values() if hasattr(v, "lazy_target")]
+
+        assert len(tasks) > 40
+        for task in tasks:
+            module_name, _, attr = task.lazy_target.partition(":")
+            assert callable(getattr(importlib.import_module(module_name), attr))
+
+
+class TestColdImports:
+    @pytest.mark.parametrize(
+        "module",
+        [
+            "docker.scheduler",
+            "main",
+            "src.core.cohort_orchestrator",
+            "src.notifications.charts",
+            "src.analysis.regime_detection",
+            "src.analysis.technical_indicators",
+            "src.optimization.ab_testing",
+        ],
+    )
+    def test_no_heavy_dependencies_at_import(self, module):
+        profile = profile_import(module, top=1)
+
+        assert profile.heavy_loaded == []
+        assert profile.total_ms > 0
+
+    def test_parse_importtime(self):
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   json.decoder\n"
+            "import time:       300 |       1500 | json\n"
+        )
+
+        assert parse_importtime(stderr) == {"json.decoder": (0.12, 0.12), "json": (0.3, 1.5)}
+
+
+class TestLoggingSetup:
+    def test_setup_logging_is_idempotent(self, tmp_path, monkeypatch):
+        from src.core.bot import setup_logging
+
+        monkeypatch.chdir(tmp_path)
+        logger = logging.getLogger("trading_bot")
+        before = list(logger.handlers)
+        try:
+            setup_logging()
+            setup_logging()
+
+            assert sum(isinstance(h, RotatingFileHandler) for h in logger.handlers) == 1
+        finally:
+            for handler in logger.handlers[:]:
+                if handler not in before:
+                    logger.removeHandler(handler)
+                    handler.close()
@@ -0,0 +1,199 @@
+"""Tests for the live state snapshot and the consolidated cohort dashboard."""
+
+import json
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+from src.core.live_snapshot import LiveSnapshotPublisher, read_snapshot, snapshot_grid_states
+from src.data.cohort_metrics import CohortMetrics, fetch_cohort_metrics
+
+COHORTS = {
+    "balanced": {
+        "current_mode": "GRID",
+        "config": {"total_investment": 1000},
+        "symbols": {"BTCUSDT": {"symbol": "BTCUSDT", "allocation_usd": 400}},
+        "grid_orders": {
+            "BTCUSDT": {
+                "1": {"type": "BUY", "price": 49000, "quantity": 0.002, "created_at": None},
+                "2": {"type": "SELL", "price": 51000, "quantity": 0.002, "created_at": None},
+            }
+        },
+        "prices": {"BTCUSDT": 50000.0},
+    }
+}
+
+
+class TestLiveSnapshot:
+    def test_publish_read_roundtrip(self, tmp_path):
+        path = tmp_path / "snap.json"
+        publisher = LiveSnapshotPublisher(path)
+
+        assert publisher.publish(COHORTS)
+        snapshot = read_snapshot(path)
+
+        assert snapshot["version"] == 1
+        assert snapshot["cohorts"] == COHORTS
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_missing_or_stale_returns_none(self, tmp_path):
+        path = tmp_path / "snap.json"
+        assert read_snapshot(path) is None
+
+        path.write_text(json.dumps({"published_at": time.time() - 600, "cohorts": {}}))
+        assert read_snapshot(path, max_age=300) is None
+
+    def test_parsed_once_per_version(self, tmp_path):
+        path = tmp_path / "snap.json"
+        publisher = LiveSnapshotPublisher(path)
+        publisher.publish(COHORTS)
+
+        with patch("src.core.live_snapshot.json.load", wraps=json.load) as load:
+            read_snapshot(path)
+            read_snapshot(path)
+            assert load.call_count <= 1
+
+            publisher.publish({})
+            os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+            assert read_snapshot(path)["cohorts"] == {}
+
+    def test_clear_removes_snapshot(self, tmp_path):
+        path = tmp_path / "snap.json"
+        publisher = LiveSnapshotPublisher(path)
+        publisher.publish(COHORTS)
+
+        publisher.clear()
+
+        assert read_snapshot(path) is None
+
+    def test_grid_states_shape(self):
+        states = snapshot_grid_states({"cohorts": COHORTS})
+
+        assert set(states) == {"balanced:BTCUSDT"}
+        assert states["balanced:BTCUSDT"]["active_orders"]["2"]["type"] == "SELL"
+
+    def test_cohort_orchestrator_publishes_after_tick(self, reset_new_singletons):
+        from src.core.cohort_orchestrator import CohortOrchestrator
+
+        co = CohortOrchestrator(client=MagicMock())
+        orch = MagicMock(state_store=None)
+        orch.live_state.return_value = {"current_mode": "GRID", "symbols": {}}
+        co.orchestrators = {"balanced": orch}
+        co.cohort_configs = {"balanced": {"grid_range_pct": 3.0}}
+
+        co.tick()
+
+        cohorts = read_snapshot()["cohorts"]
+        assert cohorts["balanced"]["cohort_config"] == {"grid_range_pct": 3.0}
+
+
+class TestCohortMetrics:
+    def test_from_row_parses_json_and_rates(self):
+        row = (
+            "c1",
+            "balanced",
+            1000,
+            1050,
+            '{"grid_range_pct": 3}',
+            50.0,
+            4,
+            3,
+            '{"BTCUSDT": {"cost_basis": 100, "total_qty": 0.002}}',
+        )
+
+        metrics = CohortMetrics.from_row(row)
+
+        assert metrics.config == {"grid_range_pct": 3}
+        assert metrics.open_pairs["BTCUSDT"]["total_qty"] == 0.002
+        assert metrics.win_rate == 75.0
+        assert metrics.pnl_pct == 5.0
+
+    def test_single_query(self):
+        conn = MagicMock()
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.fetchall.return_value = [
+            ("c1", "a", 1000, 1000, {}, 10, 1, 1, {}),
+            ("c2", "b", 1000, 1000, {}, 0, 0, 0, {}),
+        ]
+
+        result = fetch_cohort_metrics(conn)
+
+        assert set(result) == {"a", "b"}
+        cur.execute.assert_called_once()
+
+    def test_error_returns_empty(self):
+        conn = MagicMock()
+        conn.cursor.return_value.__enter__.return_value.execute.side_effect = RuntimeError("x")
+
+        assert fetch_cohort_metrics(conn) == {}
+        conn.rollback.assert_called_once()
+
+
+class TestCohortDashboard:
+    def _metrics(self):
+        return {
+            "balanced": CohortMetrics(
+                id="c1",
+                name="balanced",
+                starting_capital=1000,
+                current_capital=1000,
+                config={"grid_range_pct": 3},
+                realized_pnl=12.5,
+                trade_count=3,
+                wins=2,
+                open_pairs={"BTCUSDT": {"cost_basis": 100.0, "total_qty": 0.002}},
+            ),
+            "aggressive": CohortMetrics(
+                id="c2",
+                name="aggressive",
+                starting_capital=1000,
+                current_capital=1000,
+                config={},
+                realized_pnl=-5.0,
+                trade_count=2,
+                wins=0,
+            ),
+        }
+
+    def test_status_from_snapshot_without_exchange_calls(self):
+        from src.tasks import reporting_tasks
+
+        LiveSnapshotPublisher().publish(COHORTS)
+
+        with (
+            patch.object(reporting_tasks, "_load_cohort_metrics", return_value=self._metrics()),
+            patch.object(reporting_tasks, "_get_report_client") as get_client,
+        ):
+            report = reporting_tasks._build_cohort_status()
+
+        get_client.assert_not_called()
+        assert "BALANCED" in report
+        assert "1B/1S" in report
+        assert "12.50$" in report
+
+    def test_status_falls_back_to_client_for_missing_price(self):
+        from src.tasks import reporting_tasks
+
+        cohorts = {"balanced": {**COHORTS["balanced"], "prices": {}}}
+        LiveSnapshotPublisher().publish(cohorts)
+        client = MagicMock()
+        client.get_current_price.return_value = 50000.0
+
+        with (
+            patch.object(reporting_tasks, "_load_cohort_metrics", return_value={}),
+            patch.object(reporting_tasks, "_get_report_client", return_value=client),
+        ):
+            report = reporting_tasks._build_cohort_status()
+
+        client.get_current_price.assert_called_once_with("BTCUSDT")
+        client.get_open_orders.assert_not_called()
+        assert "1B/1S" in report
+
+    def test_comparison_ranks_by_pnl_pct(self):
+        from src.tasks import reporting_tasks
+
+        with patch.object(reporting_tasks, "_load_cohort_metrics", return_value=self._metrics()):
+            report = reporting_tasks._build_cohort_comparison()
+
+        assert report.index("balanced") < report.index("aggressive")
+        assert "Spread: 1.8pp" in report
@@ -61,6 +61,41 @@ class TestMarketDataProvider:
         assert mock_get.call_count == 1
         assert price1 == price2
 
+    @patch("src.api.http_client.HTTPClient.get")
+    def test_get_prices_bulk(self, mock_get, reset_new_singletons, sample_btc_price_response):
+        """Mehrere Preise mit einem Request, Cache-Treffer werden nicht erneut geholt"""
+        from src.data.market_data import get_market_data
+
+        provider = get_market_data()
+        mock_get.return_value = sample_btc_price_response
+        provider.get_price("BTCUSDT")
+
+        mock_get.return_value = [
+            {"symbol": "ETHUSDT", "price": "3000.0"},
+            {"symbol": "SOLUSDT", "price": "0.0"},
+        ]
+        prices = provider.get_prices(["BTCUSDT", "ETHUSDT", "SOLUSDT"])
+
+        assert prices == {"BTCUSDT": 42500.50, "ETHUSDT": 3000.0}
+        assert mock_get.call_count == 2
+        assert mock_get.call_args.kwargs["params"] == {"symbols": '["ETHUSDT","SOLUSDT"]'}
+
+    @patch("src.api.http_client.HTTPClient.get")
+    def test_get_prices_falls_back_per_symbol(self, mock_get, reset_new_singletons):
+        """Fehlerhafter Sammel-Request: Preise einzeln nachladen"""
+        from src.api.http_client import HTTPClientError
+        from src.data.market_data import get_market_data
+
+        mock_get.side_effect = [
+            HTTPClientError("Invalid symbol"),
+            {"symbol": "BTCUSDT", "price": "42000"},
+            HTTPClientError("Invalid symbol"),
+        ]
+
+        prices = get_market_data().get_prices(["BTCUSDT", "FOOUSDT"])
+
+        assert prices == {"BTCUSDT": 42000.0}
+
     @patch("src.api.http_client.HTTPClient.get")
     def test_get_24h_ticker(self, mock_get, reset_new_singletons, sample_ticker_24h_response):
         """Testet 24h Ticker Abruf"""
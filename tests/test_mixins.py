@@ -145,6 +145,28 @@ class TestRiskGuardMixin:
 
         mock_sell.assert_called_once()
 
+    @patch("src.risk.stop_loss_executor.execute_stop_loss_sell")
+    def test_check_stop_losses_invalidates_balance_ledger(self, mock_sell, bot_with_strategy):
+        bot = bot_with_strategy
+        mock_sell.return_value = {"success": True, "order": {"orderId": 1}}
+        bot.client.get_account_balance.return_value = 100.0
+        bot.balance_ledger.balance("USDT")
+
+        from src.risk.stop_loss import StopType
+
+        bot.stop_loss_manager.create_stop(
+            symbol="BTCUSDT",
+            entry_price=50000.0,
+            quantity=0.001,
+            stop_type=StopType.FIXED,
+            stop_percentage=5.0,
+        )
+
+        bot._check_stop_losses(47000.0)
+        bot.client.get_account_balance.return_value = 147.0
+
+        assert bot.balance_ledger.balance("USDT") == 147.0
+
     @patch("src.risk.stop_loss_executor.execute_stop_loss_sell")
     def test_check_stop_losses_reactivate_on_failure(self, mock_sell, bot_with_strategy):
         bot = bot_with_strategy
@@ -452,3 +474,35 @@ class TestStateManagerMixin:
         bot.save_state()
 
         assert not (tmp_path / "test_state.tmp").exists()
+
+    def test_save_state_skips_when_orders_unchanged(self, bot_with_strategy, tmp_path):
+        bot = bot_with_strategy
+        bot.state_file = tmp_path / "test_state.json"
+        bot.active_orders = {100: {"type": "BUY", "price": 48750.0}}
+
+        bot.save_state()
+        bot.state_file.unlink()
+        bot.save_state()
+        assert not bot.state_file.exists()
+
+        bot.save_state(force=True)
+        assert bot.state_file.exists()
+
+    def test_save_state_after_mutation(self, bot_with_strategy, tmp_path):
+        bot = bot_with_strategy
+        bot.state_file = tmp_path / "test_state.json"
+        bot.active_orders = {100: {"type": "BUY", "price": 48750.0}}
+        bot.save_state()
+
+        bot.active_orders[100]["retry_count"] = 1
+        bot.active_orders.touch()
+        bot.save_state()
+
+        with open(bot.state_file) as f:
+            assert json.load(f)["active_orders"]["100"]["retry_count"] == 1
+
+        del bot.active_orders[100]
+        bot.save_state()
+
+        with open(bot.state_file) as f:
+            assert json.load(f)["active_orders"] == {}
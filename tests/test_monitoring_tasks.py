@@ -74,6 +74,29 @@ class TestLoadGridStates:
 
         assert result == {}
 
+    def test_prefers_live_snapshot(self, tmp_path):
+        from src.core.live_snapshot import LiveSnapshotPublisher
+        from src.tasks.monitoring_tasks import _load_grid_states, _load_hybrid_states
+
+        state = _grid_state("BTCUSDT", {"123": {"type": "BUY", "price": "50000"}})
+        _write_state(tmp_path, "grid_state_BTCUSDT_conservative.json", state)
+        LiveSnapshotPublisher().publish(
+            {
+                "balanced": {
+                    "symbols": {"ETHUSDT": {"allocation_usd": 100}},
+                    "grid_orders": {"ETHUSDT": {"7": {"type": "SELL", "failed_followup": True}}},
+                }
+            }
+        )
+
+        with patch("src.tasks.monitoring_tasks.CONFIG_DIR", tmp_path / "config"):
+            grid_states = _load_grid_states()
+            hybrid_states = _load_hybrid_states()
+
+        assert set(grid_states) == {"balanced:ETHUSDT"}
+        assert grid_states["balanced:ETHUSDT"]["active_orders"]["7"]["failed_followup"]
+        assert set(hybrid_states) == {"balanced"}
+
 
 # ═══════════════════════════════════════════════════════════════
 # task_reconcile_orders
@@ -95,16 +118,17 @@ class TestTaskReconcileOrders:
         _write_state(tmp_path, "grid_state_BTCUSDT_conservative.json", state)
 
         mock_client = MagicMock()
-        mock_client.get_open_orders.return_value = [
-            {"orderId": 111},
-            {"orderId": 222},
+        mock_client.get_all_open_orders.return_value = [
+            {"symbol": "BTCUSDT", "orderId": 111},
+            {"symbol": "BTCUSDT", "orderId": 222},
         ]
         mock_client_fn.return_value = mock_client
 
         with patch("src.tasks.monitoring_tasks.CONFIG_DIR", tmp_path / "config"):
             task_reconcile_orders()
 
-        mock_client.get_open_orders.assert_called_once_with("BTCUSDT")
+        mock_client.get_all_open_orders.assert_called_once_with()
+        mock_client.get_open_orders.assert_not_called()
 
     @patch("src.notifications.telegram_service.get_telegram")
     @patch("src.tasks.monitoring_tasks._get_binance_client")
@@ -122,7 +146,7 @@ class TestTaskReconcileOrders:
 
         mock_client = MagicMock()
         # Only order 111 exists on Binance, 222 is orphan
-        mock_client.get_open_orders.return_value = [{"orderId": 111}]
+        mock_client.get_all_open_orders.return_value = [{"symbol": "BTCUSDT", "orderId": 111}]
         mock_client_fn.return_value = mock_client
 
         mock_telegram = MagicMock()
@@ -136,6 +160,20 @@ class TestTaskReconcileOrders:
         assert "Orphans" in call_msg
         assert "1" in call_msg
 
+    @patch("src.notifications.telegram_service.get_telegram")
+    @patch("src.tasks.monitoring_tasks._get_binance_client")
+    def test_exchange_error_skips_without_alert(self, mock_client_fn, mock_tg_fn, tmp_path):
+        from src.tasks.monitoring_tasks import task_reconcile_orders
+
+        state = _grid_state("BTCUSDT", {"111": {"type": "BUY"}})
+        _write_state(tmp_path, "grid_state_BTCUSDT_conservative.json", state)
+        mock_client_fn.return_value.get_all_open_orders.return_value = None
+
+        with patch("src.tasks.monitoring_tasks.CONFIG_DIR", tmp_path / "config"):
+            task_reconcile_orders()
+
+        mock_tg_fn.return_value.send.assert_not_called()
+
     def test_no_state_files(self, tmp_path):
         from src.tasks.monitoring_tasks import task_reconcile_orders
 
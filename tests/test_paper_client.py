@@ -122,6 +122,18 @@ class TestPaperBinanceClient:
         assert len(orders) == 2
         assert all(o["status"] == "NEW" for o in orders)
 
+    @patch("src.api.paper_client.PaperBinanceClient._fetch_mainnet_price")
+    def test_get_all_open_orders(self, mock_price, tmp_path):
+        """Should return NEW orders across symbols."""
+        mock_price.return_value = 50000.0
+
+        client = self._make_client(1000.0, tmp_path)
+        client.place_limit_buy("BTCUSDT", 0.005, 40000.0)
+        client.place_limit_buy("ETHUSDT", 0.05, 1000.0)
+
+        orders = client.get_all_open_orders()
+        assert {o["symbol"] for o in orders} == {"BTCUSDT", "ETHUSDT"}
+
     @patch("src.api.paper_client.PaperBinanceClient._fetch_mainnet_price")
     def test_order_matching_on_price_check(self, mock_price, tmp_path):
         """Orders should fill when price moves past limit."""
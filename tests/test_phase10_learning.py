@@ -11,6 +11,8 @@ Covers:
 
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 # ═══════════════════════════════════════════════════════════════
 # Helpers
 # ═══════════════════════════════════════════════════════════════
@@ -123,7 +125,7 @@ class TestOutcomeTimeframes:
         task_update_outcomes_1h()
 
         select_sql = cur.execute.call_args_list[0][0][0]
-        assert "1 hours" in select_sql
+        assert cur.execute.call_args_list[0][0][1] == (1, 2)
         assert "outcome_1h" in select_sql
         conn.commit.assert_called_once()
 
@@ -142,7 +144,7 @@ class TestOutcomeTimeframes:
 
         task_update_outcomes_4h()
         select_sql = cur.execute.call_args_list[0][0][0]
-        assert "4 hours" in select_sql
+        assert cur.execute.call_args_list[0][0][1] == (4, 5)
         assert "outcome_4h" in select_sql
 
     @patch("src.tasks.system_tasks.get_db_connection")
@@ -159,7 +161,7 @@ class TestOutcomeTimeframes:
 
         task_update_outcomes_7d()
         select_sql = cur.execute.call_args_list[0][0][0]
-        assert "168 hours" in select_sql
+        assert cur.execute.call_args_list[0][0][1] == (168, 169)
         assert "outcome_7d" in select_sql
 
     @patch("src.tasks.system_tasks.get_db_connection")
@@ -274,33 +276,37 @@ class TestPlaybookSignalAccuracy:
     def test_analyze_signal_accuracy_with_data(self):
         pb = self._make_playbook()
 
-        cur = MagicMock()
-        call_count = [0]
+        def row(signal, regime, total, correct, sum_strength=0.0):
+            return {
+                "signal": signal,
+                "regime": regime,
+                "total": total,
+                "correct": correct,
+                "sum_strength": sum_strength,
+            }
 
-        def fake_fetchone():
-            call_count[0] += 1
-            # First 9 calls: per-signal queries
-            if call_count[0] <= 9:
-                if call_count[0] == 1:  # fear_greed_signal
-                    return {"total": 100, "correct": 68, "avg_strength": 0.45}
-                elif call_count[0] == 2:  # rsi_signal
-                    return {"total": 90, "correct": 55, "avg_strength": 0.52}
-                else:
-                    return {"total": 3, "correct": 1, "avg_strength": 0.3}  # below threshold
-            elif call_count[0] == 10:  # overall
-                return {"total": 200, "correct": 120}
-            else:  # per-regime (3 calls)
-                return {"total": 60, "correct": 35}
-
-        cur.fetchone = fake_fetchone
+        cur = MagicMock()
+        # Grouped rows from signal_rollup_daily (signal x regime)
+        cur.fetchall.return_value = [
+            row("fear_greed_signal", "BULL", 60, 40, 27.0),
+            row("fear_greed_signal", "BEAR", 40, 28, 18.0),
+            row("rsi_signal", "", 90, 55, 46.8),
+            row("macd_signal", "BULL", 3, 1, 0.9),  # below threshold
+            row("overall", "BULL", 60, 35),
+            row("overall", "BEAR", 60, 35),
+            row("overall", "", 80, 50),
+        ]
 
         result = pb._analyze_signal_accuracy(cur)
 
+        cur.execute.assert_called_once()
         assert result["overall_total"] == 200
         assert result["overall_accuracy"] == 60.0
         assert len(result["signals"]) == 2  # Only F&G and RSI meet threshold
         assert result["signals"][0]["signal"] == "Fear & Greed"  # Sorted by accuracy desc
         assert result["signals"][0]["accuracy"] == 68.0
+        assert result["signals"][0]["avg_strength"] == 0.45
+        assert set(result["regime_accuracy"]) == {"BULL", "BEAR"}
 
     def test_analyze_signal_accuracy_no_data(self):
         pb = self._make_playbook()
@@ -452,23 +458,37 @@ class TestPlaybookRegimeStratification:
     def test_fear_greed_patterns_include_regime(self):
         pb = self._make_playbook()
 
-        cur = MagicMock()
-        call_count = [0]
-
-        def fake_fetchone():
-            call_count[0] += 1
-            # Return above threshold for some combos
-            if call_count[0] % 7 == 1:
-                return {"trades": 10, "wins": 7, "avg_return": 2.5, "volatility": 1.0}
-            return {"trades": 2, "wins": 1, "avg_return": 0.5, "volatility": 0.5}
+        def row(bucket, action, regime, wins, returns):
+            return {
+                "bucket": bucket,
+                "action": action,
+                "regime": regime,
+                "trades": len(returns),
+                "wins": wins,
+                "sum_return": sum(returns),
+                "sumsq_return": sum(r * r for r in returns),
+            }
 
-        cur.fetchone = fake_fetchone
+        cur = MagicMock()
+        # One grouped query over trade_rollup_daily (bucket = fear_greed / 20)
+        cur.fetchall.return_value = [
+            row(1, "BUY", "BULL", 4, [1.0, 2.0, 3.0, 4.0, 5.0]),
+            row(1, "BUY", "BEAR", 1, [-1.0, 0.0, 1.0]),
+        ]
 
         patterns = pb._analyze_fear_greed_patterns(cur)
 
+        cur.execute.assert_called_once()
         for p in patterns:
             assert "regime" in p
             assert p["regime"] in ["BULL", "BEAR", "SIDEWAYS", "ALL"]
+        by_regime = {p["regime"]: p for p in patterns}
+        assert set(by_regime) == {"BULL", "ALL"}  # BEAR below threshold
+        assert by_regime["BULL"]["range"] == "Fear"
+        assert by_regime["BULL"]["avg_return"] == 3.0
+        assert by_regime["BULL"]["volatility"] == pytest.approx(2.5**0.5)
+        assert by_regime["ALL"]["trades"] == 8
+        assert by_regime["ALL"]["success_rate"] == 62.5
 
     def test_anti_patterns_stratified_by_regime(self):
         pb = self._make_playbook()
@@ -269,6 +269,78 @@ class TestIndexHoldingsTier:
         total = tier.get_total_value()
         assert total == 0.1 * 50000 + 2.0 * 3000  # 5000 + 6000 = 11000
 
+    def _loaded_tier(self):
+        from src.portfolio.tiers.index_holdings import IndexHoldingsTier
+
+        conn = MagicMock()
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.fetchall.return_value = [
+            {
+                "symbol": symbol,
+                "target_weight_pct": 50,
+                "current_weight_pct": 0,
+                "quantity": qty,
+                "avg_entry_price": price,
+                "current_price": price,
+                "trailing_stop_price": price * 0.85,
+                "highest_price": price,
+                "market_cap_rank": rank,
+            }
+            for rank, (symbol, qty, price) in enumerate(
+                [("BTCUSDT", 0.1, 50000.0), ("ETHUSDT", 2.0, 3000.0), ("SOLUSDT", 0.0, 100.0)],
+                start=1,
+            )
+        ]
+        tier = IndexHoldingsTier(MagicMock(), conn=conn)
+        tier.load_holdings()
+        return tier, conn
+
+    def test_vectorized_trailing_stops_across_symbols(self):
+        tier, _ = self._loaded_tier()
+
+        changed = tier.update_prices({"BTCUSDT": 60000.0, "ETHUSDT": 2500.0, "SOLUSDT": 10.0})
+        triggered = tier.update_trailing_stops()
+
+        assert changed == 3
+        # SOL has no quantity and never triggers
+        assert triggered == ["ETHUSDT"]
+        btc = tier._holdings["BTCUSDT"]
+        assert btc.highest_price == 60000.0
+        assert btc.trailing_stop_price == 60000.0 * 0.85
+        assert tier.get_total_value() == 0.1 * 60000 + 2.0 * 2500
+
+    def test_save_persists_only_changed_rows_in_one_batch(self):
+        tier, conn = self._loaded_tier()
+
+        with patch("src.portfolio.tiers.index_holdings.execute_values") as mock_ev:
+            tier.save_holdings()
+            mock_ev.assert_not_called()
+
+            tier.update_prices({"BTCUSDT": 50000.0, "ETHUSDT": 3100.0})
+            tier.update_trailing_stops()
+            tier.save_holdings()
+
+        mock_ev.assert_called_once()
+        rows = mock_ev.call_args.args[2]
+        assert [r[0] for r in rows] == ["ETHUSDT"]
+        assert rows[0][5] == 3100.0
+        assert rows[0][7] == 3100.0
+        conn.commit.assert_called_once()
+
+    def test_rebalance_sells_holdings_outside_target(self):
+        tier, _ = self._loaded_tier()
+
+        orders = tier.calculate_rebalance_orders(
+            [{"symbol": "BTCUSDT", "weight_pct": 60}, {"symbol": "ADAUSDT", "weight_pct": 40}],
+            available_capital=10000.0,
+        )
+
+        assert orders == [
+            {"symbol": "BTCUSDT", "action": "BUY", "amount_usd": 1000.0},
+            {"symbol": "ADAUSDT", "action": "BUY", "amount_usd": 4000.0},
+            {"symbol": "ETHUSDT", "action": "SELL", "amount_usd": 6000.0},
+        ]
+
 
 # ═══════════════════════════════════════════════════════════════
 # 11.5: Trading Tier
@@ -80,6 +80,32 @@ class TestMainHybrid:
 
         assert exc_info.value.code == 1
 
+    @patch("src.core.cohort_orchestrator.CohortOrchestrator")
+    @patch("src.api.binance_client.BinanceClient")
+    def test_main_stops_recording_on_exit(
+        self, mock_client_cls, mock_co_cls, tmp_path, monkeypatch
+    ):
+        """The replay recorder is flushed and closed when main() exits."""
+        import main_hybrid
+        from src.core import replay
+
+        monkeypatch.setenv("REPLAY_RECORD_PATH", str(tmp_path / "ticks.jsonl"))
+        mock_co_cls.return_value.initialize.return_value = False
+        recorders = []
+        start_recording = replay.start_recording
+
+        def spy(path):
+            recorders.append(start_recording(path))
+            return recorders[-1]
+
+        monkeypatch.setattr(replay, "start_recording", spy)
+
+        with patch("main_hybrid.load_dotenv"), pytest.raises(SystemExit):
+            main_hybrid.main()
+
+        assert replay.get_recorder() is None
+        assert recorders[0]._file.closed
+
 
 # ═══════════════════════════════════════════════════════════════
 # 6.2: Task Locking (B3)
@@ -229,30 +229,30 @@ class TestPortfolioAllocator:
         yield
         PortfolioAllocator.reset_instance()
 
-    @patch("src.portfolio.allocator.psycopg2")
-    def test_singleton_pattern(self, mock_psycopg2):
+    @patch("src.portfolio.allocator.get_pooled_connection")
+    def test_singleton_pattern(self, mock_get_conn):
         """Test dass Singleton-Pattern funktioniert."""
-        mock_psycopg2.connect.return_value = MagicMock()
+        mock_get_conn.return_value = MagicMock()
 
         allocator1 = PortfolioAllocator.get_instance()
         allocator2 = PortfolioAllocator.get_instance()
 
         assert allocator1 is allocator2
 
-    @patch("src.portfolio.allocator.psycopg2")
-    def test_set_constraints(self, mock_psycopg2):
+    @patch("src.portfolio.allocator.get_pooled_connection")
+    def test_set_constraints(self, mock_get_conn):
         """Test Setzen von Constraints."""
-        mock_psycopg2.connect.return_value = MagicMock()
+        mock_get_conn.return_value = MagicMock()
 
         allocator = PortfolioAllocator()
         allocator.set_constraints(AGGRESSIVE_CONSTRAINTS)
 
         assert allocator.constraints.max_per_coin_pct == 15.0
 
-    @patch("src.portfolio.allocator.psycopg2")
-    def test_calculate_allocation_empty_opportunities(self, mock_psycopg2):
+    @patch("src.portfolio.allocator.get_pooled_connection")
+    def test_calculate_allocation_empty_opportunities(self, mock_get_conn):
         """Test Allocation mit leerer Opportunity-Liste."""
-        mock_psycopg2.connect.return_value = MagicMock()
+        mock_get_conn.return_value = MagicMock()
 
         allocator = PortfolioAllocator()
         result = allocator.calculate_allocation(
@@ -264,10 +264,10 @@ class TestPortfolioAllocator:
         assert result.total_allocated == 0.0
         assert result.cash_remaining == 1000.0
 
-    @patch("src.portfolio.allocator.psycopg2")
-    def test_calculate_allocation_basic(self, mock_psycopg2):
+    @patch("src.portfolio.allocator.get_pooled_connection")
+    def test_calculate_allocation_basic(self, mock_get_conn):
         """Test grundlegende Allocation-Berechnung."""
-        mock_psycopg2.connect.return_value = MagicMock()
+        mock_get_conn.return_value = MagicMock()
 
         allocator = PortfolioAllocator()
 
@@ -298,10 +298,10 @@ class TestPortfolioAllocator:
         assert result.total_allocated > 0
         assert result.cash_remaining < 1000.0
 
-    @patch("src.portfolio.allocator.psycopg2")
-    def test_calculate_allocation_respects_min_position(self, mock_psycopg2):
+    @patch("src.portfolio.allocator.get_pooled_connection")
+    def test_calculate_allocation_respects_min_position(self, mock_get_conn):
         """Test dass min Position Size respektiert wird."""
-        mock_psycopg2.connect.return_value = MagicMock()
+        mock_get_conn.return_value = MagicMock()
 
         allocator = PortfolioAllocator()
 
@@ -325,10 +325,10 @@ class TestPortfolioAllocator:
         if "LOWSCORE" in result.rejected:
             assert "too small" in result.rejected["LOWSCORE"].lower()
 
-    @patch("src.portfolio.allocator.psycopg2")
-    def test_min_confidence_filters_low_confidence(self, mock_psycopg2):
+    @patch("src.portfolio.allocator.get_pooled_connection")
+    def test_min_confidence_filters_low_confidence(self, mock_get_conn):
         """Test that min_confidence parameter filters low-confidence coins."""
-        mock_psycopg2.connect.return_value = MagicMock()
+        mock_get_conn.return_value = MagicMock()
 
         allocator = PortfolioAllocator()
 
@@ -366,10 +366,10 @@ class TestPortfolioAllocator:
         )
         assert "BTCUSDT" in result2.allocations
 
-    @patch("src.portfolio.allocator.psycopg2")
-    def test_allowed_categories_filters_coins(self, mock_psycopg2):
+    @patch("src.portfolio.allocator.get_pooled_connection")
+    def test_allowed_categories_filters_coins(self, mock_get_conn):
         """Test that allowed_categories filters out wrong-category coins."""
-        mock_psycopg2.connect.return_value = MagicMock()
+        mock_get_conn.return_value = MagicMock()
 
         allocator = PortfolioAllocator()
 
@@ -415,10 +415,10 @@ class TestPortfolioAllocator:
         )
         assert "BTCUSDT" in result2.allocations
 
-    @patch("src.portfolio.allocator.psycopg2")
-    def test_get_risk_multiplier(self, mock_psycopg2):
+    @patch("src.portfolio.allocator.get_pooled_connection")
+    def test_get_risk_multiplier(self, mock_get_conn):
         """Test Risk Multiplier für Position Sizing."""
-        mock_psycopg2.connect.return_value = MagicMock()
+        mock_get_conn.return_value = MagicMock()
 
         allocator = PortfolioAllocator()
 
@@ -426,10 +426,10 @@ class TestPortfolioAllocator:
         assert allocator._get_risk_multiplier(OpportunityRisk.MEDIUM) == 1.0
         assert allocator._get_risk_multiplier(OpportunityRisk.HIGH) == 0.7
 
-    @patch("src.portfolio.allocator.psycopg2")
-    def test_calculate_rebalance(self, mock_psycopg2):
+    @patch("src.portfolio.allocator.get_pooled_connection")
+    def test_calculate_rebalance(self, mock_get_conn):
         """Test Rebalancing-Berechnung."""
-        mock_psycopg2.connect.return_value = MagicMock()
+        mock_get_conn.return_value = MagicMock()
 
         allocator = PortfolioAllocator()
 
@@ -467,15 +467,15 @@ class TestPortfolioAllocator:
         assert trades["SOLUSDT"]["action"] == "BUY"
         assert trades["SOLUSDT"]["amount"] == 100.0
 
-    @patch("src.portfolio.allocator.psycopg2")
-    def test_get_portfolio_stats_empty(self, mock_psycopg2):
+    @patch("src.portfolio.allocator.get_pooled_connection")
+    def test_get_portfolio_stats_empty(self, mock_get_conn):
         """Test Portfolio Stats bei leerem Portfolio."""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
         mock_cursor.fetchall.return_value = []
         mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
         mock_conn.cursor.return_value.__exit__ = MagicMock()
-        mock_psycopg2.connect.return_value = mock_conn
+        mock_get_conn.return_value = mock_conn
 
         allocator = PortfolioAllocator()
 
@@ -491,10 +491,10 @@ class TestPortfolioAllocator:
 class TestKellyAdjustment:
     """Tests für Kelly Criterion Adjustment."""
 
-    @patch("src.portfolio.allocator.psycopg2")
-    def test_kelly_increases_high_confidence(self, mock_psycopg2):
+    @patch("src.portfolio.allocator.get_pooled_connection")
+    def test_kelly_increases_high_confidence(self, mock_get_conn):
         """Test dass Kelly bei hoher Confidence erhöht."""
-        mock_psycopg2.connect.return_value = MagicMock()
+        mock_get_conn.return_value = MagicMock()
 
         allocator = PortfolioAllocator()
 
@@ -517,10 +517,10 @@ class TestKellyAdjustment:
         # But won't necessarily be > 100 due to half-kelly
         assert "BTCUSDT" in adjusted
 
-    @patch("src.portfolio.allocator.psycopg2")
-    def test_kelly_reduces_low_confidence(self, mock_psycopg2):
+    @patch("src.portfolio.allocator.get_pooled_connection")
+    def test_kelly_reduces_low_confidence(self, mock_get_conn):
         """Test dass Kelly bei niedriger Confidence reduziert."""
-        mock_psycopg2.connect.return_value = MagicMock()
+        mock_get_conn.return_value = MagicMock()
 
         allocator = PortfolioAllocator()
 
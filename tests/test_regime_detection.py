@@ -69,6 +69,54 @@ class TestRegimeDetector:
         assert detector is not None
         assert detector.NUM_STATES == 3
 
+    def test_store_regime_survives_missing_regime_daily(self, reset_new_singletons):
+        """Fehler im regime_daily Upsert verwirft den regime_history Insert nicht"""
+        from unittest.mock import MagicMock
+
+        from src.analysis.regime_detection import MarketRegime, RegimeDetector, RegimeState
+
+        detector = RegimeDetector()
+        detector.conn = MagicMock()
+        cur = detector.conn.cursor.return_value.__enter__.return_value
+
+        def execute(query, params=None):
+            if "INSERT INTO regime_daily" in query:
+                raise RuntimeError('relation "regime_daily" does not exist')
+
+        cur.execute.side_effect = execute
+        state = RegimeState(
+            current_regime=MarketRegime.BULL,
+            regime_probability=0.8,
+            transition_probability=0.1,
+            return_7d=5.0,
+            volatility_7d=2.0,
+            volume_trend=0.1,
+            fear_greed_avg=60.0,
+            model_confidence=0.9,
+            previous_regime=None,
+            regime_duration_days=3,
+        )
+
+        detector.store_regime(state)
+
+        queries = [c.args[0] for c in cur.execute.call_args_list]
+        assert "ROLLBACK TO SAVEPOINT regime_daily_upsert" in queries
+        detector.conn.commit.assert_called_once()
+        detector.conn.rollback.assert_not_called()
+        detector.conn = None
+
+    def test_ensure_regime_daily_table(self):
+        from unittest.mock import MagicMock
+
+        from src.analysis.regime_detection import ensure_regime_daily_table
+
+        conn = MagicMock()
+
+        assert ensure_regime_daily_table(conn)
+        query = conn.cursor.return_value.__enter__.return_value.execute.call_args.args[0]
+        assert "CREATE TABLE IF NOT EXISTS regime_daily" in query
+        conn.commit.assert_called_once()
+
     def test_regime_mapping(self, reset_new_singletons):
         """Test Regime Mapping"""
         from src.analysis.regime_detection import MarketRegime, RegimeDetector
@@ -0,0 +1,258 @@
+"""Tests for the tick recorder and offline replay harness."""
+
+import json
+import math
+import os
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from src.api.paper_client import PaperBinanceClient
+from src.core import replay as replay_module
+from src.core.hybrid_config import HybridConfig
+from src.core.hybrid_orchestrator import HybridOrchestrator
+from src.core.replay import (
+    RecordedTick,
+    Recording,
+    RecordingClient,
+    ReplayClient,
+    ReplayedError,
+    ReplayMismatch,
+    TickRecorder,
+    recorded_input,
+    recorded_tick,
+    replay,
+    virtual_clock,
+)
+
+SYMBOL_INFO = {
+    "min_qty": 0.00001,
+    "max_qty": 9000.0,
+    "step_size": 0.00001,
+    "tick_size": 0.01,
+    "min_notional": 5.0,
+}
+
+
+class OfflinePaperClient(PaperBinanceClient):
+    price = 50000.0
+
+    def _fetch_mainnet_price(self, symbol):
+        return self.price
+
+    def get_symbol_info(self, symbol):
+        return {**SYMBOL_INFO, "symbol": symbol}
+
+
+@pytest.fixture
+def recorder(tmp_path, monkeypatch):
+    recorder = TickRecorder(tmp_path / "recording.jsonl")
+    monkeypatch.setattr(replay_module, "_recorder", recorder)
+    yield recorder
+    recorder.close()
+
+
+def _record_session(tmp_path, monkeypatch, recorder, ticks=40):
+    """Paper-trade a swinging BTC price for ``ticks`` ticks while recording."""
+    monkeypatch.chdir(tmp_path)
+    paper = OfflinePaperClient(initial_usdt=1000, state_dir="paper", cohort_name="rec")
+    orch = HybridOrchestrator(
+        HybridConfig(
+            initial_mode="GRID",
+            num_grids=3,
+            grid_range_percent=5.0,
+            total_investment=400.0,
+            min_position_usd=10.0,
+        ),
+        client=RecordingClient(paper, recorder),
+        cohort_name="rec",
+    )
+    orch.telegram.send = lambda *a, **k: None
+    orch.add_symbol("BTCUSDT", 200.0)
+    for i in range(ticks):
+        paper.price = 50000 * (1 + 0.04 * math.sin(i / 5))
+        orch.tick()
+    recorder.flush()
+    return recorder.path
+
+
+@pytest.fixture(autouse=True)
+def offline_fear_greed(monkeypatch):
+    from src.core.order_manager import OrderManagerMixin
+
+    monkeypatch.setattr(OrderManagerMixin, "_fetch_fear_greed", staticmethod(lambda: 40))
+
+
+class TestRecordReplay:
+    def test_replay_reproduces_recorded_orders(self, tmp_path, monkeypatch, recorder):
+        path = _record_session(tmp_path, monkeypatch, recorder)
+
+        report = replay(path, strict=True)
+
+        assert report.ticks == 40
+        assert report.calls > 40
+        assert report.exact == report.calls
+        assert report.unused == 0
+        assert report.matches
+        assert "identical to recording" in report.summary()
+
+    def test_recording_contains_meta_and_state(self, tmp_path, monkeypatch, recorder):
+        path = _record_session(tmp_path, monkeypatch, recorder, ticks=3)
+
+        recording = Recording.load(path)
+
+        cohort = recording.meta["cohorts"]["rec"]
+        assert cohort["mode"] == "GRID"
+        assert "BTCUSDT" in cohort["symbols"]
+        assert len(recording.ticks) == 3
+        assert recording.ticks[0].calls
+
+    def test_replay_leaves_environment_untouched(self, tmp_path, monkeypatch, recorder):
+        from src.notifications.telegram_service import get_telegram
+
+        path = _record_session(tmp_path, monkeypatch, recorder, ticks=5)
+        monkeypatch.setenv("STATE_BACKEND", "sqlite")
+        monkeypatch.delenv("WRITE_BEHIND", raising=False)
+        telegram_enabled = get_telegram().enabled
+
+        replay(path)
+
+        assert Path.cwd() == tmp_path
+        assert os.environ["STATE_BACKEND"] == "sqlite"
+        assert "WRITE_BEHIND" not in os.environ
+        assert get_telegram().enabled == telegram_enabled
+
+    def test_changed_decisions_are_reported(self, tmp_path, monkeypatch, recorder):
+        path = _record_session(tmp_path, monkeypatch, recorder)
+        lines = path.read_text().splitlines()
+        meta = json.loads(lines[0])
+        meta["cohorts"]["rec"]["symbols"]["BTCUSDT"]["allocation_usd"] = 120.0
+        lines[0] = json.dumps(meta)
+        path.write_text("\n".join(lines) + "\n")
+
+        report = replay(path)
+
+        assert not report.matches
+        assert report.fallback > 0
+
+    def test_tick_limit(self, tmp_path, monkeypatch, recorder):
+        path = _record_session(tmp_path, monkeypatch, recorder, ticks=10)
+
+        assert replay(path, max_ticks=4).ticks == 4
+
+    def test_fear_greed_is_replayed(self, tmp_path, monkeypatch, recorder):
+        path = _record_session(tmp_path, monkeypatch, recorder)
+        calls = [json.loads(line) for line in path.read_text().splitlines()]
+        assert any(c.get("method") == "input:fear_greed" for c in calls)
+
+        from src.core.order_manager import OrderManagerMixin
+
+        def offline():
+            raise AssertionError("replay must not fetch Fear & Greed")
+
+        monkeypatch.setattr(OrderManagerMixin, "_fetch_fear_greed", staticmethod(offline))
+
+        assert replay(path, strict=True).matches
+
+
+class TestReplayClient:
+    def _client(self, calls, strict=False):
+        tick = RecordedTick(1, datetime(2024, 1, 1), calls=calls)
+        client = ReplayClient(Recording({"cohorts": {}}, [tick]), strict=strict)
+        client.begin_tick(tick)
+        return client
+
+    def test_answers_by_arguments(self):
+        client = self._client(
+            [
+                {"method": "get_current_price", "args": ["ETHUSDT"], "kwargs": {}, "result": 3000},
+                {"method": "get_current_price", "args": ["BTCUSDT"], "kwargs": {}, "result": 60000},
+            ]
+        )
+
+        assert client.get_current_price("BTCUSDT") == 60000
+        assert client.get_current_price("ETHUSDT") == 3000
+        # Repeated call falls back to the last answer
+        assert client.get_current_price("BTCUSDT") == 60000
+        assert client.finish().fallback == 1
+
+    def test_strict_mode_rejects_unrecorded_call(self):
+        client = self._client([], strict=True)
+
+        with pytest.raises(ReplayMismatch):
+            client.get_account_balance("USDT")
+
+    def test_recorded_error_is_raised(self):
+        client = self._client(
+            [
+                {
+                    "method": "cancel_order",
+                    "args": ["BTCUSDT", 1],
+                    "kwargs": {},
+                    "error": "ConnectionError: timeout",
+                }
+            ]
+        )
+
+        with pytest.raises(ReplayedError, match="timeout"):
+            client.cancel_order("BTCUSDT", 1)
+
+    def test_unknown_attribute(self):
+        with pytest.raises(AttributeError):
+            self._client([]).not_a_client_method  # noqa: B018
+
+
+class TestRecorder:
+    def test_calls_outside_tick_are_not_recorded(self, recorder):
+        client = RecordingClient(SimpleNamespace(get_symbol_info=lambda s: {"symbol": s}), recorder)
+
+        client.get_symbol_info("BTCUSDT")
+        recorder.flush()
+
+        assert recorder.path.read_text() == ""
+
+    def test_recorded_input_outside_replay_fetches(self, recorder):
+        assert recorded_input("fear_greed", lambda: 42) == 42
+
+    def test_recorded_input_error_is_recorded(self, recorder):
+        owner = SimpleNamespace(orchestrators={}, client=None)
+
+        def offline():
+            raise ConnectionError("no route")
+
+        with recorded_tick(owner), pytest.raises(ConnectionError):
+            recorded_input("klines:BTCUSDT:1h:200", offline)
+        recorder.flush()
+
+        event = json.loads(recorder.path.read_text().splitlines()[-1])
+        assert event["method"] == "input:klines:BTCUSDT:1h:200"
+        assert event["error"] == "ConnectionError: no route"
+
+    def test_nested_ticks_count_once(self, recorder):
+        owner = SimpleNamespace(orchestrators={}, client=None)
+
+        with recorded_tick(owner), recorded_tick(owner):
+            pass
+
+        assert recorder.ticks == 1
+
+
+class TestVirtualClock:
+    def test_src_modules_follow_tick_time(self):
+        from src.core import hybrid_orchestrator
+
+        clock = replay_module._VirtualClock(datetime(2024, 1, 1, 12, 0))
+        with virtual_clock(clock):
+            clock.now = datetime(2024, 1, 1, 12, 5)
+            assert hybrid_orchestrator.datetime.now() == datetime(2024, 1, 1, 12, 5)
+
+        assert hybrid_orchestrator.datetime is datetime
+
+    def test_sleep_is_skipped(self):
+        from src.risk import stop_loss_executor
+
+        clock = replay_module._VirtualClock(datetime(2024, 1, 1))
+        with virtual_clock(clock):
+            stop_loss_executor.time.sleep(60)
@@ -0,0 +1,101 @@
+"""Tests for partition-based data retention."""
+
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, patch
+
+from src.tasks import retention_tasks
+from src.tasks.retention_tasks import RETENTION_CONFIG, expired_partitions, task_cleanup_old_data
+
+NOW = datetime(2026, 6, 15, tzinfo=UTC)
+
+
+class TestExpiredPartitions:
+    def test_only_fully_expired_months(self):
+        names = [
+            "whale_alerts_p202603",
+            "whale_alerts_p202604",
+            "whale_alerts_p202605",
+            "whale_alerts_default",
+        ]
+
+        # Cutoff 2026-04-16: April still holds rows inside the window
+        assert expired_partitions("whale_alerts", names, 60, NOW) == ["whale_alerts_p202603"]
+
+    def test_december_rolls_over_year(self):
+        names = ["regime_history_p202512"]
+
+        assert expired_partitions("regime_history", names, 1, datetime(2026, 1, 2, tzinfo=UTC)) == [
+            "regime_history_p202512"
+        ]
+        assert (
+            expired_partitions("regime_history", names, 1, datetime(2026, 1, 1, tzinfo=UTC)) == []
+        )
+
+    def test_ignores_foreign_names(self):
+        names = ["market_snapshots_p202001", "market_snapshots_legacy", "other_p202001"]
+
+        assert expired_partitions("market_snapshots", names, 90, NOW) == [
+            "market_snapshots_p202001"
+        ]
+
+
+def _conn(partitioned, children):
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchone.return_value = (partitioned,)
+    cur.fetchall.return_value = [(name,) for name in children]
+    cur.rowcount = 0
+    return conn, cur
+
+
+class TestCleanupTask:
+    def test_drops_expired_partitions(self):
+        conn, cur = _conn(True, ["opportunities_p202001", "opportunities_default"])
+
+        with (
+            patch.object(retention_tasks, "RETENTION_CONFIG", {"opportunities": ("timestamp", 30)}),
+            patch.object(retention_tasks, "get_db_connection", return_value=conn),
+        ):
+            task_cleanup_old_data()
+
+        statements = [c.args[0] for c in cur.execute.call_args_list]
+        assert "SELECT ensure_monthly_partitions(%s, %s)" in statements
+        assert "ALTER TABLE opportunities DETACH PARTITION opportunities_p202001" in statements
+        assert "DROP TABLE opportunities_p202001" in statements
+        assert any(s.startswith("DELETE FROM opportunities_default") for s in statements)
+        assert not any(s.startswith("DELETE FROM opportunities ") for s in statements)
+        conn.commit.assert_called_once()
+        conn.close.assert_called_once()
+
+    def test_unpartitioned_table_falls_back_to_delete(self):
+        conn, cur = _conn(False, [])
+
+        with (
+            patch.object(retention_tasks, "RETENTION_CONFIG", {"whale_alerts": ("timestamp", 60)}),
+            patch.object(retention_tasks, "get_db_connection", return_value=conn),
+        ):
+            task_cleanup_old_data()
+
+        last = cur.execute.call_args_list[-1]
+        assert last.args[0].startswith("DELETE FROM whale_alerts WHERE timestamp <")
+        assert last.args[1] == (60,)
+
+    def test_failure_rolls_back_and_continues(self):
+        conn, cur = _conn(True, [])
+        cur.execute.side_effect = [RuntimeError("lock timeout")] + [None] * 20
+
+        with (
+            patch.object(
+                retention_tasks,
+                "RETENTION_CONFIG",
+                {"ai_conversations": ("timestamp", 30), "regime_history": ("timestamp", 180)},
+            ),
+            patch.object(retention_tasks, "get_db_connection", return_value=conn),
+        ):
+            task_cleanup_old_data()
+
+        conn.rollback.assert_called_once()
+        conn.commit.assert_called_once()
+
+    def test_retention_uses_partition_key(self):
+        assert {column for column, _ in RETENTION_CONFIG.values()} == {"timestamp"}
@@ -199,20 +199,20 @@ class TestCoinScanner:
         yield
         CoinScanner.reset_instance()
 
-    @patch("src.scanner.coin_scanner.psycopg2")
-    def test_singleton_pattern(self, mock_psycopg2):
+    @patch("src.scanner.coin_scanner.get_pooled_connection")
+    def test_singleton_pattern(self, mock_get_conn):
         """Test dass Singleton-Pattern funktioniert."""
-        mock_psycopg2.connect.return_value = MagicMock()
+        mock_get_conn.return_value = MagicMock()
 
         scanner1 = CoinScanner.get_instance()
         scanner2 = CoinScanner.get_instance()
 
         assert scanner1 is scanner2
 
-    @patch("src.scanner.coin_scanner.psycopg2")
-    def test_set_weights(self, mock_psycopg2):
+    @patch("src.scanner.coin_scanner.get_pooled_connection")
+    def test_set_weights(self, mock_get_conn):
         """Test Setzen von benutzerdefinierten Gewichten."""
-        mock_psycopg2.connect.return_value = MagicMock()
+        mock_get_conn.return_value = MagicMock()
 
         scanner = CoinScanner()
         scanner.set_weights({"technical": 0.5, "volume": 0.5})
@@ -221,10 +221,10 @@ class TestCoinScanner:
         total = sum(scanner._weights.values())
         assert abs(total - 1.0) < 0.01
 
-    @patch("src.scanner.coin_scanner.psycopg2")
-    def test_default_weights(self, mock_psycopg2):
+    @patch("src.scanner.coin_scanner.get_pooled_connection")
+    def test_default_weights(self, mock_get_conn):
         """Test Default Score Weights."""
-        mock_psycopg2.connect.return_value = MagicMock()
+        mock_get_conn.return_value = MagicMock()
 
         scanner = CoinScanner()
 
@@ -233,10 +233,10 @@ class TestCoinScanner:
         assert scanner._weights["technical"] == 0.30
         assert scanner._weights["volume"] == 0.20
 
-    @patch("src.scanner.coin_scanner.psycopg2")
-    def test_scan_stats_empty(self, mock_psycopg2):
+    @patch("src.scanner.coin_scanner.get_pooled_connection")
+    def test_scan_stats_empty(self, mock_get_conn):
         """Test Stats bei leerem Scan."""
-        mock_psycopg2.connect.return_value = MagicMock()
+        mock_get_conn.return_value = MagicMock()
 
         scanner = CoinScanner()
         stats = scanner.get_scan_stats()
@@ -244,11 +244,11 @@ class TestCoinScanner:
         assert stats["last_scan"] is None
         assert stats["total_opportunities"] == 0
 
-    @patch("src.scanner.coin_scanner.psycopg2")
+    @patch("src.scanner.coin_scanner.get_pooled_connection")
     @patch("src.data.watchlist.get_watchlist_manager")
-    def test_scan_opportunities_no_coins(self, mock_watchlist, mock_psycopg2):
+    def test_scan_opportunities_no_coins(self, mock_watchlist, mock_get_conn):
         """Test Scan ohne Coins in Watchlist."""
-        mock_psycopg2.connect.return_value = MagicMock()
+        mock_get_conn.return_value = MagicMock()
         mock_manager = MagicMock()
         mock_manager.get_tradeable_coins.return_value = []
         mock_watchlist.return_value = mock_manager
@@ -258,10 +258,10 @@ class TestCoinScanner:
 
         assert opportunities == []
 
-    @patch("src.scanner.coin_scanner.psycopg2")
-    def test_get_top_opportunities(self, mock_psycopg2):
+    @patch("src.scanner.coin_scanner.get_pooled_connection")
+    def test_get_top_opportunities(self, mock_get_conn):
         """Test Abrufen der Top Opportunities."""
-        mock_psycopg2.connect.return_value = MagicMock()
+        mock_get_conn.return_value = MagicMock()
 
         scanner = CoinScanner()
 
@@ -280,10 +280,10 @@ class TestCoinScanner:
         assert top_3[0].symbol == "BTC"
         assert top_3[0].total_score == 0.9
 
-    @patch("src.scanner.coin_scanner.psycopg2")
-    def test_get_opportunities_by_category(self, mock_psycopg2):
+    @patch("src.scanner.coin_scanner.get_pooled_connection")
+    def test_get_opportunities_by_category(self, mock_get_conn):
         """Test Filtern nach Kategorie."""
-        mock_psycopg2.connect.return_value = MagicMock()
+        mock_get_conn.return_value = MagicMock()
 
         scanner = CoinScanner()
 
@@ -299,10 +299,10 @@ class TestCoinScanner:
         assert len(large_caps) == 2
         assert all(o.category == "LARGE_CAP" for o in large_caps)
 
-    @patch("src.scanner.coin_scanner.psycopg2")
-    def test_get_opportunities_by_direction(self, mock_psycopg2):
+    @patch("src.scanner.coin_scanner.get_pooled_connection")
+    def test_get_opportunities_by_direction(self, mock_get_conn):
         """Test Filtern nach Richtung."""
-        mock_psycopg2.connect.return_value = MagicMock()
+        mock_get_conn.return_value = MagicMock()
 
         scanner = CoinScanner()
 
@@ -333,10 +333,10 @@ class TestCoinScanner:
         assert len(longs) == 2
         assert all(o.direction == OpportunityDirection.LONG for o in longs)
 
-    @patch("src.scanner.coin_scanner.psycopg2")
-    def test_get_opportunities_by_risk(self, mock_psycopg2):
+    @patch("src.scanner.coin_scanner.get_pooled_connection")
+    def test_get_opportunities_by_risk(self, mock_get_conn):
         """Test Filtern nach Risiko."""
-        mock_psycopg2.connect.return_value = MagicMock()
+        mock_get_conn.return_value = MagicMock()
 
         scanner = CoinScanner()
 
@@ -3,6 +3,7 @@ Tests für SocialSentimentProvider
 """
 
 from datetime import datetime
+from unittest.mock import MagicMock, patch
 
 
 class TestSocialMetrics:
@@ -57,3 +58,91 @@ class TestSocialSentimentProvider:
 
         # Sollte ohne Fehler initialisieren
         assert provider is not None
+
+    @patch("src.data.social_sentiment.get_async_http_client")
+    def test_lunarcrush_fetched_in_parallel(self, mock_async, reset_new_singletons, monkeypatch):
+        """Alle Symbole in einem fetch_all, Fehler pro Symbol -> None"""
+        from src.api.http_client import HTTPClientError
+        from src.data.social_sentiment import SocialSentimentProvider
+
+        monkeypatch.setenv("LUNARCRUSH_API_KEY", "key")
+        mock_async.return_value.fetch_all.return_value = [
+            {"data": {"galaxy_score": 70, "sentiment": 4}},
+            HTTPClientError("HTTP 404"),
+        ]
+        provider = SocialSentimentProvider()
+
+        metrics = provider.get_lunarcrush_metrics_many(["BTC", "ETH"])
+
+        requests = mock_async.return_value.fetch_all.call_args.args[0]
+        assert [r["url"].rsplit("/", 2)[1] for r in requests] == ["btc", "eth"]
+        assert metrics["BTC"]["galaxy_score"] == 70
+        assert metrics["ETH"] is None
+
+    @patch("src.data.social_sentiment.get_async_http_client")
+    def test_lunarcrush_without_key_skips_requests(
+        self, mock_async, reset_new_singletons, monkeypatch
+    ):
+        from src.data.social_sentiment import SocialSentimentProvider
+
+        monkeypatch.delenv("LUNARCRUSH_API_KEY", raising=False)
+        provider = SocialSentimentProvider()
+
+        assert provider.get_lunarcrush_metrics_many(["BTC"]) == {"BTC": None}
+        mock_async.assert_not_called()
+
+    @patch("src.data.social_sentiment.get_async_http_client")
+    def test_aggregated_sentiments(self, mock_async, reset_new_singletons, monkeypatch):
+        from src.data.social_sentiment import SocialSentimentProvider
+
+        monkeypatch.setenv("LUNARCRUSH_API_KEY", "key")
+        mock_async.return_value.fetch_all.return_value = [
+            {"data": {"galaxy_score": 80, "social_volume": 1000}},
+            {"data": {"galaxy_score": 30}},
+        ]
+        provider = SocialSentimentProvider()
+
+        result = provider.get_aggregated_sentiments(["BTC", "ETH"])
+
+        assert mock_async.return_value.fetch_all.call_count == 1
+        assert result["BTC"].galaxy_score == 80
+        assert result["BTC"].social_volume == 1000
+        assert result["ETH"].galaxy_score == 30
+
+    @patch("src.data.social_sentiment.get_async_http_client")
+    def test_lunarcrush_bulk_failure_falls_back_per_symbol(
+        self, mock_async, reset_new_singletons, monkeypatch
+    ):
+        """Transportfehler im fetch_all trifft nur die Symbole, die auch einzeln scheitern"""
+        from src.data.social_sentiment import SocialSentimentProvider
+
+        monkeypatch.setenv("LUNARCRUSH_API_KEY", "key")
+        mock_async.return_value.fetch_all.side_effect = TimeoutError("loop stalled")
+        provider = SocialSentimentProvider()
+        provider.http = MagicMock()
+        provider.http.get.side_effect = [
+            {"data": {"galaxy_score": 70}},
+            ConnectionError("reset"),
+        ]
+
+        metrics = provider.get_lunarcrush_metrics_many(["BTC", "ETH"])
+
+        assert metrics["BTC"]["galaxy_score"] == 70
+        assert metrics["ETH"] is None
+
+    @patch("src.data.social_sentiment.get_async_http_client")
+    def test_fetch_and_store_survives_bulk_failure(
+        self, mock_async, reset_new_singletons, monkeypatch
+    ):
+        from src.data.social_sentiment import SocialSentimentProvider
+
+        monkeypatch.setenv("LUNARCRUSH_API_KEY", "key")
+        mock_async.return_value.fetch_all.side_effect = RuntimeError("event loop closed")
+        provider = SocialSentimentProvider()
+        provider.http = MagicMock()
+        provider.http.get.return_value = {"data": {"galaxy_score": 60}}
+        provider.store_metrics = MagicMock()
+
+        provider.fetch_and_store(["BTC", "ETH"])
+
+        assert provider.store_metrics.call_count == 2
@@ -0,0 +1,186 @@
+"""Tests for src/core/state_store.py (incremental SQLite state persistence)."""
+
+import json
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.core.state_store import StateStore, load_grid_states, load_hybrid_states
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = StateStore(tmp_path / "state.db")
+    yield s
+    s.close()
+
+
+class TestStateStore:
+    def test_sync_rows_writes_only_delta(self, store):
+        assert store.sync_rows("ns", {"1": {"price": 1}, "2": {"price": 2}}) == 2
+        assert store.sync_rows("ns", {"1": {"price": 1}, "2": {"price": 3}}) == 1
+        assert store.stats["row_writes"] == 3
+
+        assert store.sync_rows("ns", {"1": {"price": 1}, "2": {"price": 3}}) == 0
+        assert store.stats["skipped"] == 1
+
+    def test_sync_rows_deletes_removed_keys(self, store):
+        store.sync_rows("ns", {1: {"a": 1}, 2: {"a": 2}})
+        store.sync_rows("ns", {1: {"a": 1}})
+
+        assert store.load_rows("ns") == {"1": {"a": 1}}
+        assert store.stats["row_deletes"] == 1
+
+    def test_decimal_values_serialized(self, store):
+        store.sync_rows("ns", {"1": {"price": Decimal("1.5")}})
+        assert store.load_rows("ns")["1"]["price"] == 1.5
+
+    def test_put_document_skips_unchanged(self, store):
+        assert store.put_document("ns", {"symbol": "BTCUSDT"}) is True
+        assert store.put_document("ns", {"symbol": "BTCUSDT"}) is False
+        assert store.stats["doc_writes"] == 1
+
+    def test_state_survives_reopen(self, tmp_path):
+        db_path = tmp_path / "state.db"
+        first = StateStore(db_path)
+        first.put_document("grid_state_BTCUSDT", {"symbol": "BTCUSDT"})
+        first.sync_rows("grid_state_BTCUSDT", {"123": {"type": "BUY"}})
+        first.close()
+
+        second = StateStore(db_path)
+        state = second.load_state("grid_state_BTCUSDT", rows_field="active_orders")
+        second.close()
+
+        assert state["symbol"] == "BTCUSDT"
+        assert state["active_orders"] == {"123": {"type": "BUY"}}
+        assert "timestamp" in state
+
+    def test_load_state_missing(self, store):
+        assert store.load_state("missing", rows_field="active_orders") is None
+
+    def test_namespaces_prefix_is_literal(self, store):
+        store.put_document("grid_state_BTCUSDT", {})
+        store.put_document("gridXstateXETHUSDT", {})
+
+        assert store.namespaces("grid_state_") == ["grid_state_BTCUSDT"]
+
+    def test_delete_namespace(self, store):
+        store.put_document("ns", {"a": 1})
+        store.sync_rows("ns", {"1": {}})
+        store.delete_namespace("ns")
+
+        assert store.load_state("ns", rows_field="rows") is None
+        assert store.load_rows("ns") == {}
+
+    def test_batch_commits_once(self, store):
+        with store.batch():
+            store.sync_rows("a", {"1": {}})
+            store.put_document("b", {"x": 1})
+
+        assert store.load_rows("a") == {"1": {}}
+        assert store.get_document("b")[0] == {"x": 1}
+
+    def test_batch_rollback_resets_diff_cache(self, store):
+        with pytest.raises(RuntimeError), store.batch():
+            store.sync_rows("a", {"1": {}})
+            raise RuntimeError("boom")
+
+        assert store.load_rows("a") == {}
+        assert store.sync_rows("a", {"1": {}}) == 1
+
+
+class TestReaders:
+    def test_merges_json_and_store(self, tmp_path):
+        (tmp_path / "grid_state_ETHUSDT_balanced.json").write_text(
+            json.dumps({"symbol": "ETHUSDT", "active_orders": {}})
+        )
+        s = StateStore(tmp_path / "state.db")
+        s.put_document("grid_state_BTCUSDT_conservative", {"symbol": "BTCUSDT"})
+        s.sync_rows("grid_state_BTCUSDT_conservative", {"1": {"type": "SELL"}})
+        s.close()
+
+        states = load_grid_states(tmp_path)
+
+        assert set(states) == {"balanced:ETHUSDT", "conservative:BTCUSDT"}
+        assert states["conservative:BTCUSDT"]["active_orders"] == {"1": {"type": "SELL"}}
+
+    def test_newer_store_wins_over_stale_json(self, tmp_path):
+        (tmp_path / "hybrid_state_balanced.json").write_text(
+            json.dumps({"timestamp": "2000-01-01T00:00:00", "symbols": {}})
+        )
+        s = StateStore(tmp_path / "state.db")
+        s.put_document("hybrid_state_balanced", {"current_mode": "GRID"})
+        s.sync_rows("hybrid_state_balanced", {"BTCUSDT": {"symbol": "BTCUSDT"}})
+        s.close()
+
+        states = load_hybrid_states(tmp_path)
+
+        assert list(states["balanced"]["symbols"]) == ["BTCUSDT"]
+
+    def test_hybrid_single_fallback(self, tmp_path):
+        (tmp_path / "hybrid_state.json").write_text(json.dumps({"symbols": {}}))
+
+        assert load_hybrid_states(tmp_path) == {}
+        assert list(load_hybrid_states(tmp_path, include_single=True)) == ["default"]
+
+
+class TestBackendIntegration:
+    def test_grid_bot_roundtrip(self, tmp_path, reset_new_singletons, monkeypatch):
+        from src.core.bot import GridBot
+
+        monkeypatch.setenv("STATE_BACKEND", "sqlite")
+        monkeypatch.setenv("STATE_DB_PATH", str(tmp_path / "state.db"))
+
+        client = MagicMock()
+        client.get_order_status.return_value = {"status": "NEW", "executedQty": "0"}
+        config = {
+            "symbol": "BTCUSDT",
+            "investment": 100,
+            "num_grids": 3,
+            "grid_range_percent": 5,
+            "testnet": True,
+            "state_file": "grid_state_BTCUSDT_test.json",
+        }
+        with patch("src.core.bot.TelegramNotifier"):
+            bot = GridBot(config, client=client)
+        assert bot.state_store is not None
+
+        bot.active_orders = {123: {"type": "BUY", "price": 50000.0, "quantity": 0.001}}
+        bot.save_state()
+        bot.save_state()
+
+        assert bot.state_store.stats["row_writes"] == 1
+        assert not Path("config/grid_state_BTCUSDT_test.json").exists()
+
+        bot.active_orders = {}
+        assert bot.load_state() is True
+        assert list(bot.active_orders) == [123]
+
+    def test_orchestrator_roundtrip(self, tmp_path, reset_new_singletons, monkeypatch):
+        from src.core.hybrid_config import HybridConfig
+        from src.core.hybrid_orchestrator import HybridOrchestrator
+
+        monkeypatch.setenv("STATE_BACKEND", "sqlite")
+        monkeypatch.setenv("STATE_DB_PATH", str(tmp_path / "state.db"))
+
+        with (
+            patch("src.core.hybrid_orchestrator.TelegramNotifier"),
+            patch("src.core.hybrid_orchestrator.StopLossManager"),
+        ):
+            orch = HybridOrchestrator(HybridConfig(), client=MagicMock(), cohort_name="test")
+            orch.add_symbol("BTCUSDT", 50.0)
+            orch.add_symbol("ETHUSDT", 50.0)
+
+        orch.symbols["BTCUSDT"].hold_quantity = 0.001
+        orch.save_state()
+        writes = orch.state_store.stats["row_writes"]
+
+        orch.symbols["BTCUSDT"].hold_quantity = 0.002
+        orch.save_state()
+        assert orch.state_store.stats["row_writes"] == writes + 1
+
+        orch.symbols["BTCUSDT"].hold_quantity = 0.0
+        orch.load_state()
+        assert orch.symbols["BTCUSDT"].hold_quantity == 0.002
@@ -0,0 +1,152 @@
+"""Tests for the per-symbol stop-loss trigger index."""
+
+import copy
+import random
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.risk.stop_loss import StopLossManager, StopType
+
+
+def _reference_update(stops, prices, atrs=None):
+    """Previous update_all: scan every stop on every call."""
+    triggered = []
+    for stop in stops:
+        if not stop.is_active:
+            continue
+        price = prices.get(stop.symbol)
+        if not price:
+            continue
+        atr = atrs.get(stop.symbol) if atrs else None
+        if stop.update(price, atr):
+            triggered.append(stop.id)
+    return triggered
+
+
+class TestTriggerIndex:
+    def test_matches_full_scan_on_random_walk(self):
+        rng = random.Random(7)
+        manager = StopLossManager()
+        types = [StopType.FIXED, StopType.TRAILING, StopType.ATR, StopType.BREAK_EVEN]
+        for i in range(60):
+            manager.create_stop(
+                symbol=("BTCUSDT", "ETHUSDT", "SOLUSDT")[i % 3],
+                entry_price=100.0 * rng.uniform(0.9, 1.1),
+                quantity=1.0,
+                stop_type=types[i % 4],
+                stop_percentage=rng.uniform(2, 8),
+                trailing_distance=rng.uniform(1, 6),
+            )
+        reference = copy.deepcopy(list(manager.stops.values()))
+
+        price = {"BTCUSDT": 100.0, "ETHUSDT": 100.0, "SOLUSDT": 100.0}
+        for _ in range(300):
+            symbol = rng.choice(list(price))
+            price[symbol] *= rng.uniform(0.98, 1.025)
+            atrs = {symbol: 1.5}
+
+            got = sorted(s.id for s in manager.update_all(dict(price), atrs))
+            expected = sorted(_reference_update(reference, dict(price), atrs))
+            assert got == expected
+
+            # Caller confirms triggered stops, like the bot does after a sell
+            for stop_id in got:
+                manager.stops[stop_id].confirm_trigger()
+                manager.notify_and_persist_trigger(manager.stops[stop_id])
+            for stop in reference:
+                if stop.id in expected:
+                    stop.confirm_trigger()
+
+        for stop in reference:
+            live = manager.stops[stop.id]
+            assert live.current_stop_price == pytest.approx(stop.current_stop_price)
+            assert live.highest_price == pytest.approx(stop.highest_price)
+
+    def test_fixed_stops_trigger_from_sorted_levels(self):
+        manager = StopLossManager()
+        stops = [
+            manager.create_stop("BTCUSDT", 100.0, 1.0, StopType.FIXED, stop_percentage=pct)
+            for pct in (2.0, 5.0, 10.0)
+        ]
+
+        triggered = manager.update_all({"BTCUSDT": 95.0})
+
+        assert {s.id for s in triggered} == {stops[0].id, stops[1].id}
+        assert all(s.triggered_price == 95.0 for s in triggered)
+
+    def test_unchanged_price_skips_symbol(self):
+        manager = StopLossManager()
+        stop = manager.create_stop("BTCUSDT", 100.0, 1.0, StopType.ATR)
+        stop.update = MagicMock(return_value=False)
+
+        manager.update_all({"BTCUSDT": 101.0})
+        manager.update_all({"BTCUSDT": 101.0, "ETHUSDT": 50.0})
+        manager.update_all({"BTCUSDT": 101.0}, atrs={"BTCUSDT": 2.0})
+
+        assert stop.update.call_count == 2
+
+    def test_reactivated_stop_is_rechecked_at_same_price(self):
+        manager = StopLossManager()
+        stop = manager.create_stop("BTCUSDT", 100.0, 1.0, StopType.FIXED)
+
+        assert manager.update_all({"BTCUSDT": 90.0}) == [stop]
+        stop.reactivate()  # market sell failed
+
+        assert manager.update_all({"BTCUSDT": 90.0}) == [stop]
+
+    def test_trailing_batch_raises_stops(self):
+        manager = StopLossManager()
+        a = manager.create_stop("BTCUSDT", 100.0, 1.0, trailing_distance=5.0)
+        b = manager.create_stop("BTCUSDT", 120.0, 1.0, trailing_distance=2.0)
+
+        assert manager.update_all({"BTCUSDT": 110.0}) == [b]
+        assert a.highest_price == 110.0
+        assert a.current_stop_price == pytest.approx(104.5)
+        assert b.highest_price == 120.0
+
+    def test_cancel_removes_from_index(self):
+        manager = StopLossManager()
+        stop = manager.create_stop("BTCUSDT", 100.0, 1.0, StopType.FIXED)
+
+        assert manager.cancel_stop(stop.id)
+
+        assert manager.update_all({"BTCUSDT": 50.0}) == []
+        assert stop.id in manager.stops
+        assert "BTCUSDT" not in manager._books
+
+
+class TestSchedulerStopCheck:
+    @patch("src.tasks.system_tasks.get_db_connection")
+    @patch("src.data.market_data.get_market_data")
+    def test_one_price_per_symbol_and_batched_trailing(self, mock_md, mock_db):
+        from src.tasks.system_tasks import TRAILING_STOP_UPDATE, task_check_stops
+
+        market = MagicMock()
+        market.get_price.return_value = 70000.0
+        mock_md.return_value = market
+        conn = MagicMock()
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.fetchall.return_value = [
+            {
+                "id": i,
+                "symbol": "BTCUSDT",
+                "entry_price": 60000,
+                "stop_price": 60000,
+                "quantity": 0.1,
+                "stop_type": "trailing",
+                "highest_price": 65000,
+                "trailing_distance": 5.0,
+            }
+            for i in range(3)
+        ]
+        mock_db.return_value = conn
+
+        task_check_stops()
+
+        market.get_price.assert_called_once_with("BTCUSDT")
+        cur.executemany.assert_called_once()
+        sql, rows = cur.executemany.call_args.args
+        assert sql is TRAILING_STOP_UPDATE
+        assert [r[2] for r in rows] == [0, 1, 2]
+        conn.commit.assert_called_once()
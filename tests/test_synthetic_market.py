@@ -0,0 +1,70 @@
+"""Tests für den synthetischen Markt-Generator"""
+
+import numpy as np
+
+from src.backtest.synthetic import SyntheticMarket
+
+
+class TestSyntheticMarket:
+    def test_same_seed_same_data(self):
+        a = SyntheticMarket(seed=7).ohlcv("BTCUSDT", 300)
+        b = SyntheticMarket(seed=7).ohlcv("BTCUSDT", 300)
+
+        for key in ("open", "high", "low", "close", "volume"):
+            np.testing.assert_array_equal(a[key], b[key])
+
+    def test_symbol_stream_independent_of_call_order(self):
+        market = SyntheticMarket(seed=7)
+        eth_first = market.ohlcv("ETHUSDT", 100)["close"]
+        market.ohlcv("BTCUSDT", 100)
+
+        np.testing.assert_array_equal(market.ohlcv("ETHUSDT", 100)["close"], eth_first)
+
+    def test_different_seed_differs(self):
+        a = SyntheticMarket(seed=1).ohlcv("BTCUSDT", 100)["close"]
+        b = SyntheticMarket(seed=2).ohlcv("BTCUSDT", 100)["close"]
+
+        assert not np.allclose(a, b)
+
+    def test_candles_are_consistent(self):
+        data = SyntheticMarket().ohlcv("SOLUSDT", 500)
+
+        assert (data["high"] >= np.maximum(data["open"], data["close"])).all()
+        assert (data["low"] <= np.minimum(data["open"], data["close"])).all()
+        assert (data["volume"] > 0).all()
+
+    def test_symbols_are_correlated(self):
+        frame = SyntheticMarket(market_beta=0.8).price_frame(periods=400)
+        corr = frame.pct_change().dropna().corr()
+
+        assert list(frame.columns)[:2] == ["BTC", "ETH"]
+        assert corr.loc["BTC", "ETH"] > 0.3
+
+    def test_klines_match_binance_format(self):
+        rows = SyntheticMarket().klines("BTCUSDT", 3)
+
+        assert len(rows) == 3
+        assert rows[0][0] == 1704067200000  # 2024-01-01 UTC
+        assert rows[1][0] - rows[0][0] == 3_600_000
+        assert float(rows[0][4]) > 0
+
+    def test_order_flow_sides_bracket_close(self):
+        market = SyntheticMarket()
+        close = market.ohlcv("BTCUSDT", 500)["close"]
+        orders = market.order_flow("BTCUSDT", 200)
+
+        assert len(orders) == 200
+        for order in orders:
+            reference = close[order.created_index]
+            if order.side == "BUY":
+                assert order.price < reference
+            else:
+                assert order.price > reference
+
+    def test_trade_history_rows(self):
+        trades = SyntheticMarket().trade_history(50)
+
+        assert len(trades) == 50
+        assert {t["market_trend"] for t in trades} <= {"BULL", "SIDEWAYS", "BEAR"}
+        assert all(0 <= t["fear_greed"] <= 100 for t in trades)
+        assert trades == SyntheticMarket().trade_history(50)
@@ -0,0 +1,146 @@
+"""Tests for the priority scheduler executor."""
+
+import importlib
+import threading
+
+import schedule
+
+from src.tasks.executor import Priority, TaskExecutor
+from src.utils.telemetry import TaskTelemetry
+
+WAIT = 5.0
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _blocking_task(name):
+    started, release = threading.Event(), threading.Event()
+
+    def task():
+        started.set()
+        release.wait(WAIT)
+
+    task.__name__ = name
+    return task, started, release
+
+
+def _drain(executor):
+    executor.shutdown(timeout=WAIT)
+
+
+class TestTaskExecutor:
+    def test_risk_runs_while_reporting_lane_is_busy(self):
+        executor = TaskExecutor()
+        executor.start()
+        report, report_started, release = _blocking_task("task_weekly_export")
+        stops_done = threading.Event()
+
+        def task_check_stops():
+            stops_done.set()
+
+        try:
+            executor.submit(report, Priority.REPORTING)
+            assert report_started.wait(WAIT)
+            executor.submit(task_check_stops, Priority.RISK)
+
+            assert stops_done.wait(WAIT)
+            assert executor.running() == ["task_weekly_export"]
+        finally:
+            release.set()
+            _drain(executor)
+
+    def test_overlapping_submission_is_skipped(self):
+        executor = TaskExecutor(telemetry=TaskTelemetry())
+        executor.start()
+        task, started, release = _blocking_task("task_regime_detection")
+        try:
+            assert executor.submit(task, Priority.DATA)
+            assert started.wait(WAIT)
+
+            assert executor.submit(task, Priority.DATA) is False
+        finally:
+            release.set()
+            _drain(executor)
+
+        stats = executor.telemetry.snapshot()["tasks"]["task_regime_detection"]
+        assert stats["runs"] == 1
+        assert stats["skipped"] == 1
+
+    def test_failures_and_durations_are_recorded(self):
+        executor = TaskExecutor(telemetry=TaskTelemetry())
+        executor.start()
+
+        def task_broken():
+            raise RuntimeError("boom")
+
+        executor.submit(task_broken, Priority.DATA)
+        _drain(executor)
+
+        stats = executor.telemetry.snapshot()["tasks"]["task_broken"]
+        assert stats["runs"] == 1
+        assert stats["failures"] == 1
+        assert stats["duration_max"] >= 0.0
+        assert stats["lag_count"] == 1
+
+    def test_timeout_replaces_stuck_worker(self):
+        clock = FakeClock()
+        executor = TaskExecutor(
+            workers={Priority.TRADING: 1}, clock=clock, telemetry=TaskTelemetry()
+        )
+        executor.start()
+        stuck, started, release = _blocking_task("task_mode_evaluation")
+        done = threading.Event()
+
+        def task_reconcile_orders():
+            done.set()
+
+        try:
+            executor.submit(stuck, Priority.TRADING, timeout=10.0)
+            assert started.wait(WAIT)
+            executor.submit(task_reconcile_orders, Priority.TRADING)
+
+            assert executor.check_timeouts() == []
+            clock.now = 11.0
+            assert executor.check_timeouts() == ["task_mode_evaluation"]
+
+            # Replacement worker serves the queued task while the stuck one still runs
+            assert done.wait(WAIT)
+            assert executor.telemetry.snapshot()["tasks"]["task_mode_evaluation"]["timeouts"] == 1
+        finally:
+            release.set()
+            _drain(executor)
+
+        assert len(executor._lanes[Priority.TRADING].workers) == 1
+
+    def test_wrap_jobs_submits_schedule_jobs(self):
+        scheduler = schedule.Scheduler()
+        executor = TaskExecutor()
+        executor.start()
+        ran_on = []
+
+        def task_check_stops():
+            ran_on.append(threading.current_thread().name)
+
+        scheduler.every(5).minutes.do(task_check_stops)
+        executor.wrap_jobs(scheduler.get_jobs(), {"task_check_stops": Priority.RISK})
+        scheduler.run_all()
+        _drain(executor)
+
+        assert ran_on == ["scheduler-risk-0"]
+        assert scheduler.get_jobs()[0].job_func.__name__ == "task_check_stops"
+
+
+class TestSchedulerPriorities:
+    def test_priority_table_names_registered_tasks(self):
+        scheduler = importlib.import_module("docker.scheduler")
+
+        for name in [*scheduler.TASK_PRIORITIES, *scheduler.TASK_TIMEOUTS]:
+            assert callable(getattr(scheduler, name))
+        assert scheduler.TASK_PRIORITIES["task_check_stops"] is Priority.RISK
+        assert scheduler.TASK_PRIORITIES["task_weekly_export"] is Priority.REPORTING
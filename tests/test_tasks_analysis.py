@@ -56,6 +56,39 @@ class TestTaskRegimeDetection:
         task_regime_detection()  # Should not raise
 
 
+class TestTaskRefreshRiskBudgets:
+    @patch("src.tasks.analysis_tasks.get_db_connection")
+    @patch("src.risk.cvar_sizing.CVaRPositionSizer.get_instance")
+    def test_refreshes_watchlist_and_traded_symbols(self, mock_sizer_cls, mock_db):
+        from src.tasks.analysis_tasks import task_refresh_risk_budgets
+
+        mock_conn = MagicMock()
+        cur = mock_conn.cursor.return_value.__enter__.return_value
+        cur.fetchall.return_value = [("SOLUSDT",), ("BTCUSDT",)]
+        mock_db.return_value = mock_conn
+
+        task_refresh_risk_budgets()
+
+        assert cur.execute.call_args.args[1] == (30,)
+        mock_sizer_cls.return_value.refresh_risk_budgets.assert_called_once_with(
+            ["BTCUSDT", "SOLUSDT"]
+        )
+        mock_conn.close.assert_called_once()
+
+    @patch("src.tasks.analysis_tasks.get_db_connection")
+    @patch("src.risk.cvar_sizing.CVaRPositionSizer.get_instance")
+    def test_no_symbols(self, mock_sizer_cls, mock_db):
+        from src.tasks.analysis_tasks import task_refresh_risk_budgets
+
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value.__enter__.return_value.fetchall.return_value = []
+        mock_db.return_value = mock_conn
+
+        task_refresh_risk_budgets()
+
+        mock_sizer_cls.return_value.refresh_risk_budgets.assert_not_called()
+
+
 class TestTaskUpdateSignalWeights:
     @patch("src.analysis.bayesian_weights.BayesianWeightLearner.get_instance")
     def test_happy_path(self, mock_learner_cls):
@@ -243,36 +276,36 @@ class TestTaskAbTestCheck:
         from src.tasks.cycle_tasks import task_ab_test_check
 
         mock_fw = MagicMock()
-        mock_fw.get_all_experiments_summary.return_value = [
-            {"id": "exp1", "name": "Test A", "status": "RUNNING"}
-        ]
-        mock_fw.check_early_stopping.return_value = (True, "Significant")
         result = MagicMock()
         result.winner = "variant_a"
         result.p_value = 0.01
         result.winner_improvement = 15.0
         result.significance.value = "HIGH"
+        mock_fw.experiments = {"exp1": MagicMock()}
+        mock_fw.experiments["exp1"].name = "Test A"
+        mock_fw.check_running_experiments.return_value = {"exp1": (True, "Significant", result)}
         mock_fw.complete_experiment.return_value = result
         mock_fw_cls.return_value = mock_fw
 
         task_ab_test_check()
 
-        mock_fw.check_early_stopping.assert_called_once_with("exp1")
-        mock_fw.complete_experiment.assert_called_once()
+        mock_fw.check_running_experiments.assert_called_once()
+        mock_fw.check_early_stopping.assert_not_called()
+        mock_fw.complete_experiment.assert_called_once_with(
+            "exp1", promote_winner=True, result=result
+        )
 
     @patch("src.optimization.ab_testing.ABTestingFramework.get_instance")
     def test_no_running_experiments(self, mock_fw_cls):
         from src.tasks.cycle_tasks import task_ab_test_check
 
         mock_fw = MagicMock()
-        mock_fw.get_all_experiments_summary.return_value = [
-            {"id": "exp1", "name": "Done", "status": "COMPLETED"}
-        ]
+        mock_fw.check_running_experiments.return_value = {}
         mock_fw_cls.return_value = mock_fw
 
         task_ab_test_check()
 
-        mock_fw.check_early_stopping.assert_not_called()
+        mock_fw.complete_experiment.assert_not_called()
 
     @patch("src.optimization.ab_testing.ABTestingFramework.get_instance")
     def test_exception(self, mock_fw_cls):
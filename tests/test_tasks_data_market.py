@@ -51,19 +51,21 @@ class TestTaskFetchSocialSentiment:
         metrics = MagicMock()
         metrics.composite_sentiment = 0.8
         metrics.social_volume = 50000
-        mock_provider.get_aggregated_sentiment.return_value = metrics
+        mock_provider.get_aggregated_sentiments.side_effect = lambda symbols: dict.fromkeys(
+            symbols, metrics
+        )
         mock_provider_cls.return_value = mock_provider
 
         task_fetch_social_sentiment()
 
-        assert mock_provider.get_aggregated_sentiment.call_count == 3
+        mock_provider.get_aggregated_sentiments.assert_called_once_with(["BTC", "ETH", "SOL"])
 
     @patch("src.data.social_sentiment.SocialSentimentProvider.get_instance")
     def test_no_metrics(self, mock_provider_cls):
         from src.tasks.data_tasks import task_fetch_social_sentiment
 
         mock_provider = MagicMock()
-        mock_provider.get_aggregated_sentiment.return_value = None
+        mock_provider.get_aggregated_sentiments.return_value = {"BTC": None}
         mock_provider_cls.return_value = mock_provider
 
         task_fetch_social_sentiment()
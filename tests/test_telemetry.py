@@ -0,0 +1,173 @@
+"""Tests for scheduler task telemetry."""
+
+import json
+import urllib.request
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.tasks.executor import Priority, TaskExecutor
+from src.utils.task_lock import task_locked
+from src.utils.telemetry import (
+    TaskTelemetry,
+    format_perf_summary,
+    get_task_telemetry,
+    read_published,
+    record_db,
+    record_http,
+    start_metrics_server,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTaskTelemetry:
+    def test_span_collects_duration_lag_db_and_http(self):
+        clock = FakeClock()
+        telemetry = TaskTelemetry(clock=clock)
+
+        with telemetry.track("task_check_stops", lag=3.0):
+            record_db(0.2)
+            record_db(0.3)
+            record_http(1.5)
+            clock.now = 2.0
+        record_db(9.0)  # outside any task: ignored
+
+        m = telemetry.snapshot()["tasks"]["task_check_stops"]
+        assert m["runs"] == 1
+        assert m["duration_sum"] == 2.0
+        assert m["duration_p95_le"] == 5.0
+        assert m["lag_avg"] == 3.0
+        assert (m["db_queries"], m["db_seconds"]) == (2, 0.5)
+        assert (m["http_calls"], m["http_seconds"]) == (1, 1.5)
+
+    def test_nested_track_records_one_run(self):
+        telemetry = TaskTelemetry()
+
+        with telemetry.track("outer"), telemetry.track("inner"):
+            record_db(0.1)
+
+        tasks = telemetry.snapshot()["tasks"]
+        assert list(tasks) == ["outer"]
+        assert tasks["outer"]["db_queries"] == 1
+
+    def test_failure_is_counted_and_reraised(self):
+        telemetry = TaskTelemetry()
+
+        with pytest.raises(RuntimeError), telemetry.track("task_broken"):
+            raise RuntimeError("boom")
+
+        assert telemetry.snapshot()["tasks"]["task_broken"]["failures"] == 1
+
+    def test_prometheus_text(self):
+        telemetry = TaskTelemetry()
+        with telemetry.track("task_daily_summary", lag=0.5):
+            record_http(0.25)
+
+        text = telemetry.render_prometheus()
+
+        assert "# TYPE scheduler_task_duration_seconds histogram" in text
+        assert (
+            'scheduler_task_duration_seconds_bucket{task="task_daily_summary",le="+Inf"} 1' in text
+        )
+        assert 'scheduler_task_start_lag_seconds_count{task="task_daily_summary"} 1' in text
+        assert 'scheduler_task_http_requests_total{task="task_daily_summary"} 1' in text
+
+    def test_publish_and_read(self, tmp_path):
+        telemetry = TaskTelemetry()
+        with telemetry.track("task_weekly_export"):
+            pass
+        path = tmp_path / "task_telemetry.json"
+
+        assert telemetry.publish(path)
+
+        snapshot = read_published(path)
+        assert snapshot["tasks"]["task_weekly_export"]["runs"] == 1
+        assert read_published(path, max_age=-1) is None
+        assert read_published(tmp_path / "missing.json") is None
+
+    def test_perf_summary_lists_slowest_and_problems(self):
+        clock = FakeClock()
+        telemetry = TaskTelemetry(clock=clock)
+        with telemetry.track("task_weekly_export"):
+            clock.now = 120.0
+        with telemetry.track("task_check_stops"):
+            clock.now = 120.5
+        telemetry.record_skip("task_check_stops")
+
+        summary = format_perf_summary(telemetry.snapshot())
+
+        assert summary.index("weekly_export") < summary.index("check_stops")
+        assert "task_check_stops: 0 Fehler, 0 Timeouts, 1 übersprungen" in summary
+
+    def test_metrics_endpoint(self):
+        telemetry = TaskTelemetry()
+        with telemetry.track("task_market_snapshot"):
+            pass
+        server = start_metrics_server(0, telemetry=telemetry)
+        try:
+            base = f"http://127.0.0.1:{server.server_port}"
+            with urllib.request.urlopen(f"{base}/metrics", timeout=5) as resp:
+                assert b"task_market_snapshot" in resp.read()
+            with urllib.request.urlopen(f"{base}/metrics.json", timeout=5) as resp:
+                assert json.load(resp)["tasks"]["task_market_snapshot"]["runs"] == 1
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestInstrumentation:
+    def test_executor_records_lag_and_db(self):
+        telemetry = TaskTelemetry()
+        executor = TaskExecutor(telemetry=telemetry)
+        executor.start()
+
+        def task_update_watchlist():
+            record_db(0.01)
+
+        executor.submit(task_update_watchlist, Priority.DATA, late=2.0)
+        executor.shutdown(timeout=5)
+
+        m = telemetry.snapshot()["tasks"]["task_update_watchlist"]
+        assert m["runs"] == 1
+        assert m["db_queries"] == 1
+        assert m["lag_avg"] >= 2.0
+
+    def test_task_locked_tracks_runs(self):
+        @task_locked
+        def task_telemetry_probe():
+            return "done"
+
+        assert task_telemetry_probe() == "done"
+
+        assert get_task_telemetry().snapshot()["tasks"]["task_telemetry_probe"]["runs"] >= 1
+
+    def test_leased_cursor_records_statements(self):
+        from src.data.database import _LeasedCursor
+
+        telemetry = TaskTelemetry()
+        cursor = _LeasedCursor(MagicMock(), MagicMock())
+
+        with telemetry.track("task_cleanup_old_data"):
+            cursor.execute("DELETE FROM market_snapshots WHERE ts < %s", ("x",))
+            cursor.executemany("UPDATE trades SET x = %s", [(1,), (2,)])
+
+        assert telemetry.snapshot()["tasks"]["task_cleanup_old_data"]["db_queries"] == 2
+
+    @patch("requests.Session.get")
+    def test_http_client_records_requests(self, mock_get, reset_new_singletons):
+        from src.api.http_client import HTTPClient
+
+        mock_get.return_value = MagicMock(status_code=200, json=lambda: {"ok": True})
+        telemetry = TaskTelemetry()
+
+        with telemetry.track("task_fetch_etf_flows"):
+            HTTPClient().get("https://api.example.com/flows")
+
+        assert telemetry.snapshot()["tasks"]["task_fetch_etf_flows"]["http_calls"] == 1
@@ -0,0 +1,138 @@
+"""Tests for the tick-loop profiler."""
+
+import logging
+import threading
+import time
+
+from src.core import tick_profiler
+from src.core.tick_profiler import (
+    ALL_SYMBOLS,
+    SamplingProfiler,
+    TickProfiler,
+    poll_profile_request,
+    read_profile_result,
+    request_profile,
+    tick_phase,
+    tick_section,
+)
+
+
+class TestTickProfiler:
+    def test_phases_are_recorded_per_symbol_and_overall(self):
+        profiler = TickProfiler("grid_bot", window=8, slow_ms=10_000)
+
+        for symbol in ("BTCUSDT", "ETHUSDT"):
+            with profiler.tick(symbol) as timer, timer.phase("check_orders"):
+                pass
+
+        stats = profiler.stats()
+        assert stats["check_orders"]["BTCUSDT"]["count"] == 1
+        assert stats["check_orders"][ALL_SYMBOLS]["count"] == 2
+        assert stats["total"][ALL_SYMBOLS]["count"] == 2
+        assert profiler.ticks == 2
+
+    def test_window_keeps_latest_durations(self):
+        profiler = TickProfiler("grid_bot", window=3, slow_ms=10_000)
+
+        for _ in range(5):
+            with profiler.tick("BTCUSDT") as timer:
+                timer.add("price_fetch", 0.1)
+
+        stats = profiler.stats()["price_fetch"]["BTCUSDT"]
+        assert stats["count"] == 3
+        assert stats["p50"] == stats["p99"] == 100.0
+
+    def test_multi_symbol_tick_attributes_phase_to_symbol(self):
+        profiler = TickProfiler("hybrid", slow_ms=10_000)
+
+        with profiler.tick() as timer:
+            timer.add("execute", 0.2, "BTCUSDT")
+            timer.add("execute", 0.1, "ETHUSDT")
+
+        stats = profiler.stats()["execute"]
+        assert stats["BTCUSDT"]["p50"] == 200.0
+        assert stats[ALL_SYMBOLS]["p50"] == 300.0
+
+    def test_sub_phases_join_running_tick(self):
+        profiler = TickProfiler("grid_bot", slow_ms=10_000)
+
+        @tick_phase("telegram")
+        def send():
+            return "sent"
+
+        assert send() == "sent"  # outside a tick: plain call
+        with profiler.tick("BTCUSDT"):
+            send()
+            with tick_section("stop_updates"):
+                pass
+
+        stats = profiler.stats()
+        assert stats["telegram"]["BTCUSDT"]["count"] == 1
+        assert "stop_updates" in stats
+
+    def test_slow_tick_logs_breakdown(self, caplog):
+        profiler = TickProfiler("grid_bot", slow_ms=50)
+
+        with (
+            caplog.at_level(logging.WARNING, logger="trading_bot"),
+            profiler.tick("BTCUSDT") as timer,
+        ):
+            timer.add("check_orders", 0.01)
+            timer.add("price_fetch", 0.09)
+            time.sleep(0.06)
+
+        assert profiler.slow_ticks == 1
+        message = caplog.records[-1].getMessage()
+        assert "Slow tick: grid_bot BTCUSDT" in message
+        assert message.index("price_fetch") < message.index("check_orders")
+
+    def test_format_stats_orders_by_p95(self):
+        profiler = TickProfiler("grid_bot", slow_ms=10_000)
+        with profiler.tick("BTCUSDT") as timer:
+            timer.add("save_state", 0.001)
+            timer.add("check_orders", 0.5)
+
+        lines = profiler.format_stats().splitlines()
+        phases = [line.split()[0] for line in lines[2:]]
+        assert phases.index("check_orders") < phases.index("save_state")
+
+
+class TestSamplingProfiler:
+    def test_samples_only_while_ticking(self):
+        sampler = SamplingProfiler()
+        profiler = TickProfiler("grid_bot", slow_ms=10_000)
+        thread_id = threading.get_ident()
+
+        sampler.sample(thread_id)
+        assert sampler.samples == 0
+
+        with profiler.tick("BTCUSDT"):
+            sampler.sample(thread_id)
+
+        assert sampler.samples == 1
+        (stack,) = sampler.stacks
+        assert stack[-1].endswith(":sample")
+        assert "test_samples_only_while_ticking" in sampler.folded()
+        labels = [label for label, _own, _incl in sampler.top_functions(n=500)]
+        assert any(label.endswith(":test_samples_only_while_ticking") for label in labels)
+
+    def test_request_file_starts_sampler(self, tmp_path, monkeypatch):
+        started = []
+        monkeypatch.setattr(tick_profiler._sampler, "start", started.append)
+        path = tmp_path / "tick_profile_request.json"
+
+        assert not poll_profile_request(path)
+        request_profile(15, path=path)
+        poll_profile_request(path)
+
+        assert started == [15.0]
+        assert not path.exists()
+
+    def test_read_profile_result_respects_since(self, tmp_path):
+        path = tmp_path / "tick_profile.txt"
+        assert read_profile_result(path=path) is None
+
+        path.write_text("summary")
+
+        assert read_profile_result(since=0, path=path) == "summary"
+        assert read_profile_result(since=time.time() + 60, path=path) is None
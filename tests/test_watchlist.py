@@ -94,41 +94,41 @@ class TestWatchlistManager:
         yield
         WatchlistManager.reset_instance()
 
-    @patch("src.data.watchlist.psycopg2")
-    def test_singleton_pattern(self, mock_psycopg2):
+    @patch("src.data.watchlist.get_pooled_connection")
+    def test_singleton_pattern(self, mock_get_conn):
         """Test dass Singleton-Pattern funktioniert."""
-        mock_psycopg2.connect.return_value = MagicMock()
+        mock_get_conn.return_value = MagicMock()
 
         manager1 = WatchlistManager.get_instance()
         manager2 = WatchlistManager.get_instance()
 
         assert manager1 is manager2
 
-    @patch("src.data.watchlist.psycopg2")
-    def test_connect_success(self, mock_psycopg2):
+    @patch("src.data.watchlist.get_pooled_connection")
+    def test_connect_success(self, mock_get_conn):
         """Test erfolgreiche DB-Verbindung."""
         mock_conn = MagicMock()
-        mock_psycopg2.connect.return_value = mock_conn
+        mock_get_conn.return_value = mock_conn
 
         manager = WatchlistManager()
 
         assert manager.conn is not None
-        mock_psycopg2.connect.assert_called_once()
+        mock_get_conn.assert_called_once()
 
-    @patch("src.data.watchlist.psycopg2")
-    def test_connect_failure(self, mock_psycopg2):
+    @patch("src.data.watchlist.get_pooled_connection")
+    def test_connect_failure(self, mock_get_conn):
         """Test Fehlerbehandlung bei DB-Verbindung."""
-        mock_psycopg2.connect.side_effect = Exception("Connection failed")
+        mock_get_conn.side_effect = Exception("Connection failed")
 
         manager = WatchlistManager()
 
         assert manager.conn is None
 
-    @patch("src.data.watchlist.psycopg2")
-    def test_load_watchlist(self, mock_psycopg2, mock_db_connection):
+    @patch("src.data.watchlist.get_pooled_connection")
+    def test_load_watchlist(self, mock_get_conn, mock_db_connection):
         """Test Laden der Watchlist aus DB."""
         conn, cursor = mock_db_connection
-        mock_psycopg2.connect.return_value = conn
+        mock_get_conn.return_value = conn
 
         # Mock DB response
         cursor.fetchall.return_value = [
@@ -162,11 +162,11 @@ class TestWatchlistManager:
         assert coins[0].symbol == "BTCUSDT"
         assert coins[0].category == "LARGE_CAP"
 
-    @patch("src.data.watchlist.psycopg2")
-    def test_get_tradeable_coins(self, mock_psycopg2, mock_db_connection):
+    @patch("src.data.watchlist.get_pooled_connection")
+    def test_get_tradeable_coins(self, mock_get_conn, mock_db_connection):
         """Test Filtern nach tradeable Coins."""
         conn, cursor = mock_db_connection
-        mock_psycopg2.connect.return_value = conn
+        mock_get_conn.return_value = conn
 
         # Mock DB response mit einem tradeable und einem nicht-tradeable Coin
         cursor.fetchall.return_value = [
@@ -222,11 +222,11 @@ class TestWatchlistManager:
         assert len(tradeable) == 1
         assert tradeable[0].symbol == "BTCUSDT"
 
-    @patch("src.data.watchlist.psycopg2")
-    def test_get_coins_by_category(self, mock_psycopg2, mock_db_connection):
+    @patch("src.data.watchlist.get_pooled_connection")
+    def test_get_coins_by_category(self, mock_get_conn, mock_db_connection):
         """Test Filtern nach Kategorie."""
         conn, cursor = mock_db_connection
-        mock_psycopg2.connect.return_value = conn
+        mock_get_conn.return_value = conn
 
         cursor.fetchall.return_value = [
             {
@@ -284,11 +284,11 @@ class TestWatchlistManager:
         assert len(mid_caps) == 1
         assert mid_caps[0].symbol == "SOLUSDT"
 
-    @patch("src.data.watchlist.psycopg2")
-    def test_get_stats(self, mock_psycopg2, mock_db_connection):
+    @patch("src.data.watchlist.get_pooled_connection")
+    def test_get_stats(self, mock_get_conn, mock_db_connection):
         """Test Statistik-Berechnung."""
         conn, cursor = mock_db_connection
-        mock_psycopg2.connect.return_value = conn
+        mock_get_conn.return_value = conn
 
         cursor.fetchall.return_value = [
             {
@@ -0,0 +1,342 @@
+"""Tests for src/data/write_behind.py (batched write-behind persistence)."""
+
+import json
+from contextlib import contextmanager
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.data import write_behind
+from src.data.write_behind import WriteBehindWriter
+
+
+class FakeDB:
+    """DatabaseManager-Ersatz: zählt Transaktionen, optional mit Fehlern."""
+
+    def __init__(self):
+        self.transactions = 0
+        self.fail_next = 0
+        self.error = RuntimeError("Keine Datenbankverbindung verfügbar")
+
+    def _ensure_pool(self):
+        return True
+
+    @contextmanager
+    def transaction(self):
+        if self.fail_next:
+            self.fail_next -= 1
+            raise self.error
+        self.transactions += 1
+        yield MagicMock()
+
+
+@pytest.fixture
+def written(monkeypatch):
+    """Ersetzt die Handler durch Recorder: Liste von (kind, payloads)."""
+    calls = []
+
+    def recorder(kind):
+        return lambda cur, payloads: calls.append((kind, [p["n"] for p in payloads]))
+
+    monkeypatch.setattr(write_behind, "PREPARERS", {})
+    monkeypatch.setattr(
+        write_behind,
+        "HANDLERS",
+        {
+            kind: recorder(kind)
+            for kind in ("trade_fill", "pair_close_symbol", "stop_loss_save", "stop_loss_update")
+        },
+    )
+    return calls
+
+
+@pytest.fixture
+def db():
+    return FakeDB()
+
+
+@pytest.fixture
+def make_writer(tmp_path, db):
+    writers = []
+
+    def factory(**kwargs):
+        kwargs.setdefault("flush_interval", 0.01)
+        w = WriteBehindWriter(spool_path=tmp_path / "spool.jsonl", db=db, **kwargs)
+        w.RETRY_BASE_DELAY = 0.01
+        writers.append(w)
+        return w
+
+    yield factory
+    for w in writers:
+        w.close(timeout=1)
+
+
+def _spool_lines(tmp_path):
+    path = tmp_path / "spool.jsonl"
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestWriteBehindWriter:
+    def test_batches_preserve_order(self, make_writer, written, db):
+        writer = make_writer(batch_size=50, flush_interval=0.2)
+        for n in range(5):
+            writer.submit("trade_fill", {"n": n})
+        writer.submit("stop_loss_save", {"n": 5})
+        writer.submit("trade_fill", {"n": 6})
+
+        assert writer.flush(timeout=5)
+
+        assert written == [
+            ("trade_fill", [0, 1, 2, 3, 4]),
+            ("stop_loss_save", [5]),
+            ("trade_fill", [6]),
+        ]
+        assert db.transactions == 1
+        assert writer.stats["written"] == 7
+
+    def test_spool_compacted_after_commit(self, make_writer, written, tmp_path):
+        writer = make_writer()
+        writer.submit("trade_fill", {"n": 1})
+
+        assert writer.flush(timeout=5)
+        assert _spool_lines(tmp_path) == []
+
+    def test_unacked_jobs_replayed_on_start(self, make_writer, written, tmp_path):
+        (tmp_path / "spool.jsonl").write_text(
+            "\n".join(
+                [
+                    json.dumps({"seq": 1, "kind": "trade_fill", "payload": {"n": 1}}),
+                    json.dumps({"seq": 2, "kind": "trade_fill", "payload": {"n": 2}}),
+                    json.dumps({"ack": 1}),
+                    json.dumps({"seq": 3, "kind": "stop_loss_update", "payload": {"n": 3}}),
+                    '{"seq": 4, "kind": "trade_',  # abgeschnittene Zeile
+                ]
+            )
+        )
+
+        writer = make_writer()
+        assert writer.flush(timeout=5)
+
+        assert written == [("trade_fill", [2]), ("stop_loss_update", [3])]
+        assert writer.stats["replayed"] == 2
+        assert writer.submit("trade_fill", {"n": 4}) == 4
+
+    def test_retries_when_db_unavailable(self, make_writer, written, db):
+        db.fail_next = 2
+        writer = make_writer()
+        writer.submit("trade_fill", {"n": 1})
+
+        assert writer.flush(timeout=5)
+        assert written == [("trade_fill", [1])]
+        assert writer.stats["retries"] == 2
+
+    def test_close_keeps_pending_jobs_in_spool(self, make_writer, written, db, tmp_path):
+        db.fail_next = 10_000
+        writer = make_writer()
+        writer.submit("trade_fill", {"n": 1})
+
+        writer.close(timeout=0.2)
+
+        assert [line.get("seq") for line in _spool_lines(tmp_path)] == [1]
+
+    def test_bad_job_dead_lettered(self, make_writer, written, monkeypatch, tmp_path):
+        def picky(cur, payloads):
+            if any(p["n"] == 2 for p in payloads):
+                raise ValueError("constraint violation")
+            written.append(("trade_fill", [p["n"] for p in payloads]))
+
+        monkeypatch.setitem(write_behind.HANDLERS, "trade_fill", picky)
+        writer = make_writer(flush_interval=0.2)
+        for n in (1, 2, 3):
+            writer.submit("trade_fill", {"n": n})
+
+        assert writer.flush(timeout=5)
+        assert written == [("trade_fill", [1]), ("trade_fill", [3])]
+        assert writer.stats["failed"] == 1
+        failed = (tmp_path / "spool.failed.jsonl").read_text()
+        assert "constraint violation" in failed
+
+    def test_unknown_kind_rejected(self, make_writer):
+        writer = make_writer()
+        with pytest.raises(ValueError):
+            writer.submit("nope", {})
+
+    def test_spool_append_is_fsynced(self, make_writer, written):
+        writer = make_writer()
+
+        with patch("src.data.write_behind.os.fsync") as fsync:
+            writer.submit("trade_fill", {"n": 1})
+
+        assert fsync.called
+
+    def test_default_spool_per_process(self, monkeypatch):
+        monkeypatch.delenv("WRITE_BEHIND_SPOOL", raising=False)
+        monkeypatch.setattr(write_behind.sys, "argv", ["/app/main_hybrid.py"])
+        hybrid = write_behind.default_spool_path()
+        monkeypatch.setattr(write_behind.sys, "argv", ["/app/main.py"])
+
+        assert hybrid == "data/spool/write_behind_main_hybrid.jsonl"
+        assert write_behind.default_spool_path() != hybrid
+
+    def test_singleton(self, reset_new_singletons, tmp_path, monkeypatch):
+        monkeypatch.setenv("WRITE_BEHIND_SPOOL", str(tmp_path / "spool.jsonl"))
+
+        assert write_behind.get_write_behind() is write_behind.get_write_behind()
+
+
+class TestTradeFillHandler:
+    def test_pairs_follow_fill_order(self):
+        cur = MagicMock()
+        trade = {"symbol": "BTCUSDT", "price": 100.0, "quantity": 1.0, "fee_usd": 0.1}
+        payloads = [
+            {"trade": {**trade, "timestamp": "2026-01-01T00:00:00"}, "pair": {"action": "open"}},
+            {"trade": {**trade, "timestamp": "2026-01-01T00:01:00"}, "pair": {"action": "open"}},
+            {"trade": {**trade, "timestamp": "2026-01-01T00:02:00"}, "pair": {"action": "close"}},
+            {"trade": {**trade, "timestamp": "2026-01-01T00:03:00"}, "pair": None},
+        ]
+        calls = []
+
+        with (
+            patch("psycopg2.extras.execute_values", return_value=[(11,), (12,), (13,), (14,)]),
+            patch(
+                "src.data.trade_pairs.TradePairTracker.insert_open_pairs",
+                side_effect=lambda cur, rows: calls.append(("open", [r[2] for r in rows])),
+            ),
+            patch(
+                "src.data.trade_pairs.TradePairTracker.close_oldest_pair",
+                side_effect=lambda *a, **kw: calls.append(("close", kw["exit_trade_id"])),
+            ) as close,
+        ):
+            write_behind._write_trade_fills(cur, payloads)
+
+        assert calls == [("open", ["11", "12"]), ("close", 13)]
+        assert close.call_args.kwargs["now"] == datetime(2026, 1, 1, 0, 2)
+
+
+class TestTradeFillPreparer:
+    FILL = {
+        "fill": {
+            "symbol": "ETHUSDT",
+            "side": "BUY",
+            "order_price": 3000.0,
+            "price": 3003.0,
+            "quantity": 0.1,
+            "fee_usd": 0.3,
+            "timestamp": "2026-01-01T00:00:00",
+        },
+        "pair": {"action": "open", "cohort_id": "c1", "exit_reason": "grid_fill"},
+        "cohort_id": "c1",
+    }
+
+    def test_builds_trade_with_market_context(self):
+        market = MagicMock()
+        market.get_fear_greed.return_value.value = 30
+        market.get_price.return_value = 61000.0
+
+        with patch("src.data.market_data.get_market_data", return_value=market):
+            payload = write_behind._prepare_trade_fill(self.FILL)
+
+        trade = payload["trade"]
+        assert "fill" not in payload
+        assert payload["pair"] == self.FILL["pair"]
+        assert trade["fear_greed"] == 30
+        assert trade["btc_price"] == 61000.0
+        assert trade["timestamp"] == datetime(2026, 1, 1)
+        assert trade["slippage_bps"] == 10.0
+        assert payload["signals"]["fear_greed_signal"] is not None
+
+    def test_prepared_once_across_retries(self, make_writer, written, db, monkeypatch):
+        prepared = []
+        monkeypatch.setitem(
+            write_behind.PREPARERS,
+            "trade_fill",
+            lambda payload: prepared.append(payload["n"]) or payload,
+        )
+        db.fail_next = 2
+        writer = make_writer()
+
+        writer.submit("trade_fill", {"n": 1})
+        assert writer.flush(timeout=2)
+
+        assert prepared == [1]
+        assert written == [("trade_fill", [1])]
+
+
+class TestPairCloseHandler:
+    def test_closes_symbol_pairs_in_order(self):
+        cur = MagicMock()
+        payloads = [
+            {
+                "cohort_id": "c1",
+                "symbol": "SOLUSDT",
+                "exit_price": 90.0,
+                "exit_qty": 0.8,
+                "exit_reason": "stop_loss",
+                "timestamp": "2026-01-01T00:05:00",
+            },
+            {
+                "cohort_id": "c1",
+                "symbol": "ETHUSDT",
+                "exit_price": 3000.0,
+                "exit_qty": 0.1,
+                "exit_reason": "cash_exit",
+                "timestamp": "2026-01-01T00:06:00",
+            },
+        ]
+
+        with patch("src.data.trade_pairs.TradePairTracker.close_symbol_pairs") as close:
+            write_behind._write_pair_closes(cur, payloads)
+
+        assert [c.args[2] for c in close.call_args_list] == ["SOLUSDT", "ETHUSDT"]
+        assert close.call_args_list[0].kwargs == {
+            "exit_price": 90.0,
+            "exit_reason": "stop_loss",
+            "now": datetime(2026, 1, 1, 0, 5),
+        }
+
+    def test_pair_close_queued_behind_fills(self, make_writer, written, db):
+        writer = make_writer(batch_size=50, flush_interval=0.2)
+
+        writer.submit("trade_fill", {"n": 1})
+        writer.submit("pair_close_symbol", {"n": 2})
+        assert writer.flush(timeout=2)
+
+        assert written == [("trade_fill", [1]), ("pair_close_symbol", [2])]
+
+
+class TestOrderFillIntegration:
+    def test_fill_enqueued_instead_of_direct_writes(self, bot, mock_binance):
+        from decimal import Decimal
+
+        bot.strategy = MagicMock()
+        bot.strategy.on_buy_filled.return_value = {"action": "NONE"}
+        bot.memory = MagicMock()
+        bot.write_behind = MagicMock()
+        bot._trade_pair_tracker = MagicMock(cohort_id="c1")
+        bot.active_orders = {
+            1: {"type": "BUY", "price": Decimal("50000"), "quantity": Decimal("0.001")}
+        }
+        mock_binance.get_open_orders.return_value = []
+        mock_binance.get_order_status.return_value = {
+            "status": "FILLED",
+            "price": "50000.00",
+            "executedQty": "0.001",
+        }
+
+        with patch.object(bot, "_get_current_fear_greed") as fear_greed:
+            bot.check_orders()
+
+        # Kein Netzwerk-I/O für den Trade-Datensatz im Fill-Pfad
+        fear_greed.assert_not_called()
+        mock_binance.get_current_price.assert_not_called()
+        bot.memory.save_trade.assert_not_called()
+        bot._trade_pair_tracker.open_pair.assert_not_called()
+        kind, payload = bot.write_behind.submit.call_args.args
+        assert kind == "trade_fill"
+        assert payload["pair"] == {"action": "open", "cohort_id": "c1", "exit_reason": "grid_fill"}
+        assert payload["fill"]["quantity"] == 0.001
+        assert payload["fill"]["order_price"] == 50000.0
+        json.dumps(payload)  # spoolbar ohne default=str